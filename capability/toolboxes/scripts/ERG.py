@@ -18,62 +18,94 @@ import arcpy
 import os
 import math
 import datetime
+import numpy
 
 
-def LookUpERG(pChemical, pPlacardID, pSpillSize, pTimeOfDay, pERGdbf):
-    # Returns a tuple of {Initial Isolation Distance, Protective Action Distance, Materials, GuideNum}, the first 2 both in meters, the
-    # third a list of materials that match the Placard ID passed in (where one was passed in - otherwise this will simply be
-    # equal to pChemical) and the last the guide number that relates to the ERG entry
+# ERG lookup tables already read by LoadERGTable, keyed by the path of the dbf
+_ergTables = {}
 
-    materialFieldName = "Material"
-    placardFieldName = "Placard"
-    guideNumFieldName = "GuideNum"
+ergSpillSizes = (("Small", "SM"), ("Large", "LG"))
+ergTimesOfDay = (("Day", "DWD_DAY"), ("Night", "DWD_NITE"))
 
-    scriptFolder = os.path.dirname(__file__)
-    toolBoxFolder = os.path.dirname(scriptFolder)
 
-    # Identify the where clause and fields to request
-    whereClause = materialFieldName + " = '" + pChemical + "'"
-    if (pChemical == ""):
-        whereClause = placardFieldName + " = " + str(pPlacardID)
-        
-    prefix = "SM"
+def ERGKey(pChemical, pPlacardID, pSpillSize, pTimeOfDay):
+    # Returns the key of an ERG entry in the table built by LoadERGTable: (material or placard ID, spill size, time of day)
+    # The placard ID is used when no chemical is given, as in the "Placard = n" query LookUpERG used to run
+    spillSize = "Small"
     if (pSpillSize == "Large"):
-        prefix = "LG"
-
-    timeField = "DWD_DAY"
+        spillSize = "Large"
+    timeOfDay = "Day"
     if (pTimeOfDay == "Night"):
-        timeField = "DWD_NITE"
+        timeOfDay = "Night"
+    if (pChemical == "" or pChemical is None):
+        return (int(pPlacardID), spillSize, timeOfDay)
+    return (pChemical, spillSize, timeOfDay)
+
 
-    iidField = prefix + "_RAD"
-    padField = prefix + timeField
+def LoadERGTable(pERGdbf):
+    # Reads the ERG dbf once and indexes it in memory. Returns a dictionary keyed as ERGKey, each entry being the list of
+    # (Initial Isolation Distance, Protective Action Distance, Material, GuideNum) rows that match, in table order.
+    # The table is cached for the session so repeated lookups do not scan the dbf again
 
-    # Look up the dbf file for the relevant distances
+    tableKey = os.path.normcase(os.path.abspath(pERGdbf))
+    if tableKey in _ergTables:
+        return _ergTables[tableKey]
+
+    distanceFields = []
+    for spillSize, prefix in ergSpillSizes:
+        distanceFields.append(prefix + "_RAD")
+        for timeOfDay, timeField in ergTimesOfDay:
+            distanceFields.append(prefix + timeField)
+    fields = ["Material", "Placard", "GuideNum"] + distanceFields
+
+    table = {}
+    for row in arcpy.da.SearchCursor(pERGdbf, fields):
+        material, placard, guidenum = row[0], row[1], row[2]
+        values = dict(zip(distanceFields, row[3:]))
+        for spillSize, prefix in ergSpillSizes:
+            for timeOfDay, timeField in ergTimesOfDay:
+                entry = (values[prefix + "_RAD"], values[prefix + timeField], material, guidenum)
+                table.setdefault((material, spillSize, timeOfDay), []).append(entry)
+                if (placard is not None):
+                    table.setdefault((int(placard), spillSize, timeOfDay), []).append(entry)
+
+    _ergTables[tableKey] = table
+    return table
+
+
+def SummarizeERG(pRows):
+    # Returns (IID, PAD, Materials, GuideNum) for the rows of an ERG entry: the maximum distances across the rows, the
+    # materials joined with " OR " and the guide number of the last row (as LookUpERG has always done)
     iid = 0
     pad = 0
     materials = ""
     guidenum = ""
-    myCount = 0
-    for row in arcpy.da.SearchCursor(pERGdbf, (iidField, padField, materialFieldName, guideNumFieldName), whereClause):
-        # If there are multiple results, find the highest values
-        myCount += 1
-        thisIid = row[0]
-        thisPad = row[1]
-        thisMaterial = row[2]
-        guidenum = row[3]
+    for thisIid, thisPad, thisMaterial, guidenum in pRows:
         if (materials != ""):
             materials += " OR "
         materials += thisMaterial
-        arcpy.AddMessage("Found " + thisMaterial)
-        arcpy.AddMessage("Initial Isolation Distance = " + str(thisIid) + " meters")
-        arcpy.AddMessage("Protective Action Distance = " + str(thisPad) + " meters")
         if (thisIid > iid):
             iid = thisIid
         if (thisPad > pad):
             pad = thisPad
-            
+    return (iid, pad, materials, guidenum)
+
+
+def LookUpERG(pChemical, pPlacardID, pSpillSize, pTimeOfDay, pERGdbf):
+    # Returns a tuple of {Initial Isolation Distance, Protective Action Distance, Materials, GuideNum}, the first 2 both in meters, the
+    # third a list of materials that match the Placard ID passed in (where one was passed in - otherwise this will simply be
+    # equal to pChemical) and the last the guide number that relates to the ERG entry
+
+    # Look up the in-memory ERG table for the relevant distances
+    rows = LoadERGTable(pERGdbf).get(ERGKey(pChemical, pPlacardID, pSpillSize, pTimeOfDay), [])
+    for thisIid, thisPad, thisMaterial, thisGuideNum in rows:
+        arcpy.AddMessage("Found " + thisMaterial)
+        arcpy.AddMessage("Initial Isolation Distance = " + str(thisIid) + " meters")
+        arcpy.AddMessage("Protective Action Distance = " + str(thisPad) + " meters")
+    iid, pad, materials, guidenum = SummarizeERG(rows)
+
     # Report if there were multiple results
-    if (myCount > 1):
+    if (len(rows) > 1):
         arcpy.AddMessage("Multiple possible materials found... selecting the maximum distances across all of them:")
         arcpy.AddMessage("Furthest Initial Isolation Distance = " + str(iid) + " meters")
         arcpy.AddMessage("Furthest Protective Action Distance = " + str(pad) + " meters")
@@ -82,6 +114,17 @@ def LookUpERG(pChemical, pPlacardID, pSpillSize, pTimeOfDay, pERGdbf):
     return (iid, pad, materials, guidenum)
 
 
+def UTMFactoryCode(pLongitude, pLatitude):
+    # Returns the factory code of the WGS84 UTM zone used for a geographic location
+    # The following code is taken from the previous (.NET) version of ERG to assign a UTM based on NAD27
+    uTMConstantValue = int(math.floor((pLongitude - 3) / 6 + 0.5) + 31)
+    if (uTMConstantValue > 60):
+        uTMConstantValue = 60
+    if (pLatitude > 0):
+        return 32600 + uTMConstantValue
+    return 32700 + uTMConstantValue
+
+
 def GetProjectedPoint(pPointFeatureRecordSet):
     arcpy.AddMessage("Getting the projected point")
     # Returns a point in a projected coordinate system (could be the same as the input feature set)
@@ -92,22 +135,9 @@ def GetProjectedPoint(pPointFeatureRecordSet):
         if (sr.type == "Geographic"):
             arcpy.AddMessage("Point is in Geographic reference system (" + sr.name + ")")
             arcpy.AddMessage("Projecting to...")
-            # The following code is taken from the previous (.NET) version of ERG to assign a UTM based on NAD27
-            uTMConstantValue = int(math.floor((pt.X - 3) / 6 + 0.5) + 31)
-            if (uTMConstantValue > 60):
-                uTMConstantValue = 60
-            arcpy.AddMessage("  UTM Zone: " + str(uTMConstantValue))
-            if (pt.Y) > 0:
-                if (uTMConstantValue < 10):
-                    esriPRConstant = "3260" + str(uTMConstantValue)
-                else:
-                    esriPRConstant = "326" + str(uTMConstantValue)
-            else:
-                if (uTMConstantValue < 10):
-                    esriPRConstant = "3270" + str(uTMConstantValue)
-                else:
-                    esriPRConstant = "327" + str(uTMConstantValue)
-            arcpy.AddMessage("  Factory code: " + esriPRConstant)
+            esriPRConstant = UTMFactoryCode(pt.X, pt.Y)
+            arcpy.AddMessage("  UTM Zone: " + str(esriPRConstant % 100))
+            arcpy.AddMessage("  Factory code: " + str(esriPRConstant))
             srUTM = arcpy.SpatialReference(int(esriPRConstant))
             newgeom = geom.projectAs(srUTM)
             if newgeom == None:
@@ -230,3 +260,141 @@ def MakeERGFeatures(pProjectedPointGeometry, pWindBlowingToDirection, pInitialIs
     
 
     return
+
+
+def ERGZoneGeometries(pX, pY, pWindBlowingToDirection, pIID, pPAD, pCircleVertices=360, pArcVertices=61):
+    # Computes the vertices of the ERG zones for arrays of spill points in one NumPy pass. All distances are in the units of
+    # the (projected) coordinates and the wind directions in degrees of the direction the wind is blowing to. Returns a
+    # dictionary of arrays, the first axis being the spill point:
+    #   "iiz"     - (n, pCircleVertices + 1, 2) closed ring of the initial isolation zone
+    #   "paz"     - (n, 5, 2) closed ring of the protective action zone rectangle
+    #   "arc"     - (n, pArcVertices, 2) protective action arc
+    #   "radials" - (n, 2, 2, 2) the two radials from the edge of the initial isolation zone to the ends of the arc
+    # The protective action zone is the same rectangle MakeERGFeatures builds: PAD wide, centred on the spill point and PAD
+    # long downwind. Its sides cut the PAD circle at 30 degrees either side of the wind direction, which bounds the arc, and
+    # the IID circle at asin(PAD / (2 * IID)) (or on the base line where the circle is narrower than the zone)
+    x = numpy.asarray(pX, dtype=float).reshape(-1, 1)
+    y = numpy.asarray(pY, dtype=float).reshape(-1, 1)
+    wind = numpy.radians(numpy.asarray(pWindBlowingToDirection, dtype=float) * numpy.ones(x.shape[0])).reshape(-1, 1)
+    iid = (numpy.asarray(pIID, dtype=float) * numpy.ones(x.shape[0])).reshape(-1, 1)
+    pad = (numpy.asarray(pPAD, dtype=float) * numpy.ones(x.shape[0])).reshape(-1, 1)
+
+    def ring(bearings, radius):
+        # points at bearings (radians clockwise from north) and radius from the spill points
+        return numpy.dstack((x + radius * numpy.sin(bearings), y + radius * numpy.cos(bearings)))
+
+    circle = numpy.linspace(0.0, 2 * math.pi, pCircleVertices + 1).reshape(1, -1)
+    iiz = ring(circle, iid)
+    iiz[:, -1] = iiz[:, 0]
+
+    left = ring(wind - math.pi / 2, pad / 2)[:, 0]
+    right = ring(wind + math.pi / 2, pad / 2)[:, 0]
+    downwind = numpy.hstack((pad * numpy.sin(wind), pad * numpy.cos(wind)))
+    paz = numpy.dstack((left, left + downwind, right + downwind, right, left)).transpose(0, 2, 1)
+
+    halfArc = math.asin(0.5)
+    arc = ring(wind + numpy.linspace(-halfArc, halfArc, pArcVertices).reshape(1, -1), pad)
+
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        innerAngle = numpy.where(iid > 0, numpy.arcsin(numpy.clip(pad / (2 * iid), 0.0, 1.0)), math.pi / 2)
+    inner = ring(numpy.hstack((wind - innerAngle, wind + innerAngle)), iid)
+    radials = numpy.empty((x.shape[0], 2, 2, 2))
+    radials[:, 0, 0], radials[:, 0, 1] = inner[:, 0], arc[:, 0]
+    radials[:, 1, 0], radials[:, 1, 1] = inner[:, 1], arc[:, -1]
+
+    return {"iiz": iiz, "paz": paz, "arc": arc, "radials": radials}
+
+
+def _ergGeometry(pVertices, pGeometryType, pSR):
+    # Builds an arcpy polygon or polyline from an (n, 2) array of vertices
+    return pGeometryType(arcpy.Array([arcpy.Point(vx, vy) for vx, vy in pVertices]), pSR)
+
+
+def MakeERGFeaturesForPoints(pIncidentPoints, pMaterialField, pWindBlowingToDirection, pSpillSize, pTimeOfDay, pERGdbf,
+                             pOutAreas, pOutLines, pTemplateLoc):
+    # Batch version of LookUpERG and MakeERGFeatures for a feature class of incident points. Creates the same 3 polygon and
+    # 3 line features as MakeERGFeatures for every point, in one pass over the points and one insert cursor per output:
+    #   pMaterialField holds the material name or, where it is numeric, the placard ID of each incident
+    #   pWindBlowingToDirection, pSpillSize and pTimeOfDay are either a field of the incident points or one value for all
+    # The outputs use the coordinate system of the incident points or, where that is geographic, the UTM zone of their
+    # centre. Points whose material is not in the ERG table are skipped with a warning.
+    # Returns the number of incidents written
+
+    fieldNames = [f.name for f in arcpy.ListFields(pIncidentPoints)]
+    valueFields = [pMaterialField]
+    constants = {}
+    for name, value in (("wind", pWindBlowingToDirection), ("size", pSpillSize), ("time", pTimeOfDay)):
+        if (str(value) in fieldNames):
+            valueFields.append(str(value))
+        else:
+            constants[name] = value
+
+    # Work out the output coordinate system
+    sr = arcpy.Describe(pIncidentPoints).spatialReference
+    if (sr.type == "Geographic"):
+        lonLat = [row[0] for row in arcpy.da.SearchCursor(pIncidentPoints, ["SHAPE@XY"])]
+        if (len(lonLat) == 0):
+            arcpy.AddWarning("No incident points found")
+            return 0
+        centre = numpy.mean(numpy.array(lonLat), axis=0)
+        sr = arcpy.SpatialReference(UTMFactoryCode(centre[0], centre[1]))
+        arcpy.AddMessage("Incident points are geographic, using " + sr.name)
+
+    # Read every incident and look up its ERG entry
+    table = LoadERGTable(pERGdbf)
+    incidents = []
+    for row in arcpy.da.SearchCursor(pIncidentPoints, ["SHAPE@XY"] + valueFields, spatial_reference=sr):
+        values = dict(zip(valueFields, row[1:]))
+        material = values[pMaterialField]
+        wind = constants.get("wind", values.get(str(pWindBlowingToDirection)))
+        spillSize = constants.get("size", values.get(str(pSpillSize)))
+        timeOfDay = constants.get("time", values.get(str(pTimeOfDay)))
+        if (isinstance(material, (int, float)) or str(material).strip().isdigit()):
+            key = ERGKey("", int(material), spillSize, timeOfDay)
+        else:
+            key = ERGKey(material, "", spillSize, timeOfDay)
+        if (key not in table):
+            arcpy.AddWarning("No ERG entry for " + str(material) + ", skipping incident")
+            continue
+        iid, pad, materials, guidenum = SummarizeERG(table[key])
+        incidents.append((row[0][0], row[0][1], float(wind or 0), iid, pad, materials, guidenum, key[1], key[2]))
+    arcpy.AddMessage(str(len(incidents)) + " incidents found in the ERG table")
+
+    # Compute all of the zones at once
+    metersPerUnit = sr.metersPerUnit
+    columns = list(zip(*incidents)) if incidents else [[]] * 9
+    geometries = ERGZoneGeometries(columns[0], columns[1], columns[2],
+                                   numpy.array(columns[3], dtype=float) / metersPerUnit,
+                                   numpy.array(columns[4], dtype=float) / metersPerUnit)
+    arcpy.AddMessage("All output geometries have been calculated")
+
+    # Create the output featureclasses based on the templates
+    arcpy.AddMessage("Creating output Feature Classes...")
+    arcpy.CreateFeatureclass_management(os.path.dirname(pOutAreas), os.path.basename(pOutAreas), "POLYGON",
+                                        pTemplateLoc + "\\ERGAreas", "DISABLED", "DISABLED", sr)
+    arcpy.CreateFeatureclass_management(os.path.dirname(pOutLines), os.path.basename(pOutLines), "POLYLINE",
+                                        pTemplateLoc + "\\ERGLines", "DISABLED", "DISABLED", sr)
+
+    dtNow = datetime.datetime.now()
+    arcpy.AddMessage("Populating output Feature Classes...")
+    areas = arcpy.da.InsertCursor(pOutAreas, ("SHAPE@", "X", "Y", "ERGZone", "Materials", "SpillTimeOfDay", "SpillSize", "DateEntered", "GuideNum"))
+    lines = arcpy.da.InsertCursor(pOutLines, ("SHAPE@", "X", "Y", "LineType", "Materials", "SpillTimeOfDay", "SpillSize", "DateEntered", "GuideNum"))
+    try:
+        for i, (originX, originY, wind, iid, pad, materials, guidenum, spillSize, timeOfDay) in enumerate(incidents):
+            initialIsolationZone = _ergGeometry(geometries["iiz"][i], arcpy.Polygon, sr)
+            protectiveActionZone = _ergGeometry(geometries["paz"][i], arcpy.Polygon, sr)
+            combinedZone = initialIsolationZone.union(protectiveActionZone)
+            attributes = (originX, originY)
+            details = (materials, timeOfDay, spillSize, dtNow, guidenum)
+            areas.insertRow((combinedZone,) + attributes + ("Combined Zone",) + details)
+            areas.insertRow((protectiveActionZone,) + attributes + ("Protective Action Zone",) + details)
+            areas.insertRow((initialIsolationZone,) + attributes + ("Initial Isolation Zone",) + details)
+            lines.insertRow((_ergGeometry(geometries["arc"][i], arcpy.Polyline, sr),) + attributes + ("Arc",) + details)
+            for radial in geometries["radials"][i]:
+                lines.insertRow((_ergGeometry(radial, arcpy.Polyline, sr),) + attributes + ("Radial",) + details)
+    finally:
+        del areas
+        del lines
+    arcpy.AddMessage("...populated")
+
+    return len(incidents)
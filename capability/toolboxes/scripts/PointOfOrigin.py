@@ -15,14 +15,17 @@
 # 7/13/2015 - ps Added logic to hold Group Layer Result with a time string appended to the Group Layer name.
 # 7/14/2015 - ps Noticed that issue with hang at MakeFeatureLayer_management is related to Pro's Indexing and/or the Windows process ArcGISCleanup.exe
 # 7/16/2015 - ps Added option to uncheck True Curve, results in densified polygon which can be projected on the fly more readily that True Curve
+# 10/19/2026 - Ranges and points of origin from PointOfOriginUtils (NumPy range rings and overlap counts) instead of Buffer/Erase/Intersect per impact point
 # Using Build 3308 (release candidate?)
 # ---------------------------------------------------------------------------
 # Have NOT changed overall structure of script to use Functions()
 #
 # ======================Import arcpy module=================================
 import os, sys, traceback, math, decimal, time
+import numpy
 import arcpy
 from arcpy import env
+import PointOfOriginUtils
 
 # ======================ARGUMENTS & LOCALS ===============================
 inFeature = arcpy.GetParameterAsText(0) # Feature Set
@@ -44,7 +47,7 @@ outputImpactRangeFeatures = [] # Feature Class - multiple
 
 outputCoordinateSystem = arcpy.GetParameter(13) # Coordinate System
 outputCoordinateSystemAsText = arcpy.GetParameterAsText(13) # String
-outputUseTrueCurve = arcpy.GetParameterAsText(14) # boolean string (true or false)
+outputUseTrueCurve = arcpy.GetParameterAsText(14) # boolean string (true or false) - no longer used, ranges are always densified
 
 # Will use a time stamp on the grouped layer for keeping track of multiple runs; prefix should distinguish Feature Classes?
 timestr = time.strftime("%Y%m%d_%H%M")
@@ -131,104 +134,65 @@ try:
 
     modelOriginsDict = {} #modelOriginsDict[scrubbedModel] = [{"ranges":impactPointBuffersList},{"combined":output_poo}]
 
-    #Loop through the weapons and create create the Point of Origin for each
-    for indexWeaponModel in range(len(selectedWeaponModels)):
-        
-        selectedModel = selectedWeaponModels[indexWeaponModel]
+    # Read the impact points and the ranges of the selected weapons once
+    impacts = PointOfOriginUtils.ReadImpactPoints(outputImpactPointFeatures)
+    weaponRanges = PointOfOriginUtils.ReadWeaponRanges(weaponTable, modelField, minRangeField, maxRangeField, selectedWeaponModels)
+    models = []
+    for selectedModel in selectedWeaponModels:
+        if selectedModel in weaponRanges:
+            models.append(selectedModel)
+        else:
+            arcpy.AddWarning("No ranges found for: " + selectedModel)
+    if len(impacts) == 0 or len(models) == 0:
+        raise Exception("At least one impact point and one weapon model with ranges are needed")
+    ranges = [weaponRanges[selectedModel] for selectedModel in models]
+    impactLon = [impact[1] for impact in impacts]
+    impactLat = [impact[2] for impact in impacts]
+
+    # Range rings of all impact points and weapons in one pass (always densified, there are no true curves)
+    arcpy.AddMessage("Building ranges for " + str(len(impacts)) + " impact points and " + str(len(models)) + " weapon models...")
+    rings = PointOfOriginUtils.GeodesicRings(impactLon, impactLat, numpy.tile(numpy.ravel(ranges), (len(impacts), 1)))
+    rings = rings.reshape(len(impacts), len(models), 2, rings.shape[-2], 2)
+
+    # Count the ranges covering each cell of a grid shared by all of the weapons
+    arcpy.AddMessage("Counting overlapping ranges...")
+    grid = PointOfOriginUtils.ImpactGrid(impactLon, impactLat, ranges)
+    counts = None
+    if grid is not None:
+        counts = PointOfOriginUtils.OverlapCounts(grid, impactLon, impactLat, ranges)
+        if DEBUG == True: arcpy.AddMessage("Grid: " + str(grid.rows) + " x " + str(grid.cols) + " cells")
+
+    #Loop through the weapons and write the ranges and Point of Origin for each
+    for indexWeaponModel, selectedModel in enumerate(models):
         scrubbedModel = ''.join(e for e in selectedModel if (e.isalnum() or e == " " or e == "_"))
         scrubbedModel = scrubbedModel.replace(" ", "_")
-        arcpy.AddMessage("Getting Range for: " + selectedModel)
-        if DEBUG == True: 
-           arcpy.AddMessage("Model: " + selectedModel) 
-           arcpy.AddMessage("Scrubbed Model: " + scrubbedModel)
-           
-        
-        #Set the minimum and maximum range based on the selected weapon system
-        where = modelField + " = " + selectedModel
-        fields = minRangeField + "," + maxRangeField
-        cursor = arcpy.SearchCursor(weaponTable, where, None,fields)
-        
-        #TODO: remove version/app specific switching here if we can
-        # gisVersion = arcpy.GetInstallInfo()["Version"]
-        # gisBuild = arcpy.GetInstallInfo()["BuildNumber"]
-        # if gisVersion in desktopVersion or gisVersion == "1.0" or gisBuild == "3068":
-        if app == "ARCGIS_PRO":
-            record = cursor.next() # this is method for Pro 1.0.2, or public  beta 1.1 build 3068
-        else:
-            record = next(cursor) # Python 3 method - but only works in Pro 1.1 later builds.
-            
-        minRange =  record.getValue(minRangeField)
-        maxRange =  record.getValue(maxRangeField)
+        minRange, maxRange = ranges[indexWeaponModel]
         if DEBUG == True:
+            arcpy.AddMessage("Model: " + selectedModel)
+            arcpy.AddMessage("Scrubbed Model: " + scrubbedModel)
             arcpy.AddMessage("Minimum Range: " + str(minRange))
             arcpy.AddMessage("Maximum Range: " + str(maxRange))
-            
-        del cursor, record
-
-        # combine buffers of all impact points -
-        # Consider not using True Curves, or Densifying/Generalizing Buffers into non-True Curve Polygons for Project-on-the-Fly 
-        impactPointBuffersList = []
-        inFields = ["OID@","SHAPE@"]
-        rows = arcpy.da.SearchCursor(outputImpactPointFeatures,inFields)
-        for row in rows:                   
-            oid = row[0]
-            feat = row[1]
-            arcpy.AddMessage("Buffering Impact Point OID " + str(oid) + " for " + selectedModel)
-            
-            # buffer the max distance from point - check if True Curves are not wanted 
-            impactMaxBuffer = os.path.join(env.scratchWorkspace,"Impact_Max_" + str(oid) + "_" + scrubbedModel)            
-            if outputUseTrueCurve == "true":
-                if DEBUG == True: arcpy.AddMessage("Using True Curve" )
-                arcpy.Buffer_analysis(feat,impactMaxBuffer,maxRange)
-                delete_me.append(impactMaxBuffer)
-            if outputUseTrueCurve == "false":
-                if DEBUG == True: arcpy.AddMessage("Densifying True Curve to regular polygon" )
-                arcpy.Buffer_analysis(feat,impactMaxBuffer,maxRange)
-                arcpy.Densify_edit(impactMaxBuffer, "ANGLE","", "", "0.75")
-                delete_me.append(impactMaxBuffer)
-                
-            # buffer the min distance from point
-            impactMinBuffer = os.path.join(env.scratchWorkspace,"Impact_Min_" + str(oid) + "_" + scrubbedModel)
-            if outputUseTrueCurve == "true":
-                if DEBUG == True: arcpy.AddMessage("Using True Curve" )
-                arcpy.Buffer_analysis(feat,impactMinBuffer,minRange)
-                delete_me.append(impactMinBuffer)
-            if outputUseTrueCurve == "false":
-                if DEBUG == True: arcpy.AddMessage("Densifying True Curve to regular polygon" )
-                arcpy.Buffer_analysis(feat,impactMinBuffer,minRange)
-                arcpy.Densify_edit(impactMinBuffer, "ANGLE","", "", "0.75")
-                delete_me.append(impactMinBuffer)
-                
-            
-            # Find the area within the model weapon areas min and max ranges
-            impactPointClassName = scrubbedImpactBufferOutPrefix + "_" + str(oid) + "_" + scrubbedModel
-            impactPointOut = os.path.join(outWorkspace,impactPointClassName)
-            arcpy.Erase_analysis(impactMaxBuffer, impactMinBuffer, impactPointOut)
-            arcpy.AddField_management(impactPointOut,"ImpactID","LONG","","","","Impact OID")
-            arcpy.CalculateField_management(impactPointOut,"ImpactID",oid,"PYTHON_9.3")
-            arcpy.AddField_management(impactPointOut,"Model","TEXT","","","","Weapon Model")
-            arcpy.CalculateField_management(impactPointOut,"Model",selectedModel,"PYTHON_9.3")
-            arcpy.AddField_management(impactPointOut,"MinRange","DOUBLE","","","","Minimum Range")
-            arcpy.CalculateField_management(impactPointOut,"MinRange",minRange,"PYTHON_9.3")
-            arcpy.AddField_management(impactPointOut,"MaxRange","DOUBLE","","","","Maximum Range")
-            arcpy.CalculateField_management(impactPointOut,"MaxRange",maxRange,"PYTHON_9.3")
-            
-            #Add this area to the list to be intersected.
-            impactPointBuffersList.append(impactPointOut);
-            #Add this area to the output list
-            outputImpactRangeFeatures.append(impactPointOut)
-        # impact point loop ends here, on to next point
-        
-        #Intersect the areas of all impact points for this model
+
+        # The range of every impact point for this model, with the impact OID
+        impactPointClassName = scrubbedImpactBufferOutPrefix + "_" + scrubbedModel
+        impactPointOut = os.path.join(outWorkspace,impactPointClassName)
+        PointOfOriginUtils.RangeFeatures(impacts, rings[:, indexWeaponModel], selectedModel, minRange, maxRange,
+                                         outputCoordinateSystem, impactPointOut)
+        impactPointBuffersList = [impactPointOut]
+        outputImpactRangeFeatures.append(impactPointOut)
+
+        # The area within range of all of the impact points
         featureClassName = scrubbedPooOutPrefix + "_" + scrubbedModel
         output_poo = os.path.join(outWorkspace,featureClassName)
-        arcpy.Intersect_analysis(impactPointBuffersList,output_poo,"","","")
-        arcpy.AddField_management(output_poo,"Model","TEXT","","","","Weapon Model")
-        arcpy.CalculateField_management(output_poo,"Model",selectedModel,"PYTHON_9.3")
+        modelCounts = counts[indexWeaponModel] if counts is not None else numpy.zeros((0, 0))
+        maxOverlap = PointOfOriginUtils.OriginFeatures(modelCounts, grid, len(impacts), selectedModel,
+                                                       outputCoordinateSystem, output_poo)
+        if maxOverlap < len(impacts):
+            arcpy.AddWarning("No point of origin for " + selectedModel + ": the ranges of at most " + str(maxOverlap) +
+                             " of the " + str(len(impacts)) + " impact points overlap")
         outputPointsOfOriginFeatures.append(output_poo)
 
         modelOriginsDict[scrubbedModel] = [{"ranges":impactPointBuffersList},{"combined":output_poo}]
-        del rows, row, indexWeaponModel
     # model loop ends here, on to next model
     
     # now for symbology...
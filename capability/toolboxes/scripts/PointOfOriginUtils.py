@@ -0,0 +1,226 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+PointOfOriginUtils.py
+--------------------------------------------------
+requirements: ArcGIS 10.3.1+, ArcGIS Pro 1.2+, NumPy
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: Range annulus and overlap engine for PointOfOrigin.py.
+The min/max range rings of every impact point and weapon model are
+computed at once with NumPy on the sphere, and the possible points of
+origin are found by counting, on one longitude/latitude grid shared by
+all models, how many impact ranges cover each cell instead of chaining
+Buffer, Erase and Intersect.
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import math
+import numpy
+import arcpy
+
+# mean earth radius (meters) used for the ranges
+earthRadius = 6371008.8
+
+# vertices per range ring, about the 0.75 degree densify of the original tool
+ringVertices = 480
+
+# cells per ring width when no cell size is given, and the largest grid
+cellsPerRangeWidth = 200
+maxGridCells = 4000000
+
+# rows of the grid counted at a time
+blockRows = 256
+
+def GeodesicRings(lon, lat, distances, vertices=ringVertices):
+    '''
+    Closed rings of points at distances (meters) around lon, lat (degrees)
+    on the sphere. distances is (points, rings); returns an array of
+    (points, rings, vertices + 1, 2) longitude/latitude vertices.
+    '''
+    lon = numpy.radians(numpy.asarray(lon, dtype=float)).reshape(-1, 1, 1)
+    lat = numpy.radians(numpy.asarray(lat, dtype=float)).reshape(-1, 1, 1)
+    angular = numpy.asarray(distances, dtype=float) / earthRadius
+    angular = angular.reshape(lon.shape[0], -1, 1)
+    bearing = numpy.linspace(0.0, 2 * math.pi, vertices + 1).reshape(1, 1, -1)
+
+    ringLat = numpy.arcsin(numpy.sin(lat) * numpy.cos(angular) +
+                           numpy.cos(lat) * numpy.sin(angular) * numpy.cos(bearing))
+    ringLon = lon + numpy.arctan2(numpy.sin(bearing) * numpy.sin(angular) * numpy.cos(lat),
+                                  numpy.cos(angular) - numpy.sin(lat) * numpy.sin(ringLat))
+    rings = numpy.concatenate((numpy.degrees(ringLon)[..., numpy.newaxis],
+                               numpy.degrees(ringLat)[..., numpy.newaxis]), axis=3)
+    rings[:, :, -1] = rings[:, :, 0]
+    return rings
+
+def Distance(lon1, lat1, lon2, lat2):
+    ''' great circle distance (meters) between broadcastable arrays of lon/lat degrees '''
+    lon1, lat1, lon2, lat2 = [numpy.radians(numpy.asarray(v, dtype=float)) for v in [lon1, lat1, lon2, lat2]]
+    a = numpy.sin((lat2 - lat1) / 2.0) ** 2 + \
+        numpy.cos(lat1) * numpy.cos(lat2) * numpy.sin((lon2 - lon1) / 2.0) ** 2
+    return 2 * earthRadius * numpy.arcsin(numpy.sqrt(numpy.clip(a, 0.0, 1.0)))
+
+class LonLatGrid:
+    ''' a north-up grid of cells in longitude/latitude degrees '''
+
+    def __init__(self, west, south, cellLon, cellLat, rows, cols):
+        self.west = west
+        self.south = south
+        self.cellLon = cellLon
+        self.cellLat = cellLat
+        self.rows = rows
+        self.cols = cols
+
+    def centers(self, firstRow, lastRow):
+        ''' lon (1 x cols) and lat (rows x 1) of the cell centers of rows firstRow to lastRow (top row is 0) '''
+        north = self.south + self.rows * self.cellLat
+        lon = self.west + (numpy.arange(self.cols) + 0.5) * self.cellLon
+        lat = north - (numpy.arange(firstRow, lastRow) + 0.5) * self.cellLat
+        return lon.reshape(1, -1), lat.reshape(-1, 1)
+
+def ImpactGrid(lon, lat, ranges, cellSize=None):
+    '''
+    The grid shared by all weapon models: the area every impact point's
+    largest max range can reach, in cells of cellSize meters (by default
+    1/cellsPerRangeWidth of the narrowest range ring, coarsened to at most
+    maxGridCells cells). ranges is a list of (minRange, maxRange).
+    Returns None when the max ranges of the impact points do not overlap.
+    '''
+    lon = numpy.asarray(lon, dtype=float)
+    lat = numpy.asarray(lat, dtype=float)
+    ranges = numpy.asarray(ranges, dtype=float).reshape(-1, 2)
+    reachLat = numpy.degrees(ranges[:, 1].max() / earthRadius)
+    reachLon = reachLat / numpy.maximum(numpy.cos(numpy.radians(lat)), 0.01)
+    west, east = (lon - reachLon).max(), (lon + reachLon).min()
+    south, north = (lat - reachLat).max(), (lat + reachLat).min()
+    if west >= east or south >= north:
+        return None
+
+    if cellSize is None:
+        cellSize = max((ranges[:, 1] - ranges[:, 0]).min(), 1.0) / cellsPerRangeWidth
+    cellLat = numpy.degrees(cellSize / earthRadius)
+    cellLon = cellLat / max(math.cos(math.radians((south + north) / 2.0)), 0.01)
+    cells = ((east - west) / cellLon) * ((north - south) / cellLat)
+    if cells > maxGridCells:
+        scale = math.sqrt(cells / maxGridCells)
+        cellLon *= scale
+        cellLat *= scale
+    cols = int(math.ceil((east - west) / cellLon))
+    rows = int(math.ceil((north - south) / cellLat))
+    return LonLatGrid(west, north - rows * cellLat, cellLon, cellLat, rows, cols)
+
+def OverlapCounts(grid, lon, lat, ranges):
+    '''
+    Number of impact point ranges covering each grid cell, for each weapon
+    model: (models, rows, cols). A cell is covered when its center is
+    between the min and max range of an impact point. Distances to each
+    impact point are computed once per block and shared by all models.
+    '''
+    ranges = numpy.asarray(ranges, dtype=float).reshape(-1, 2)
+    counts = numpy.zeros((ranges.shape[0], grid.rows, grid.cols), dtype=numpy.uint16)
+    for firstRow in range(0, grid.rows, blockRows):
+        lastRow = min(firstRow + blockRows, grid.rows)
+        cellLon, cellLat = grid.centers(firstRow, lastRow)
+        for impactLon, impactLat in zip(lon, lat):
+            distance = Distance(impactLon, impactLat, cellLon, cellLat)
+            for model, (minRange, maxRange) in enumerate(ranges):
+                counts[model, firstRow:lastRow] += (distance >= minRange) & (distance <= maxRange)
+    return counts
+
+def ReadImpactPoints(impactFeatures):
+    ''' [(OID, lon, lat)] of the impact points, read in one pass '''
+    with arcpy.da.SearchCursor(impactFeatures, ["OID@", "SHAPE@XY"],
+                               spatial_reference=arcpy.SpatialReference(4326)) as rows:
+        return [(row[0], row[1][0], row[1][1]) for row in rows]
+
+def ReadWeaponRanges(weaponTable, modelField, minRangeField, maxRangeField, models):
+    ''' {model: (minRange, maxRange)} of the selected models, read in one pass '''
+    selected = set(models)
+    ranges = {}
+    with arcpy.da.SearchCursor(weaponTable, [modelField, minRangeField, maxRangeField]) as rows:
+        for row in rows:
+            model = str(row[0])
+            if model in selected and model not in ranges:
+                ranges[model] = (float(row[1]), float(row[2]))
+    return ranges
+
+def _polygon(ring, spatialReference):
+    ''' arcpy polygon from a (vertices, 2) array '''
+    return arcpy.Polygon(arcpy.Array([arcpy.Point(x, y) for x, y in ring]), spatialReference)
+
+def _createFeatureClass(outputFeatures, spatialReference, fields):
+    ''' create an empty polygon feature class with fields [(name, type, alias)] '''
+    if arcpy.Exists(outputFeatures):
+        arcpy.Delete_management(outputFeatures)
+    arcpy.CreateFeatureclass_management(os.path.dirname(outputFeatures), os.path.basename(outputFeatures),
+                                        "POLYGON", "", "DISABLED", "DISABLED", spatialReference)
+    for name, fieldType, alias in fields:
+        arcpy.AddField_management(outputFeatures, name, fieldType, "", "", "", alias)
+    return outputFeatures
+
+def RangeFeatures(impacts, rings, model, minRange, maxRange, spatialReference, outputFeatures):
+    '''
+    Write the range annulus of every impact point for one weapon model to
+    outputFeatures with ImpactID, Model, MinRange and MaxRange. rings is
+    (impacts, 2, vertices + 1, 2) min and max range rings from GeodesicRings.
+    '''
+    wgs84 = arcpy.SpatialReference(4326)
+    _createFeatureClass(outputFeatures, spatialReference,
+                        [("ImpactID", "LONG", "Impact OID"), ("Model", "TEXT", "Weapon Model"),
+                         ("MinRange", "DOUBLE", "Minimum Range"), ("MaxRange", "DOUBLE", "Maximum Range")])
+    with arcpy.da.InsertCursor(outputFeatures, ["SHAPE@", "ImpactID", "Model", "MinRange", "MaxRange"]) as cursor:
+        for (oid, lon, lat), (minRing, maxRing) in zip(impacts, rings):
+            annulus = _polygon(maxRing, wgs84)
+            if minRange > 0:
+                annulus = annulus.difference(_polygon(minRing, wgs84))
+            cursor.insertRow([annulus.projectAs(spatialReference), oid, model, minRange, maxRange])
+    return outputFeatures
+
+def OriginFeatures(counts, grid, impactCount, model, spatialReference, outputFeatures):
+    '''
+    Write the cells covered by the ranges of all impactCount impact points
+    as polygons to outputFeatures with Model and Impacts. Returns the
+    largest number of overlapping ranges, which is less than impactCount
+    when there is no possible point of origin.
+    '''
+    _createFeatureClass(outputFeatures, spatialReference,
+                        [("Model", "TEXT", "Weapon Model"), ("Impacts", "LONG", "Impact Count")])
+    maxCount = int(counts.max()) if counts.size else 0
+    if maxCount < impactCount:
+        return maxCount
+
+    mask = (counts == impactCount).astype(numpy.uint8)
+    scratchRaster = os.path.join(arcpy.env.scratchGDB, "poo_cells")
+    scratchPolygons = os.path.join(arcpy.env.scratchGDB, "poo_polygons")
+    raster = arcpy.NumPyArrayToRaster(mask, arcpy.Point(grid.west, grid.south), grid.cellLon, grid.cellLat, 0)
+    raster.save(scratchRaster)
+    arcpy.DefineProjection_management(scratchRaster, arcpy.SpatialReference(4326))
+    arcpy.RasterToPolygon_conversion(scratchRaster, scratchPolygons, "SIMPLIFY", "VALUE")
+    try:
+        with arcpy.da.SearchCursor(scratchPolygons, ["SHAPE@"], spatial_reference=spatialReference) as rows:
+            with arcpy.da.InsertCursor(outputFeatures, ["SHAPE@", "Model", "Impacts"]) as cursor:
+                for row in rows:
+                    cursor.insertRow([row[0], model, impactCount])
+    finally:
+        for scratch in [scratchRaster, scratchPolygons]:
+            arcpy.Delete_management(scratch)
+    return maxCount
@@ -0,0 +1,270 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+GPXUtils.py
+--------------------------------------------------
+requirements: ArcGIS 10.3.1+, ArcGIS Pro 1.2+
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: Streaming GPX reader for gpx2layer.py (GPX to Features).
+GPX files are read with iterparse: each waypoint, route point and track
+point is turned into a row when its element ends, and every finished
+element is dropped from the tree, so memory stays flat however large the
+file. Rows are inserted in fixed-size batches. A folder, wildcard or
+list of GPX files is read across a pool of processes, each file into a
+feature class in the worker's own scratch geodatabase, and appended to
+the output once.
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import glob
+import multiprocessing
+import arcpy
+import ProcessPoolUtils
+
+try:
+    from xml.etree import cElementTree as ElementTree
+except ImportError:
+    from xml.etree import ElementTree
+
+gpxNamespaces = ["http://www.topografix.com/GPX/1/0", "http://www.topografix.com/GPX/1/1"]
+
+# point elements and their Type value
+pointTypes = {"trkpt": "TRKPT", "rtept": "RTEPT", "wpt": "WPT"}
+
+# attributes inherited by points from their track or route, or from the previous point
+textElements = ["name", "desc", "cmt", "sym"]
+
+# smallest length of the text fields
+minTextLength = 255
+
+# rows inserted at a time
+batchSize = 10000
+
+# output fields: (name, type, length)
+gpxFields = [("Name", "TEXT", None), ("Descript", "TEXT", None), ("Type", "TEXT", 255),
+             ("Comment", "TEXT", None), ("Symbol", "TEXT", None), ("DateTimeS", "TEXT", 64),
+             ("Elevation", "DOUBLE", None)]
+insertFields = ["Name", "Descript", "Type", "Comment", "Symbol", "DateTimeS", "Elevation",
+                "SHAPE@X", "SHAPE@Y", "SHAPE@Z"]
+
+def GPXFiles(gpxInput):
+    ''' the GPX files of a file, folder, wildcard or ;-separated list of them '''
+    files = []
+    for item in [item.strip().strip("'\"") for item in gpxInput.split(";") if item.strip()]:
+        if os.path.isdir(item):
+            files += sorted(glob.glob(os.path.join(item, "*.gpx")) + glob.glob(os.path.join(item, "*.GPX")))
+        elif os.path.exists(item):
+            files.append(item)
+        else:
+            files += sorted(glob.glob(item))
+    unique = []
+    for path in files:
+        if path not in unique:
+            unique.append(path)
+    return unique
+
+def _localName(tag):
+    return tag.rsplit("}", 1)[-1]
+
+def _number(text):
+    return float(text.replace(",", "."))
+
+class GPXReader:
+    ''' rows of the points of a GPX file, read with iterparse '''
+
+    def __init__(self, gpxFile):
+        self.gpxFile = gpxFile
+        self.namespace = None
+        self.badPoints = 0
+
+    def _events(self, events):
+        ''' (event, element, parent) of the elements of a GPX file; ended elements are dropped '''
+        stack = []
+        for event, element in ElementTree.iterparse(self.gpxFile, events=("start", "end")):
+            if event == "start":
+                if not stack:
+                    self.namespace = element.tag[1:].split("}")[0] if element.tag.startswith("{") else ""
+                    if self.namespace not in gpxNamespaces:
+                        return
+                stack.append(element)
+                if "start" in events:
+                    yield event, element, stack[-2] if len(stack) > 1 else None
+            else:
+                stack.pop()
+                parent = stack[-1] if stack else None
+                if "end" in events:
+                    yield event, element, parent
+                if parent is not None and _localName(parent.tag) not in pointTypes:
+                    # the element ended last, so it is the parent's last child; the children
+                    # of a point are kept until the point ends and is dropped with them
+                    del parent[-1]
+
+    def fieldLengths(self):
+        ''' ({text element: longest text, at least minTextLength}, points) of the file '''
+        lengths = dict([(name, minTextLength) for name in textElements])
+        points = 0
+        for event, element, parent in self._events(("end",)):
+            name = _localName(element.tag)
+            if name in lengths and element.text:
+                lengths[name] = max(lengths[name], len(element.text))
+            elif name in pointTypes:
+                points += 1
+        return lengths, points
+
+    def rows(self):
+        '''
+        Rows of insertFields for each valid point, in document order. As the
+        tool always has, a point without a name, desc, cmt or sym takes that
+        of its track or route, or of the point before it.
+        '''
+        inherited = dict([(name, "") for name in textElements])
+        for event, element, parent in self._events(("end",)):
+            name = _localName(element.tag)
+            if name in textElements and parent is not None and _localName(parent.tag) in ("trk", "rte"):
+                inherited[name] = element.text or inherited[name]
+            elif name in pointTypes:
+                values = {}
+                for child in element:
+                    values[_localName(child.tag)] = child.text
+                for text in textElements:
+                    inherited[text] = values.get(text) or inherited[text]
+                try:
+                    x = _number(element.attrib.get("lon"))
+                    y = _number(element.attrib.get("lat"))
+                    z = _number(values.get("ele") or "0.0")
+                except (AttributeError, ValueError):
+                    self.badPoints += 1
+                    continue
+                yield [inherited["name"], inherited["desc"], pointTypes[name], inherited["cmt"], inherited["sym"],
+                       values.get("time") or "", z, x, y, z]
+
+    def batches(self, size=batchSize):
+        ''' lists of at most size rows '''
+        batch = []
+        for row in self.rows():
+            batch.append(row)
+            if len(batch) == size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+def CreateGPXFeatureClass(outFC, lengths):
+    ''' the output point feature class (Z enabled, WGS84) with text fields of lengths {element: length} '''
+    if arcpy.Exists(outFC):
+        arcpy.Delete_management(outFC)
+    arcpy.CreateFeatureclass_management(os.path.dirname(outFC), os.path.basename(outFC), "POINT", "", "DISABLED",
+                                        "ENABLED", arcpy.SpatialReference(4326))
+    elementOfField = {"Name": "name", "Descript": "desc", "Comment": "cmt", "Symbol": "sym"}
+    for name, fieldType, length in gpxFields:
+        if fieldType == "TEXT" and length is None:
+            length = lengths.get(elementOfField[name], minTextLength)
+        arcpy.AddField_management(outFC, name, fieldType, "", "", length)
+    return outFC
+
+def WriteGPX(reader, outFC, size=batchSize, progress=None):
+    ''' insert the rows of a GPXReader into outFC in batches; returns the number of points written '''
+    written = 0
+    with arcpy.da.InsertCursor(outFC, insertFields) as cursor:
+        for batch in reader.batches(size):
+            for row in batch:
+                cursor.insertRow(row)
+            written += len(batch)
+            if progress:
+                progress(written)
+    return written
+
+def _maxLengths(allLengths):
+    lengths = dict([(name, minTextLength) for name in textElements])
+    for fileLengths in allLengths:
+        for name, length in fileLengths.items():
+            lengths[name] = max(lengths[name], length)
+    return lengths
+
+_gpxContext = {}
+
+def _initGPXWorker(workFolder, size):
+    ''' pool initializer: the work folder of the worker's scratch geodatabase '''
+    _gpxContext.update(workFolder=workFolder, size=size)
+
+def _gpxJob(job):
+    ''' pool worker: (index, gpxFile) read to a feature class; returns (feature class, lengths, points, bad points) '''
+    index, gpxFile = job
+    reader = GPXReader(gpxFile)
+    lengths, points = reader.fieldLengths()
+    if reader.namespace not in gpxNamespaces:
+        return None, lengths, 0, 0
+    # the scratch geodatabase is made by the first job that writes, so every one is in the results
+    workspace = ProcessPoolUtils.ScratchGDB(_gpxContext["workFolder"], "gpx")
+    featureClass = CreateGPXFeatureClass(os.path.join(workspace, "gpx_" + str(index)), lengths)
+    written = WriteGPX(reader, featureClass, _gpxContext["size"])
+    return featureClass, lengths, written, reader.badPoints
+
+def GPXToFeatures(gpxFiles, outFC, processes=None, workFolder=None, size=batchSize):
+    '''
+    Write the points of gpxFiles to the point feature class outFC. A single
+    file (or processes 1) is streamed straight into outFC; several files
+    are read across a pool of processes and appended to outFC in file
+    order. Returns (points written, bad points, files without a GPX
+    namespace).
+    '''
+    if workFolder is None:
+        workFolder = arcpy.env.scratchFolder
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    processes = max(1, min(int(processes), len(gpxFiles)))
+
+    if processes == 1:
+        arcpy.SetProgressorLabel("Scanning contents of GPX files")
+        readers = [GPXReader(gpxFile) for gpxFile in gpxFiles]
+        scans = [reader.fieldLengths() for reader in readers]
+        skipped = [reader.gpxFile for reader in readers if reader.namespace not in gpxNamespaces]
+        CreateGPXFeatureClass(outFC, _maxLengths([lengths for lengths, points in scans]))
+        total = sum([points for lengths, points in scans])
+        arcpy.SetProgressor("step", "Converting GPX points...", 0, max(total, 1), 1)
+        written = 0
+        for reader in readers:
+            if reader.namespace in gpxNamespaces:
+                done = written
+                written += WriteGPX(reader, outFC, size, lambda count: arcpy.SetProgressorPosition(done + count))
+        return written, sum([reader.badPoints for reader in readers]), skipped
+
+    arcpy.SetProgressorLabel("Converting " + str(len(gpxFiles)) + " GPX files in " + str(processes) + " processes")
+    pool = ProcessPoolUtils.StartPool(processes, _initGPXWorker, (workFolder, size))
+    try:
+        results = pool.map(_gpxJob, list(enumerate(gpxFiles)))
+    finally:
+        pool.close()
+        pool.join()
+    featureClasses = [featureClass for featureClass, lengths, points, bad in results if featureClass]
+    try:
+        CreateGPXFeatureClass(outFC, _maxLengths([lengths for featureClass, lengths, points, bad in results]))
+        if featureClasses:
+            arcpy.Append_management(featureClasses, outFC, "NO_TEST")
+    finally:
+        # the workers' scratch geodatabases, with their feature classes
+        for workspace in sorted(set([os.path.dirname(featureClass) for featureClass in featureClasses])):
+            arcpy.Delete_management(workspace)
+    skipped = [gpxFile for gpxFile, result in zip(gpxFiles, results) if not result[0]]
+    return (sum([points for featureClass, lengths, points, bad in results]),
+            sum([bad for featureClass, lengths, points, bad in results]), skipped)
@@ -0,0 +1,318 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+PatrolReportUtils.py
+--------------------------------------------------
+requirements: ArcGIS 10.3.1+, ArcGIS Pro 1.2+
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: Streaming InfoPath Patrol Report reader shared by
+ImportPatrolRptXML.py (Import Patrol Rpt XML) and
+ImportEnemySightingsXML.py (Import Enemy Sightings XML).
+A ReportSchema maps element paths of the report to fields of the output
+table, and is compiled once against the output table's field types.
+Each report is read with iterparse into rows of those fields; a folder,
+wildcard or list of reports is read across a pool of processes. Rows are
+inserted with one arcpy.da.InsertCursor in fixed-size batches, each
+with its report number (a field added to the enemy sightings table), and
+reports whose number is already in the output table are skipped, so a
+backlog can be imported again safely, under any track.
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import re
+import glob
+import multiprocessing
+from datetime import datetime
+import arcpy
+import ProcessPoolUtils
+
+try:
+    from xml.etree import cElementTree as ElementTree
+except ImportError:
+    from xml.etree import ElementTree
+
+# namespace of the InfoPath Patrol Report form
+reportNamespace = "http://helyx.co.uk/infopath/2003/myXSD/2010-06-09"
+
+# rows inserted at a time
+batchSize = 5000
+
+# field linking the rows to a track
+trackField = "FK_TrackGUID"
+
+# length of the report number field added to tables without one
+reportIdLength = 50
+
+timestampPattern = re.compile(r""" ^
+    (?P<year>-?[0-9]{4}) - (?P<month>[0-9]{2}) - (?P<day>[0-9]{2})
+    T (?P<hour>[0-9]{2}) : (?P<minute>[0-9]{2}) : (?P<second>[0-9]{2})
+    (?P<microsecond>\.[0-9]{1,6})?
+    (?P<tz>
+      Z | (?P<tz_hr>[-+][0-9]{2}) : (?P<tz_min>[0-9]{2})
+    )?
+    $ """, re.X)
+
+def ParseTimestamp(s):
+    ''' (datetime, tz offset in minutes) of an xs:dateTime, or (None, None) '''
+    m = timestampPattern.match(s.strip()) if s else None
+    if m is None:
+        return None, None
+    values = m.groupdict()
+    if values["tz"] in ("Z", None):
+        tz = 0
+    else:
+        minutes = abs(int(values["tz_hr"])) * 60 + int(values["tz_min"])
+        tz = -minutes if values["tz_hr"].startswith("-") else minutes
+    if values["microsecond"] is None:
+        values["microsecond"] = 0
+    else:
+        values["microsecond"] = values["microsecond"][1:]
+        values["microsecond"] += "0" * (6 - len(values["microsecond"]))
+    values = dict((k, int(v)) for k, v in list(values.items()) if not k.startswith("tz"))
+    try:
+        return datetime(**values), tz
+    except ValueError:
+        return None, None
+
+def _integer(text):
+    return int(text.strip())
+
+def _double(text):
+    return float(text.strip().replace(",", "."))
+
+def _date(text):
+    return ParseTimestamp(text)[0]
+
+# converters of element text by output field type; other types take the text as is
+fieldConverters = {"SmallInteger": _integer, "Integer": _integer, "Single": _double,
+                   "Double": _double, "Date": _date}
+
+def ConvertText(text, converter=None):
+    ''' the field value of element text; None when empty or not valid '''
+    if text is None or not text.strip():
+        return None
+    if converter is None:
+        return text
+    try:
+        return converter(text)
+    except ValueError:
+        return None
+
+class ReportSchema:
+    '''
+    Fields of an output table read from a report: a row for each
+    recordPath element (the path below the root; () for one row per
+    report), and fields [(element path below the record, field)]
+    '''
+
+    def __init__(self, recordPath, fields, reportIdPath=("Report", "ReportNumber"), reportIdField="ReportNumber"):
+        self.recordPath = tuple(recordPath)
+        self.fields = [(tuple(path), field) for path, field in fields]
+        self.reportIdPath = tuple(reportIdPath)
+        self.reportIdField = reportIdField
+        self.fieldNames = [field for path, field in self.fields]
+        self.compile({})
+
+    def compile(self, fieldTypes):
+        ''' the element path lookup and converters for output field types {field: type} '''
+        self.fieldIndex = dict([(path, index) for index, (path, field) in enumerate(self.fields)])
+        self.converters = [fieldConverters.get(fieldTypes.get(field)) for field in self.fieldNames]
+        return self
+
+    def convert(self, index, text):
+        ''' the value of field index from element text '''
+        return ConvertText(text, self.converters[index])
+
+PatrolReportSchema = ReportSchema((), [
+    (("Report", "ReportNumber"), "ReportNumber"),
+    (("Report", "Classification"), "Classification"),
+    (("Report", "To"), "ReportTo"),
+    (("Report", "From"), "ReportFrom"),
+    (("Report", "ReportDateTime"), "ReportDateTime"),
+    (("Patrol", "Callsign"), "Callsign"),
+    (("Patrol", "Subunit"), "Subunit"),
+    (("Patrol", "PatrolBase"), "PatrolBase"),
+    (("Patrol", "PatrolType"), "PatrolType"),
+    (("Patrol", "PatrolCommand"), "PatrolCommand"),
+    (("Patrol", "Interpreter"), "Interpreter"),
+    (("Patrol", "PatrolSize"), "PatrolSize"),
+    (("Patrol", "Composition"), "Composition"),
+    (("Task", "OpName"), "OpName"),
+    (("Task", "TaskName"), "TaskName"),
+    (("Task", "TaskDescription"), "TaskDescription"),
+    (("Observations", "TerrainDescription"), "TerrainDescription"),
+    (("Observations", "MiscInfo"), "MiscInfo"),
+    (("Observations", "Conclusions"), "Conclusions"),
+    (("PatrolCondition", "NumPatrolOK"), "NumPatrolOK"),
+    (("PatrolCondition", "NumPatrolWounded"), "NumPatrolWounded"),
+    (("PatrolCondition", "NumPatrolKIA"), "NumPatrolKIA"),
+    (("PatrolCondition", "NumPatrolMissing"), "NumPatrolMissing"),
+    (("PatrolCondition", "NumPatrolCaptured"), "NumPatrolCaptured")])
+
+EnemySightingsSchema = ReportSchema(("Observations", "EnemySightings"), [
+    (("DateTimeSighted",), "SightingDateTime"),
+    (("Strength",), "Strength"),
+    (("ActivityAttitude",), "ActivityAttitude"),
+    (("WeaponsEquipment",), "WeaponsEquipment"),
+    (("Disposition",), "Disposition"),
+    (("Intention",), "Intention"),
+    (("AdditionalObservations",), "AdditionalObservations")])
+
+def ReportFiles(xmlInput):
+    ''' the report files of a file, folder, wildcard or ;-separated list of them '''
+    files = []
+    for item in [item.strip().strip("'\"") for item in xmlInput.split(";") if item.strip()]:
+        if os.path.isdir(item):
+            files += sorted(glob.glob(os.path.join(item, "*.xml")) + glob.glob(os.path.join(item, "*.XML")))
+        elif os.path.exists(item):
+            files.append(item)
+        else:
+            files += sorted(glob.glob(item))
+    unique = []
+    for path in files:
+        if path not in unique:
+            unique.append(path)
+    return unique
+
+def _localName(tag):
+    return tag.rsplit("}", 1)[-1]
+
+def ReadReport(xmlFile, schema):
+    '''
+    (report number, rows of schema.fieldNames) of a report, read with
+    iterparse; finished elements are cleared as they end. Raises
+    ValueError for a document that is not a Patrol Report.
+    '''
+    path = []
+    reportId = None
+    rows = []
+    record = None
+    depth = len(schema.recordPath)
+    for event, element in ElementTree.iterparse(xmlFile, events=("start", "end")):
+        if event == "start":
+            if not path and not element.tag.startswith("{" + reportNamespace + "}"):
+                raise ValueError("not a Patrol Report: " + element.tag)
+            path.append(_localName(element.tag))
+            if tuple(path[1:]) == schema.recordPath:
+                record = [None] * len(schema.fields)
+            continue
+        below = tuple(path[1:])
+        if below == schema.reportIdPath:
+            reportId = element.text
+        if record is not None and below[:depth] == schema.recordPath:
+            index = schema.fieldIndex.get(below[depth:])
+            if index is not None:
+                record[index] = schema.convert(index, element.text)
+        if below == schema.recordPath:
+            rows.append(record)
+            record = None
+        path.pop()
+        element.clear()
+    return reportId, rows
+
+_reportContext = {}
+
+def _initReportWorker(schema):
+    ''' pool initializer: the compiled schema '''
+    _reportContext.update(schema=schema)
+
+def _reportJob(xmlFile):
+    ''' pool worker: (xmlFile, report number, rows, error) of a report '''
+    try:
+        reportId, rows = ReadReport(xmlFile, _reportContext["schema"])
+        return xmlFile, reportId, rows, None
+    except Exception as err:
+        return xmlFile, None, [], str(err)
+
+def _readReports(xmlFiles, schema, processes):
+    ''' (xmlFile, report number, rows, error) of each report, in file order '''
+    if processes == 1:
+        _initReportWorker(schema)
+        for xmlFile in xmlFiles:
+            yield _reportJob(xmlFile)
+        return
+    pool = ProcessPoolUtils.StartPool(processes, _initReportWorker, (schema,))
+    try:
+        for result in pool.imap(_reportJob, xmlFiles, max(1, len(xmlFiles) // (processes * 4))):
+            yield result
+    finally:
+        pool.close()
+        pool.join()
+
+def LoadedReports(outTable, reportIdField):
+    ''' the report numbers in reportIdField of outTable '''
+    with arcpy.da.SearchCursor(outTable, [reportIdField]) as cursor:
+        return set([row[0] for row in cursor if row[0] is not None])
+
+def ImportReports(xmlFiles, outTable, schema, trackID, processes=None, size=batchSize):
+    '''
+    Insert the rows of schema read from xmlFiles into outTable, with
+    trackID in FK_TrackGUID and the report number in every row. The
+    report number field is added to outTable when it has none (the enemy
+    sightings table). Reports whose number is already in outTable are
+    skipped, whatever their track. Returns (rows inserted, reports
+    skipped, [(xmlFile, error)] of the reports that could not be read).
+    '''
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    processes = max(1, min(int(processes), len(xmlFiles)))
+
+    reportIdField = schema.reportIdField
+    fieldTypes = dict([(field.name, field.type) for field in arcpy.ListFields(outTable)])
+    if reportIdField not in fieldTypes:
+        arcpy.AddField_management(outTable, reportIdField, "TEXT", "", "", reportIdLength)
+        fieldTypes[reportIdField] = "String"
+    schema.compile(fieldTypes)
+    insertFields = schema.fieldNames + [trackField]
+    reportIdConverter = fieldConverters.get(fieldTypes[reportIdField])
+    addReportId = reportIdField not in schema.fieldNames
+    if addReportId:
+        insertFields.append(reportIdField)
+    loaded = LoadedReports(outTable, reportIdField)
+
+    arcpy.SetProgressor("step", "Importing " + str(len(xmlFiles)) + " reports...", 0, max(len(xmlFiles), 1), 1)
+    inserted, skipped, failed = 0, 0, []
+    batch = []
+    with arcpy.da.InsertCursor(outTable, insertFields) as cursor:
+        for xmlFile, reportId, rows, error in _readReports(xmlFiles, schema, processes):
+            arcpy.SetProgressorPosition()
+            if error:
+                failed.append((xmlFile, error))
+                continue
+            reportId = ConvertText(reportId, reportIdConverter)
+            if reportId is not None:
+                if reportId in loaded:
+                    skipped += 1
+                    continue
+                loaded.add(reportId)
+            batch += [values + [trackID] + ([reportId] if addReportId else []) for values in rows]
+            if len(batch) >= size:
+                for row in batch:
+                    cursor.insertRow(row)
+                inserted += len(batch)
+                batch = []
+        for row in batch:
+            cursor.insertRow(row)
+        inserted += len(batch)
+    arcpy.ResetProgressor()
+    return inserted, skipped, failed
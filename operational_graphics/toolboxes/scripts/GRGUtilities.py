@@ -0,0 +1,194 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+GRGUtilities.py
+--------------------------------------------------
+requirements: ArcGIS 10.3.1+, ArcGIS Pro 1.2+, NumPy
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: In-memory grid engine for Gridded Reference Graphics (GRG).
+Cell corners, rotation and labels are computed with NumPy in one pass
+and the cells are written with a single insert cursor, replacing the
+Fishnet + Sort + UpdateCursor + RotateFeatureClass chain.
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import math
+import numpy
+import arcpy
+
+labelStyles = ["Alpha-Numeric", "Alpha-Alpha", "Numeric"]
+
+labelStartPositions = {"Upper-Left": "UL",
+                       "Upper-Right": "UR",
+                       "Lower-Left": "LL",
+                       "Lower-Right": "LR"}
+
+# Precomputed Excel-style column labels: A..Z, AA..ZZ (index 0 is 'A')
+_alphaLabelTable = []
+
+def ColIdxToXlName(index):
+    ''' Converts an index into a letter, labeled like excel columns, A to Z, AA to ZZ, etc. '''
+    if index < 1:
+        raise ValueError("Index is too small")
+    result = ""
+    while True:
+        if index > 26:
+            index, r = divmod(index - 1, 26)
+            result = chr(r + ord('A')) + result
+        else:
+            return chr(index + ord('A') - 1) + result
+
+def AlphaLabels(count):
+    ''' Return the first <count> alpha labels (A, B, ... ZZ, AAA...) from the label table '''
+    if count > len(_alphaLabelTable):
+        _alphaLabelTable.extend([ColIdxToXlName(i) for i in
+                                 range(len(_alphaLabelTable) + 1, count + 1)])
+    return numpy.array(_alphaLabelTable[:count])
+
+def _startPosition(labelStartPos):
+    ''' normalize a label start position to UL, UR, LL or LR '''
+    startPos = labelStartPositions.get(labelStartPos, labelStartPos)
+    if startPos not in list(labelStartPositions.values()):
+        raise ValueError("Unknown label start position: " + str(labelStartPos))
+    return startPos
+
+def GridLabelOrder(rows, cols, labelStartPos="Upper-Left"):
+    '''
+    Return a (rows, cols) array with the 0-based labeling sequence of each
+    cell. Row 0 is the bottom row and column 0 is the left column of the grid,
+    matching GridCellCorners. Labeling runs row by row from the start corner.
+    '''
+    startPos = _startPosition(labelStartPos)
+    rowOrder = numpy.arange(rows)
+    colOrder = numpy.arange(cols)
+    if startPos[0] == "U":
+        rowOrder = rowOrder[::-1]
+    if startPos[1] == "R":
+        colOrder = colOrder[::-1]
+    return rowOrder[:, numpy.newaxis] * cols + colOrder[numpy.newaxis, :]
+
+def GridLabels(rows, cols, labelStyle, labelStartPos="Upper-Left"):
+    '''
+    Return a (rows, cols) array of cell labels, laid out like GridLabelOrder.
+
+    labelStyle      "Alpha-Numeric" (A1, A2...), "Alpha-Alpha" (AA, AB...) or "Numeric" (1, 2...)
+    labelStartPos   corner of the first label: "Upper-Left", "Upper-Right",
+                    "Lower-Left", "Lower-Right" (or UL, UR, LL, LR)
+    '''
+    if labelStyle not in labelStyles:
+        raise ValueError("Unknown label style: " + str(labelStyle))
+    sequence = GridLabelOrder(rows, cols, labelStartPos)
+    if labelStyle == "Numeric":
+        return (sequence + 1).astype(str)
+
+    # row letters and column letters/numbers come straight from the label table
+    labelRow, labelCol = numpy.divmod(sequence, cols)
+    rowLabels = AlphaLabels(rows)[labelRow]
+    if labelStyle == "Alpha-Alpha":
+        colLabels = AlphaLabels(cols)[labelCol]
+    else:
+        colLabels = (labelCol + 1).astype(str)
+    return numpy.char.add(rowLabels, colLabels)
+
+def GridCellCorners(originX, originY, cellWidth, cellHeight, rows, cols):
+    '''
+    Return a (rows, cols, 5, 2) array of closed cell rings for a grid whose
+    lower-left corner is at originX, originY. Rings are clockwise, starting
+    at the lower-left corner of each cell.
+    '''
+    xs = originX + numpy.arange(cols + 1) * float(cellWidth)
+    ys = originY + numpy.arange(rows + 1) * float(cellHeight)
+    x0 = numpy.broadcast_to(xs[numpy.newaxis, :-1], (rows, cols))
+    x1 = numpy.broadcast_to(xs[numpy.newaxis, 1:], (rows, cols))
+    y0 = numpy.broadcast_to(ys[:-1, numpy.newaxis], (rows, cols))
+    y1 = numpy.broadcast_to(ys[1:, numpy.newaxis], (rows, cols))
+    ringX = numpy.stack([x0, x0, x1, x1, x0], axis=-1)
+    ringY = numpy.stack([y0, y1, y1, y0, y0], axis=-1)
+    return numpy.stack([ringX, ringY], axis=-1)
+
+def RotateCoordinates(coords, angle, pivotX, pivotY):
+    '''
+    Rotate an (..., 2) coordinate array clockwise (like Rotate_management)
+    by angle degrees about pivotX, pivotY.
+    '''
+    if not angle:
+        return coords
+    radians = math.radians(-float(angle))
+    cosA, sinA = math.cos(radians), math.sin(radians)
+    x = coords[..., 0] - pivotX
+    y = coords[..., 1] - pivotY
+    return numpy.stack([x * cosA - y * sinA + pivotX,
+                        x * sinA + y * cosA + pivotY], axis=-1)
+
+def WriteGRGFeatures(outputFeatureClass, corners, labels, sequence=None,
+                     spatialReference=None, gridField="Grid"):
+    '''
+    Bulk write cell rings and labels to a new polygon feature class through
+    one insert cursor. If a labeling sequence is given, cells are inserted in
+    that order so the OIDs follow the labels.
+    '''
+    rings = corners.reshape(-1, 5, 2)
+    cellLabels = labels.reshape(-1)
+    if sequence is None:
+        order = numpy.arange(cellLabels.size)
+    else:
+        order = numpy.argsort(sequence.reshape(-1), kind="mergesort")
+
+    outPath, outName = os.path.split(outputFeatureClass)
+    arcpy.CreateFeatureclass_management(outPath, outName, "POLYGON",
+                                        "#", "DISABLED", "DISABLED",
+                                        spatialReference)
+    fieldLength = int(numpy.char.str_len(cellLabels).max()) if cellLabels.size else 1
+    arcpy.AddField_management(outputFeatureClass, gridField, "TEXT", "#", "#", max(fieldLength, 1))
+
+    ringList = rings[order].tolist()
+    labelList = cellLabels[order].tolist()
+    with arcpy.da.InsertCursor(outputFeatureClass, ["SHAPE@", gridField]) as cursor:
+        for ring, label in zip(ringList, labelList):
+            cursor.insertRow([arcpy.Polygon(arcpy.Array([arcpy.Point(x, y) for x, y in ring]),
+                                            spatialReference), label])
+    return outputFeatureClass
+
+def CreateGRG(outputFeatureClass, originX, originY, cellWidth, cellHeight,
+              rows, cols, labelStyle, labelStartPos,
+              angle=0, pivot=None, spatialReference=None, gridField="Grid"):
+    '''
+    Make a GRG polygon feature class in one pass.
+
+    originX, originY    lower-left corner of the unrotated grid
+    rows, cols          number of cell rows and columns
+    angle               clockwise rotation in degrees
+    pivot               (x, y) rotation center, defaults to the grid origin
+    '''
+    rows, cols = int(rows), int(cols)
+    if rows < 1 or cols < 1:
+        raise ValueError("Grid must have at least one row and one column")
+    corners = GridCellCorners(originX, originY, cellWidth, cellHeight, rows, cols)
+    if angle:
+        if pivot is None:
+            pivot = (originX, originY)
+        corners = RotateCoordinates(corners, angle, pivot[0], pivot[1])
+    sequence = GridLabelOrder(rows, cols, labelStartPos)
+    labels = GridLabels(rows, cols, labelStyle, labelStartPos)
+    return WriteGRGFeatures(outputFeatureClass, corners, labels, sequence,
+                            spatialReference, gridField)
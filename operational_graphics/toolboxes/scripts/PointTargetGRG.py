@@ -34,6 +34,7 @@ import os, sys, math, traceback
 import arcpy
 from arcpy import env
 import Utilities
+import GRGUtilities
 
 # Read in the parameters
 targetPointOrigin = arcpy.GetParameterAsText(0)
@@ -46,7 +47,6 @@ gridSize = arcpy.GetParameterAsText(6)
 labelStyle = arcpy.GetParameterAsText(7)
 outputFeatureClass = arcpy.GetParameterAsText(8)
 labelStartPos = arcpy.GetParameterAsText(9)
-tempOutput = os.path.join("in_memory", "tempFishnetGrid")
 sysPath = sys.path[0]
 
 appEnvironment = None
@@ -97,222 +97,6 @@ def findLayerByName(layerName):
     else:
         arcpy.AddMessage("Non-map application (ArcCatalog, stand-alone test, etc.")
 
-def RotateFeatureClass(inputFC, outputFC,
-                       angle=0, pivot_point=None):
-    """Rotate Feature Class
-
-    inputFC     Input features
-    outputFC    Output feature class
-    angle       Angle to rotate, in degrees
-    pivot_point X,Y coordinates (as space-separated string)
-                Default is lower-left of inputFC
-
-    As the output feature class no longer has a "real" xy locations,
-    after rotation, it no coordinate system defined.
-    """
-
-    def RotateXY(x, y, xc=0, yc=0, angle=0, units="DEGREES"):
-        """Rotate an xy cooordinate about a specified origin
-
-        x,y      xy coordinates
-        xc,yc   center of rotation
-        angle   angle
-        units    "DEGREES" (default) or "RADIANS"
-        """
-        import math
-        x = x - xc
-        y = y - yc
-        # make angle clockwise (like Rotate_management)
-        angle = angle * -1
-        if units == "DEGREES":
-            angle = math.radians(angle)
-        xr = (x * math.cos(angle)) - (y * math.sin(angle)) + xc
-        yr = (x * math.sin(angle)) + (y * math.cos(angle)) + yc
-        return xr, yr
-
-    # temp names for cleanup
-    env_file = None
-    lyrFC, lyrTmp, lyrOut   = [None] * 3  # layers
-    tmpFC  = None # temp dataset
-    Row, Rows, oRow, oRows = [None] * 4 # cursors
-
-    try:
-        # process parameters
-        try:
-            xcen, ycen = [float(xy) for xy in pivot_point.split()]
-            pivot_point = xcen, ycen
-        except:
-            # if pivot point was not specified, get it from
-            # the lower-left corner of the feature class
-            ext = arcpy.Describe(inputFC).extent
-            xcen, ycen  = ext.XMin, ext.YMin
-            pivot_point = xcen, ycen
-
-        angle = float(angle)
-
-        # set up environment
-        env_file = arcpy.CreateScratchName("xxenv",".xml","file",
-                                           os.environ["TEMP"])
-        arcpy.SaveSettings(env_file)
-
-        # Disable any GP environment clips or project on the fly
-        arcpy.ClearEnvironment("extent")
-        arcpy.ClearEnvironment("outputCoordinateSystem")
-        WKS = env.workspace
-        if not WKS:
-            if os.path.dirname(outputFC):
-                WKS = os.path.dirname(outputFC)
-            else:
-                WKS = os.path.dirname(
-                    arcpy.Describe(inputFC).catalogPath)
-        env.workspace = env.scratchWorkspace = WKS
-
-        # Disable GP environment clips or project on the fly
-        arcpy.ClearEnvironment("extent")
-        arcpy.ClearEnvironment("outputCoordinateSystem")
-
-        # get feature class properties
-        lyrFC = "lyrFC"
-        arcpy.MakeFeatureLayer_management(inputFC, lyrFC)
-        dFC = arcpy.Describe(lyrFC)
-        shpField = dFC.shapeFieldName
-        shpType = dFC.shapeType
-        FID = dFC.OIDFieldName
-
-        # create temp feature class
-        tmpFC = arcpy.CreateScratchName("xxfc", "", "featureclass")
-        arcpy.CreateFeatureclass_management(os.path.dirname(tmpFC),
-                                            os.path.basename(tmpFC),
-                                            shpType)
-        lyrTmp = "lyrTmp"
-        arcpy.MakeFeatureLayer_management(tmpFC, lyrTmp)
-
-        # set up id field (used to join later)
-        TFID = "XXXX_FID"
-        arcpy.AddField_management(lyrTmp, TFID, "LONG")
-        arcpy.DeleteField_management(lyrTmp, "ID")
-
-        # rotate the feature class coordinates
-        # only points, polylines, and polygons are supported
-
-        # open read and write cursors
-        Rows = arcpy.SearchCursor(lyrFC, "", "",
-                                  "%s;%s" % (shpField,FID))
-        oRows = arcpy.InsertCursor(lyrTmp)
-        arcpy.AddMessage("Opened search cursor")
-        if shpType  == "Point":
-            for Row in Rows:
-                shp = Row.getValue(shpField)
-                pnt = shp.getPart()
-                pnt.X, pnt.Y = RotateXY(pnt.X, pnt.Y, xcen, ycen, angle)
-                oRow = oRows.newRow()
-                oRow.setValue(shpField, pnt)
-                oRow.setValue(TFID, Row. getValue(FID))
-                oRows.insertRow(oRow)
-        elif shpType in ["Polyline", "Polygon"]:
-            parts = arcpy.Array()
-            rings = arcpy.Array()
-            ring = arcpy.Array()
-            for Row in Rows:
-                shp = Row.getValue(shpField)
-                p = 0
-                for part in shp:
-                    for pnt in part:
-                        if pnt:
-                            x, y = RotateXY(pnt.X, pnt.Y, xcen, ycen, angle)
-                            ring.add(arcpy.Point(x, y, pnt.ID))
-                        else:
-                            # if we have a ring, save it
-                            if len(ring) > 0:
-                                rings.add(ring)
-                                ring.removeAll()
-                    # we have our last ring, add it
-                    rings.add(ring)
-                    ring.removeAll()
-                    # if only one, remove nesting
-                    if len(rings) == 1: rings = rings.getObject(0)
-                    parts.add(rings)
-                    rings.removeAll()
-                    p += 1
-
-                # if only one, remove nesting
-                if len(parts) == 1: parts = parts.getObject(0)
-                if dFC.shapeType == "Polyline":
-                    shp = arcpy.Polyline(parts)
-                else:
-                    shp = arcpy.Polygon(parts)
-                parts.removeAll()
-                oRow = oRows.newRow()
-                oRow.setValue(shpField, shp)
-                oRow.setValue(TFID,Row.getValue(FID))
-                oRows.insertRow(oRow)
-        else:
-            #raise Exception, "Shape type {0} is not supported".format(shpType) #UPDATE
-            raise Exception("Shape type {0} is not supported".format(shpType))
-
-        del oRow, oRows # close write cursor (ensure buffer written)
-        oRow, oRows = None, None # restore variables for cleanup
-
-        # join attributes, and copy to output
-        arcpy.AddJoin_management(lyrTmp, TFID, lyrFC, FID)
-        env.qualifiedFieldNames = False
-        arcpy.Merge_management(lyrTmp, outputFC)
-        lyrOut = "lyrOut"
-        arcpy.MakeFeatureLayer_management(outputFC, lyrOut)
-        # drop temp fields 2,3 (TFID, FID)
-        fnames = [f.name for f in arcpy.ListFields(lyrOut)]
-        dropList = ";".join(fnames[2:4])
-        arcpy.DeleteField_management(lyrOut, dropList)
-
-    #except MsgError, xmsg: #UPDATE
-    except MsgError as xmsg:
-        arcpy.AddError(str(xmsg))
-    except arcpy.ExecuteError:
-        tbinfo = traceback.format_tb(sys.exc_info()[2])[0]
-        arcpy.AddError(tbinfo.strip())
-        arcpy.AddError(arcpy.GetMessages())
-        numMsg = arcpy.GetMessageCount()
-        for i in range(0, numMsg):
-            arcpy.AddReturnMessage(i)
-    #except Exception, xmsg: #UPDATE
-    except Exception as xmsg:
-        tbinfo = traceback.format_tb(sys.exc_info()[2])[0]
-        arcpy.AddError(tbinfo + str(xmsg))
-    finally:
-        # reset environment
-        if env_file: arcpy.LoadSettings(env_file)
-        # Clean up temp files
-        for f in [lyrFC, lyrTmp, lyrOut, tmpFC, env_file]:
-            try:
-                if f: arcpy.Delete_management(f)
-            except:
-                pass
-        # delete cursors
-        try:
-            for c in [Row, Rows, oRow, oRows]: del c
-        except:
-            pass
-
-        # return pivot point
-        try:
-            pivot_point = "{0} {1}".format(*pivot_point)
-        except:
-            pivot_point = None
-
-        return pivot_point
-
-def ColIdxToXlName(index):
-    ''' Converts an index into a letter, labeled like excel columns, A to Z, AA to ZZ, etc. '''
-    if index < 1:
-        raise ValueError("Index is too small")
-    result = ""
-    while True:
-        if index > 26:
-            index, r = divmod(index - 1, 26)
-            result = chr(r + ord('A')) + result
-        else:
-            return chr(index + ord('A') - 1) + result
-
 def main():
     ''' main method '''
     try:
@@ -421,109 +205,26 @@ def main():
             else:
                 pointExtents[0] = str(float(pointExtents[0]) + vertShiftAmt)
 
-        # From the template extent, get the origin, y axis, and opposite corner corrdinates
-        rightCorner =  float(pointExtents[0]) + ((float(cellWidth) * float(numberCellsVert)) /2.0)
+        # From the shifted center point, get the lower left origin of the (unrotated) grid
         leftCorner = float(pointExtents[0]) - ((float(cellWidth) * float(numberCellsVert)) /2.0)
-        topCorner = float(pointExtents[1]) + ((float(cellHeight) * float(numberCellsHo)) /2.0)
         bottomCorner = float(pointExtents[1]) - ((float(cellHeight) * float(numberCellsHo)) /2.0)
-        originCoordinate = str(leftCorner) + " " + str(bottomCorner)
-        yAxisCoordinate = str(leftCorner) + " " + str(bottomCorner)
-        oppCornerCoordinate = str(rightCorner) + " " + str(topCorner)
-        fullExtent = str(leftCorner) + " " + str(bottomCorner) + " " + str(rightCorner) + " " + str(topCorner)
 
-        # If grid size is drawn on the map, then calculate the rotation of the grid
+        # If grid size is drawn on the map, rotate the grid about the center point
+        angle = 0
+        pivot = None
         if inputExtentDrawnFromMap:
-            # Find the highest two points in the inputExtentDrawnFromMap shape
-            highestPoint = None
-            nextHighestPoint = None
-            for pt in pts:
-                if highestPoint is None or pt[1] > highestPoint[1]:
-                    nextHighestPoint = highestPoint
-                    highestPoint = pt
-                elif nextHighestPoint is None or pt[1] > nextHighestPoint[1]:
-                    nextHighestPoint = pt
-            topLeft = highestPoint if highestPoint[0] < nextHighestPoint[0] else nextHighestPoint
-            topRight = highestPoint if highestPoint[0] > nextHighestPoint[0] else nextHighestPoint
-            yDiff = topRight[1] - topLeft[1]
-            xDiff = topRight[0] - topLeft[0]
-
-            # Set the Y-Axis Coordinate so that the grid rotates properly
-            extentHeight = float(topCorner) - float(bottomCorner)
+            angle = angleDrawn
+            pivot = (float(pointExtents[0]), float(pointExtents[1]))
 
-        # Set the start position for labeling
-        startPos = None
-        if (labelStartPos == "Upper-Right"):
-            startPos = "UR"
-        elif (labelStartPos == "Upper-Left"):
-            startPos = "UL"
-        elif (labelStartPos == "Lower-Left"):
-            startPos = "LL"
-        elif (labelStartPos == "Lower-Right"):
-            startPos = "LR"
-
-        # Import the custom toolbox with the fishnet tool in it, and run this. This had to be added to a model,
-        # because of a bug, which will now allow you to pass variables to the Create Fishnet tool.
-        #UPDATE
-        toolboxPath = None
-        if appEnvironment == "ARCGIS_PRO":
-            toolboxPath = os.path.join(os.path.dirname(sysPath), "Clearing Operations Tools.tbx")
-        else:
-            toolboxPath = os.path.join(os.path.dirname(sysPath), "Clearing Operations Tools_10.4.tbx")
-
-        arcpy.ImportToolbox(toolboxPath)
-        arcpy.AddMessage("Creating Fishnet Grid")
-        arcpy.Fishnet_ClearingOperations(tempOutput, originCoordinate, yAxisCoordinate, 0, 0, str(numberCellsHo), str(numberCellsVert), oppCornerCoordinate, "NO_LABELS", fullExtent, "POLYGON")
-
-        # Sort the grid upper left to lower right, and delete the in memory one
-        arcpy.AddMessage("Sorting the grid for labeling")
-        tempSort = os.path.join("in_memory", "tempSort")
-        arcpy.Sort_management(tempOutput, tempSort, [["Shape", "ASCENDING"]], startPos)
-        # arcpy.Delete_management("in_memory") #Not sure why we are trying to delete in_memory
-
-        # Add a field which will be used to add the grid labels
-        arcpy.AddMessage("Adding field for labeling the grid")
+        # Build, label, rotate and write every cell of the grid in one pass
+        arcpy.AddMessage("Creating and labeling grid")
         gridField = "Grid"
-        arcpy.AddField_management(tempSort, gridField, "TEXT")
-
-        # Number the fields
-        arcpy.AddMessage("Numbering the grids")
-        letterIndex = 1
-        secondLetterIndex = 1
-        letter = 'A'
-        secondLetter = 'A'
-        number = 1
-        lastY = -9999
-        cursor = arcpy.UpdateCursor(tempSort)
-        for row in cursor:
-            yPoint = row.getValue("SHAPE").firstPoint.Y
-            if (lastY != yPoint) and (lastY != -9999):
-                letterIndex += 1
-                letter = ColIdxToXlName(letterIndex)
-                if (labelStyle != "Numeric"):
-                    number = 1
-                secondLetter = 'A'
-                secondLetterIndex = 1
-            lastY = yPoint
-
-            if (labelStyle == "Alpha-Numeric"):
-                row.setValue(gridField, str(letter) + str(number))
-            elif (labelStyle == "Alpha-Alpha"):
-                row.setValue(gridField, str(letter) + str(secondLetter))
-            elif (labelStyle == "Numeric"):
-                row.setValue(gridField, str(number))
-
-            cursor.updateRow(row)
-            number += 1
-            secondLetterIndex += 1
-            secondLetter = ColIdxToXlName(secondLetterIndex)
-
-        # Rotate the shape, if needed.
-        if (inputExtentDrawnFromMap):
-            arcpy.AddMessage("Rotating the grid")
-            RotateFeatureClass(tempSort, outputFeatureClass, angleDrawn, pointExtents[0] + " " + pointExtents[1])
-        else:
-            arcpy.CopyFeatures_management(tempSort, outputFeatureClass)
-        arcpy.Delete_management(tempSort)
+        spatialReference = arcpy.Describe(targetPointOrigin).spatialReference
+        GRGUtilities.CreateGRG(outputFeatureClass, leftCorner, bottomCorner,
+                               float(cellWidth), float(cellHeight),
+                               int(numberCellsHo), int(numberCellsVert),
+                               labelStyle, labelStartPos,
+                               angle, pivot, spatialReference, gridField)
 
         # Get and label the output feature
         #UPDATE
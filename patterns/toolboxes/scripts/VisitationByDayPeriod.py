@@ -23,36 +23,21 @@
 # night (12 AM to 6 AM), morning (6 AM to 12 PM),
 # afternoon (12 PM to 5 PM), and evening (5 PM to 12 AM)
 #
+# 10/19/2026 - Minutes by period computed for all events at once with
+#              VisitationUtils and the output table written in one go
+#
 
 # IMPORTS ==========================================
 import os, sys, traceback, types
-from datetime import datetime
-from datetime import timedelta
-from datetime import time
-from datetime import date
+import numpy
 import arcpy
 from arcpy import env
 from arcpy import da
+import VisitationUtils
 
 # LOCALS ===========================================
 deleteme = [] # intermediate datasets to be deleted
 debug = False # extra messaging during development
-data = []
-dtEtoN = time(0,0,0)  # From Evening to Night
-dtNtoM = time(6,0,0)  # From Night to Morning
-dtMtoA = time(12,0,0) # From Morning to Afternoon
-dtAtoE = time(17,0,0) # From Afternoon to Evening
-periodBreaks = [dtEtoN,dtNtoM,dtMtoA,dtAtoE]
-
-
-# FUNCTIONS ========================================
-def timedeltaToMinutes(inTime):
-    minutes = None
-    #Convert a time duration to minutes
-    asSeconds = inTime.total_seconds()
-    minutes = int(asSeconds/60)
-    if asSeconds % 60 > 0.0: minutes += 1 #round up
-    return minutes
 
 # ARGUMENTS ========================================
 inFeatures = arcpy.GetParameterAsText(0)
@@ -67,125 +52,38 @@ try:
     env.overwriteOutput = True
     env.outputCoordinateSystem = arcpy.Describe(inFeatures).spatialReference
 
-    # use start and end times from inFeatures
+    # read the start and end times from inFeatures in one pass
     inFeatureFields = ["OID@",locationIDField,arriveTimeField,departTimeField]
-    for rowLocation in da.SearchCursor(inFeatures,inFeatureFields):
-        oid = rowLocation[0]
-        if debug == True: arcpy.AddMessage("oid: " + str(oid))
-        locID = rowLocation[1]
-        arrive = rowLocation[2]
-        depart = rowLocation[3]
-        
-        # How much time between arrive and depart?
-        duration = depart - arrive
-        if debug == True: arcpy.AddMessage("... duration: " + str(duration))
-        durationMinutes = timedeltaToMinutes(duration)
-        if debug == True: arcpy.AddMessage("... durationMinutes: " + str(durationMinutes))
-        daysBetween = duration.days
-        
-        if depart - arrive <= timedelta(days=0,seconds=0):
-            arcpy.AddWarning("OID " + str(oid) + " departure starts before arrival, or at the same time. Skipping row...")
-            continue
-        
-        if depart == None or arrive == None:
-            arcpy.AddWarning("OID " + str(oid) + " depart or arrive dates are empty. Skipping row...")
-            continue
-        
-        # What are the dates of the event?
-        daysList = []
-        for d in range(0,daysBetween + 1): daysList.append(arrive.date() + timedelta(days=d))
-        
-        # How many periods in those days?
-        periodList = []
-        for day in daysList:
-            for period in periodBreaks:
-                periodList.append(datetime.combine(day,period))
-        periodList.append(datetime.combine(day + timedelta(days=1),dtEtoN)) # Add midnight of the next day
-        
-        minutesNight = 0
-        minutesMorning = 0
-        minutesAfternoon = 0
-        minutesEvening = 0
-        
-        arriveBefore = None
-        arriveBeforeDiff = None
-        departAfter = None
-        departAfterDiff = None
-        
-        for i in range(0,len(periodList) - 1):
-            first = periodList[i]
-            second = periodList[i + 1]
-            
-            # if they are in the same period
-            if (first <= arrive < second) and (first <= depart < second):
-                diff = timedeltaToMinutes(depart - arrive)
-                if first.time() == dtEtoN: minutesNight = minutesNight + diff
-                if first.time() == dtNtoM: minutesMorning = minutesMorning + diff
-                if first.time() == dtMtoA: minutesAfternoon = minutesAfternoon + diff
-                if first.time() == dtAtoE: minutesEvening = minutesEvening + diff
-                continue
-            
-            #Arrival
-            if first <= arrive < second:
-                #print("arrived between " + str(first) + " and " + str(second))
-                arriveBefore = i + 1
-                arriveBeforeDiff = timedeltaToMinutes(second - arrive)
-                if first.time() == dtEtoN: minutesNight = minutesNight + arriveBeforeDiff
-                if first.time() == dtNtoM: minutesMorning = minutesMorning + arriveBeforeDiff
-                if first.time() == dtMtoA: minutesAfternoon = minutesAfternoon + arriveBeforeDiff
-                if first.time() == dtAtoE: minutesEvening = minutesEvening + arriveBeforeDiff
-                
-            # Depature
-            if first <= depart < second:
-                #print("departed between " + str(first) + " and " + str(second))
-                departAfter = i
-                departAfterDiff = timedeltaToMinutes(depart - first)
-                if first.time() == dtEtoN: minutesNight = minutesNight + departAfterDiff
-                if first.time() == dtNtoM: minutesMorning = minutesMorning + departAfterDiff
-                if first.time() == dtMtoA: minutesAfternoon = minutesAfternoon + departAfterDiff
-                if first.time() == dtAtoE: minutesEvening = minutesEvening + departAfterDiff
-            
-            #In between
-            if arrive < first and second < depart:
-                diff = timedeltaToMinutes(second - first)
-                #print("still there " + str(diff) + " minutes")
-                if first.time() == dtEtoN: minutesNight = minutesNight + diff
-                if first.time() == dtNtoM: minutesMorning = minutesMorning + diff
-                if first.time() == dtMtoA: minutesAfternoon = minutesAfternoon + diff
-                if first.time() == dtAtoE: minutesEvening = minutesEvening + diff
-        
-        #Percentage of total time spent
-        pctNight = (float(minutesNight)/float(durationMinutes)) * 100.0
-        pctMorning = (float(minutesMorning)/float(durationMinutes)) * 100.0
-        pctAfternoon = (float(minutesAfternoon)/float(durationMinutes)) * 100.0
-        pctEvening = (float(minutesEvening)/float(durationMinutes)) * 100.0
-        
-        data.append([oid,locID,arrive,depart,durationMinutes,minutesNight,pctNight,minutesMorning,pctMorning,minutesAfternoon,pctAfternoon,minutesEvening,pctEvening])
-    del rowLocation
-    
-    #create the output table
-    arcpy.AddMessage("Creating output structure...")
-    arcpy.CreateTable_management(os.path.dirname(outVisitation),os.path.basename(outVisitation))
-    arcpy.AddField_management(outVisitation,"source","LONG","#","#","#","Source Table OID")
-    arcpy.AddField_management(outVisitation,"locid","TEXT","#","#","#","Location ID")
-    arcpy.AddField_management(outVisitation,"arrive","DATE","#","#","#","Arrive Date/Time")
-    arcpy.AddField_management(outVisitation,"depart","DATE","#","#","#","Depart Date/Time")
-    arcpy.AddField_management(outVisitation,"duration","LONG","#","#","#","Duration (minutes)")
-    arcpy.AddField_management(outVisitation,"minNight","LONG","#","#","#","Night (minutes)")
-    arcpy.AddField_management(outVisitation,"pctNight","DOUBLE",6,2,"#","Night (% duration)")
-    arcpy.AddField_management(outVisitation,"minMorn","LONG","#","#","#","Morning (minutes)")
-    arcpy.AddField_management(outVisitation,"pctMorn","DOUBLE",6,2,"#","Morning (% duration)")
-    arcpy.AddField_management(outVisitation,"minAfter","LONG","#","#","#","Afternoon (minutes)")
-    arcpy.AddField_management(outVisitation,"pctAfter","DOUBLE",6,2,"#","Afternoon (% duration)")
-    arcpy.AddField_management(outVisitation,"minEven","LONG","#","#","#","Evening (minutes)")
-    arcpy.AddField_management(outVisitation,"pctEven","DOUBLE",6,2,"#","Evening (% duration)")
-    
-    # fill the table
-    fields = ["source","locid","arrive","depart","duration","minNight","pctNight","minMorn","pctMorn","minAfter","pctAfter","minEven","pctEven"]
-    inRows = arcpy.da.InsertCursor(outVisitation,fields)
-    for j in data:
-        inRows.insertRow(j)
-    del inRows
+    rows = [rowLocation for rowLocation in da.SearchCursor(inFeatures,inFeatureFields)]
+    oids = numpy.array([row[0] for row in rows], dtype=numpy.int32)
+    locIDs = [row[1] for row in rows]
+    arrive = numpy.array([row[2] for row in rows], dtype="datetime64[us]")
+    depart = numpy.array([row[3] for row in rows], dtype="datetime64[us]")
+    del rows
+
+    valid = VisitationUtils.ValidEvents(arrive, depart)
+    missing = VisitationUtils.MissingTimes(arrive, depart)
+    for index in numpy.flatnonzero(~valid):
+        if missing[index]:
+            arcpy.AddWarning("OID " + str(oids[index]) + " depart or arrive dates are empty. Skipping row...")
+        else:
+            arcpy.AddWarning("OID " + str(oids[index]) + " departure starts before arrival, or at the same time. Skipping row...")
+
+    # minutes of every event in each day period, all at once
+    arcpy.AddMessage("Summarizing " + str(int(valid.sum())) + " events by day period...")
+    duration, minutes = VisitationUtils.PeriodMinutes(arrive[valid], depart[valid])
+    data = VisitationUtils.VisitationTable(oids[valid], [locID for locID, isValid in zip(locIDs, valid) if isValid],
+                                           arrive[valid], depart[valid], duration, minutes)
+    if debug == True: arcpy.AddMessage("... minutes by period: " + str(minutes.sum(axis=0)))
+
+    # write the output table in one go, then set the field aliases (not supported by dBASE tables)
+    arcpy.AddMessage("Creating output table...")
+    if arcpy.Exists(outVisitation):
+        arcpy.Delete_management(outVisitation)
+    da.NumPyArrayToTable(data, outVisitation)
+    if not outVisitation.lower().endswith(".dbf"):
+        for name, fieldType, alias in VisitationUtils.visitationFields:
+            arcpy.AlterField_management(outVisitation, name, "#", alias)
     
     # Set output
     arcpy.SetParameter(4,outVisitation)
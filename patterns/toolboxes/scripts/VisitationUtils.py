@@ -0,0 +1,135 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+VisitationUtils.py
+--------------------------------------------------
+requirements: ArcGIS 10.3.1+, ArcGIS Pro 1.2+, NumPy
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: Day period overlap kernel for VisitationByDayPeriod.py.
+The minutes of every event in each daily period are computed at once
+from datetime64 arrays: the time spent in a period up to any moment is a
+closed form of the day count and time of day, so the overlap of an event
+with a period is the difference of that at departure and arrival, with
+no loop over the days of the event.
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import numpy
+
+# day periods: night (12 AM to 6 AM), morning (6 AM to 12 PM),
+# afternoon (12 PM to 5 PM) and evening (5 PM to 12 AM)
+periodStarts = [0, 6 * 60, 12 * 60, 17 * 60] # minutes after midnight
+minutesPerDay = 24 * 60
+
+# output table fields: (name, numpy type, alias)
+visitationFields = [("source", numpy.int32, "Source Table OID"),
+                    ("locid", None, "Location ID"),
+                    ("arrive", "datetime64[us]", "Arrive Date/Time"),
+                    ("depart", "datetime64[us]", "Depart Date/Time"),
+                    ("duration", numpy.int32, "Duration (minutes)"),
+                    ("minNight", numpy.int32, "Night (minutes)"),
+                    ("pctNight", numpy.float64, "Night (% duration)"),
+                    ("minMorn", numpy.int32, "Morning (minutes)"),
+                    ("pctMorn", numpy.float64, "Morning (% duration)"),
+                    ("minAfter", numpy.int32, "Afternoon (minutes)"),
+                    ("pctAfter", numpy.float64, "Afternoon (% duration)"),
+                    ("minEven", numpy.int32, "Evening (minutes)"),
+                    ("pctEven", numpy.float64, "Evening (% duration)")]
+
+def _seconds(times):
+    ''' seconds since 1970-01-01 00:00:00 (a midnight) of datetimes or datetime64 values '''
+    return numpy.asarray(times, dtype="datetime64[s]").astype(numpy.int64)
+
+def MissingTimes(arrive, depart):
+    ''' events without an arrive or a depart time (NaT) '''
+    # NaT is the smallest int64; comparing NaT with itself is not reliable across NumPy versions
+    nat = numpy.iinfo(numpy.int64).min
+    return (numpy.asarray(arrive, dtype="datetime64[s]").astype(numpy.int64) == nat) | \
+           (numpy.asarray(depart, dtype="datetime64[s]").astype(numpy.int64) == nat)
+
+def ValidEvents(arrive, depart):
+    ''' events with both times that depart after they arrive '''
+    valid = ~MissingTimes(arrive, depart)
+    valid[valid] = _seconds(depart)[valid] > _seconds(arrive)[valid]
+    return valid
+
+def _cumulativeMinutes(minutes, starts, ends):
+    ''' minutes spent in each daily period from 1970-01-01 up to minutes (events x 1) '''
+    days = minutes // minutesPerDay
+    timeOfDay = minutes % minutesPerDay
+    return days * (ends - starts) + numpy.clip(timeOfDay - starts, 0, ends - starts)
+
+def PeriodMinutes(arrive, depart, starts=periodStarts):
+    '''
+    Minutes of each event from arrive to depart (arrays of datetimes, all
+    valid, see ValidEvents) spent in each daily period starting at starts
+    (minutes after midnight). Returns (duration, minutes): the rounded up
+    duration of each event and an (events x periods) array.
+
+    As the tool always has, partial minutes are rounded up separately for
+    the part of an event in the period it arrives in and the part in the
+    period it departs in, or once when it arrives and departs in the same
+    period.
+    '''
+    arriveSeconds = _seconds(arrive).reshape(-1, 1)
+    departSeconds = _seconds(depart).reshape(-1, 1)
+    starts = numpy.asarray(starts, dtype=numpy.int64).reshape(1, -1)
+    ends = numpy.append(starts[:, 1:], [[minutesPerDay]], axis=1)
+    duration = -((arriveSeconds - departSeconds) // 60)
+
+    # round the arrival down and the departure up to whole minutes, the period breaks being on whole minutes
+    arriveMinutes = arriveSeconds // 60
+    departMinutes = -(-departSeconds // 60)
+    minutes = _cumulativeMinutes(departMinutes, starts, ends) - _cumulativeMinutes(arriveMinutes, starts, ends)
+
+    # events within a single period
+    def period(seconds):
+        day = seconds // (minutesPerDay * 60)
+        index = numpy.searchsorted(starts[0] * 60, seconds % (minutesPerDay * 60), side="right") - 1
+        return day * starts.shape[1] + index, index
+    arrivePeriod, arriveIndex = period(arriveSeconds)
+    departPeriod, departIndex = period(departSeconds)
+    samePeriod = arrivePeriod == departPeriod
+    inArrivePeriod = numpy.arange(starts.shape[1]).reshape(1, -1) == arriveIndex
+    minutes = numpy.where(samePeriod, inArrivePeriod * duration, minutes)
+
+    return duration.ravel(), minutes
+
+def VisitationTable(oids, locIDs, arrive, depart, duration, minutes):
+    ''' structured array of the visitation summary, with the visitationFields '''
+    locIDs = [("" if locID is None else str(locID)) for locID in locIDs]
+    width = max([len(locID) for locID in locIDs] + [1])
+    dtype = [(name, fieldType if fieldType is not None else "U" + str(width))
+             for name, fieldType, alias in visitationFields]
+    table = numpy.zeros(len(locIDs), dtype=dtype)
+    table["source"] = oids
+    table["locid"] = locIDs
+    table["arrive"] = numpy.asarray(arrive, dtype="datetime64[us]")
+    table["depart"] = numpy.asarray(depart, dtype="datetime64[us]")
+    table["duration"] = duration
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        percent = minutes * 100.0 / numpy.asarray(duration, dtype=float).reshape(-1, 1)
+    for index, (minutesField, percentField) in enumerate([("minNight", "pctNight"), ("minMorn", "pctMorn"),
+                                                         ("minAfter", "pctAfter"), ("minEven", "pctEven")]):
+        table[minutesField] = minutes[:, index]
+        table[percentField] = percent[:, index]
+    return table
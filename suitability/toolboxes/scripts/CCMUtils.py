@@ -0,0 +1,625 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+CCMUtils.py
+--------------------------------------------------
+requirements: ArcGIS 10.3.1+, ArcGIS Pro 1.2+
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: CCM engine for FM5-33CCM.py and RasterOffRoad.py.
+Slope-intercept frequency (SIF, factor f2) for FM5-33CCM.py: Each 10 km tile of the AOI is processed in a pool of
+processes, each worker in its own scratch geodatabase. Sample slope
+polygons are picked with a random generator seeded from the tile, so
+runs are repeatable, and the tiles are merged once at the end.
+The CCM can also be made as a raster: the factor polygons are rasterized
+once on the slope category grid and multiplied block by block in NumPy.
+The off-road speed model of RasterOffRoad.py reads slope and elevation
+blocks with overlapping halos and computes curvature, its focal range,
+the vehicle slope limits, speed and travel cost in one pass per block,
+across a pool of processes, for one or more vehicles.
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import random
+import multiprocessing
+import numpy
+import arcpy
+import ProcessPoolUtils
+
+# number of sample polygons per slope category in a tile
+samplesPerCategory = 10
+
+# half the width (meters) of the square the sample diagonals span
+diagonalOffset = 500.0
+
+# contour interval the SIF count is adjusted for
+sifContourInterval = 100.0
+
+# seed for the sample polygons when none is given
+defaultSeed = 0
+
+# largest number of values in one SQL IN list
+maxInValues = 1000
+
+# median slope (degrees) of each slope category
+slopeMedians = {1:1.5,2:6.5,3:15.0,4:25.0,5:37.5,6:45.0}
+
+# rows and columns of the blocks the CCM raster is computed in
+blockSize = 2048
+
+# NoData of the CCM raster
+ccmNoData = -9999.0
+
+# radius (cells) of the circle the curvature range is taken over, NbrCircle(3, "CELL")
+focalRadius = 3
+
+class ToolParameters:
+    '''
+    The parameters of FM5-33CCM.py and RasterOffRoad.py: those of the script
+    tool, or the parameter objects Cross Country Mobility Tools.pyt passes
+    to main.
+    '''
+
+    def __init__(self, parameters=None):
+        self.parameters = parameters
+
+    def count(self):
+        ''' number of parameters '''
+        if self.parameters is None:
+            return arcpy.GetArgumentCount()
+        return len(self.parameters)
+
+    def text(self, index):
+        ''' a parameter as text, "" when not set '''
+        if self.parameters is None:
+            return arcpy.GetParameterAsText(index)
+        return self.parameters[index].valueAsText or ""
+
+    def value(self, index):
+        ''' a parameter as an object '''
+        if self.parameters is None:
+            return arcpy.GetParameter(index)
+        return self.parameters[index].value
+
+    def set(self, index, value):
+        ''' set an output parameter '''
+        if self.parameters is None:
+            arcpy.SetParameter(index, value)
+        else:
+            self.parameters[index].value = value
+
+def TileSeed(seed, tileID):
+    ''' random seed for the samples of one tile '''
+    return int(seed) * 1000003 + int(tileID)
+
+def SampleOIDs(oidsByCategory, seed, count=samplesPerCategory):
+    '''
+    Up to count OIDs from each category in {category: [OID, ...]}, picked
+    with a generator seeded with seed. The same input and seed always
+    give the same sample. Returns {category: sorted OID list}.
+    '''
+    generator = random.Random(seed)
+    samples = {}
+    for category in sorted(oidsByCategory):
+        oids = sorted(oidsByCategory[category])
+        if len(oids) > count:
+            oids = sorted(generator.sample(oids, count))
+        samples[category] = oids
+    return samples
+
+def OIDWhereClause(oidFieldName, oids):
+    ''' where clause selecting the OIDs, as IN lists of up to maxInValues values '''
+    oids = sorted(set(int(oid) for oid in oids))
+    if not oids:
+        return oidFieldName + " IS NULL"
+    clauses = []
+    for start in range(0, len(oids), maxInValues):
+        values = ",".join(str(oid) for oid in oids[start:start + maxInValues])
+        clauses.append(oidFieldName + " IN (" + values + ")")
+    return " OR ".join(clauses)
+
+def CalcSIF(meanCount, contourInterval=sifContourInterval):
+    ''' f2 from the mean number of contour intercepts of the sample diagonals '''
+    if meanCount is None:
+        meanCount = 0.0
+    return (280.0 - float((meanCount * contourInterval) / 20.0)) / 280.0
+
+def MeanIntercepts(categoryBySample, interceptsBySample):
+    '''
+    Mean number of contour intercepts per sample diagonal for each category.
+    categoryBySample is {sample: category}, interceptsBySample is
+    {sample: intercepts}; samples without intercepts count as zero.
+    Returns {category: mean}.
+    '''
+    totals = {}
+    for sample, category in categoryBySample.items():
+        total = totals.setdefault(category, [0, 0])
+        total[0] += interceptsBySample.get(sample, 0)
+        total[1] += 1
+    return dict((category, float(count) / samples) for category, (count, samples) in totals.items())
+
+def Diagonals(x, y, offset=diagonalOffset):
+    ''' the two crossing diagonals of the square of half width offset around x, y '''
+    diagonal1 = arcpy.Array([arcpy.Point(x - offset, y + offset), arcpy.Point(x + offset, y - offset)])
+    diagonal2 = arcpy.Array([arcpy.Point(x - offset, y - offset), arcpy.Point(x + offset, y + offset)])
+    return arcpy.Array([diagonal1, diagonal2])
+
+def ProcessTile(tileID, tileWKT, slopePolygons, contours, spatialReference, workFolder, seed=defaultSeed):
+    '''
+    Compute f2 for the slope category polygons of one tile.
+
+    The slope polygons (with a SlopeCat field) are clipped to the tile, up
+    to samplesPerCategory polygons per category are sampled and the
+    diagonals around a point inside each are intersected with contours.
+    f2 of a category comes from the mean number of intercepts per sample.
+    spatialReference is a spatial reference string (exportToString).
+    Returns the clipped polygons with an f2 field, "tile_<tileID>" in this
+    process's scratch geodatabase in workFolder.
+    '''
+    sr = arcpy.SpatialReference()
+    sr.loadFromString(spatialReference)
+    arcpy.env.outputCoordinateSystem = sr
+    arcpy.env.overwriteOutput = True
+    gdb = ProcessPoolUtils.ScratchGDB(workFolder, "ccm")
+    tile = arcpy.FromWKT(tileWKT, sr)
+
+    # clip slope categories to the tile
+    slopeClip = os.path.join(gdb, "tile_" + str(tileID))
+    arcpy.Clip_analysis(slopePolygons, tile, slopeClip)
+    arcpy.AddField_management(slopeClip, "f2", "DOUBLE")
+
+    oidsByCategory = {}
+    with arcpy.da.SearchCursor(slopeClip, ["OID@", "SlopeCat"]) as rows:
+        for oid, category in rows:
+            oidsByCategory.setdefault(category, []).append(oid)
+    if not oidsByCategory:
+        return slopeClip
+    samples = SampleOIDs(oidsByCategory, TileSeed(seed, tileID))
+    categoryBySample = {}
+    for category, oids in samples.items():
+        for oid in oids:
+            categoryBySample[oid] = category
+
+    # diagonals around a point inside each sample polygon
+    diagonals = os.path.join(gdb, "diagonals")
+    arcpy.CreateFeatureclass_management(gdb, "diagonals", "POLYLINE", "#", "#", "#", sr)
+    arcpy.AddField_management(diagonals, "RNDID", "LONG")
+    oidFieldName = arcpy.Describe(slopeClip).OIDFieldName
+    where = OIDWhereClause(oidFieldName, categoryBySample.keys())
+    with arcpy.da.SearchCursor(slopeClip, ["OID@", "SHAPE@"], where) as rows:
+        with arcpy.da.InsertCursor(diagonals, ["SHAPE@", "RNDID"]) as insert:
+            for oid, polygon in rows:
+                inside = polygon.labelPoint
+                insert.insertRow([arcpy.Polyline(Diagonals(inside.X, inside.Y), sr), oid])
+
+    # count contour intercepts per diagonal
+    intersects = os.path.join(gdb, "intersects")
+    arcpy.Intersect_analysis([diagonals, contours], intersects, "ONLY_FID", "#", "POINT")
+    diagonalSample = dict(row for row in arcpy.da.SearchCursor(diagonals, ["OID@", "RNDID"]))
+    interceptsBySample = {}
+    with arcpy.da.SearchCursor(intersects, ["FID_diagonals", "SHAPE@"]) as rows:
+        for diagonalOID, points in rows:
+            sample = diagonalSample[diagonalOID]
+            interceptsBySample[sample] = interceptsBySample.get(sample, 0) + points.pointCount
+
+    f2 = dict((category, CalcSIF(mean)) for category, mean in
+              MeanIntercepts(categoryBySample, interceptsBySample).items())
+    with arcpy.da.UpdateCursor(slopeClip, ["SlopeCat", "f2"]) as rows:
+        for row in rows:
+            row[1] = f2.get(row[0])
+            rows.updateRow(row)
+
+    for dataset in [diagonals, intersects]:
+        arcpy.Delete_management(dataset)
+    return slopeClip
+
+_tileContext = {}
+
+def _initTileWorker(slopePolygons, contours, spatialReference, workFolder, seed):
+    ''' pool initializer: inputs shared by all tiles '''
+    _tileContext.update(slopePolygons=slopePolygons, contours=contours,
+                        spatialReference=spatialReference, workFolder=workFolder, seed=seed)
+
+def _tileJob(tile):
+    ''' pool worker: (tileID, tileWKT) '''
+    return ProcessTile(tile[0], tile[1], **_tileContext)
+
+def ReadTiles(fishnet):
+    ''' [(OID, WKT)] of the tile polygons '''
+    with arcpy.da.SearchCursor(fishnet, ["OID@", "SHAPE@WKT"]) as rows:
+        return [(oid, wkt) for oid, wkt in rows]
+
+def WorkerDataset(dataset, workFolder, copies):
+    '''
+    A path to dataset that worker processes can open. Layers (map layer
+    names do not exist in the workers) are resolved to their catalog path;
+    the selected or queried features of a layer are copied to this
+    process's scratch geodatabase in workFolder and the copy is added to
+    copies.
+    '''
+    desc = arcpy.Describe(dataset)
+    if desc.dataType not in ("FeatureLayer", "Layer"):
+        return getattr(desc, "catalogPath", dataset) or dataset
+    if not getattr(desc, "FIDSet", "") and not getattr(desc, "whereClause", ""):
+        return desc.catalogPath
+    copy = os.path.join(ProcessPoolUtils.ScratchGDB(workFolder, "ccm"), "input_" + str(len(copies)))
+    arcpy.CopyFeatures_management(dataset, copy)
+    copies.append(copy)
+    return copy
+
+def RunTiles(tiles, slopePolygons, contours, spatialReference, workFolder=None,
+             seed=defaultSeed, processes=None):
+    '''
+    ProcessTile for each (tileID, tileWKT) in tiles across a pool of
+    processes (serially when processes is 1 or there is one tile).
+    slopePolygons and contours may be layers (see WorkerDataset).
+    spatialReference is a SpatialReference. Returns the tile feature
+    classes in tile order.
+    '''
+    if workFolder is None:
+        workFolder = arcpy.env.scratchFolder
+    copies = []
+    try:
+        initargs = (WorkerDataset(slopePolygons, workFolder, copies), WorkerDataset(contours, workFolder, copies),
+                    spatialReference.exportToString(), workFolder, seed)
+
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        processes = max(1, min(int(processes), len(tiles)))
+        if processes == 1:
+            _initTileWorker(*initargs)
+            return [_tileJob(tile) for tile in tiles]
+        pool = ProcessPoolUtils.StartPool(processes, _initTileWorker, initargs)
+        try:
+            return pool.map(_tileJob, tiles)
+        finally:
+            pool.close()
+            pool.join()
+    finally:
+        for copy in copies:
+            arcpy.Delete_management(copy)
+
+def MergeTiles(tileFeatureClasses, output):
+    ''' merge the tiles of RunTiles into output once and remove them '''
+    arcpy.Merge_management(tileFeatureClasses, output)
+    for tile in tileFeatureClasses:
+        arcpy.Delete_management(tile)
+    return output
+
+def F1ByCategory(maxKPH, onSlope, offSlope):
+    ''' {slope category: f1} for a vehicle, f1 = (max off road slope - slope) / (max on road slope / max road speed) '''
+    return dict((category, float((offSlope - median) / (onSlope / maxKPH)))
+                for category, median in slopeMedians.items())
+
+def FactorFields(fieldNames, vegetation="MAX", soils="DRY"):
+    '''
+    The CCM factor fields among fieldNames: f1, f2, f3min or f3max
+    (vegetation "MIN" or "MAX"), f4wet or f4dry (soils "WET" or "DRY") and f5.
+    '''
+    wanted = ["f1", "f2",
+              "f3min" if str(vegetation).upper() == "MIN" else "f3max",
+              "f4wet" if str(soils).upper() == "WET" else "f4dry",
+              "f5"]
+    present = set(name.lower() for name in fieldNames)
+    return [field for field in wanted if field in present]
+
+def CalculateCCM(featureClass, factorFields):
+    ''' add a ccm field with the product of factorFields; missing factors are set to 1.0 '''
+    if "ccm" not in [field.name.lower() for field in arcpy.ListFields(featureClass)]:
+        arcpy.AddField_management(featureClass, "ccm", "DOUBLE")
+    with arcpy.da.UpdateCursor(featureClass, ["ccm"] + factorFields) as rows:
+        for row in rows:
+            ccm = 1.0
+            for i in range(1, len(row)):
+                if row[i] is None:
+                    row[i] = 1.0
+                ccm *= row[i]
+            row[0] = ccm
+            rows.updateRow(row)
+    return featureClass
+
+def CCMBlock(slopeCategories, f1ByCategory, factors):
+    '''
+    CCM for a block of cells: f1 looked up from the slope categories times
+    each factor array. Factors that are NaN (no polygon) count as 1.0;
+    cells without a slope category are NaN.
+    '''
+    slopeCategories = numpy.asarray(slopeCategories, dtype=float)
+    known = ~numpy.isnan(slopeCategories)
+    categories = numpy.where(known, slopeCategories, 0).astype(int)
+    lookup = numpy.ones(max(max(f1ByCategory), categories.max()) + 1)
+    for category, f1 in f1ByCategory.items():
+        lookup[category] = f1
+    ccm = lookup[categories]
+    for factor in factors:
+        ccm *= numpy.where(numpy.isnan(factor), 1.0, factor)
+    return numpy.where(known, ccm, numpy.nan)
+
+class RasterGrid:
+    ''' the cells of a template raster, read and written in blocks '''
+
+    def __init__(self, raster):
+        raster = arcpy.Raster(raster)
+        self.xmin = raster.extent.XMin
+        self.ymax = raster.extent.YMax
+        self.cellWidth = raster.meanCellWidth
+        self.cellHeight = raster.meanCellHeight
+        self.width = raster.width
+        self.height = raster.height
+        self.spatialReference = raster.spatialReference
+
+    def blocks(self, size=blockSize):
+        ''' (row, column, rows, columns) of each block, from the top left '''
+        for row in range(0, self.height, size):
+            for col in range(0, self.width, size):
+                yield (row, col, min(size, self.height - row), min(size, self.width - col))
+
+    def lowerLeft(self, block):
+        ''' lower left corner of a block '''
+        row, col, nrows, ncols = block
+        return arcpy.Point(self.xmin + col * self.cellWidth, self.ymax - (row + nrows) * self.cellHeight)
+
+    def read(self, raster, block, halo=0):
+        '''
+        The block of a raster on this grid as floats, NoData as NaN, with
+        halo extra cells on each side (NaN beyond the edges of the grid).
+        '''
+        row, col, nrows, ncols = block
+        values = numpy.empty((nrows + 2 * halo, ncols + 2 * halo))
+        values.fill(numpy.nan)
+        row0, col0 = max(row - halo, 0), max(col - halo, 0)
+        row1 = min(row + nrows + halo, self.height)
+        col1 = min(col + ncols + halo, self.width)
+        noData = arcpy.Raster(raster).noDataValue
+        if noData is None:
+            noData = ccmNoData
+        array = arcpy.RasterToNumPyArray(raster, self.lowerLeft((row0, col0, row1 - row0, col1 - col0)),
+                                         col1 - col0, row1 - row0, noData)
+        inside = array.astype(float)
+        inside[array == noData] = numpy.nan
+        top, left = row0 - (row - halo), col0 - (col - halo)
+        values[top:top + inside.shape[0], left:left + inside.shape[1]] = inside
+        return values
+
+    def save(self, array, block, outputRaster):
+        ''' write a block (NaN as NoData) to outputRaster '''
+        array = numpy.where(numpy.isnan(array), ccmNoData, array).astype(numpy.float32)
+        out = arcpy.NumPyArrayToRaster(array, self.lowerLeft(block), self.cellWidth, self.cellHeight, ccmNoData)
+        out.save(outputRaster)
+        arcpy.DefineProjection_management(outputRaster, self.spatialReference)
+        return outputRaster
+
+def RasterizeFactor(polygons, field, templateRaster, outputRaster):
+    ''' rasterize a factor field of polygons on the cells of templateRaster '''
+    template = arcpy.Raster(templateRaster)
+    previousSnapRaster = arcpy.env.snapRaster
+    previousExtent = arcpy.env.extent
+    try:
+        arcpy.env.snapRaster = templateRaster
+        arcpy.env.extent = template.extent
+        arcpy.PolygonToRaster_conversion(polygons, field, outputRaster, "CELL_CENTER", "", template.meanCellWidth)
+    finally:
+        arcpy.env.snapRaster = previousSnapRaster
+        arcpy.env.extent = previousExtent
+    return outputRaster
+
+def CCMRaster(slopeCategoryRaster, f1ByCategory, factorRasters, outputRaster, workFolder=None, size=blockSize):
+    '''
+    Write the CCM raster on the grid of slopeCategoryRaster: f1 from the
+    slope categories times the factor rasters (on the same grid), computed
+    block by block.
+    '''
+    if workFolder is None:
+        workFolder = arcpy.env.scratchFolder
+    grid = RasterGrid(slopeCategoryRaster)
+    parts = []
+    for i, block in enumerate(grid.blocks(size)):
+        factors = [grid.read(raster, block) for raster in factorRasters]
+        ccm = CCMBlock(grid.read(slopeCategoryRaster, block), f1ByCategory, factors)
+        part = os.path.join(workFolder, "ccm_" + str(os.getpid()) + "_" + str(i) + ".tif")
+        parts.append(grid.save(ccm, block, part))
+
+    return _mosaicParts(parts, grid, outputRaster)
+
+def _mosaicParts(parts, grid, outputRaster):
+    ''' mosaic the block rasters of a grid into outputRaster once and remove them '''
+    if arcpy.Exists(outputRaster):
+        arcpy.Delete_management(outputRaster)
+    if len(parts) == 1:
+        arcpy.CopyRaster_management(parts[0], outputRaster)
+    else:
+        arcpy.MosaicToNewRaster_management(parts, os.path.dirname(outputRaster), os.path.basename(outputRaster),
+                                           grid.spatialReference, "32_BIT_FLOAT", grid.cellWidth, 1)
+    for part in parts:
+        arcpy.Delete_management(part)
+    return outputRaster
+
+def CCMPolygons(ccmRaster, outputFeatures, precision=100):
+    ''' polygons of the CCM raster, in steps of 1/precision, with a ccm field '''
+    steps = arcpy.sa.Int(arcpy.sa.Raster(ccmRaster) * precision + 0.5)
+    arcpy.RasterToPolygon_conversion(steps, outputFeatures, "NO_SIMPLIFY", "VALUE")
+    arcpy.AddField_management(outputFeatures, "ccm", "DOUBLE")
+    with arcpy.da.UpdateCursor(outputFeatures, ["gridcode", "ccm"]) as rows:
+        for row in rows:
+            row[1] = row[0] / float(precision)
+            rows.updateRow(row)
+    return outputFeatures
+
+def Curvature(elevation, cellSize):
+    '''
+    Curvature (as the Curvature tool, 1/100 of a z unit) of the cells inside
+    a one cell border of elevation. NoData neighbors take the center value.
+    '''
+    z = numpy.asarray(elevation, dtype=float)
+    center = z[1:-1, 1:-1]
+    def neighbor(rows, cols):
+        values = z[rows, cols]
+        return numpy.where(numpy.isnan(values), center, values)
+    north = neighbor(slice(0, -2), slice(1, -1))
+    west = neighbor(slice(1, -1), slice(0, -2))
+    east = neighbor(slice(1, -1), slice(2, None))
+    south = neighbor(slice(2, None), slice(1, -1))
+    d = ((west + east) / 2.0 - center) / cellSize ** 2
+    e = ((north + south) / 2.0 - center) / cellSize ** 2
+    return -2.0 * (d + e) * 100.0
+
+def FocalRange(values, radius=focalRadius):
+    '''
+    Range (maximum - minimum, ignoring NoData) over a circle of radius cells
+    for the cells inside a radius wide border of values.
+    '''
+    values = numpy.asarray(values, dtype=float)
+    nrows = values.shape[0] - 2 * radius
+    ncols = values.shape[1] - 2 * radius
+    high = numpy.empty((nrows, ncols))
+    high.fill(numpy.nan)
+    low = high.copy()
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            if dy * dy + dx * dx > radius * radius:
+                continue
+            window = values[radius + dy:radius + dy + nrows, radius + dx:radius + dx + ncols]
+            high = numpy.fmax(high, window)
+            low = numpy.fmin(low, window)
+    return high - low
+
+def CurvatureRange(elevation, cellSize, radius=focalRadius):
+    ''' focal range of the curvature, for elevation with a radius + 1 cell halo; NaN where the center is NoData '''
+    curvature = Curvature(elevation, cellSize)
+    center = elevation[radius + 1:elevation.shape[0] - radius - 1, radius + 1:elevation.shape[1] - radius - 1]
+    return numpy.where(numpy.isnan(center), numpy.nan, FocalRange(curvature, radius))
+
+def VehicleF1(slope, maxKPH, onSlope, offSlope):
+    ''' f1 for slope (degrees), limited to the vehicle's max off road slope: (max off road slope - slope) / (max on road slope / max road speed) '''
+    return (offSlope - numpy.minimum(slope, offSlope)) / (onSlope / maxKPH)
+
+def TravelCost(speed):
+    ''' seconds per meter at speed (kph); NaN where the speed is zero or less '''
+    speed = numpy.asarray(speed, dtype=float)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        return numpy.where(speed > 0, 3.6 / speed, numpy.nan)
+
+def OffRoadBlock(slope, elevation, factors, vehicles, cellSize, maxRange, radius=focalRadius):
+    '''
+    CCM of each vehicle for a block of cells.
+
+    slope       slope (degrees) of the block
+    elevation   elevation of the block with a radius + 1 cell halo
+    factors     other factor arrays of the block (f3, f4, f5); NaN counts as 1.0
+    vehicles    {name: (max road speed kph, max on road slope, max off road slope)}
+    maxRange    largest curvature range over the whole grid, for f2
+
+    f1 is in kph, so the CCM is the off-road speed in kph. Returns
+    {name: CCM array}, NaN where slope or elevation is NoData.
+    '''
+    curvatureRange = CurvatureRange(elevation, cellSize, radius)
+    if maxRange:
+        terrain = (maxRange - curvatureRange) / maxRange
+    else:
+        terrain = numpy.where(numpy.isnan(curvatureRange), numpy.nan, 1.0)
+    for factor in factors:
+        terrain = terrain * numpy.where(numpy.isnan(factor), 1.0, factor)
+    terrain = numpy.where(numpy.isnan(slope), numpy.nan, terrain)
+    return dict((name, VehicleF1(slope, *parameters) * terrain) for name, parameters in vehicles.items())
+
+_offRoadContext = {}
+
+def _initOffRoadWorker(slopeRaster, elevationRaster, factorRasters, vehicles, costs, workFolder):
+    ''' pool initializer: inputs shared by all blocks '''
+    _offRoadContext.update(slopeRaster=slopeRaster, elevationRaster=elevationRaster,
+                           factorRasters=factorRasters, vehicles=vehicles, costs=costs,
+                           workFolder=workFolder)
+    _offRoadContext["grid"] = RasterGrid(slopeRaster)
+
+def _rangeMaxJob(block):
+    ''' pool worker: largest curvature range in a block, None when it has no data '''
+    grid = _offRoadContext["grid"]
+    elevation = grid.read(_offRoadContext["elevationRaster"], block, focalRadius + 1)
+    curvatureRange = CurvatureRange(elevation, grid.cellWidth)
+    valid = curvatureRange[~numpy.isnan(curvatureRange)]
+    if valid.size == 0:
+        return None
+    return float(valid.max())
+
+def _offRoadJob(job):
+    ''' pool worker: (block index, block, maxRange) -> [(vehicle, "ccm" or "cost", block raster)] '''
+    index, block, maxRange = job
+    context = _offRoadContext
+    grid = context["grid"]
+    slope = grid.read(context["slopeRaster"], block)
+    elevation = grid.read(context["elevationRaster"], block, focalRadius + 1)
+    factors = [grid.read(raster, block) for raster in context["factorRasters"]]
+    ccms = OffRoadBlock(slope, elevation, factors, context["vehicles"], grid.cellWidth, maxRange)
+    parts = []
+    for number, name in enumerate(sorted(ccms)):
+        prefix = os.path.join(context["workFolder"], "offroad_" + str(os.getpid()) + "_" + str(index) + "_" + str(number))
+        parts.append((name, "ccm", grid.save(ccms[name], block, prefix + "_ccm.tif")))
+        if name in context["costs"]:
+            parts.append((name, "cost", grid.save(TravelCost(ccms[name]), block, prefix + "_cost.tif")))
+    return parts
+
+def OffRoadSurfaces(slopeRaster, elevationRaster, factorRasters, vehicles, outputs,
+                    workFolder=None, processes=None, size=blockSize):
+    '''
+    Write off-road mobility rasters for several vehicles in one run.
+
+    slopeRaster and elevationRaster (and the factorRasters) are on the same
+    grid. vehicles is {name: (max road speed kph, max on road slope, max off
+    road slope)} and outputs is {name: (CCM raster, travel cost raster or
+    None)}. The grid is processed in blocks across a pool of processes
+    (serially when processes is 1 or there is one block): a first pass
+    finds the largest curvature range for f2, a second computes and writes
+    the blocks, which are mosaicked once per output. Returns outputs.
+    '''
+    if workFolder is None:
+        workFolder = arcpy.env.scratchFolder
+    costs = [name for name in vehicles if outputs[name][1]]
+    initargs = (slopeRaster, elevationRaster, factorRasters, vehicles, costs, workFolder)
+    grid = RasterGrid(slopeRaster)
+    blocks = list(grid.blocks(size))
+
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    processes = max(1, min(int(processes), len(blocks)))
+    pool = None
+    if processes == 1:
+        _initOffRoadWorker(*initargs)
+        runJobs = lambda worker, jobs: [worker(job) for job in jobs]
+    else:
+        pool = ProcessPoolUtils.StartPool(processes, _initOffRoadWorker, initargs)
+        runJobs = pool.map
+    try:
+        maxRanges = [m for m in runJobs(_rangeMaxJob, blocks) if m is not None]
+        maxRange = max(maxRanges or [0.0])
+        results = runJobs(_offRoadJob, [(i, block, maxRange) for i, block in enumerate(blocks)])
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    partsByOutput = {}
+    for parts in results:
+        for name, kind, part in parts:
+            partsByOutput.setdefault((name, kind), []).append(part)
+    for (name, kind), parts in partsByOutput.items():
+        _mosaicParts(parts, grid, outputs[name][0 if kind == "ccm" else 1])
+    return outputs
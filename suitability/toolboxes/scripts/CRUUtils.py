@@ -0,0 +1,100 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+CRUUtils.py
+--------------------------------------------------
+requirements: ArcGIS 10.3.1+, ArcGIS Pro 1.2+, NumPy
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: Climate Research Unit CL 2.0 archive reader for
+ImportCRU_CL2ToRaster.py. The (lat, lon, values) records of a gzipped
+grid_10min_<variable>.dat.gz archive are decoded in chunks with NumPy
+and placed on the global 10' grid. Needs no arcpy.
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import re
+import gzip
+import warnings
+import numpy
+
+cl2Types = {"dtr":"Diurnal Temperature Range (C)","elv":"Elevation (km)","frs":"No Frost Days","pre":"Precipitation (mm)","rd0":"No Wet Days","reh":"Relative Humidity (%)","sunp":"Sunshine (max %)","tmp":"Mean Temp (C)","wnd":"Windspeed (m/s)"}
+fieldList = ["jan","feb","mar","apr","may","jun","jul","aug","sep","oct","nov","dec"]
+
+cellsPerDegree = 6 # 10' grid
+gridRows = 180 * cellsPerDegree
+gridCols = 360 * cellsPerDegree
+noDataValue = -9999.0
+chunkBytes = 16 * 1024 * 1024 # records decoded at a time
+numberPattern = re.compile(r"-?\d+(?:\.\d*)?") # fixed-width values may run together
+
+def CL2Type(gzFile):
+    ''' the CL 2.0 variable of an archive, "pre" for grid_10min_pre.dat.gz '''
+    return os.path.basename(gzFile)[11:].split(".")[0]
+
+def DecodeRecords(text, columns):
+    ''' (records, columns) array of the whitespace or fixed-width records in text '''
+    records = text.count("\n") + (0 if text.endswith("\n") else 1)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore") # NumPy warns of the values it can't read to the end
+            values = numpy.fromstring(text, dtype=numpy.float64, sep=" ")
+    except ValueError:
+        values = None
+    if values is None or values.size != records * columns:
+        values = numpy.array(numberPattern.findall(text), dtype=numpy.float64)
+    if values.size % columns != 0:
+        raise ValueError("Records with other than " + str(columns) + " values")
+    return values.reshape(-1, columns)
+
+def ReadGrids(gzFile, layers):
+    '''
+    Stream the records (lat, lon, values) of a CL 2.0 archive in chunks
+    into preallocated grids of the first layers values on the global 10'
+    grid. Values after the first layers (the coefficients of variation of
+    the pre archive) are skipped. Returns the (layers, rows, cols) grids
+    and the (top, left, bottom, right) cells holding data.
+    '''
+    grids = numpy.empty((layers, gridRows, gridCols), dtype=numpy.float32)
+    grids.fill(noDataValue)
+    bounds = [gridRows, gridCols, -1, -1]
+    columns = None
+    gzOpen = gzip.open(gzFile, 'rb')
+    try:
+        while True:
+            lines = gzOpen.readlines(chunkBytes)
+            if not lines:
+                break
+            text = b"".join(lines).decode("ascii").strip()
+            if not text:
+                continue
+            if columns is None:
+                columns = len(numberPattern.findall(text.split("\n")[0]))
+            records = DecodeRecords(text, columns)
+            rows = numpy.clip(((90.0 - records[:, 0]) * cellsPerDegree).astype(int), 0, gridRows - 1)
+            cols = numpy.clip(((records[:, 1] + 180.0) * cellsPerDegree).astype(int), 0, gridCols - 1)
+            grids[:, rows, cols] = records[:, 2:2 + layers].T
+            bounds = [min(bounds[0], rows.min()), min(bounds[1], cols.min()),
+                      max(bounds[2], rows.max()), max(bounds[3], cols.max())]
+    finally:
+        gzOpen.close()
+    return grids, bounds
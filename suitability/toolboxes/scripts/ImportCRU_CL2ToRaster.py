@@ -18,97 +18,65 @@ limitations under the License.
 ==================================================
 ImportCRU_CL2ToRaster.py
 --------------------------------------------------
-requirments: ArcGIS 10.3+, Python 2.7
+requirments: ArcGIS 10.3+, Python 2.7, NumPy
 author: ArcGIS Solutions
 company: Esri
 ==================================================
 description:
 Import Climate Resarch Unit CL 2.0 10' grids to raster
+The archives are read by CRUUtils.py.
 ==================================================
 history:
 2/18/2014 - mf - original development
 12/2/2015 - mf - updates for move into MAoW
+10/19/2026 - stream the archives into NumPy grids and write the rasters, or one netCDF, directly
+10/19/2026 - read the Python-only netCDF output argument only when it is passed
+10/19/2026 - archive reading moved to CRUUtils.py; Python-only netCDF output removed
 ==================================================
 '''
 
 # IMPORTS ==========================================
-import os, sys, traceback, gzip, glob
+import os, sys, traceback, glob
 import arcpy
 from arcpy import env
+import CRUUtils
 
 # LOCALS ===========================================
 deleteme = [] # intermediate datasets to be deleted
 debug = True # extra messaging during development
 
-headerGeneral = r"lat,lon,jan,feb,mar,apr,may,jun,jul,aug,sep,oct,nov,dec"
-headerPrecip = r"lat,lon,jan,feb,mar,apr,may,jun,jul,aug,sep,oct,nov,dec,jancv,febcv,marcv,aprcv,maycv,juncv,julcv,augcv,sepcv,octcv,novcv,deccv"
-headerElev = r"lat,lon,elev"
-cl2Types = {"dtr":"Diurnal Temperature Range (C)","elv":"Elevation (km)","frs":"No Frost Days","pre":"Precipitation (mm)","rd0":"No Wet Days","reh":"Relative Humidity (%)","sunp":"Sunshine (max %)","tmp":"Mean Temp (C)","wnd":"Windspeed (m/s)"}
-fieldList = ["jan","feb","mar","apr","may","jun","jul","aug","sep","oct","nov","dec"]
-datFiles = []
-featureClasses = []
 outputRasterDatasets = []
 GCS_WGS_1984 = arcpy.SpatialReference(4326)
 
 
 # FUNCTIONS =======================================
-def extract_archive(gzFile):
-    ''' get the data from the GZ file archive '''
-    arcpy.AddMessage("Extracting and converting " + os.path.basename(gzFile))
-    
-    if os.path.splitext(gzFile)[0].find("_pre.") != -1:
-        header = headerPrecip
-    elif os.path.splitext(gzFile)[0].find("_elv.") != -1:
-        header = headerElev
+def write_rasters(cl2, grids, bounds, workspace):
+    ''' write the monthly (or elevation) grids, cropped to the cells with data, as rasters '''
+    if cl2 == "elv":
+        names = ["elv_ras"]
     else:
-        header = headerGeneral
-
-    
-    # open the archive
-    gzOpen = gzip.open(gzFile,'rb')
-
-    # make the output name
-    newFilename0 = os.path.splitext(gzFile)[0]
-    newFilename = str(os.path.splitext(newFilename0)[0]) + ".csv"
-    outFile = open(newFilename,'w')    
-
-    # write header
-    outFile.write(header)
-    # read line, convert, write line
-    for line in gzOpen.readlines():
-        after = ",".join(line.split())
-        outFile.writelines("\n" + after)
-    
-    outFile.close()
-    gzOpen.close()
-    
-    return newFilename
-
-def pointName(datFile):
-    ''' make a point feature class file name '''
-    d = os.path.dirname(datFile)
-    f = os.path.basename(datFile)
-    f = str(f)
-    f = f[11:]
-    f = f.split(".")[0]
-    f = f + "_pnt"
-    if arcpy.Describe(d).workspaceType == "FileSystem":
-        f = f + ".shp"
-    return os.path.join(d,f)
-
-def pointFieldToRaster(pntFile, fieldName):
-    '''  '''
-    pass
-    return
-
-# ARGUMENTS ========================================
-import_archive_folder = arcpy.GetParameterAsText(0)
-output_raster_workspace = arcpy.GetParameterAsText(1)
-
+        names = [cl2 + "_" + monthField for monthField in CRUUtils.fieldList]
+        if arcpy.Describe(workspace).workspaceType == "FileSystem":
+            names = [name + ".tif" for name in names] # if our output workspace is a folder, make the rasters as TIFFs
+    top, left, bottom, right = bounds
+    cellSize = 1.0 / CRUUtils.cellsPerDegree
+    lowerLeft = arcpy.Point(-180.0 + left * cellSize, 90.0 - (bottom + 1) * cellSize)
+    rasters = []
+    for name, grid in zip(names, grids):
+        outRasterDataset = os.path.join(workspace, name)
+        arcpy.AddMessage("Building " + name)
+        raster = arcpy.NumPyArrayToRaster(grid[top:bottom + 1, left:right + 1], lowerLeft, cellSize, cellSize, CRUUtils.noDataValue)
+        raster.save(outRasterDataset)
+        arcpy.DefineProjection_management(outRasterDataset, GCS_WGS_1984)
+        rasters.append(outRasterDataset)
+    return rasters
 
 def main():
     ''' main script function to put it all together '''
     try:
+        import_archive_folder = arcpy.GetParameterAsText(0)
+        output_raster_workspace = arcpy.GetParameterAsText(1)
+
         # get/set environment
         env.overwriteOutput = True
         env.scratchWorkspace = import_archive_folder
@@ -117,39 +85,18 @@ def main():
         gzFiles = glob.glob(os.path.join(import_archive_folder,"*.gz"))
         if debug == True: arcpy.AddMessage("Found these files: " + str(gzFiles))
         
-        # GZ To Table
+        # GZ To Grids, in one pass over each archive
         for gzFile in gzFiles:
-            datFiles.append(extract_archive(gzFile))
-        
-        # Table To Points  
-        for datFile in datFiles:
-            
-            pntFile = pointName(datFile)
-            
-            arcpy.AddMessage("Converting " + os.path.basename(datFile) + " to points (" + os.path.basename(pntFile) + "). This will take several minutes.")
-            # arcpy.MakeXYEventLayer_management(datFile, "lon", "lat", os.path.basename(datFile),GCS_WGS_1984, "")
-            # arcpy.FeatureClassToFeatureClass_conversion(os.path.basename(datFile), os.path.dirname(pntFile), os.path.basename(pntFile))
-            arcpy.ConvertCoordinateNotation_management(datFile,pntFile,"lon","lat","DD_2","DD_NUMERIC","",GCS_WGS_1984, GCS_WGS_1984)
-            featureClasses.append(pntFile)
-                    
-            # Points To Rasters
-            if pntFile.find("elv") != -1:
-                outRasterDataset = os.path.join(output_raster_workspace,"elv_ras")
-                # process as elevation
-                arcpy.AddMessage("Building " + "elv_ras")
-                arcpy.PointToRaster_conversion(pntFile,"elev",outRasterDataset)
-                outputRasterDatasets.append(outRasterDataset)
-                                               
-            else:
-                for monthField in fieldList:
-                    outRasterName = os.path.basename(pntFile).split("_")[0] + "_" + str(monthField)
-                    if (arcpy.Describe(output_raster_workspace).workspaceType == "FileSystem"):
-                        outRasterName = outRasterName + ".tif"  # if our output workspace is a folder, make the rasters as TIFFs
-                    outRasterDataset= os.path.join(output_raster_workspace,outRasterName)
-                    arcpy.AddMessage("Building " + outRasterName)
-                    if debug == True: arcpy.AddMessage("RasterDataset: " + str(outRasterDataset))
-                    arcpy.PointToRaster_conversion(pntFile,monthField,outRasterDataset)
-                    outputRasterDatasets.append(outRasterDataset)
+            cl2 = CRUUtils.CL2Type(gzFile)
+            layers = 1 if cl2 == "elv" else len(CRUUtils.fieldList)
+            arcpy.AddMessage("Reading " + os.path.basename(gzFile))
+            grids, bounds = CRUUtils.ReadGrids(gzFile, layers)
+            if bounds[2] < 0:
+                arcpy.AddWarning("No records in " + os.path.basename(gzFile))
+                continue
+
+            # Grids To Rasters
+            outputRasterDatasets.extend(write_rasters(cl2, grids, bounds, output_raster_workspace))
                     
         
         if debug == True: arcpy.AddMessage("DONE -----------------")
@@ -0,0 +1,306 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+MosaicSyncUtils.py
+--------------------------------------------------
+requirements: ArcGIS 10.3.1+, ArcGIS Pro 1.2+, netCDF4 (NetCDFSlices)
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: Incremental update of weather mosaic datasets for
+WeatherImportModule.py and NAMDownload.py. The catalog of a mosaic
+dataset is compared with the source files on disk by path, modification
+time and variable/time slice: only files with slices the catalog is
+missing are added, and only items of changed, deleted, superseded or
+expired slices are removed, after the new items are in place, so the
+mosaic dataset stays queryable while it updates. Items added by an
+update are never removed by it. Only the overviews marked stale by the
+update are regenerated.
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import re
+import datetime
+import arcpy
+
+# catalog field holding the modification time of the source of each item
+modifiedField = "SourceModified"
+
+# catalog fields of multidimensional mosaic datasets
+variableField = "Variable"
+timeField = "StdTime"
+
+# items removed per RemoveRastersFromMosaicDataset call
+removeBatchSize = 500
+
+# time units of CF/COARDS time coordinates, in seconds
+timeUnitSeconds = {"second": 1, "sec": 1, "s": 1,
+                   "minute": 60, "min": 60,
+                   "hour": 3600, "hr": 3600, "h": 3600,
+                   "day": 86400, "d": 86400}
+
+def SourceModified(path):
+    ''' modification time of a source file, or of the geodatabase holding a source dataset '''
+    while path and not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return round(os.path.getmtime(path), 3)
+
+def _normalizePath(path):
+    return os.path.normcase(os.path.abspath(path))
+
+def _normalizeTime(value):
+    if value is None:
+        return None
+    return value.replace(microsecond=0)
+
+def _julianOrdinal(year, month, day):
+    ''' proleptic Gregorian ordinal (datetime.toordinal) of a Julian calendar date '''
+    a = (14 - month) // 12
+    y = year + 4800 - a
+    m = month + 12 * a - 3
+    return day + (153 * m + 2) // 5 + 365 * y + y // 4 - 32083 - 1721425
+
+def DimensionTime(value, units=None, calendar=None):
+    '''
+    datetime of a time dimension value: a datetime, a number of units
+    ("days since 1-1-1 00:00:0.0") or a date string. Origins before the
+    Gregorian reform are Julian dates unless the calendar is proleptic.
+    '''
+    if value is None or isinstance(value, datetime.datetime):
+        return _normalizeTime(value)
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        number = None
+    if number is not None:
+        match = re.match(r"\s*(\w+?)s?\s+since\s+(\d+)-(\d+)-(\d+)(?:[ T](\d+):(\d+)(?::(\d+(?:\.\d*)?))?)?",
+                         units or "")
+        if not match or match.group(1).lower() not in timeUnitSeconds:
+            raise ValueError("Unsupported time units: " + str(units))
+        fields = match.groups()
+        year, month, day = int(fields[1]), int(fields[2]), int(fields[3])
+        ordinal = datetime.date(year, month, day).toordinal()
+        if (year, month, day) < (1582, 10, 15) and str(calendar or "standard").lower() in ["standard", "gregorian"]:
+            ordinal = _julianOrdinal(year, month, day)
+        seconds = number * timeUnitSeconds[match.group(1).lower()] + \
+                  int(fields[4] or 0) * 3600 + int(fields[5] or 0) * 60 + float(fields[6] or 0)
+        return _normalizeTime(datetime.datetime(1, 1, 1) +
+                              datetime.timedelta(days=ordinal - 1, seconds=round(seconds)))
+    for pattern in ["%m/%d/%Y %I:%M:%S %p", "%m/%d/%Y %H:%M:%S", "%m/%d/%Y", "%Y-%m-%dT%H:%M:%S",
+                    "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"]:
+        try:
+            return datetime.datetime.strptime(str(value).strip(), pattern)
+        except ValueError:
+            pass
+    raise ValueError("Unsupported time value: " + str(value))
+
+def NetCDFSlices(path, timeDimension="time"):
+    '''
+    {(variable, time)} of the data variables of a netCDF file: variables
+    along timeDimension have a slice per time step, the others one slice
+    without a time. Coordinate and bounds variables are left out. Times
+    are read as numbers and converted with the units and calendar of the
+    time variable, so they don't depend on the locale.
+    '''
+    import netCDF4
+    dataset = netCDF4.Dataset(path, "r")
+    try:
+        coordinates = set(dataset.dimensions)
+        for variable in dataset.variables.values():
+            for name in ["coordinates", "bounds"]:
+                coordinates.update(str(getattr(variable, name, "")).split())
+        times = [None]
+        if timeDimension in dataset.variables:
+            timeVariable = dataset.variables[timeDimension]
+            times = [DimensionTime(value, getattr(timeVariable, "units", None),
+                                   getattr(timeVariable, "calendar", None))
+                     for value in timeVariable[:].ravel().tolist() if value is not None]
+        slices = set()
+        for name, variable in dataset.variables.items():
+            if name in coordinates or len(variable.dimensions) < 2:
+                continue
+            if timeDimension in variable.dimensions:
+                slices.update([(str(name), time) for time in times])
+            else:
+                slices.add((str(name), None))
+        return slices
+    finally:
+        dataset.close()
+
+def RasterSlices(path):
+    ''' a raster dataset is a single slice '''
+    return set([(None, None)])
+
+def PlanSync(items, sources, expireBefore=None):
+    '''
+    Compare the catalog with the sources. items is [(OID, path, modified,
+    variable, time)] of the catalog and sources {path: (modified, slices)}
+    of the files on disk, with slices a set of (variable, time). Each slice
+    is wanted from the most recently modified source that has it, unless it
+    is before expireBefore. Returns (paths to add, OIDs to remove): the
+    sources with wanted slices the catalog doesn't have, and the items that
+    aren't a wanted slice of the current version of their source.
+    '''
+    wanted = {}
+    for path in sorted(sources, key=lambda p: sources[p][0]):
+        for key in sources[path][1]:
+            if expireBefore is not None and key[1] is not None and key[1] < expireBefore:
+                continue
+            wanted[key] = path
+
+    present = set()
+    remove = []
+    for oid, path, modified, variable, time in items:
+        key = (variable, time)
+        if path in sources and modified is not None and abs(modified - sources[path][0]) < 0.001 and \
+                wanted.get(key) == path:
+            present.add((path, key))
+        else:
+            remove.append(oid)
+    add = sorted(set([path for key, path in wanted.items() if (path, key) not in present]))
+    return add, remove
+
+def _catalogFields(mosaicDataset):
+    names = [f.name for f in arcpy.ListFields(mosaicDataset)]
+    if modifiedField not in names:
+        arcpy.AddField_management(mosaicDataset, modifiedField, "DOUBLE")
+    return variableField in names, timeField in names
+
+def CatalogPaths(mosaicDataset, whereClause):
+    ''' {OID: normalized source path} of the primary catalog items matching whereClause '''
+    pathTable = os.path.join("in_memory", "md_paths")
+    if arcpy.Exists(pathTable):
+        arcpy.Delete_management(pathTable)
+    arcpy.ExportMosaicDatasetPaths_management(mosaicDataset, pathTable, whereClause, "ALL", "RASTER")
+    try:
+        with arcpy.da.SearchCursor(pathTable, ["SourceOID", "Path"]) as rows:
+            return dict([(row[0], _normalizePath(row[1])) for row in rows])
+    finally:
+        arcpy.Delete_management(pathTable)
+
+def CatalogItems(mosaicDataset, useVariable, useTime):
+    ''' [(OID, path, modified, variable, time)] of the primary catalog items, read in one pass '''
+    paths = CatalogPaths(mosaicDataset, "Category = 1")
+    fields = ["OID@", modifiedField] + ([variableField] if useVariable else []) + ([timeField] if useTime else [])
+    items = []
+    with arcpy.da.SearchCursor(mosaicDataset, fields, "Category = 1") as rows:
+        for row in rows:
+            variable = str(row[2]) if useVariable and row[2] is not None else None
+            time = _normalizeTime(row[-1]) if useTime else None
+            items.append((row[0], paths.get(row[0]), row[1], variable, time))
+    return items
+
+def _maxOID(mosaicDataset):
+    maxOID = 0
+    with arcpy.da.SearchCursor(mosaicDataset, ["OID@"]) as rows:
+        for row in rows:
+            maxOID = max(maxOID, row[0])
+    return maxOID
+
+def _hasOverviews(mosaicDataset):
+    with arcpy.da.SearchCursor(mosaicDataset, ["OID@"], "Category = 2") as rows:
+        for row in rows:
+            return True
+    return False
+
+def _removeItems(mosaicDataset, oids):
+    for first in range(0, len(oids), removeBatchSize):
+        batch = oids[first:first + removeBatchSize]
+        arcpy.RemoveRastersFromMosaicDataset_management(mosaicDataset,
+                                                        "OBJECTID IN (" + ",".join([str(oid) for oid in batch]) + ")",
+                                                        "UPDATE_BOUNDARY", "MARK_OVERVIEW_ITEMS",
+                                                        "DELETE_OVERVIEW_IMAGES", "DELETE_ITEM_CACHE",
+                                                        "REMOVE_MOSAICDATASET_ITEMS", "UPDATE_CELL_SIZES")
+
+def SyncMosaicDataset(mosaicDataset, sourcePaths, rasterType, slicesFunction=RasterSlices, expireBefore=None,
+                      calculateStatistics=True, buildOverviews=False):
+    '''
+    Update mosaicDataset to hold the wanted slices of the sources at
+    sourcePaths (files, or datasets in a geodatabase) added with
+    rasterType. slicesFunction gives the {(variable, time)} slices of a
+    source; slices from older sources are replaced by those of newer ones,
+    and slices before expireBefore are removed. New items get their
+    statistics when calculateStatistics is set; when buildOverviews is set
+    and the mosaic dataset has overviews, those made stale by the update
+    are regenerated. Items added by this update are kept even when they
+    match no wanted slice, with a warning. Returns (added OIDs, number of
+    removed items).
+    '''
+    useVariable, useTime = _catalogFields(mosaicDataset)
+    sources = {}
+    for path in sourcePaths:
+        slices = slicesFunction(path)
+        slices = set([(variable if useVariable else None, time if useTime else None) for variable, time in slices])
+        sources[_normalizePath(path)] = (SourceModified(path), slices)
+
+    add, remove = PlanSync(CatalogItems(mosaicDataset, useVariable, useTime), sources, expireBefore)
+
+    # add the new slices before removing the old ones, so the mosaic dataset stays complete
+    added = []
+    if add:
+        arcpy.AddMessage("Adding " + str(len(add)) + " new or changed sources to " + mosaicDataset)
+        firstOID = _maxOID(mosaicDataset) + 1
+        arcpy.AddRastersToMosaicDataset_management(mosaicDataset, rasterType, ";".join(add), "UPDATE_CELL_SIZES",
+                                                   "UPDATE_BOUNDARY", "NO_OVERVIEWS", "", "0", "1500", "", "",
+                                                   "NO_SUBFOLDERS", "ALLOW_DUPLICATES", "NO_PYRAMIDS",
+                                                   "CALCULATE_STATISTICS" if calculateStatistics else "NO_STATISTICS",
+                                                   "NO_THUMBNAILS", "", "NO_FORCE_SPATIAL_REFERENCE")
+        whereClause = "Category = 1 AND OBJECTID >= " + str(firstOID)
+        paths = CatalogPaths(mosaicDataset, whereClause)
+        with arcpy.da.UpdateCursor(mosaicDataset, ["OID@", modifiedField], whereClause) as rows:
+            for row in rows:
+                source = sources.get(paths.get(row[0]))
+                row[1] = source[0] if source else None
+                rows.updateRow(row)
+                added.append(row[0])
+
+        # the added sources may hold superseded or expired slices too, but
+        # never remove what was just added: an added item that matches no
+        # wanted slice means slicesFunction doesn't describe the source the
+        # way the raster type catalogs it
+        items = CatalogItems(mosaicDataset, useVariable, useTime)
+        remove = PlanSync(items, sources, expireBefore)[1]
+        addedOIDs = set(added)
+        removeOIDs = set(remove)
+        unmatched = [item for item in items if item[0] in addedOIDs and item[0] in removeOIDs]
+        if unmatched:
+            arcpy.AddWarning(str(len(unmatched)) + " items added to " + mosaicDataset +
+                             " match no wanted slice of their source and are kept: " +
+                             ", ".join([str(oid) + " (" + str(variable) + ", " + str(time) + ")"
+                                        for oid, path, modified, variable, time in unmatched[:10]]) +
+                             (", ..." if len(unmatched) > 10 else ""))
+        remove = [oid for oid in remove if oid not in addedOIDs]
+
+    if remove:
+        arcpy.AddMessage("Removing " + str(len(remove)) + " changed, superseded or expired items from " + mosaicDataset)
+        _removeItems(mosaicDataset, remove)
+
+    if (add or remove) and buildOverviews and _hasOverviews(mosaicDataset):
+        arcpy.AddMessage("Regenerating stale overviews of " + mosaicDataset)
+        arcpy.BuildOverviews_management(mosaicDataset, "", "DEFINE_MISSING_TILES", "GENERATE_OVERVIEWS",
+                                        "GENERATE_MISSING_IMAGES", "REGENERATE_STALE_IMAGES")
+    if not add and not remove:
+        arcpy.AddMessage(mosaicDataset + " is up to date")
+
+    return added, len(remove)
@@ -0,0 +1,606 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of the dataset copy and the statistics kernels of the
+Multidimension Supplemental Tools, on synthetic data.
+
+CF compliant netCDF files of a configurable size are generated in a
+scratch folder: a gridded dataset with *variables* variables of
+``(time, lat, lon)`` and a discrete sampling geometry dataset of
+``timeSeries`` feature type. Run from the Scripts folder::
+
+    python -m mds.benchmark --rows 720 --columns 1440 --times 120 \\
+        --chunking map --output benchmark.json
+
+Each benchmark runs in a fresh worker process, so the peak memory reported
+is that of the benchmark alone. Wall times and peak memory are written to a
+JSON results file. Zonal statistics benchmarks import the zonal statistics
+tool, which needs arcpy. They are skipped when it is not available.
+"""
+import argparse
+import datetime
+import fnmatch
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import netCDF4
+import numpy
+import mds.constants
+import mds.math
+import mds.netcdf.dataset
+
+
+CHUNKINGS = ["contiguous", "map", "time_series"]
+"""
+Chunk layouts of the generated gridded dataset: a contiguous layout, or
+chunks as written by :py:meth:`mds.netcdf.Dataset.xcopy` for map or time
+series access.
+"""
+
+EPOCH = datetime.datetime(2000, 1, 1)
+
+FILL_VALUE = -9999.0
+
+
+def peak_memory():
+    """
+    Return the peak resident memory of this process in bytes, or None if it
+    cannot be determined.
+    """
+    if sys.platform == "win32":
+        import ctypes
+        import ctypes.wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", ctypes.wintypes.DWORD),
+                ("PageFaultCount", ctypes.wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(
+                ctypes.windll.kernel32.GetCurrentProcess(),
+                ctypes.byref(counters), counters.cb):
+            return None
+        return int(counters.PeakWorkingSetSize)
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, OS X bytes.
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def time_points(
+        nr_times,
+        time_step):
+    """
+    Return the *nr_times* datetimes of the generated datasets, *time_step*
+    hours apart.
+    """
+    return [EPOCH + datetime.timedelta(hours=time_step * index) for index in
+        xrange(nr_times)]
+
+
+def _create_time(
+        dataset,
+        nr_times,
+        time_step):
+    dataset.createDimension("time", nr_times)
+    variable = dataset.createVariable("time", "f8", ("time",))
+    variable.standard_name = "time"
+    variable.long_name = "time"
+    variable.units = "hours since 2000-01-01 00:00:00"
+    variable.calendar = "standard"
+    variable.axis = "T"
+    variable[:] = numpy.arange(nr_times) * float(time_step)
+
+
+def _random_values(
+        random,
+        shape,
+        nodata_fraction):
+    values = (280.0 + 10.0 * random.standard_normal(shape)).astype(
+        numpy.float32)
+    values[random.random_sample(shape) < nodata_fraction] = FILL_VALUE
+    return values
+
+
+def write_grid_dataset(
+        filename,
+        nr_rows,
+        nr_columns,
+        nr_times,
+        nr_variables,
+        chunking="contiguous",
+        time_step=6,
+        nodata_fraction=0.01,
+        seed=0,
+        block_size=mds.constants.COPY_BLOCK_SIZE):
+    """
+    Write a CF-1.6 gridded dataset to *filename* with *nr_variables* float32
+    variables ``variable_<index>(time, lat, lon)`` on a global grid of
+    *nr_rows* by *nr_columns* cells, *nr_times* time points *time_step*
+    hours apart.
+
+    *chunking* is one of :py:data:`CHUNKINGS`. A fraction *nodata_fraction*
+    of the values is the fill value. Values are written in blocks of at most
+    *block_size* bytes.
+    """
+    assert chunking in CHUNKINGS, chunking
+    random = numpy.random.RandomState(seed)
+    dataset = netCDF4.Dataset(filename, mode="w", clobber=True,
+        format="NETCDF4_CLASSIC")
+    try:
+        dataset.Conventions = "CF-1.6"
+        dataset.title = "Synthetic gridded dataset"
+        dataset.history = "Created by mds.benchmark"
+
+        _create_time(dataset, nr_times, time_step)
+
+        for name, length, start, units, axis in [
+                ("lat", nr_rows, -90.0, "degrees_north", "Y"),
+                ("lon", nr_columns, -180.0, "degrees_east", "X")]:
+            dataset.createDimension(name, length)
+            variable = dataset.createVariable(name, "f8", (name,))
+            variable.standard_name = "latitude" if axis == "Y" else \
+                "longitude"
+            variable.units = units
+            variable.axis = axis
+            cell_size = (180.0 if axis == "Y" else 360.0) / length
+            variable[:] = start + (numpy.arange(length) + 0.5) * cell_size
+
+        shape = (nr_times, nr_rows, nr_columns)
+        if chunking == "contiguous":
+            settings = {"contiguous": True}
+        else:
+            settings = {"chunksizes": mds.netcdf.dataset.chunk_shape(shape,
+                [1, 2], mds.constants.MAP_ACCESS if chunking == "map" else
+                    mds.constants.TIME_SERIES_ACCESS, 4)}
+
+        for index in xrange(nr_variables):
+            variable = dataset.createVariable("variable_{}".format(index),
+                "f4", ("time", "lat", "lon"), fill_value=FILL_VALUE,
+                **settings)
+            variable.long_name = "Synthetic variable {}".format(index)
+            variable.units = "K"
+            for block in mds.netcdf.dataset.copy_blocks(
+                    [(0, length) for length in shape], 4, block_size):
+                slices = tuple(slice(start, end) for start, end in block)
+                variable[slices] = _random_values(random,
+                    [end - start for start, end in block], nodata_fraction)
+    finally:
+        dataset.close()
+
+
+def write_discrete_dataset(
+        filename,
+        nr_stations,
+        nr_times,
+        nr_variables,
+        time_step=6,
+        nodata_fraction=0.01,
+        seed=0):
+    """
+    Write a CF-1.6 discrete sampling geometry dataset of ``timeSeries``
+    feature type to *filename*, in the orthogonal multidimensional array
+    representation, with *nr_variables* float32 variables
+    ``variable_<index>(time, station)`` at *nr_stations* random stations.
+    """
+    random = numpy.random.RandomState(seed)
+    dataset = netCDF4.Dataset(filename, mode="w", clobber=True,
+        format="NETCDF4_CLASSIC")
+    try:
+        dataset.Conventions = "CF-1.6"
+        dataset.featureType = "timeSeries"
+        dataset.title = "Synthetic time series dataset"
+        dataset.history = "Created by mds.benchmark"
+
+        _create_time(dataset, nr_times, time_step)
+
+        dataset.createDimension("station", nr_stations)
+        variable = dataset.createVariable("station_id", "i4", ("station",))
+        variable.long_name = "station id"
+        variable.cf_role = "timeseries_id"
+        variable[:] = numpy.arange(nr_stations)
+        for name, extent, units, axis in [
+                ("lat", 90.0, "degrees_north", "Y"),
+                ("lon", 180.0, "degrees_east", "X")]:
+            variable = dataset.createVariable(name, "f8", ("station",))
+            variable.standard_name = "latitude" if axis == "Y" else \
+                "longitude"
+            variable.units = units
+            variable.axis = axis
+            variable[:] = random.uniform(-extent, extent, nr_stations)
+
+        for index in xrange(nr_variables):
+            variable = dataset.createVariable("variable_{}".format(index),
+                "f4", ("time", "station"), fill_value=FILL_VALUE)
+            variable.long_name = "Synthetic variable {}".format(index)
+            variable.units = "K"
+            variable.coordinates = "time lat lon"
+            variable[:] = _random_values(random, (nr_times, nr_stations),
+                nodata_fraction)
+    finally:
+        dataset.close()
+
+
+def grid_zones(
+        nr_rows,
+        nr_columns,
+        zone_size):
+    """
+    Return a zone array of *nr_rows* by *nr_columns* cells with square zones
+    of *zone_size* cells, numbered from 1.
+    """
+    nr_zone_columns = (nr_columns + zone_size - 1) // zone_size
+    rows = numpy.arange(nr_rows).reshape(-1, 1) // zone_size
+    columns = numpy.arange(nr_columns).reshape(1, -1) // zone_size
+    return (rows * nr_zone_columns + columns + 1).astype(numpy.int32)
+
+
+def station_zones(
+        nr_stations,
+        nr_zones,
+        seed=0):
+    """
+    Return a dictionary with the station indices in each of *nr_zones*
+    zones, numbered from 1, of *nr_stations* randomly assigned stations.
+    """
+    zone = numpy.random.RandomState(seed).randint(1, nr_zones + 1,
+        nr_stations)
+    return dict((int(value), numpy.flatnonzero(zone == value).tolist())
+        for value in numpy.unique(zone))
+
+
+def _zonal_tool():
+    from mds.tools.multidimensional_zonal_statistics_as_table import \
+        MultidimensionalZonalStatisticsAsTable
+    return MultidimensionalZonalStatisticsAsTable()
+
+
+def _open(
+        filename):
+    return mds.netcdf.Dataset(filename, filter_out_nd_coordinates=True)
+
+
+def central_extent(
+        extent,
+        fraction=0.9):
+    """
+    Return the central *fraction* of *extent* ([x_min, y_min, x_max,
+    y_max]) along each axis.
+    """
+    x_min, y_min, x_max, y_max = [float(value) for value in extent]
+    x_margin = (x_max - x_min) * (1.0 - fraction) / 2.0
+    y_margin = (y_max - y_min) * (1.0 - fraction) / 2.0
+    return [x_min + x_margin, y_min + y_margin, x_max - x_margin,
+        y_max - y_margin]
+
+
+def _xcopy(
+        settings,
+        **keywords):
+    # The copy is subset spatially, so it always goes through the block
+    # copy instead of the byte for byte copy of an unchanged file.
+    def setup():
+        dataset = _open(settings["grid_filename"])
+        variable_names = list(dataset.data_variable_names())
+        return dataset, variable_names, central_extent(dataset.extent(
+            variable_names[0]))
+
+    def run(state):
+        dataset, variable_names, extent = state
+        output_filename = os.path.join(settings["workspace"], "xcopy.nc")
+        dataset.xcopy(variable_names, output_filename, extent=extent,
+            block_size=settings["block_size"], **keywords)
+        os.remove(output_filename)
+
+    return setup, run
+
+
+def _aggregate(
+        settings,
+        statistic,
+        time_interval):
+    def setup():
+        dataset = _open(settings["grid_filename"])
+        values = [dataset.variable(name)[:] for name in
+            dataset.data_variable_names()]
+        time = time_points(len(values[0]), settings["time_step"])
+        return time, values
+
+    def run(state):
+        time, values = state
+        aggregator = mds.math.aggregator(
+            mds.constants.STATISTICS_TYPES[statistic],
+            mds.constants.TIME_INTERVALS[time_interval])
+        aggregator(time, [numpy.ma.getdata(value) for value in values],
+            mds.constants.TIME_INTERVALS[time_interval],
+            mds.constants.DONT_IGNORE_NODATA, FILL_VALUE)
+
+    return setup, run
+
+
+def _zonal_grid(
+        settings,
+        statistic):
+    def setup():
+        dataset = _open(settings["grid_filename"])
+        variable = dataset.variable("variable_0")
+        arr_zone = grid_zones(variable.shape[1], variable.shape[2],
+            settings["zone_size"])
+        return dataset, _zonal_tool(), variable, arr_zone
+
+    def run(state):
+        dataset, tool, variable, arr_zone = state
+        tool.zone_statistics_for_grid(variable, arr_zone,
+            numpy.unique(arr_zone), [0], statistic,
+            tool.statistic_names(statistic), True, False)
+
+    return setup, run
+
+
+def _zonal_discrete(
+        settings,
+        statistic):
+    def setup():
+        dataset = _open(settings["discrete_filename"])
+        variable = dataset.variable("variable_0")
+        zone_stations = station_zones(variable.shape[1], settings["zones"])
+        return dataset, _zonal_tool(), variable, zone_stations
+
+    def run(state):
+        dataset, tool, variable, zone_stations = state
+        for result in tool.zone_statistics_for_discrete(variable,
+                zone_stations, 1, statistic, True, False):
+            pass
+
+    return setup, run
+
+
+def _statistic_over_dimension(
+        settings,
+        statistic):
+    def setup():
+        # Keep the dataset referenced. It closes its file when collected.
+        dataset = _open(settings["grid_filename"])
+        return dataset, dataset.variable("variable_0")
+
+    def run(state):
+        dataset, variable = state
+        mds.math.statistic_over_dimension(variable, 0, statistic,
+            settings["block_size"])
+
+    return setup, run
+
+
+def benchmarks(
+        settings):
+    """
+    Return an ordered list of ``(name, function, arguments)`` of the
+    benchmarks for *settings*. Calling *function* with *settings* and
+    *arguments* returns a *setup* function and a *run* function, which is
+    timed with the result of *setup*.
+    """
+    result = [
+        ("xcopy", _xcopy, {}),
+        ("xcopy_zlib", _xcopy, {"zlib": True}),
+        ("xcopy_time_series", _xcopy, {
+            "chunk_layout": mds.constants.TIME_SERIES_ACCESS})]
+    for statistic in settings["statistics"]:
+        for time_interval in ["DAY", "MONTH OF YEAR"]:
+            result.append(("aggregate_{}_{}".format(statistic, time_interval)
+                .lower().replace(" ", "_"), _aggregate,
+                    {"statistic": statistic, "time_interval": time_interval}))
+    for statistic in settings["zonal_statistics"]:
+        result.append(("zonal_grid_{}".format(statistic.lower()),
+            _zonal_grid, {"statistic": statistic}))
+        result.append(("zonal_discrete_{}".format(statistic.lower()),
+            _zonal_discrete, {"statistic": statistic}))
+    for statistic in settings["statistics"]:
+        statistic = {"RANGE": "ptp"}.get(statistic, statistic.lower())
+        result.append(("statistic_over_dimension_{}".format(statistic),
+            _statistic_over_dimension, {"statistic": statistic}))
+    return result
+
+
+def run_benchmark(
+        settings,
+        name,
+        repeat):
+    """
+    Run benchmark *name* *repeat* times and return a dictionary with its
+    setup time, wall times (seconds) and peak memory (bytes), or the error
+    that stopped it.
+    """
+    function, arguments = [(function, arguments) for name_, function,
+        arguments in benchmarks(settings) if name_ == name][0]
+    result = {"name": name}
+    try:
+        start = time.time()
+        setup, run = function(settings, **arguments)
+        state = setup()
+        result["setup_seconds"] = time.time() - start
+        result["peak_memory_after_setup"] = peak_memory()
+        result["seconds"] = []
+        for index in xrange(repeat):
+            start = time.time()
+            run(state)
+            result["seconds"].append(time.time() - start)
+        result["best_seconds"] = min(result["seconds"])
+        result["peak_memory"] = peak_memory()
+    except ImportError as exception:
+        result["skipped"] = str(exception)
+    return result
+
+
+def _run_in_worker(
+        arguments):
+    return run_benchmark(*arguments)
+
+
+def environment():
+    """
+    Return a dictionary describing the software the benchmarks ran with.
+    """
+    return {
+        "python": sys.version,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "numpy": numpy.__version__,
+        "netCDF4": netCDF4.__version__,
+        "netcdf_library": getattr(netCDF4, "__netcdf4libversion__", None),
+        "hdf5_library": getattr(netCDF4, "__hdf5libversion__", None)
+    }
+
+
+def run_benchmarks(
+        settings,
+        patterns=["*"],
+        repeat=3,
+        isolate=True):
+    """
+    Generate the datasets of *settings* and run the benchmarks whose name
+    matches one of the shell style *patterns* *repeat* times. Returns a list
+    with a result per benchmark (see :py:func:`run_benchmark`).
+
+    If *isolate* is ``True``, each benchmark runs in its own worker
+    process, so its peak memory is not affected by the benchmarks before
+    it.
+    """
+    names = [name for name, function, arguments in benchmarks(settings) if
+        any(fnmatch.fnmatch(name, pattern) for pattern in patterns)]
+
+    start = time.time()
+    write_grid_dataset(settings["grid_filename"], settings["rows"],
+        settings["columns"], settings["times"], settings["variables"],
+        settings["chunking"], settings["time_step"],
+        block_size=settings["block_size"])
+    write_discrete_dataset(settings["discrete_filename"],
+        settings["stations"], settings["times"], settings["variables"],
+        settings["time_step"])
+    print("Generated datasets in {:.2f} s".format(time.time() - start))
+
+    results = []
+    for name in names:
+        if isolate:
+            pool = multiprocessing.Pool(1)
+            try:
+                result = pool.apply(_run_in_worker, ((settings, name,
+                    repeat),))
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            result = run_benchmark(settings, name, repeat)
+        if "skipped" in result:
+            print("{}: skipped ({})".format(name, result["skipped"]))
+        else:
+            print("{}: {:.3f} s".format(name, result["best_seconds"]))
+        results.append(result)
+    return results
+
+
+def parse_arguments(
+        arguments):
+    parser = argparse.ArgumentParser(description="Benchmark the "
+        "Multidimension Supplemental Tools on synthetic netCDF data.")
+    parser.add_argument("--rows", type=int, default=180,
+        help="number of rows of the grid")
+    parser.add_argument("--columns", type=int, default=360,
+        help="number of columns of the grid")
+    parser.add_argument("--times", type=int, default=240,
+        help="number of time points")
+    parser.add_argument("--time-step", type=int, default=6,
+        help="hours between time points")
+    parser.add_argument("--variables", type=int, default=2,
+        help="number of data variables")
+    parser.add_argument("--chunking", choices=CHUNKINGS,
+        default="contiguous", help="chunk layout of the gridded dataset")
+    parser.add_argument("--stations", type=int, default=1000,
+        help="number of stations of the time series dataset")
+    parser.add_argument("--zone-size", type=int, default=15,
+        help="side of the square grid zones in cells")
+    parser.add_argument("--zones", type=int, default=20,
+        help="number of station zones")
+    parser.add_argument("--statistics", nargs="+", default=["MEAN", "MAX"],
+        choices=sorted(mds.constants.STATISTICS_TYPES.keys()),
+        help="time interval and over dimension statistics")
+    parser.add_argument("--zonal-statistics", nargs="+",
+        default=["MEAN", "ALL_FLOAT"], help="zonal statistics")
+    parser.add_argument("--block-size", type=int,
+        default=mds.constants.COPY_BLOCK_SIZE,
+        help="bytes read at once by the copy and over dimension statistics")
+    parser.add_argument("--benchmarks", nargs="+", default=["*"],
+        help="shell style patterns of the benchmarks to run")
+    parser.add_argument("--repeat", type=int, default=3,
+        help="number of timed runs per benchmark")
+    parser.add_argument("--no-isolate", action="store_true",
+        help="run all benchmarks in this process")
+    parser.add_argument("--workspace",
+        help="folder for the datasets, a temporary folder by default")
+    parser.add_argument("--output", default="benchmark.json",
+        help="JSON results file")
+    return parser.parse_args(arguments)
+
+
+def main(
+        arguments=None):
+    arguments = parse_arguments(arguments)
+
+    workspace = arguments.workspace or tempfile.mkdtemp(prefix="mds_")
+    if not os.path.isdir(workspace):
+        os.makedirs(workspace)
+
+    settings = {
+        "rows": arguments.rows,
+        "columns": arguments.columns,
+        "times": arguments.times,
+        "time_step": arguments.time_step,
+        "variables": arguments.variables,
+        "chunking": arguments.chunking,
+        "stations": arguments.stations,
+        "zone_size": arguments.zone_size,
+        "zones": arguments.zones,
+        "statistics": arguments.statistics,
+        "zonal_statistics": arguments.zonal_statistics,
+        "block_size": arguments.block_size,
+        "workspace": workspace,
+        "grid_filename": os.path.join(workspace, "grid.nc"),
+        "discrete_filename": os.path.join(workspace, "stations.nc")
+    }
+
+    try:
+        results = run_benchmarks(settings, arguments.benchmarks,
+            arguments.repeat, not arguments.no_isolate)
+    finally:
+        if not arguments.workspace:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    with open(arguments.output, "w") as file_:
+        json.dump({
+            "date": datetime.datetime.now().isoformat(),
+            "environment": environment(),
+            "settings": settings,
+            "results": results
+        }, file_, indent=2, sort_keys=True)
+    print("Results written to {}".format(arguments.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -90,3 +90,30 @@ OVER_TIME_INTERVALS = [
 IGNORE_NODATA, DONT_IGNORE_NODATA = (
     mds.keyword.Keyword(*enum) for enum in enumerate([
         "IGNORE_NODATA", "DONT_IGNORE_NODATA"]))
+
+
+# Keyword constants. Each keyword has a unique name and id.
+MAP_ACCESS, TIME_SERIES_ACCESS = (
+    mds.keyword.Keyword(*enum) for enum in enumerate([
+        "MAP", "TIME_SERIES"]))
+
+CHUNK_LAYOUTS = mds.keywords.Keywords([
+    MAP_ACCESS,
+    TIME_SERIES_ACCESS
+])
+"""
+Output chunk layouts supported when copying datasets. *MAP* favors reading
+whole spatial slices, *TIME_SERIES* favors reading all values over the
+non-spatial dimensions at a location.
+"""
+
+COPY_BLOCK_SIZE = 64 * 1024 * 1024
+"""
+Maximum number of bytes of a variable read and written at once when copying
+datasets.
+"""
+
+CHUNK_SIZE = 4 * 1024 * 1024
+"""
+Target number of bytes of an output chunk when a chunk layout is requested.
+"""
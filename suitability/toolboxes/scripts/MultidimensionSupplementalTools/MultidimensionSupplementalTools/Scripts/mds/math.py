@@ -781,3 +781,127 @@ def aggregator(
 
     assert result
     return result
+
+
+class RunningStatistics(object):
+    """
+    Accumulate statistics of masked values block by block along one axis.
+
+    Per cell of the remaining axes, the count, sum, minimum and maximum are
+    kept, as well as the mean and the sum of squared differences from the
+    mean. The latter two are combined per block with the parallel form of
+    Welford's algorithm (Chan et al.), so the variance stays accurate for
+    long series with a large mean. Masked values are ignored.
+    """
+
+    STATISTICS = ["count", "max", "mean", "min", "ptp", "std", "sum", "var"]
+    """
+    Names of the statistics supported, named like the numpy.ma functions.
+    """
+
+    def __init__(self):
+        self.count = None
+        self.sum = None
+        self.minimum = None
+        self.maximum = None
+        self.average = None
+        self.m2 = None
+
+    def update(self,
+            values,
+            axis):
+        """
+        Add the (masked) *values* of a block along *axis*.
+        """
+        values = numpy.ma.asarray(values)
+        floats = values.astype(numpy.float64)
+        count = numpy.ma.count(values, axis)
+        total = numpy.ma.filled(floats.sum(axis), 0.0)
+        minimum = numpy.ma.filled(floats.min(axis), numpy.inf)
+        maximum = numpy.ma.filled(floats.max(axis), -numpy.inf)
+
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            average = numpy.where(count > 0, total / count, 0.0)
+        m2 = numpy.ma.filled(((floats - numpy.expand_dims(average, axis)) **
+            2).sum(axis), 0.0)
+
+        if self.count is None:
+            self.count = count
+            self.sum = total
+            self.minimum = minimum
+            self.maximum = maximum
+            self.average = average
+            self.m2 = m2
+            return
+
+        new_count = self.count + count
+        delta = average - self.average
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            weight = numpy.where(new_count > 0, count / new_count.astype(
+                numpy.float64), 0.0)
+        self.average = self.average + delta * weight
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * weight
+        self.count = new_count
+        self.sum = self.sum + total
+        self.minimum = numpy.minimum(self.minimum, minimum)
+        self.maximum = numpy.maximum(self.maximum, maximum)
+
+    def result(self,
+            statistic):
+        """
+        Return *statistic* (one of :py:attr:`STATISTICS`) as a masked array.
+        Cells without values are masked. The variance is the population
+        variance, like numpy.ma.var.
+        """
+        assert statistic in RunningStatistics.STATISTICS, statistic
+        assert self.count is not None, "no values added"
+
+        empty = self.count == 0
+        if statistic == "count":
+            return numpy.ma.asarray(self.count)
+        elif statistic == "max":
+            return numpy.ma.masked_where(empty, self.maximum)
+        elif statistic == "min":
+            return numpy.ma.masked_where(empty, self.minimum)
+        elif statistic == "ptp":
+            return numpy.ma.masked_where(empty, self.maximum - self.minimum)
+        elif statistic == "sum":
+            return numpy.ma.masked_where(empty, self.sum)
+        elif statistic == "mean":
+            return numpy.ma.masked_where(empty, self.average)
+
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            variance = numpy.where(empty, 0.0, self.m2 / numpy.maximum(
+                self.count, 1))
+        if statistic == "std":
+            return numpy.ma.masked_where(empty, numpy.sqrt(variance))
+        return numpy.ma.masked_where(empty, variance)
+
+
+def statistic_over_dimension(
+        variable,
+        axis,
+        statistic,
+        block_size=mds.constants.COPY_BLOCK_SIZE):
+    """
+    Return *statistic* of *variable* over *axis*, reading *variable* in
+    blocks of at most *block_size* bytes along *axis*.
+
+    *variable* can be anything that can be sliced like a numpy array, like a
+    netCDF4 variable. *statistic* is one of
+    :py:attr:`RunningStatistics.STATISTICS`. Only one block and the running
+    statistics for the other axes are in memory at any time.
+    """
+    shape = variable.shape
+    assert 0 <= axis < len(shape)
+    slice_size = variable.dtype.itemsize * int(numpy.prod([length for
+        dimension, length in enumerate(shape) if dimension != axis]))
+    nr_rows = max(1, block_size // max(1, slice_size))
+
+    statistics = RunningStatistics()
+    for start in xrange(0, shape[axis], nr_rows):
+        slices = [slice(None)] * len(shape)
+        slices[axis] = slice(start, min(start + nr_rows, shape[axis]))
+        statistics.update(variable[tuple(slices)], axis)
+
+    return statistics.result(statistic)
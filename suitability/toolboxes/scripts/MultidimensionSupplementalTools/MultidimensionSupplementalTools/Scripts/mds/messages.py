@@ -22,6 +22,9 @@ VARIABLES_MUST_SHARE_DIMENSIONS = \
 
 OUTPUT_FILE_EXTENSION_MUST_BE_NC = \
     "Output netCDF File: Output file extension must be .nc."
+OUTPUT_FILE_EXTENSION_MUST_BE_TABLE = \
+    "Output Table: Output must be a geodatabase table or a file with a " \
+    ".dbf, .csv, .nc or .parquet extension."
 
 DIMENSION_NOT_PRESENT = \
     "Dimensions: Dimension {} not present in selected variable(s)."
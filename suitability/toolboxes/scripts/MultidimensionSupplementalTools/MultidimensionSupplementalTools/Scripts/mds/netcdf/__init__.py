@@ -5,4 +5,5 @@ Sub-package with code handling netcdf datasets.
 import dataset
 from operations import *
 from dataset import *
+from pool import *
 from date_time import *
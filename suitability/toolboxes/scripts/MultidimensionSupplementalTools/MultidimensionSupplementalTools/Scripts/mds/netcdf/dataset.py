@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import os.path
+import shutil
 import netCDF4
 import mds.constants
 # import mds.date_time
@@ -7,6 +9,112 @@ import mds.math
 import mds.netcdf.convention
 
 
+def file_signature(
+        name):
+    """
+    Return the modification time and size of file *name*, or None if *name*
+    is not a local file (an OPeNDAP URL, for example).
+    """
+    if not os.path.isfile(name):
+        return None
+    status = os.stat(name)
+    return status.st_mtime, status.st_size
+
+
+def _product(
+        values):
+    result = 1
+    for value in values:
+        result *= value
+    return result
+
+
+def copy_blocks(
+        ranges,
+        item_size,
+        block_size=mds.constants.COPY_BLOCK_SIZE,
+        chunk_shape=None):
+    """
+    Generate the blocks in which to copy the hyperslab *ranges*.
+
+    *ranges* is a sequence with a ``(start, end)`` index range per dimension.
+    Each block generated is a tuple with a ``(start, end)`` range per
+    dimension. Blocks are cut along the slowest varying (first) dimension and
+    hold at most *block_size* bytes of *item_size* bytes values, unless a
+    single value along the last dimension is already larger. If one index
+    along the first dimension holds more than *block_size* bytes, blocks are
+    cut along the next dimension too.
+
+    If the source is chunked, *chunk_shape* is its chunk shape. When a block
+    holds at least a chunk's length along the first dimension, block
+    boundaries along that dimension are aligned to chunk boundaries, so
+    blocks do not share chunks. Otherwise a chunk may be decoded once per
+    block it overlaps: when blocks are cut along inner dimensions while a
+    chunk spans several indices along the first dimension, or when fewer
+    rows than a chunk's length fit in *block_size*.
+    """
+    ranges = [tuple(range_) for range_ in ranges]
+    if not ranges:
+        yield ()
+        return
+    if any(start >= end for start, end in ranges):
+        return
+
+    start, end = ranges[0]
+    inner_size = item_size * _product(end_ - start_ for start_, end_ in
+        ranges[1:])
+
+    if inner_size > block_size and len(ranges) > 1:
+        inner_chunk_shape = chunk_shape[1:] if chunk_shape else None
+        for index in range(start, end):
+            for block in copy_blocks(ranges[1:], item_size, block_size,
+                    inner_chunk_shape):
+                yield ((index, index + 1),) + block
+        return
+
+    nr_rows = max(1, block_size // max(1, inner_size))
+    if chunk_shape and nr_rows >= chunk_shape[0]:
+        nr_rows -= nr_rows % chunk_shape[0]
+
+    first = start
+    while first < end:
+        last = min(end, (first // nr_rows + 1) * nr_rows)
+        yield ((first, last),) + tuple(ranges[1:])
+        first = last
+
+
+def chunk_shape(
+        shape,
+        space_axes,
+        chunk_layout,
+        item_size,
+        chunk_size=mds.constants.CHUNK_SIZE):
+    """
+    Return the output chunk shape of a variable with *shape* and spatial
+    dimensions at *space_axes* for access pattern *chunk_layout*.
+
+    With :py:data:`mds.MAP_ACCESS` a chunk holds a whole spatial slice at
+    one position along the other dimensions. With
+    :py:data:`mds.TIME_SERIES_ACCESS` a chunk holds all values along the
+    other dimensions for a square block of locations. In both cases the
+    spatial sides are halved until the chunk holds at most *chunk_size*
+    bytes.
+    """
+    assert chunk_layout in mds.constants.CHUNK_LAYOUTS.values()
+    chunks = [max(1, length) for length in shape]
+
+    if chunk_layout == mds.constants.MAP_ACCESS:
+        chunks = [length if axis in space_axes else 1 for axis, length in
+            enumerate(chunks)]
+
+    while _product(chunks) * item_size > chunk_size and \
+            any(chunks[axis] > 1 for axis in space_axes):
+        for axis in space_axes:
+            chunks[axis] = max(1, (chunks[axis] + 1) // 2)
+
+    return chunks
+
+
 class Dataset(object):
     """
     Constructs an instance based on a *name* and an optional default
@@ -18,6 +126,13 @@ class Dataset(object):
     favor_convention_class
         See :py:func:`mds.netcdf.convention.select_convention`.
 
+    Results of convention queries (data variables, dimensions, coordinates,
+    extents) are computed once per open file and cached. An open dataset
+    does not notice when its file changes on disk, and it is never reopened
+    in place, so variables obtained from it stay valid. The
+    :py:class:`mds.netcdf.DatasetPool` checks the file and opens a new
+    dataset when it changed.
+
     This class is implemented using `netCDF4.Dataset <http://netcdf4-python.googlecode.com/svn/trunk/docs/netCDF4.Dataset-class.html>`_ from the
     `netcdf4-python package <https://code.google.com/p/netcdf4-python/>`_.
     If you need functionality that isn't available in this class' interface,
@@ -40,9 +155,40 @@ class Dataset(object):
         if self.convention is None:
             raise RuntimeError("Convention rules are not implemented")
 
+        self.metadata = {}
+
+    def memoized(self,
+            key,
+            function,
+            *arguments):
+        """
+        Return the result of calling *function* with *arguments*, computing
+        it only once per open file. Results are stored under *key*.
+
+        Mutable results are copied, so callers can change them without
+        affecting the cache.
+        """
+        if key not in self.metadata:
+            self.metadata[key] = function(*arguments)
+        result = self.metadata[key]
+        if isinstance(result, mds.ordered_set.OrderedSet):
+            result = mds.ordered_set.OrderedSet(result)
+        elif isinstance(result, list):
+            result = list(result)
+        elif isinstance(result, dict):
+            result = dict(result)
+        return result
+
     def __del__(self):
-        if hasattr(self, "dataset"):
+        self.close()
+
+    def close(self):
+        """
+        Close the layered dataset. Closing a closed dataset has no effect.
+        """
+        if getattr(self, "dataset", None) is not None:
             self.dataset.close()
+            self.dataset = None
 
     # Revamp when necessary.
     # def __enter__(self):
@@ -116,19 +262,22 @@ class Dataset(object):
         Return an :py:class:`mds.ordered_set.OrderedSet` with the names of the
         data variables.
         """
-        return self.convention.data_variable_names()
+        return self.memoized("data_variable_names",
+            self.convention.data_variable_names)
 
     def spatial_data_variable_names(self):
         """
         Return an OrderedSet with the names of the spatial data variables.
         """
-        return self.convention.spatial_data_variable_names()
+        return self.memoized("spatial_data_variable_names",
+            self.convention.spatial_data_variable_names)
 
     def temporal_data_variable_names(self):
         """
         Return an OrderedSet with the names of the temporal data variables.
         """
-        return self.convention.temporal_data_variable_names()
+        return self.memoized("temporal_data_variable_names",
+            self.convention.temporal_data_variable_names)
 
     def variable_dimension_names(self,
             variable_name):
@@ -148,7 +297,8 @@ class Dataset(object):
         Return an OrderedSet with the names of *variable_name*'s spatial
         dimensions.
         """
-        return self.convention.space_dimension_names(variable_name)
+        return self.memoized(("space_dimension_names", variable_name),
+            self.convention.space_dimension_names, variable_name)
 
     def non_space_dimension_names(self,
             variable_name):
@@ -157,8 +307,7 @@ class Dataset(object):
         dimensions.
         """
         dimension_names = self.variable_dimension_names(variable_name)
-        space_dimension_names = self.convention.space_dimension_names(
-            variable_name)
+        space_dimension_names = self.space_dimension_names(variable_name)
         return tuple(name for name in dimension_names if not name in
             space_dimension_names)
 
@@ -168,7 +317,8 @@ class Dataset(object):
         Return an OrderedSet with the names of *variable_name*'s temporal
         dimensions.
         """
-        return self.convention.time_dimension_names(variable_name)
+        return self.memoized(("time_dimension_names", variable_name),
+            self.convention.time_dimension_names, variable_name)
 
     def is_spatial_variable(self,
             variable_name):
@@ -178,14 +328,16 @@ class Dataset(object):
         A variable is considered spatial if it has two dimensions representing
         the x and y dimensions.
         """
-        return self.convention.is_spatial_variable(variable_name)
+        return self.memoized(("is_spatial_variable", variable_name),
+            self.convention.is_spatial_variable, variable_name)
 
     def is_temporal_variable(self,
             variable_name):
         """
         Return whether variable *variable_name* is temporal.
         """
-        return self.convention.is_temporal_variable(variable_name)
+        return self.memoized(("is_temporal_variable", variable_name),
+            self.convention.is_temporal_variable, variable_name)
 
     def compatible_data_variable_names(self,
             variable_name):
@@ -195,11 +347,14 @@ class Dataset(object):
 
         See also :py:meth:`.convention.Convention.compatible_data_variable_names`.
         """
-        return self.convention.compatible_data_variable_names(variable_name)
+        return self.memoized(("compatible_data_variable_names",
+            variable_name), self.convention.compatible_data_variable_names,
+                variable_name)
 
     def dependent_variable_names(self,
             variable_name):
-        return self.convention.dependent_variable_names(variable_name)
+        return self.memoized(("dependent_variable_names", variable_name),
+            self.convention.dependent_variable_names, variable_name)
 
     def extent(self,
             variable_name):
@@ -208,12 +363,18 @@ class Dataset(object):
 
         The result is a list with four values: ``[x_min, y_min, x_max, y_max]``.
         """
-        return self.convention.extent(variable_name)
+        return self.memoized(("extent", variable_name),
+            self.convention.extent, variable_name)
 
     def spatial_dimension_slices(self,
             variable_name,
             extent):
-        return self.convention.spatial_dimension_slices(variable_name, extent)
+        # The extent may hold numpy scalars or 0-d masked arrays (as returned
+        # by netCDF4), which are not hashable.
+        return self.memoized(("spatial_dimension_slices", variable_name,
+            tuple(float(value) for value in extent)),
+                self.convention.spatial_dimension_slices, variable_name,
+                    extent)
 
     def dimension_slice(self,
             dimension_name,
@@ -257,7 +418,12 @@ class Dataset(object):
             extent=None,
             dimension_selections=[],
             value_selection_method=mds.constants.SELECT_BY_VALUE,
-            history_message=None):
+            history_message=None,
+            zlib=None,
+            complevel=4,
+            shuffle=True,
+            chunk_layout=None,
+            block_size=mds.constants.COPY_BLOCK_SIZE):
         """
         Copy the variables *variable_names* from the layered dataset to a
         netCDF file named *output_filename*, honoring the spatial *extent* and
@@ -280,12 +446,37 @@ class Dataset(object):
         The *history_message* is written to the netCDF file. The value is
         appended to the value of the global history attribute. If no value is
         passed, the history attribute, if present, is not changed.
+
+        Variables are copied in blocks of at most *block_size* bytes (see
+        :py:func:`copy_blocks`), so the selected hyperslab never has to fit
+        in memory.
+
+        If *zlib* is ``True``, variables are deflated with compression level
+        *complevel* (1-9), using the *shuffle* filter. If *zlib* is ``False``,
+        variables are not compressed. If *zlib* is ``None``, the compression
+        settings of the source variables are kept.
+
+        *chunk_layout* may be one of the :py:data:`mds.CHUNK_LAYOUTS`. Spatial
+        data variables are then chunked for map or time series access (see
+        :py:func:`chunk_shape`). Otherwise the chunk shape of source variables
+        that are not subset is kept.
+
+        Compression and chunking need the netCDF-4 format. When they are
+        requested for a netCDF-3 source, the output is written as
+        ``NETCDF4_CLASSIC``.
+
+        If nothing is subset, compressed or rechunked and the copy would hold
+        all variables of a local file, the file is copied as is, without
+        decoding any values.
         """
         assert len(variable_names) > 0
         assert all([variable_name in self.data_variable_names() for
             variable_name in variable_names])
+        assert chunk_layout is None or \
+            chunk_layout in mds.constants.CHUNK_LAYOUTS.values()
 
         variable_names = list(variable_names)
+        data_variable_names = set(variable_names)
         first_spatial_variable_name = next((variable_name for variable_name in
             variable_names if self.is_spatial_variable(variable_name)),
             None)
@@ -301,24 +492,6 @@ class Dataset(object):
         if dimension_selections is None:
             dimension_selections = []
 
-        # Create target dataset with same format as source.
-        new_dataset = netCDF4.Dataset(output_filename, mode="w",
-            clobber=True, format=self.dataset.file_format)
-
-        # Copy global attributes.
-        for attribute_name in self.dataset.ncattrs():
-            new_dataset.setncattr(attribute_name, self.dataset.getncattr(
-                attribute_name))
-
-        if history_message is not None:
-            history_messages = []
-            if "history" in new_dataset.ncattrs():
-                history_messages = new_dataset.history.split("\n")
-            history_messages.append(history_message)
-            new_dataset.history = "\n".join(history_messages)
-
-        new_dataset.Source_Software = "Esri ArcGIS"
-
         # List of lists with dependent variables.
         dependent_variable_names = [self.dependent_variable_names(
             variable_name) for variable_name in variable_names]
@@ -377,6 +550,45 @@ class Dataset(object):
         variable_names = list(mds.ordered_set.order(set(variable_names),
             self.variable_names()))
 
+        subset_dimension_names = set(dimension_name for dimension_name in
+            dimension_names if dimension_slices[dimension_name] !=
+                (0, len(self.dataset.dimensions[dimension_name])))
+        copied_variable_names = set(variable_names) | set(dimension_name for
+            dimension_name in dimension_names if dimension_name in
+                self.dataset.variables)
+
+        if not subset_dimension_names and zlib is None and \
+                chunk_layout is None and \
+                copied_variable_names == set(self.variable_names()) and \
+                os.path.isfile(self.name) and \
+                os.path.abspath(self.name) != os.path.abspath(output_filename):
+            # Fast path: the output is the source file, copy it byte for byte
+            # and only update the global attributes.
+            shutil.copyfile(self.name, output_filename)
+            new_dataset = netCDF4.Dataset(output_filename, mode="a")
+            self._update_history(new_dataset, history_message)
+            new_dataset.close()
+            return
+
+        file_format = self.dataset.file_format
+        if (zlib or chunk_layout is not None) and \
+                not file_format.startswith("NETCDF4"):
+            # Compression and chunking are netCDF-4 features.
+            file_format = "NETCDF4_CLASSIC"
+        source_is_netcdf4 = self.dataset.file_format.startswith("NETCDF4")
+        target_is_netcdf4 = file_format.startswith("NETCDF4")
+
+        # Create target dataset with same format as source.
+        new_dataset = netCDF4.Dataset(output_filename, mode="w",
+            clobber=True, format=file_format)
+
+        # Copy global attributes.
+        for attribute_name in self.dataset.ncattrs():
+            new_dataset.setncattr(attribute_name, self.dataset.getncattr(
+                attribute_name))
+
+        self._update_history(new_dataset, history_message)
+
         # Copy dimensions.
         for dimension_name in dimension_names:
             new_dataset.createDimension(dimension_name,
@@ -384,14 +596,64 @@ class Dataset(object):
                     dimension_slices[dimension_name][0] if not
                         self.dimension(dimension_name).isunlimited() else None)
 
+        def source_chunk_shape(
+                variable):
+            if not source_is_netcdf4:
+                return None
+            chunking = variable.chunking()
+            return None if chunking == "contiguous" else list(chunking)
+
+        def storage_settings(
+                variable,
+                variable_name):
+            # Compression and chunking keyword arguments for createVariable.
+            settings = {}
+            if not target_is_netcdf4 or not variable.dimensions:
+                return settings
+
+            if zlib is None:
+                filters = variable.filters() if source_is_netcdf4 else None
+                if filters and filters.get("zlib"):
+                    settings.update(zlib=True, complevel=filters["complevel"],
+                        shuffle=filters["shuffle"])
+            elif zlib:
+                settings.update(zlib=True, complevel=complevel,
+                    shuffle=shuffle)
+
+            shape = [dimension_slices[dimension_name][1] -
+                dimension_slices[dimension_name][0] for dimension_name in
+                    variable.dimensions]
+            if chunk_layout is not None and \
+                    variable_name in data_variable_names and \
+                    self.is_spatial_variable(variable_name):
+                space_dimension_names = self.space_dimension_names(
+                    variable_name)
+                space_axes = [axis for axis, dimension_name in enumerate(
+                    variable.dimensions) if dimension_name in
+                        space_dimension_names]
+                settings["chunksizes"] = chunk_shape(shape, space_axes,
+                    chunk_layout, variable.dtype.itemsize)
+            elif not any(dimension_name in subset_dimension_names for
+                    dimension_name in variable.dimensions):
+                chunks = source_chunk_shape(variable)
+                if chunks is not None:
+                    settings["chunksizes"] = chunks
+            return settings
+
         def init_variable(
                 variable,
                 variable_name):
+            # The fill value must be set when the variable is created.
+            fill_value = variable.getncattr("_FillValue") if "_FillValue" in \
+                variable.ncattrs() else None
             new_variable = new_dataset.createVariable(variable_name,
-                datatype=variable.dtype, dimensions=variable.dimensions)
+                datatype=variable.dtype, dimensions=variable.dimensions,
+                fill_value=fill_value, **storage_settings(variable,
+                    variable_name))
             for attribute_name in variable.ncattrs():
-                new_variable.setncattr(attribute_name, variable.getncattr(
-                    attribute_name))
+                if attribute_name != "_FillValue":
+                    new_variable.setncattr(attribute_name, variable.getncattr(
+                        attribute_name))
             return new_variable
 
         def copy_variable(
@@ -402,13 +664,28 @@ class Dataset(object):
             # When copying, there is no need to scale the values. It is
             # better not to because it results in small differences due to
             # casting.
-            variable.set_auto_maskandscale(False)
             new_variable.set_auto_maskandscale(False)
-
-            slices_ = [slice(*dimension_slices[dimension_name]) for
-                dimension_name in variable.dimensions]
-
-            new_variable[:] = variable[slices_] if slices_ else variable[:]
+            variable.set_auto_maskandscale(False)
+            try:
+                if not variable.dimensions:
+                    new_variable[:] = variable[:]
+                    return
+
+                ranges = [dimension_slices[dimension_name] for dimension_name
+                    in variable.dimensions]
+                offsets = [start for start, _ in ranges]
+
+                for block in copy_blocks(ranges, variable.dtype.itemsize,
+                        block_size, source_chunk_shape(variable)):
+                    source_slices = tuple(slice(start, end) for start, end in
+                        block)
+                    target_slices = tuple(slice(start - offset, end - offset)
+                        for (start, end), offset in zip(block, offsets))
+                    new_variable[target_slices] = variable[source_slices]
+            finally:
+                # The dataset may be shared with other tools through the
+                # pool, restore the default
+                variable.set_auto_maskandscale(True)
 
         for dimension_name in dimension_names:
             if dimension_name in self.dataset.variables:
@@ -421,3 +698,19 @@ class Dataset(object):
             copy_variable(variable, variable_name)
 
         new_dataset.close()
+
+    def _update_history(self,
+            new_dataset,
+            history_message):
+        """
+        Append *history_message* to the history of *new_dataset* and mark it
+        as written by ArcGIS.
+        """
+        if history_message is not None:
+            history_messages = []
+            if "history" in new_dataset.ncattrs():
+                history_messages = new_dataset.history.split("\n")
+            history_messages.append(history_message)
+            new_dataset.history = "\n".join(history_messages)
+
+        new_dataset.Source_Software = "Esri ArcGIS"
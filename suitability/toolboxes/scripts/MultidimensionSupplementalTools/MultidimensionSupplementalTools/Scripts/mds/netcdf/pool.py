@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+import collections
+import os
+import threading
+import mds.netcdf.dataset
+
+
+__all__ = ["DatasetPool", "DATASET_POOL", "open_dataset", "acquire_dataset",
+    "release_dataset", "discard_dataset"]
+
+class DatasetPool(object):
+    """
+    Process wide pool of open :py:class:`mds.netcdf.Dataset` instances.
+
+    Opening a dataset reads its header and, for OPeNDAP URLs, fetches the
+    DDS and DAS over the network. Tools open the same dataset over and over
+    while validating parameters and again when executing. The pool keeps the
+    most recently used datasets open so these calls share one handle.
+
+    Datasets are keyed by name (path or URL), the modification time and
+    size of local files and the convention settings. A file changed on disk
+    therefore gets a fresh handle.
+
+    At most *capacity* datasets are kept open. When more are opened, the
+    least recently used datasets that are not acquired are closed.
+
+    A dataset obtained with :py:meth:`acquire` is pinned until the matching
+    :py:meth:`release`. Once the last pin is released the dataset is closed,
+    so tools do not keep files open between executions. A dataset obtained
+    with :py:meth:`get` is not pinned. It stays open until *capacity* other
+    datasets have been requested, which is plenty for a single validation
+    call, or until it is released or discarded.
+    """
+
+    Entry = collections.namedtuple("Entry", ["dataset", "references"])
+
+    def __init__(self,
+            capacity=8):
+        assert capacity > 0
+        self.capacity = capacity
+        self.entries = collections.OrderedDict()
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def key(
+            name,
+            filter_out_nd_coordinates,
+            favor_convention_class=None):
+        return (name, mds.netcdf.dataset.file_signature(name),
+            bool(filter_out_nd_coordinates), favor_convention_class)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _lookup(self,
+            name,
+            filter_out_nd_coordinates,
+            favor_convention_class,
+            delta):
+        key = DatasetPool.key(name, filter_out_nd_coordinates,
+            favor_convention_class)
+
+        with self.lock:
+            if key in self.entries:
+                # Move to the most recently used end.
+                entry = self.entries.pop(key)
+            else:
+                # Handles of earlier versions of the file are of no use
+                # anymore.
+                self._evict(lambda key_: key_[0] == name and key_ != key)
+                entry = DatasetPool.Entry(mds.netcdf.dataset.Dataset(name,
+                    filter_out_nd_coordinates, favor_convention_class), 0)
+
+            self.entries[key] = entry._replace(
+                references=entry.references + delta)
+            self._evict(lambda key_: True, self.capacity)
+
+            return entry.dataset
+
+    def _evict(self,
+            predicate,
+            capacity=0):
+        """
+        Close and remove the least recently used, unreferenced datasets whose
+        key matches *predicate* until at most *capacity* datasets are left.
+        """
+        for key in list(self.entries.keys()):
+            if len(self.entries) <= capacity:
+                break
+            entry = self.entries[key]
+            if entry.references == 0 and predicate(key):
+                del self.entries[key]
+                entry.dataset.close()
+
+    def get(self,
+            name,
+            filter_out_nd_coordinates,
+            favor_convention_class=None):
+        """
+        Return a pooled dataset, opening it if needed, without pinning it.
+
+        Arguments are as for :py:class:`mds.netcdf.Dataset`. Errors raised
+        while opening the dataset are passed on and nothing is pooled.
+        """
+        return self._lookup(name, filter_out_nd_coordinates,
+            favor_convention_class, 0)
+
+    def acquire(self,
+            name,
+            filter_out_nd_coordinates,
+            favor_convention_class=None):
+        """
+        Return a pooled dataset and pin it until :py:meth:`release` is called
+        with it.
+        """
+        return self._lookup(name, filter_out_nd_coordinates,
+            favor_convention_class, 1)
+
+    def release(self,
+            dataset):
+        """
+        Unpin *dataset*, obtained with :py:meth:`acquire`. The dataset is
+        closed when it is not pinned anymore.
+        """
+        with self.lock:
+            for key, entry in list(self.entries.items()):
+                if entry.dataset is dataset:
+                    assert entry.references > 0
+                    if entry.references > 1:
+                        self.entries[key] = entry._replace(
+                            references=entry.references - 1)
+                        break
+                    del self.entries[key]
+                    dataset.close()
+                    break
+            else:
+                # The file changed while the dataset was in use, and the
+                # dataset is not pooled anymore.
+                dataset.close()
+
+    def discard(self,
+            name):
+        """
+        Close all unreferenced datasets opened from *name*.
+
+        Call this before writing to a file that may have been opened
+        through the pool. HDF5 refuses to overwrite a file that is still
+        open.
+        """
+        with self.lock:
+            self._evict(lambda key_: DatasetPool._same_name(key_[0], name))
+
+    @staticmethod
+    def _same_name(
+            name1,
+            name2):
+        if name1 == name2:
+            return True
+        if "://" in name1 or "://" in name2:
+            return False
+        return os.path.normcase(os.path.abspath(name1)) == \
+            os.path.normcase(os.path.abspath(name2))
+
+    def clear(self):
+        """
+        Close all unreferenced datasets.
+        """
+        with self.lock:
+            self._evict(lambda key_: True)
+
+
+DATASET_POOL = DatasetPool()
+"""
+Pool shared by the tools, both during validation and execution.
+"""
+
+
+def open_dataset(
+        name,
+        filter_out_nd_coordinates,
+        favor_convention_class=None):
+    """
+    Return the pooled :py:class:`mds.netcdf.Dataset` for *name*. See
+    :py:meth:`DatasetPool.get`.
+    """
+    return DATASET_POOL.get(name, filter_out_nd_coordinates,
+        favor_convention_class)
+
+
+def acquire_dataset(
+        name,
+        filter_out_nd_coordinates,
+        favor_convention_class=None):
+    """
+    Return the pooled :py:class:`mds.netcdf.Dataset` for *name* and pin it
+    until :py:func:`release_dataset` is called. See
+    :py:meth:`DatasetPool.acquire`.
+    """
+    return DATASET_POOL.acquire(name, filter_out_nd_coordinates,
+        favor_convention_class)
+
+
+def release_dataset(
+        dataset):
+    """
+    Release a dataset obtained with :py:func:`acquire_dataset`. See
+    :py:meth:`DatasetPool.release`.
+    """
+    DATASET_POOL.release(dataset)
+
+
+def discard_dataset(
+        name):
+    """
+    Close the unreferenced pooled datasets opened from *name*. See
+    :py:meth:`DatasetPool.discard`.
+    """
+    DATASET_POOL.discard(name)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import csv
+import os
+import numpy
+
+
+TABLE_EXTENSIONS = [".dbf", ".csv", ".nc", ".parquet"]
+"""
+Extensions of the table files that can be written with :py:func:`write_table`.
+Tables inside a geodatabase have no extension.
+"""
+
+
+def is_table_name(
+        filename):
+    """
+    Return whether *filename* names a table :py:func:`write_table` can
+    write: a file with one of the :py:data:`TABLE_EXTENSIONS` or a table
+    inside a file geodatabase.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    return extension in TABLE_EXTENSIONS or \
+        os.path.splitext(os.path.dirname(filename))[1].lower() == ".gdb"
+
+
+def broadcast_columns(
+        coordinates,
+        zones):
+    """
+    Return the columns of a table with a row for each combination of the
+    values in *coordinates* and *zones*.
+
+    *coordinates* is a list of 1D arrays, one per non-spatial dimension, in
+    dimension order. The rows are ordered as in nested loops over the
+    coordinates, with the zones varying fastest. The result is a list with
+    a column per coordinate array followed by the zone column.
+    """
+    shape = tuple(len(values) for values in coordinates)
+    nr_slices = int(numpy.prod(shape)) if shape else 1
+    indices = numpy.indices(shape).reshape(len(shape), nr_slices)
+    columns = [numpy.repeat(numpy.asarray(values)[index], len(zones))
+        for values, index in zip(coordinates, indices)]
+    columns.append(numpy.tile(numpy.asarray(zones), nr_slices))
+    return columns
+
+
+def _write_csv(
+        array,
+        filename):
+    names = array.dtype.names
+    with open(filename, "wb") as file_:
+        writer = csv.writer(file_)
+        writer.writerow(names)
+        writer.writerows(array.tolist())
+
+
+def _write_netcdf(
+        array,
+        filename):
+    import netCDF4
+    dataset = netCDF4.Dataset(filename, mode="w", clobber=True,
+        format="NETCDF4_CLASSIC")
+    try:
+        dataset.Source_Software = "Esri ArcGIS"
+        dataset.createDimension("row", array.size)
+        for name in array.dtype.names:
+            values = array[name]
+            if values.dtype.kind == "M":
+                variable = dataset.createVariable(name, "f8", ("row",))
+                variable.units = "seconds since 1970-01-01 00:00:00"
+                variable.calendar = "standard"
+                values = (values - numpy.datetime64("1970-01-01", "s")) / \
+                    numpy.timedelta64(1, "s")
+            else:
+                variable = dataset.createVariable(name, values.dtype,
+                    ("row",), zlib=True)
+            variable[:] = values
+    finally:
+        dataset.close()
+
+
+def _write_parquet(
+        array,
+        filename):
+    # pyarrow is optional. It is only needed for Parquet output.
+    import pyarrow
+    import pyarrow.parquet
+    table = pyarrow.Table.from_arrays(
+        [pyarrow.array(array[name]) for name in array.dtype.names],
+        names=list(array.dtype.names))
+    pyarrow.parquet.write_table(table, filename)
+
+
+def write_table(
+        array,
+        filename,
+        overwrite=True):
+    """
+    Write structured *array* to the table *filename* in one go.
+
+    The format follows from the extension of *filename*: .csv writes comma
+    separated values with a header row, .nc writes a netCDF file with a
+    variable per field along a *row* dimension and .parquet writes an
+    Apache Parquet file (requires pyarrow). Any other name (.dbf, a table
+    in a geodatabase) is written with arcpy.da.NumPyArrayToTable.
+
+    Fields of type datetime64 are written as dates.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+
+    if extension in [".csv", ".nc", ".parquet"]:
+        if os.path.exists(filename):
+            assert overwrite, filename
+            os.remove(filename)
+        if extension == ".csv":
+            _write_csv(array, filename)
+        elif extension == ".nc":
+            _write_netcdf(array, filename)
+        else:
+            _write_parquet(array, filename)
+    else:
+        import arcpy
+        if arcpy.Exists(filename):
+            assert overwrite, filename
+            arcpy.Delete_management(filename)
+        arcpy.da.NumPyArrayToTable(array, filename)
@@ -49,7 +49,7 @@ class DescribeMultidimensionalDataset(object):
 
         if parameters[0].value:
             try:
-                dataset = mds.netcdf.Dataset(parameters[0].valueAsText, '')
+                dataset = mds.netcdf.open_dataset(parameters[0].valueAsText, '')
 
             except RuntimeError, exception:
                 if "No such file or directory" in str(exception) or \
@@ -83,50 +83,53 @@ class DescribeMultidimensionalDataset(object):
 
         try:
             dataset_name = parameters[0].valueAsText
-            dataset = mds.netcdf.Dataset(dataset_name,'')
+            dataset = mds.netcdf.acquire_dataset(dataset_name,'')
         except RuntimeError, exception:
             # Handle errors not detected by updateMessages.
             messages.addErrorMessage(str(exception))
             raise arcpy.ExecuteError
 
-        # If user specified an output file, open it for writing
-        if parameters[1].value:
-            f = open(parameters[1].valueAsText, 'w')
-        # Print file, netCDF file type, and dimensions.
-        pprint("\n")
-        pprint("netcdf file: " + parameters[0].valueAsText + "  (" + \
-        dataset.dataset.file_format + ")")
-        pprint("dimensions:")
-
-        for dimobj in dataset.dataset.dimensions.values():
-            if dimobj.isunlimited(): # dimension is unlimited
-                pprint("\t" + dimobj._name + " = UNLIMITED\t// (" + "(" + \
-                 str(len(dimobj)) + " currently)")
-            else:
-                pprint("\t" + dimobj._name + " = " + str(len(dimobj)))
-
-        # Print information on variables
-        pprint("variables:")
-
-        for varname in dataset.dataset.variables.values():
-            dim_list = []
-            for d in varname.dimensions:
-                dim_list.append(dataset.dataset.dimensions[d]._name + "=" + \
-                str(dataset.dataset.dimensions[d].__len__()))
-            dim_list = ', '.join(dim_list)
-            pprint("\t" + str(varname.dtype) + " " + varname._name + \
-            "(" + dim_list + ")")
-            for attribute_name in varname.ncattrs():
-                pprint("\t\t:" + attribute_name + " = " + \
-                str(getattr(varname, attribute_name)))
-
-        # Print global attributes
-        pprint("global atributes:")
-        for name in dataset.dataset.ncattrs():
-            pprint('\t' + name + '=' + str(getattr(dataset.dataset, name)))
-
-        if parameters[1].value:
-            f.flush()
-            f.close()
+        try:
+            # If user specified an output file, open it for writing
+            if parameters[1].value:
+                f = open(parameters[1].valueAsText, 'w')
+            # Print file, netCDF file type, and dimensions.
+            pprint("\n")
+            pprint("netcdf file: " + parameters[0].valueAsText + "  (" + \
+            dataset.dataset.file_format + ")")
+            pprint("dimensions:")
+
+            for dimobj in dataset.dataset.dimensions.values():
+                if dimobj.isunlimited(): # dimension is unlimited
+                    pprint("\t" + dimobj._name + " = UNLIMITED\t// (" + "(" + \
+                     str(len(dimobj)) + " currently)")
+                else:
+                    pprint("\t" + dimobj._name + " = " + str(len(dimobj)))
+
+            # Print information on variables
+            pprint("variables:")
+
+            for varname in dataset.dataset.variables.values():
+                dim_list = []
+                for d in varname.dimensions:
+                    dim_list.append(dataset.dataset.dimensions[d]._name + "=" + \
+                    str(dataset.dataset.dimensions[d].__len__()))
+                dim_list = ', '.join(dim_list)
+                pprint("\t" + str(varname.dtype) + " " + varname._name + \
+                "(" + dim_list + ")")
+                for attribute_name in varname.ncattrs():
+                    pprint("\t\t:" + attribute_name + " = " + \
+                    str(getattr(varname, attribute_name)))
+
+            # Print global attributes
+            pprint("global atributes:")
+            for name in dataset.dataset.ncattrs():
+                pprint('\t' + name + '=' + str(getattr(dataset.dataset, name)))
+
+            if parameters[1].value:
+                f.flush()
+                f.close()
+        finally:
+            mds.netcdf.release_dataset(dataset)
 
         return
\ No newline at end of file
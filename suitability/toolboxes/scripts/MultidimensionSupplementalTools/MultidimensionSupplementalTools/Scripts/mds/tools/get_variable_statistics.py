@@ -104,7 +104,7 @@ class GetVariableStatistics(object):
         # Open dataset and populate variable names
         if input_parameter.value is not None:
             try:
-                dataset = mds.netcdf.Dataset(input_parameter.valueAsText, '')
+                dataset = mds.netcdf.open_dataset(input_parameter.valueAsText, '')
             except RuntimeError, exception:
                 if "No such file or directory" in str(exception) or \
                     "Invalid argument" in str(exception):
@@ -192,26 +192,29 @@ class GetVariableStatistics(object):
 
         # Open dataset
         try:
-            dataset = mds.netcdf.Dataset(dataset_name,'')
+            dataset = mds.netcdf.acquire_dataset(dataset_name,'')
         except RuntimeError, exception:
             # Handle errors not detected by updateMessages.
             messages.addErrorMessage(str(exception))
             raise arcpy.ExecuteError
 
-        # Variable of interest
-        var1 = dataset.variable(variable_parameter.valueAsText)
-
-        # Perform statistic
-        result1 = self.calculate_statistic(var1[:], type_parameter.valueAsText)
-
-        # Format output string
-        str_modif = "squared " if type_parameter.valueAsText == "VARIANCE" else ""
-        str_units = str(var1.units) if hasattr(var1, 'units') else "units"
-        str_output = "%s: %s %s%s" % (
-            variable_parameter.valueAsText, str(result1), str_modif, str_units)
-
-        # Output results
-        arcpy.AddMessage(str_output)
-        arcpy.SetParameter(3, result1)
+        try:
+            # Variable of interest
+            var1 = dataset.variable(variable_parameter.valueAsText)
+
+            # Perform statistic
+            result1 = self.calculate_statistic(var1[:], type_parameter.valueAsText)
+
+            # Format output string
+            str_modif = "squared " if type_parameter.valueAsText == "VARIANCE" else ""
+            str_units = str(var1.units) if hasattr(var1, 'units') else "units"
+            str_output = "%s: %s %s%s" % (
+                variable_parameter.valueAsText, str(result1), str_modif, str_units)
+
+            # Output results
+            arcpy.AddMessage(str_output)
+            arcpy.SetParameter(3, result1)
+        finally:
+            mds.netcdf.release_dataset(dataset)
 
         return
\ No newline at end of file
@@ -2,6 +2,7 @@
 import arcpy
 import mds
 import mds.messages
+import mds.netcdf.file
 import numpy
 import netCDF4
 import os.path
@@ -32,10 +33,12 @@ class GetVariableStatisticsOverDimension(object):
                            'VARIANCE':'var'}
         # List of dictionaries of statistics
         # Sublist elements indices:
-        #   0: object
+        #   0: object the statistics are named after (not called, see
+        #       calculate_statistic)
         #   1: dictionary defined by 'displayname':'methodname'
-        #       where object.methodname() is valid and displayname is what is
-        #       shown to the user
+        #       where methodname is one of RunningStatistics.STATISTICS,
+        #       computed block by block by mds.math.statistic_over_dimension,
+        #       and displayname is what is shown to the user
         self.statistics = [[numpy.ma, statistics_numpy]]
         self.default_statistic = "MEAN"
 
@@ -131,7 +134,7 @@ class GetVariableStatisticsOverDimension(object):
         # Open dataset and populate variable names
         if input_parameter.value is not None:
             try:
-                dataset = mds.netcdf.Dataset(input_parameter.valueAsText, '')
+                dataset = mds.netcdf.open_dataset(input_parameter.valueAsText, '')
             except RuntimeError, exception:
                 if "No such file or directory" in str(exception) or \
                     "Invalid argument" in str(exception):
@@ -214,15 +217,29 @@ class GetVariableStatisticsOverDimension(object):
     # Statistics
 
     def calculate_statistic(self, variable, dimension, statistic):
-        # Apply statistic
+        # Apply statistic, reading the variable block by block along the
+        # dimension
         for stat in self.statistics:
             if statistic in stat[1]:
-                func = getattr(stat[0], stat[1][statistic])
+                func = stat[1][statistic]
                 break
         else:
             # Default
-            func = getattr(numpy.ma, 'mean')
-        return func(variable, axis=dimension)
+            func = 'mean'
+        return mds.math.statistic_over_dimension(variable, dimension, func)
+
+    @staticmethod
+    def create_variable(newdataset, name, variable, datatype, dimensions):
+        # The fill value must be set when the variable is created
+        fill_value = variable.getncattr("_FillValue") if "_FillValue" in \
+            variable.ncattrs() else None
+        newvar = newdataset.createVariable(name, datatype, dimensions,
+            fill_value=fill_value)
+        for attribute_name in variable.ncattrs():
+            if attribute_name != "_FillValue":
+                newvar.setncattr(attribute_name,
+                    variable.getncattr(attribute_name))
+        return newvar
 
     # ---------------------------------------------------------
 
@@ -240,42 +257,72 @@ class GetVariableStatisticsOverDimension(object):
 
         # Open dataset
         try:
-            dataset = mds.netcdf.Dataset(dataset_name,'')
+            dataset = mds.netcdf.acquire_dataset(dataset_name,'')
         except RuntimeError, exception:
             # Handle errors not detected by updateMessages.
             messages.addErrorMessage(str(exception))
             raise arcpy.ExecuteError
 
-        # Variable of interest
-        var1 = dataset.variable(variable_parameter.valueAsText)
-
-        # Dimension of interest
-        dim1 = var1.dimensions.index(dimension_parameter.valueAsText)
-
-        # Perform statistic
-        result1 = self.calculate_statistic(var1[:], dim1, \
-            type_parameter.valueAsText)
-
-        # Collect output dataset information
-        output_dims = list(dataset.variable_dimension_names(
-            variable_parameter.valueAsText))
-        output_dims.remove(dimension_parameter.valueAsText)
-        output_dims = tuple(output_dims)
-        output_filename = output_parameter.valueAsText
-        output_name = output_var_parameter.valueAsText
-
-        # Create new dataset
-        dataset.xcopy(dataset.data_variable_names(), output_filename)
-
-        # Create new variable in dataset
-        with netCDF4.Dataset(output_filename, mode="a") as newdataset:
-            newvar = newdataset.createVariable(output_name, var1.dtype, \
-                output_dims)
-            for attribute_name in var1.ncattrs():
-                newvar.setncattr(attribute_name, var1.getncattr(attribute_name))
-            newvar[:] = result1
-
-        # Output new variable name
-        arcpy.SetParameter(5, output_name)
+        try:
+            # Variable of interest
+            var1 = dataset.variable(variable_parameter.valueAsText)
+
+            # Dimension of interest
+            dim1 = var1.dimensions.index(dimension_parameter.valueAsText)
+
+            # Perform statistic
+            result1 = self.calculate_statistic(var1, dim1, \
+                type_parameter.valueAsText)
+
+            # Collect output dataset information
+            output_dims = list(dataset.variable_dimension_names(
+                variable_parameter.valueAsText))
+            output_dims.remove(dimension_parameter.valueAsText)
+            output_dims = tuple(output_dims)
+            output_filename = output_parameter.valueAsText
+            output_name = output_var_parameter.valueAsText
+
+            # Coordinate and other dependent variables that describe the result
+            coordinate_names = [name for name in output_dims if name in
+                dataset.variable_names()]
+            coordinate_names += [name for name in
+                dataset.dependent_variable_names(variable_parameter.valueAsText)
+                    if name not in coordinate_names and all(dimension_name in
+                        output_dims for dimension_name in
+                            dataset.variable_dimension_names(name))]
+
+            # Create new dataset holding only the result and its coordinates
+            newdataset = mds.netcdf.file.initialize_dataset_copy(dataset,
+                output_filename)
+            try:
+                for dimension_name in output_dims:
+                    dimension = dataset.dimension(dimension_name)
+                    newdataset.createDimension(dimension_name, None if
+                        dimension.isunlimited() else len(dimension))
+
+                for name in coordinate_names:
+                    variable = dataset.variable(name)
+                    newvar = self.create_variable(newdataset, name, variable,
+                        variable.dtype, variable.dimensions)
+                    newvar.set_auto_maskandscale(False)
+                    variable.set_auto_maskandscale(False)
+                    try:
+                        newvar[:] = variable[:]
+                    finally:
+                        # The dataset is shared with other tools, restore
+                        # the default even when the copy fails
+                        variable.set_auto_maskandscale(True)
+
+                # Create new variable in dataset
+                newvar = self.create_variable(newdataset, output_name, var1,
+                    var1.dtype, output_dims)
+                newvar[:] = result1
+            finally:
+                newdataset.close()
+
+            # Output new variable name
+            arcpy.SetParameter(5, output_name)
+        finally:
+            mds.netcdf.release_dataset(dataset)
 
         return
\ No newline at end of file
@@ -308,7 +308,7 @@ class MultidimensionalZonalStatistics(object):
         # Open netCDF dataset
         if input_parameter.value is not None:
             try:
-                dataset = mds.netcdf.Dataset(input_parameter.valueAsText, '')
+                dataset = mds.netcdf.open_dataset(input_parameter.valueAsText, '')
             except RuntimeError, exception:
                 if "No such file or directory" in str(exception) or \
                     "Invalid argument" in str(exception):
@@ -397,18 +397,21 @@ class MultidimensionalZonalStatistics(object):
 
         # Try to open the netCDF dataset
         try:
-            dataset = mds.netcdf.Dataset(dataset_name,'')
+            dataset = mds.netcdf.acquire_dataset(dataset_name,'')
         except RuntimeError, exception:
             messages.addErrorMessage(str(exception))
             raise arcpy.ExecuteError
 
-        # Based on same criteria used to populate variable_parameter in
-        #   updateMessages(), check if input dataset is gridded or contains
-        #   discrete geometries and branch code appropriately.
-        if list(dataset.spatial_data_variable_names()) != []:
-            self.zonal_statistics_for_grid(parameters, messages, dataset)
-        else:
-            self.zonal_statistics_for_discrete(parameters, messages, dataset)
+        try:
+            # Based on same criteria used to populate variable_parameter in
+            #   updateMessages(), check if input dataset is gridded or contains
+            #   discrete geometries and branch code appropriately.
+            if list(dataset.spatial_data_variable_names()) != []:
+                self.zonal_statistics_for_grid(parameters, messages, dataset)
+            else:
+                self.zonal_statistics_for_discrete(parameters, messages, dataset)
+        finally:
+            mds.netcdf.release_dataset(dataset)
 
         return
 
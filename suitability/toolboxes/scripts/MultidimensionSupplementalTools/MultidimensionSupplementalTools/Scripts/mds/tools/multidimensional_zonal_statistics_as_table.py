@@ -1,12 +1,12 @@
 # -*- coding: utf-8 -*-
 import arcpy
 import collections
+import datetime
 import mds
 import mds.messages
+import mds.table
 import numpy
-import numpy.lib.recfunctions
 import os
-import tempfile
 
 #
 # LIMITATIONS:
@@ -24,8 +24,12 @@ import tempfile
 #
 #   > Memory:
 #   Because of the combinatorial nature of this tool and the generation of the
-#   entire table in memory prior to outputting it with NumPyArrayToTable,
-#   memory could become an issue.
+#   entire table in memory prior to outputting it in bulk, memory could become
+#   an issue.
+#
+#   > Output formats:
+#   The output table is a dBASE or geodatabase table, or, based on its
+#   extension, a .csv, .nc or .parquet file. Parquet output requires pyarrow.
 #
 #   > Discrete Geometries:
 #   For discrete datasets, the tool has been designed to read CF 1.6 discrete
@@ -160,6 +164,150 @@ class MultidimensionalZonalStatisticsAsTable(object):
             # Single valued case
             return func(variable)
 
+    def statistic_names(self, statistic):
+        """List of the names of the values calculated for 'statistic'."""
+        if statistic in self.statistics_multiple_values:
+            return self.statistics_multiple_values[statistic]
+        elif any([statistic in stat[1] for stat in self.statistics]):
+            return [str(statistic)]
+        return self.statistics_multiple_values[self.default_statistic]
+
+    def zone_statistics_for_grid(self, arr_var, arr_zone, zones, dim_indices,
+            statistic, stat_names, ignore_nodata, type_changed,
+            progress=None):
+        """Calculates 'statistic' of the cells of each of 'zones' in the
+        spatial array 'arr_zone', for each slice of 'arr_var' over its
+        non-spatial dimensions at 'dim_indices'.  Returns the count, the
+        'stat_names' values and whether the zone is kept, per slice and
+        zone.  'progress' is called after each slice."""
+        # Group the cells by zone once: cell order sorted by zone value and
+        #   the start and end of each zone's run of cells in that order
+        zone_cells = numpy.ravel(arr_zone)
+        cell_order = numpy.argsort(zone_cells, kind='mergesort')
+        zone_start = numpy.searchsorted(zone_cells[cell_order], zones, 'left')
+        zone_end = numpy.searchsorted(zone_cells[cell_order], zones, 'right')
+
+        blmultiple = len(stat_names) > 1 or \
+            statistic in self.statistics_multiple_values
+
+        # Statistics per slice and zone
+        dim_shape = arr_var.shape
+        slice_shape = tuple([dim_shape[dim_index] for dim_index in dim_indices])
+        nr_slices = int(numpy.prod(slice_shape)) if slice_shape else 1
+        counts = numpy.zeros((nr_slices, zones.size), numpy.int)
+        values = numpy.zeros((nr_slices, zones.size, len(stat_names)),
+            numpy.float)
+        valid = numpy.ones((nr_slices, zones.size), numpy.bool_)
+
+        # Loop through slices, in the order of the rows of the table
+        for slice_index, position in enumerate(numpy.ndindex(*slice_shape)):
+
+            # Take slice from data
+            varslice = [slice(None)] * len(dim_shape)
+            for dim_index, it in zip(dim_indices, position):
+                varslice[dim_index] = it
+            if type_changed:
+                arr_slice = arr_var[tuple(varslice)].astype('f8')
+            else:
+                arr_slice = arr_var[tuple(varslice)]
+
+            # Masked values and mask, ordered by zone
+            arr_slice = numpy.ma.asarray(arr_slice)
+            arr_data = arr_slice.ravel()[cell_order]
+            arr_mask = numpy.ma.getmaskarray(arr_data)
+
+            # Loop over zones
+            for zone_index in xrange(zones.size):
+                zone_data = arr_data[zone_start[zone_index]:zone_end[zone_index]]
+                zone_mask = arr_mask[zone_start[zone_index]:zone_end[zone_index]]
+                # Perform for zone when NoData is ignored
+                #   or when there is no NoData within zone; otherwise
+                #   the zone is dropped from the table for this slice
+                if (not ignore_nodata) and numpy.any(zone_mask):
+                    valid[slice_index, zone_index] = False
+                    continue
+                result = self.calculate_statistic(zone_data, statistic)
+                counts[slice_index, zone_index] = zone_mask.size - \
+                    numpy.count_nonzero(zone_mask)
+                if blmultiple:
+                    values[slice_index, zone_index] = result.tolist()[0]
+                elif result is numpy.ma.masked:
+                    values[slice_index, zone_index] = numpy.nan
+                else:
+                    values[slice_index, zone_index] = result
+
+            if progress is not None:
+                progress()
+
+        return counts, values, valid
+
+    def zone_statistics_for_discrete(self, arr_var, zone_stations,
+            stat_position, statistic, ignore_nodata, type_changed):
+        """Generates a (zone, slice, masked values, result) tuple for each
+        zone in 'zone_stations', a dictionary of the station indices in
+        each zone, and each slice of 'arr_var' over its dimensions other
+        than the station dimension at 'stat_position'.  The result of
+        'statistic' is None when the zone is dropped for the slice."""
+        # Slice generator
+        # Adapted from: http://code.activestate.com/recipes/
+        #   502194-a-generator-for-an-arbitrary-number-of-for-loops/
+        # Originally written by Steven Bethard
+        def multi_for(iterables):
+            if not iterables:
+                yield ()
+            else:
+                if isinstance(iterables[0], collections.Iterable):
+                    for item in iterables[0]:
+                        for rest_tuple in multi_for(iterables[1:]):
+                            yield (item,) + rest_tuple
+                else:
+                    for rest_tuple in multi_for(iterables[1:]):
+                        yield (iterables[0],) + rest_tuple
+
+        # Generate slice list
+        dim_slices = [xrange(length) for dim_index, length in \
+            enumerate(arr_var.shape) if dim_index != stat_position]
+
+        # Loop through zones
+        for zone in zone_stations:
+
+            # Grab station indices associated with zone
+            zone_indices = zone_stations[zone]
+
+            # Loop through slices
+            for varslice in multi_for(dim_slices):
+
+                # Insert station indices into slice
+                varslice = list(varslice)
+                varslice.insert(stat_position, zone_indices)
+
+                # Take slice from data
+                if type_changed:
+                    arr_slice = arr_var[varslice].astype('f8')
+                else:
+                    arr_slice = arr_var[varslice]
+
+                # Create masked array
+                if hasattr(arr_slice, 'mask'):
+                    arr_mask = arr_slice.mask.copy()
+                else:
+                    arr_mask = numpy.ma.make_mask_none(arr_slice.shape)
+                    arr_slice = numpy.ma.asarray(arr_slice)
+
+                # Perform for zone when NoData is ignored
+                #   or when there is no NoData within zone
+                if ignore_nodata or (not numpy.any(arr_mask)):
+
+                    # Apply mask
+                    arr_slice.mask = arr_mask
+
+                    # Apply operator to zone masked slice
+                    result = self.calculate_statistic(arr_slice[:], statistic)
+                    yield zone, varslice, arr_slice, result
+                else:
+                    # Drops zones with NoData in them from table
+                    yield zone, varslice, arr_slice, None
+
     # ---------------------------------------------------------
 
     def getParameterInfo(self):
@@ -338,7 +486,7 @@ class MultidimensionalZonalStatisticsAsTable(object):
         # Open netCDF dataset
         if input_parameter.value is not None:
             try:
-                dataset = mds.netcdf.Dataset(input_parameter.valueAsText, '')
+                dataset = mds.netcdf.open_dataset(input_parameter.valueAsText, '')
             except RuntimeError, exception:
                 if "No such file or directory" in str(exception) or \
                     "Invalid argument" in str(exception):
@@ -402,12 +550,12 @@ class MultidimensionalZonalStatisticsAsTable(object):
             type_parameter.filter.list = sorted([key for stat in \
             self.statistics for key in stat[1].keys()])
 
-        # Ensure output table has a .dbf extension
+        # Ensure output table is of a supported format
         if output_parameter.value is not None:
             output_filename = output_parameter.valueAsText
-            if os.path.splitext(output_filename)[1] != ".dbf":
+            if not mds.table.is_table_name(output_filename):
                 output_parameter.setErrorMessage(
-                    mds.messages.OUTPUT_FILE_EXTENSION_MUST_BE_DBF)
+                    mds.messages.OUTPUT_FILE_EXTENSION_MUST_BE_TABLE)
 
         return
 
@@ -430,18 +578,21 @@ class MultidimensionalZonalStatisticsAsTable(object):
 
         # Try to open the netCDF dataset
         try:
-            dataset = mds.netcdf.Dataset(dataset_name,'')
+            dataset = mds.netcdf.acquire_dataset(dataset_name,'')
         except RuntimeError, exception:
             messages.addErrorMessage(str(exception))
             raise arcpy.ExecuteError
 
-        # Based on same criteria used to populate variable_parameter in
-        #   updateMessages(), check if input dataset is gridded or contains
-        #   discrete geometries and branch code appropriately.
-        if list(dataset.spatial_data_variable_names()) != []:
-            self.zonal_statistics_as_table_for_grid(parameters, messages, dataset)
-        else:
-            self.zonal_statistics_as_table_for_discrete(parameters, messages, dataset)
+        try:
+            # Based on same criteria used to populate variable_parameter in
+            #   updateMessages(), check if input dataset is gridded or contains
+            #   discrete geometries and branch code appropriately.
+            if list(dataset.spatial_data_variable_names()) != []:
+                self.zonal_statistics_as_table_for_grid(parameters, messages, dataset)
+            else:
+                self.zonal_statistics_as_table_for_discrete(parameters, messages, dataset)
+        finally:
+            mds.netcdf.release_dataset(dataset)
 
         return
 
@@ -677,42 +828,31 @@ class MultidimensionalZonalStatisticsAsTable(object):
                 not ispacked):
             type_changed = True
 
-        # Slice generator
-        # Adapted from: http://code.activestate.com/recipes/
-        #   502194-a-generator-for-an-arbitrary-number-of-for-loops/
-        # Originally written by Steven Bethard
-        def multi_for(iterables):
-            if not iterables:
-                yield ()
-            else:
-                if isinstance(iterables[0], collections.Iterable):
-                    for item in iterables[0]:
-                        for rest_tuple in multi_for(iterables[1:]):
-                            yield (item,) + rest_tuple
-                else:
-                    for rest_tuple in multi_for(iterables[1:]):
-                        yield (iterables[0],) + rest_tuple
+        # Statistic fields of the table
+        statistic = type_parameter.valueAsText
+        stat_names = self.statistic_names(statistic)
 
-        # Generate slice list
+        # Non-spatial dimensions and their coordinates, read once
         dim_shape = arr_var.shape
         dim_name = arr_var.dimensions
-        dim_slices = []
+        time_names = self.time_coordinate_names(dataset, var_name)
+        dim_indices = []
         dim_dims = []
-        dim_prod = 1
+        coordinates = []
         for dim_index, dim_item in enumerate(dim_name):
             if not dim_item in spat_list:
-                dim_prod *= dim_shape[dim_index]
-                dim_slices.append(xrange(dim_shape[dim_index]))
-                dim_dims.append((str(dim_item), numpy.int))
-            else:
-                dim_slices.append(Ellipsis)
-
-        blstructcreated = False
-
-        def hstack_struct(arr1, arr2):
-            # Will only work correctly if arr1 and arr2 only have one record
-            dt = numpy.lib.recfunctions.zip_descr((arr1, arr2), flatten=True)
-            return numpy.array(arr1.tolist() + arr2.tolist(), dtype = dt)
+                dim_indices.append(dim_index)
+                if dim_item in dataset.variable_names():
+                    coordinates.append(numpy.ma.getdata(
+                        dataset.variable(dim_item)[:]).ravel())
+                else:
+                    coordinates.append(numpy.arange(dim_shape[dim_index]))
+                # Time coordinates are converted to dates on output
+                if dim_item in time_names:
+                    dim_dims.append((str(dim_item), coordinates[-1].dtype))
+                else:
+                    dim_dims.append((str(dim_item), numpy.int))
+        slice_shape = tuple([dim_shape[dim_index] for dim_index in dim_indices])
 
         # Get zone values
         if noDataValue is not None:
@@ -720,143 +860,32 @@ class MultidimensionalZonalStatisticsAsTable(object):
         else:
             zones = numpy.unique(arr_zone)
 
-        # Progress bar
-        dim_prod *= zones.size
+        # Statistics per slice and zone
         arcpy.ResetProgressor()
-        arcpy.SetProgressor('step', 'Calculating...', 0, dim_prod, 1)
-
-        # Loop through slices
-        index = 0
-        valid_indices = []
-        for varslice in multi_for(dim_slices):
-
-            # Take slice from data
-            if type_changed:
-                arr_slice = arr_var[varslice].astype('f8')
-            else:
-                arr_slice = arr_var[varslice]
-
-            # Create masked array
-            if hasattr(arr_slice, 'mask'):
-                arr_mask = arr_slice.mask.copy()
-            else:
-                arr_mask = numpy.ma.make_mask_none(arr_slice.shape)
-                arr_slice = numpy.ma.asarray(arr_slice)
-
-            # Loop over zones
-            for z in zones:
-                # Perform for zone when NoData is ignored
-                #   or when there is no NoData within zone
-                if ignore_parameter.value or \
-                        (not numpy.any((arr_zone==z) & arr_mask)):
-                    # Set mask to netCDF NoData mask
-                    arr_slice.mask = arr_mask
-                    # Apply zone mask
-                    arr_slice[arr_zone!=z] = numpy.ma.masked
-                    # Apply operator to zone masked slice
-                    result = self.calculate_statistic(arr_slice[:], \
-                        type_parameter.valueAsText)
-
-                    # Structure results into row
-                    struct_data = [dataset.variable(dim_name[it_ind])[it] for \
-                        it_ind, it in enumerate(list(varslice)) if \
-                        it != Ellipsis]
-                    struct_data.append(z)
-                    struct_data.append(numpy.ma.count(arr_slice))
-                    if numpy.isscalar(result):
-                        # Single-valued result
-                        struct_data.append(result)
-                    else:
-                        # Multivalued result
-                        struct_data += [it2 for it in result.tolist() for \
-                            it2 in it]
-
-                    # Create table when necessary
-                    if not blstructcreated:
-                        struct_dtype = dim_dims[:]
-                        struct_dtype.append((str(zonefield_parameter.value), \
-                            numpy.int))
-                        struct_dtype.append(('COUNT', numpy.int))
-                        if type_parameter.valueAsText in \
-                                self.statistics_multiple_values:
-                            struct_dtype += [(it, numpy.float) for it in list(
-                                result.dtype.names)]
-                        else:
-                            struct_dtype.append((str(
-                                type_parameter.valueAsText), numpy.float))
-                        struct = numpy.zeros((dim_prod,), numpy.dtype(struct_dtype))
-                        blstructcreated = True
-
-                    # Insert row
-                    struct[index] = numpy.array(tuple(struct_data), \
-                        numpy.dtype(struct_dtype))
-
-                    valid_indices.append(index)
-                #else:
-                #    # Passing drops zones with NoData in them from table
-                #    pass
-                index += 1
-                arcpy.SetProgressorPosition()
-
+        arcpy.SetProgressor('step', 'Calculating...', 0,
+            int(numpy.prod(slice_shape)) if slice_shape else 1, 1)
+        counts, values, valid = self.zone_statistics_for_grid(arr_var,
+            arr_zone, zones, dim_indices, statistic, stat_names,
+            ignore_parameter.value, type_changed, arcpy.SetProgressorPosition)
         arcpy.ResetProgressor()
 
-        if 'time' in dim_name:
-            # Output zonal statistics to temporary table
-            temp_table = os.path.join(tempfile.gettempdir(), 'temp_table.dbf')
-            if arcpy.Exists(temp_table):
-                arcpy.Delete_management(temp_table)
-            arcpy.da.NumPyArrayToTable(struct[valid_indices], temp_table)
-            # Create table view of the time dimension from netCDF file
-            temp_mdtable = r"md_table"
-            arcpy.MakeNetCDFTableView_md(dataset_name, 'time', temp_mdtable, 'time')
-            # Get time field from table view
-            desc_fields = arcpy.ListFields(temp_mdtable)
-            time_field = desc_fields[[field.name for field in \
-                desc_fields].index('time')]
-            # Create a table in the output location
-            arcpy.CreateTable_management(*os.path.split(output_filename))
-            # Add fields from temporary table except for time field, which
-            #   we add from the MakeNetCDFTableView
-            desc_fields = arcpy.ListFields(temp_table)
-            for index, field in enumerate(desc_fields):
-                if field.type != 'OID':
-                    if field.name == 'time':
-                        arcpy.AddField_management(output_filename, time_field.name, \
-                            time_field.type, time_field.precision, time_field.scale, \
-                            time_field.length, time_field.aliasName, \
-                            time_field.isNullable, time_field.required, \
-                            time_field.domain)
-                    else:
-                        arcpy.AddField_management(output_filename, field.name, \
-                            field.type, field.precision, field.scale, field.length, \
-                            field.aliasName, field.isNullable, field.required,
-                            field.domain)
-            arcpy.DeleteField_management(output_filename,"Field1")
-            # Create list of datetime objects from table view
-            time_arc = []
-            with arcpy.da.SearchCursor(temp_mdtable, 'time') as cursor:
-                for row in cursor:
-                    time_arc.append(row[0])
-            del cursor
-            # Get time variable from netCDF dataset
-            time_var = dataset.variable('time')[:].tolist()
-            # Loop through entries from temporary table
-            with arcpy.da.InsertCursor(output_filename, '*') as ins_cursor:
-                new_time_ind = ins_cursor.fields.index('time')
-                with arcpy.da.SearchCursor(temp_table, '*') as cursor:
-                    time_ind = cursor.fields.index('time')
-                    for row in cursor:
-                        new_row = list(row)
-                        new_row[new_time_ind] = \
-                            time_arc[time_var.index(row[time_ind])]
-                        ins_cursor.insertRow(tuple(new_row))
-            del ins_cursor
-            del cursor
-        else:
-            # Write table
-            if arcpy.env.overwriteOutput:
-                arcpy.Delete_management(output_filename)
-            arcpy.da.NumPyArrayToTable(struct[valid_indices], output_filename)
+        # Broadcast coordinates, zones, counts and statistics into columns
+        #   and fill the table column by column
+        keep = valid.ravel()
+        columns = mds.table.broadcast_columns(coordinates, zones)
+        columns.append(counts.ravel())
+        columns += [values[:, :, it].ravel() for it in range(len(stat_names))]
+        struct_dtype = dim_dims[:]
+        struct_dtype.append((str(zonefield_parameter.value), numpy.int))
+        struct_dtype.append(('COUNT', numpy.int))
+        struct_dtype += [(str(it), numpy.float) for it in stat_names]
+        struct = numpy.zeros((numpy.count_nonzero(keep),),
+            numpy.dtype(struct_dtype))
+        for name, column in zip(struct.dtype.names, columns):
+            struct[name] = column[keep]
+
+        # Write table
+        self.write_table(struct, dataset, var_name, output_filename, messages)
 
         return
 
@@ -968,32 +997,14 @@ class MultidimensionalZonalStatisticsAsTable(object):
                 not ispacked):
             type_changed = True
 
-        # Slice generator
-        # Adapted from: http://code.activestate.com/recipes/
-        #   502194-a-generator-for-an-arbitrary-number-of-for-loops/
-        # Originally written by Steven Bethard
-        def multi_for(iterables):
-            if not iterables:
-                yield ()
-            else:
-                if isinstance(iterables[0], collections.Iterable):
-                    for item in iterables[0]:
-                        for rest_tuple in multi_for(iterables[1:]):
-                            yield (item,) + rest_tuple
-                else:
-                    for rest_tuple in multi_for(iterables[1:]):
-                        yield (iterables[0],) + rest_tuple
-
         # Generate slice list
         dim_shape = arr_var.shape
         dim_name = arr_var.dimensions
-        dim_slices = []
         dim_dims = []
         dim_prod = 1
         for dim_index, dim_item in enumerate(dim_name):
             if dim_item != stat_variable:
                 dim_prod *= dim_shape[dim_index]
-                dim_slices.append(xrange(dim_shape[dim_index]))
                 dim_dims.append((str(dim_item), numpy.int))
 
         # Get position of statistic
@@ -1001,162 +1012,112 @@ class MultidimensionalZonalStatisticsAsTable(object):
 
         blstructcreated = False
 
-        def hstack_struct(arr1, arr2):
-            # Will only work correctly if arr1 and arr2 only have one record
-            dt = numpy.lib.recfunctions.zip_descr((arr1, arr2), flatten=True)
-            return numpy.array(arr1.tolist() + arr2.tolist(), dtype = dt)
-
         # Progress bar
         dim_prod *= len(zone_stations)
         arcpy.ResetProgressor()
         arcpy.SetProgressor('step', 'Calculating...', 0, dim_prod, 1)
 
-        # Loop through zones
+        # Loop through zones and slices
         index = 0
         valid_indices = []
-        for zone in zone_stations:
-
-            # Grab station indices associated with zone
-            zone_indices = zone_stations[zone]
-
-            # Loop through slices
-            for varslice in multi_for(dim_slices):
-
-                # Insert station indices into slice
-                varslice = list(varslice)
-                varslice.insert(stat_position, zone_indices)
-
-                # Take slice from data
-                if type_changed:
-                    arr_slice = arr_var[varslice].astype('f8')
-                else:
-                    arr_slice = arr_var[varslice]
-
-                # Create masked array
-                if hasattr(arr_slice, 'mask'):
-                    arr_mask = arr_slice.mask.copy()
+        for zone, varslice, arr_slice, result in \
+                self.zone_statistics_for_discrete(arr_var, zone_stations,
+                    stat_position, type_parameter.valueAsText,
+                    ignore_parameter.value, type_changed):
+
+            # Zones with NoData in them are dropped from table
+            if result is not None:
+
+                # Structure results into row
+                struct_data = []
+                for it_ind, it in enumerate(list(varslice)):
+                    if it_ind != stat_position:
+                        if dim_name[it_ind] in dataset.variable_names():
+                            # Dimension with variable
+                            struct_data.append(dataset.variable(dim_name[it_ind])[it])
+                        else:
+                            # Dimension without variable
+                            struct_data.append(it)
+                struct_data.append(zone)
+                struct_data.append(numpy.ma.count(arr_slice))
+                if numpy.isscalar(result):
+                    # Single-valued result
+                    struct_data.append(result)
                 else:
-                    arr_mask = numpy.ma.make_mask_none(arr_slice.shape)
-                    arr_slice = numpy.ma.asarray(arr_slice)
-
-                # Perform for zone when NoData is ignored
-                #   or when there is no NoData within zone
-                if ignore_parameter.value or (not numpy.any(arr_mask)):
-
-                    # Apply mask
-                    arr_slice.mask = arr_mask
-
-                    # Apply operator to zone masked slice
-                    result = self.calculate_statistic(arr_slice[:], \
-                        type_parameter.valueAsText)
-
-                    # Structure results into row
-                    struct_data = []
-                    for it_ind, it in enumerate(list(varslice)):
-                        if it_ind != stat_position:
-                            if dim_name[it_ind] in dataset.variable_names():
-                                # Dimension with variable
-                                struct_data.append(dataset.variable(dim_name[it_ind])[it])
-                            else:
-                                # Dimension without variable
-                                struct_data.append(it)
-                    struct_data.append(zone)
-                    struct_data.append(numpy.ma.count(arr_slice))
+                    # Multivalued result
+                    struct_data += [it2 for it in result.tolist() for it2 in it]
+
+                # Create table when necessary
+                if not blstructcreated:
+                    struct_dtype = dim_dims[:]
+                    struct_dtype.append((str(zonefield_parameter.value),numpy.int))
+                    struct_dtype.append(('COUNT', numpy.int))
                     if numpy.isscalar(result):
                         # Single-valued result
-                        struct_data.append(result)
+                        struct_dtype.append((str(type_parameter.valueAsText), \
+                            numpy.float))
                     else:
                         # Multivalued result
-                        struct_data += [it2 for it in result.tolist() for it2 in it]
-
-                    # Create table when necessary
-                    if not blstructcreated:
-                        struct_dtype = dim_dims[:]
-                        struct_dtype.append((str(zonefield_parameter.value),numpy.int))
-                        struct_dtype.append(('COUNT', numpy.int))
-                        if numpy.isscalar(result):
-                            # Single-valued result
-                            struct_dtype.append((str(type_parameter.valueAsText), \
-                                numpy.float))
-                        else:
-                            # Multivalued result
-                            struct_dtype += [(it, numpy.float) for it in list(
-                                result.dtype.names)]
-                        struct = numpy.zeros((dim_prod,), numpy.dtype(struct_dtype))
-                        blstructcreated = True
-
-                    # Insert row
-                    struct[index] = numpy.array(tuple(struct_data), \
-                        numpy.dtype(struct_dtype))
-                    valid_indices.append(index)
-                #else:
-                #    # Passing drops zones with NoData in them from table
-                #    pass
-                index += 1
-                arcpy.SetProgressorPosition()
+                        struct_dtype += [(it, numpy.float) for it in list(
+                            result.dtype.names)]
+                    struct = numpy.zeros((dim_prod,), numpy.dtype(struct_dtype))
+                    blstructcreated = True
+
+                # Insert row
+                struct[index] = numpy.array(tuple(struct_data), \
+                    numpy.dtype(struct_dtype))
+                valid_indices.append(index)
+            index += 1
+            arcpy.SetProgressorPosition()
 
         arcpy.ResetProgressor()
 
-        if 'time' in dim_name:
-            # Output zonal statistics to temporary table
-            temp_table = os.path.join(tempfile.gettempdir(), 'temp_table.dbf')
-            if arcpy.Exists(temp_table):
-                arcpy.Delete_management(temp_table)
-            arcpy.da.NumPyArrayToTable(struct[valid_indices], temp_table)
-            # Create table view of the time dimension from netCDF file
-            temp_mdtable = r"md_table"
-            arcpy.MakeNetCDFTableView_md(dataset_name, 'time', temp_mdtable, 'time')
-            # Get time field from table view
-            desc_fields = arcpy.ListFields(temp_mdtable)
-            time_field = desc_fields[[field.name for field in \
-                desc_fields].index('time')]
-            # Create a table in the output location
-            arcpy.CreateTable_management(*os.path.split(output_filename))
-            # Add fields from temporary table except for time field, which
-            #   we add from the MakeNetCDFTableView
-            desc_fields = arcpy.ListFields(temp_table)
-            for index, field in enumerate(desc_fields):
-                if field.type != 'OID':
-                    if field.name == 'time':
-                        arcpy.AddField_management(output_filename, time_field.name, \
-                            time_field.type, time_field.precision, time_field.scale, \
-                            time_field.length, time_field.aliasName, \
-                            time_field.isNullable, time_field.required, \
-                            time_field.domain)
-                    else:
-                        arcpy.AddField_management(output_filename, field.name, \
-                            field.type, field.precision, field.scale, field.length, \
-                            field.aliasName, field.isNullable, field.required,
-                            field.domain)
-            arcpy.DeleteField_management(output_filename,"Field1")
-            # Create list of datetime objects from table view
-            time_arc = []
-            with arcpy.da.SearchCursor(temp_mdtable, 'time') as cursor:
-                for row in cursor:
-                    time_arc.append(row[0])
-            del cursor
-            # Get time variable from netCDF dataset
-            time_var = dataset.variable('time')[:].tolist()
-            # Loop through entries from temporary table
-            with arcpy.da.InsertCursor(output_filename, '*') as ins_cursor:
-                new_time_ind = ins_cursor.fields.index('time')
-                with arcpy.da.SearchCursor(temp_table, '*') as cursor:
-                    time_ind = cursor.fields.index('time')
-                    for row in cursor:
-                        new_row = list(row)
-                        new_row[new_time_ind] = \
-                            time_arc[time_var.index(row[time_ind])]
-                        ins_cursor.insertRow(tuple(new_row))
-            del ins_cursor
-            del cursor
-        else:
-            # Write table
-            if arcpy.env.overwriteOutput:
-                arcpy.Delete_management(output_filename)
-            arcpy.da.NumPyArrayToTable(struct[valid_indices], output_filename)
+        # Write table
+        self.write_table(struct[valid_indices], dataset, var_name,
+            output_filename, messages)
 
         return
 
+    def time_coordinate_names(self, dataset, var_name):
+        """List of the time dimensions of 'var_name' with a coordinate
+        variable that has units, so its values can be converted to dates."""
+        names = list(dataset.time_dimension_names(var_name))
+        if 'time' not in names:
+            names.append('time')
+        dimensions = dataset.variable(var_name).dimensions
+        return [name for name in names if (name in dimensions) and (name in \
+            dataset.variable_names()) and hasattr(dataset.variable(name), 'units')]
+
+    def write_table(self, struct, dataset, var_name, output_filename,
+            messages):
+        """Writes the structured array 'struct' to 'output_filename' in
+        bulk.  Columns of time dimensions are converted to dates with one
+        look-up per distinct coordinate value."""
+        columns = collections.OrderedDict((name, struct[name]) for name in \
+            struct.dtype.names)
+        for name in self.time_coordinate_names(dataset, var_name):
+            if name not in columns:
+                continue
+            coords, inverse = numpy.unique(columns[name], return_inverse=True)
+            try:
+                dates = mds.netcdf.coordinates_to_dates(coords,
+                    dataset.variable(name))
+                dates = numpy.array([datetime.datetime(it.year, it.month,
+                    it.day, it.hour, it.minute, it.second) for it in \
+                    numpy.atleast_1d(dates)], 'datetime64[us]')
+            except ValueError:
+                # Calendar dates without a standard equivalent
+                messages.addWarningMessage(
+                    "Values of dimension {} written as coordinates".format(
+                    name))
+                continue
+            columns[name] = dates[inverse]
+        table = numpy.zeros(struct.shape, numpy.dtype([(name, column.dtype) \
+            for name, column in columns.items()]))
+        for name, column in columns.items():
+            table[name] = column
+        mds.table.write_table(table, output_filename)
+
     def get_variables_by_dimension(self, dataset, stat_name):
         """List of variables with dimension 'stat_name' and of integer, float,
         or boolean type."""
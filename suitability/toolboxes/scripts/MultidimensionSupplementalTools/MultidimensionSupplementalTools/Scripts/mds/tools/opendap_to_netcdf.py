@@ -3,7 +3,6 @@ import os.path
 import mds
 import mds.date_time
 import mds.messages
-import mds.netcdf.copy
 import time
 import netcdf_tool
 import arcpy
@@ -283,6 +282,34 @@ class OPeNDAPtoNetCDF(netcdf_tool.NetCDFTool):
             parameterType="Optional",
             direction="Input"))
         parameters[-1].filter.list = ["BY_VALUE", "BY_INDEX"]
+        parameters.append(arcpy.Parameter(
+            displayName="Compression",
+            name="compression",
+            datatype="GPString",
+            multiValue=False,
+            parameterType="Optional",
+            direction="Input"))
+        parameters[-1].filter.list = ["KEEP", "DEFLATE", "NONE"]
+        parameters[-1].value = "KEEP"
+        parameters.append(arcpy.Parameter(
+            displayName="Compression Level",
+            name="compression_level",
+            datatype="GPLong",
+            multiValue=False,
+            parameterType="Optional",
+            direction="Input"))
+        parameters[-1].filter.type = "Range"
+        parameters[-1].filter.list = [1, 9]
+        parameters[-1].value = 4
+        parameters.append(arcpy.Parameter(
+            displayName="Chunk Layout",
+            name="chunk_layout",
+            datatype="GPString",
+            multiValue=False,
+            parameterType="Optional",
+            direction="Input"))
+        parameters[-1].filter.list = ["KEEP", "MAP", "TIME_SERIES"]
+        parameters[-1].value = "KEEP"
 
         return parameters
 
@@ -298,12 +325,14 @@ class OPeNDAPtoNetCDF(netcdf_tool.NetCDFTool):
         extent_parameter = parameters[3]
         dimensions_parameter = parameters[4]
         value_selection_method_parameter = parameters[5]
+        compression_parameter = parameters[6]
+        compression_level_parameter = parameters[7]
         dataset = None
 
         # Try to open the dataset. Ignore errors.
         try:
             if not dataset_parameter is None:
-                dataset = mds.netcdf.Dataset(dataset_parameter.valueAsText,
+                dataset = mds.netcdf.open_dataset(dataset_parameter.valueAsText,
                     filter_out_nd_coordinates=True)
         except:
             pass
@@ -349,6 +378,10 @@ class OPeNDAPtoNetCDF(netcdf_tool.NetCDFTool):
                 value_selection_method_parameter.valueAsText,
                 variables_parameter)
 
+        # Compression level, only used when deflating.
+        compression_level_parameter.enabled = \
+            compression_parameter.valueAsText == "DEFLATE"
+
     def updateMessages(self,
             parameters):
         # Modify messages created by internal validation for each parameter.
@@ -370,7 +403,7 @@ class OPeNDAPtoNetCDF(netcdf_tool.NetCDFTool):
         # Dataset.
         if not dataset_parameter.value is None:
             try:
-                dataset = mds.netcdf.Dataset(dataset_parameter.valueAsText,
+                dataset = mds.netcdf.open_dataset(dataset_parameter.valueAsText,
                     filter_out_nd_coordinates=True)
             except RuntimeError, exception:
                 if "No such file or directory" in str(exception) or \
@@ -503,14 +536,32 @@ class OPeNDAPtoNetCDF(netcdf_tool.NetCDFTool):
         dimension_records = parameters[4].values
         value_selection_method = mds.SELECT_BY_VALUE if \
             parameters[5].valueAsText == "BY_VALUE" else mds.SELECT_BY_INDEX
+        # KEEP (or no value) keeps the storage settings of the source.
+        zlib = None
+        if parameters[6].valueAsText in ["DEFLATE", "NONE"]:
+            zlib = parameters[6].valueAsText == "DEFLATE"
+        complevel = 4 if parameters[7].value is None else \
+            int(parameters[7].value)
+        chunk_layout = None
+        if parameters[8].valueAsText in mds.CHUNK_LAYOUTS:
+            chunk_layout = mds.CHUNK_LAYOUTS[parameters[8].valueAsText]
         date_time_string = time.strftime("%m/%d/%Y %H:%M", time.localtime())
         history_message = mds.messages.OPENDAP_TO_NETCDF_HISTORY.format(
             date_time_string, dataset_name)
 
+        # The output file may still be open in the pool, e.g. after
+        # describing it. HDF5 refuses to overwrite an open file.
+        mds.netcdf.discard_dataset(output_filename)
+
         try:
-            dataset = mds.netcdf.Dataset(dataset_name,
+            dataset = mds.netcdf.acquire_dataset(dataset_name,
                 filter_out_nd_coordinates=True)
+        except RuntimeError, exception:
+            # Handle errors not detected by updateMessages.
+            messages.addErrorMessage(str(exception))
+            raise arcpy.ExecuteError
 
+        try:
             # Get rid of the variable names that are not part of the dataset.
             known_variable_names = \
                 variable_names & dataset.data_variable_names()
@@ -522,10 +573,12 @@ class OPeNDAPtoNetCDF(netcdf_tool.NetCDFTool):
                     mds.messages.VARIABLES_DO_NOT_EXIST.format(", ".join(
                         unknown_variable_names), "Input OPeNDAP Dataset"))
 
-            mds.netcdf.copy(dataset, known_variable_names, output_filename,
-                extent, dimension_records, value_selection_method,
-                history_message)
+            dataset.xcopy(known_variable_names, output_filename, extent,
+                dimension_records, value_selection_method, history_message,
+                zlib=zlib, complevel=complevel, chunk_layout=chunk_layout)
         except RuntimeError, exception:
             # Handle errors not detected by updateMessages.
             messages.addErrorMessage(str(exception))
             raise arcpy.ExecuteError
+        finally:
+            mds.netcdf.release_dataset(dataset)
@@ -21,14 +21,15 @@ Script works as follow;
     Gets the present time date in UTC
     Uses the OPeNDAP to NetCDF tool from Multidimension Supplimental Tool
     Downloads the specified variables into NetCDF format files and saves them in the relative location, based on where the script file is located.
-    The present data is removed from the Mosaic Dataset
     The new data is then loaded into the Mosiac Dataset
+    The slices replaced by the new forecast cycle, or before it, are removed from the Mosaic Dataset
 
 
 History:
 9/21/2015 - ab - original coding
 6/10/2016 - mf - Updates for dimension and formatting
 9/12/2016 - mf - fix for Python3 not liking leading zeros
+10/19/2026 - sync the mosaic datasets with the forecast files (MosaicSyncUtils.py) instead of reloading them
 '''
 
 #Import modules
@@ -42,6 +43,7 @@ from arcpy import env
 from datetime import datetime
 from datetime import time
 from datetime import timedelta
+import MosaicSyncUtils
 
 #Gets the current directory where the script is sitting so that everything else can work off relative paths.
 currentFolder = os.path.dirname(__file__)
@@ -62,7 +64,8 @@ geoExtent = "-126 32 -114 43"
 timeDimension = "time '2016-01-01 00:00:00' '2016-12-31 00:00:00'"
 
 # Processing flags
-REMOVE_EXISTING_RASTERS = True
+SYNC_MOSAICS = True # Only add the new forecast slices and remove the replaced or expired ones
+REMOVE_EXISTING_RASTERS = True # Empty the mosaic datasets before loading the new forecast when not syncing
 DEBUG = True # Extra messaging while debugging
 
 def makeOutputFilePath(topFolder, NetCDFData, stringDateNow, paramFN):
@@ -74,6 +77,12 @@ def makeOutputFilePath(topFolder, NetCDFData, stringDateNow, paramFN):
     outputWindDataFile = os.path.join(topFolder, NetCDFData, windDataFileName)
     return [outputOpDataFile, outputWindDataFile]
 
+def forecastFiles(topFolder, NetCDFData, wind):
+    '''Forecast files of all cycles downloaded to NetCDFData, op weather or wind'''
+    folder = os.path.join(topFolder, NetCDFData)
+    return [os.path.join(folder, fileName) for fileName in sorted(os.listdir(folder))
+            if fileName.startswith("nam") and fileName.endswith(".nc") and fileName.endswith("Wind.nc") == wind]
+
 def makeSourceURLPath(stringDateNow, paramDL):
     '''make the URL to the source forecast data'''
     return r"http://nomads.ncep.noaa.gov/dods/nam/nam%s/nam%s" % (stringDateNow, paramDL)
@@ -117,6 +126,17 @@ def download(stringDateNow, stringTimeNow, paramFN, paramDL):
     targetOpDataMosaic = os.path.join(topFolder, gdb, r"OperationalWeather.gdb\OperationalData") 
     targetWindDataMosaic = os.path.join(topFolder, gdb, r"OperationalWeather.gdb\OperationalWind")
 
+    if SYNC_MOSAICS:
+        # Add the slices of the new cycle, then remove the slices it replaces and those before it
+        cycleTime = datetime.strptime(stringDateNow, "%Y%m%d") + timedelta(hours=int(paramFN[3:5]))
+        print ("Syncing Operational Weather with the %s forecast..." % cycleTime)
+        MosaicSyncUtils.SyncMosaicDataset(targetOpDataMosaic, forecastFiles(topFolder, NetCDFData, False), "NetCDF",
+                                          MosaicSyncUtils.NetCDFSlices, cycleTime, False, True)
+        print ("Syncing Wind with the %s forecast..." % cycleTime)
+        MosaicSyncUtils.SyncMosaicDataset(targetWindDataMosaic, forecastFiles(topFolder, NetCDFData, True), "NetCDF",
+                                          MosaicSyncUtils.NetCDFSlices, cycleTime, False, True)
+        return
+
     # Remove Rasters From Mosaic Dataset
     if REMOVE_EXISTING_RASTERS:
         print ("Removing existing rasters from Operational Weather...")
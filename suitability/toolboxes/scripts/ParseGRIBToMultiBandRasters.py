@@ -28,6 +28,7 @@
 # ----------------------------------------------------------------------------
 # History: 
 # 3/27/2015 - mf - update for python 3 - tagged as #UPDATE2to3:
+# 10/19/2026 - read the degrib grids with NumPy and write each multiband raster at once (WeatherRasterUtils.py)
 #
 
 import arcpy
@@ -36,6 +37,7 @@ import sys
 import datetime, time, locale
 import subprocess
 import WeatherImportModule as wim
+import WeatherRasterUtils
 from arcpy import env
 
 inputfolder = arcpy.GetParameterAsText(0)
@@ -159,10 +161,16 @@ if datasetList:
         # generate the name of the output raster
         outName = wim.forecastGDBPath + "\\" + wim.weatherName + dt
         # generate the (multi-band) output raster
-        arcpy.AddMessage("Running arcpy.CompositeBands_management('" + str(rasterPaths) + "', '" + outName + "')")
-        # set the original processing extent (degrib sometimes adds an empty column)
-        arcpy.env.extent = gribExt
-        arcpy.CompositeBands_management(rasterPaths, outName)
+        if rasterPaths and all([rasterPath.lower().endswith(".asc") for rasterPath in rasterPaths]):
+            # read the grids and write all the bands at once, cropped to the original extent (degrib sometimes adds an empty column)
+            arcpy.AddMessage("Writing " + str(rasterPaths) + " to " + outName)
+            WeatherRasterUtils.AsciiGridsToMultiBandRaster(rasterPaths, outName,
+                                                           (gribExt.XMin, gribExt.YMin, gribExt.XMax, gribExt.YMax))
+        else:
+            arcpy.AddMessage("Running arcpy.CompositeBands_management('" + str(rasterPaths) + "', '" + outName + "')")
+            # set the original processing extent (degrib sometimes adds an empty column)
+            arcpy.env.extent = gribExt
+            arcpy.CompositeBands_management(rasterPaths, outName)
 
 # Reload the Mosaic Dataset with the newly created forecast data
 arcpy.AddMessage("")
@@ -22,6 +22,7 @@
 # ----------------------------------------------------------------------------
 # History:
 # 3/27/2015 - mf - Update for Python 3 - tagged as #UPDATE2to3:
+# 10/19/2026 - read the variables with netCDF4 and write each multiband raster at once (WeatherRasterUtils.py)
 
 import arcpy
 import os
@@ -29,6 +30,7 @@ import sys
 import collections
 import datetime, time, locale
 import WeatherImportModule as wim
+import WeatherRasterUtils
 from arcpy import env
 
 inNetCDF = arcpy.GetParameterAsText(0)
@@ -72,9 +74,8 @@ for var in vars:
     if stdvar.lower() == longVar.lower() or stdvar.lower() == longVar[0:2].lower(): longVar = var
     if stdvar.lower() == timeVar.lower(): timeVar = var
 
-# Set up an empty list to hold the NetCDF Raster Layers that will form our bands (each band will represent a weather variable)
-rasterBands = []
-nullRaster = None
+# Set up an empty list to hold the NetCDF variables that will form our bands (each band will represent a weather variable)
+bandVariables = []
 # Get the weather variables available in the NetCDF file
 ncdfVars = ncFP.getVariablesByDimension(timeVar)
 # Loop through an (ordered) dict of weather terms from the NetCDF variable mapping configuration table
@@ -111,10 +112,8 @@ for ncdfVar, maowVar in list(wim.weatherTerms.items()):
                 fileVar = var
                 break
     if fileVar != None:
-        # We've found a weather variable of interest to us within the NetCDF file, so...
-        # now call Make NetCDF Raster Layer, passing lat,lon and the var, and append it to a list of rasters that will form our raster bands
-        arcpy.AddMessage("Making NetCDF Raster Layer with " + inNetCDF + ", " + var + ", " + longVar + ", " + latVar + ", " + maowVar)
-        rasterBands.append(arcpy.MakeNetCDFRasterLayer_md(inNetCDF, var, longVar, latVar, maowVar))
+        # We've found a weather variable of interest to us within the NetCDF file, so append it to the list of our raster bands
+        bandVariables.append((fileVar, maowVar))
         # keep track of the weather variables that are available for generating derivatives
         wim.WeatherVarAvailableForDerivatives(maowVar)
 ##    else:
@@ -131,32 +130,51 @@ for ncdfVar, maowVar in list(wim.weatherTerms.items()):
 ##        arcpy.AddMessage("Setting empty raster" + suffix)
 ##        rasterBands.append(nullRaster)
 
-# Now loop through each time dimentsion
-for i in range(0, ncFP.getDimensionSize(timeVar)):
-    arcpy.AddMessage("Looping through time")
-    ncTimeValue = ncFP.getDimensionValue(timeVar, i)
-    arcpy.AddMessage(ncTimeValue)
-    arcpy.AddMessage("formatting the date")
-    locale.setlocale(locale.LC_TIME, '')
-    try:
-        dt = time.strptime(ncTimeValue, "%c")
-    except:
-        # if the time is midnight, the time portion of the date string may be missing
-        dt = time.strptime(ncTimeValue, "%x")
-    arcpy.AddMessage("got the date...")
-    strDate = time.strftime("%Y%m%dT%H%M", dt)
-    arcpy.AddMessage(strDate)
-
-    for rast in rasterBands:
-        if rast != nullRaster:
-            # call Select by Dimension tool to alter the raster layer visible dimension of each weather variable to be that of the time of interest
-            arcpy.SelectByDimension_md(rast,[[timeVar, ncTimeValue]],"BY_VALUE")       
-
-    # generate the name of the output raster
-    outName = wim.forecastGDBPath + "\\" + wim.weatherName + strDate
-    # generate the (multi-band) output raster
-    arcpy.AddMessage("Running arcpy.CompositeBands_management('" + str(rasterBands) + "', '" + outName + "')")
-    arcpy.CompositeBands_management(rasterBands, outName)
+try:
+    import netCDF4
+except ImportError:
+    netCDF4 = None
+
+if netCDF4 != None:
+    # Read each variable's time stack once and write all the bands of each time step at once
+    arcpy.AddMessage("Writing rasters of " + str([maowVar for fileVar, maowVar in bandVariables]) + " for each time step")
+    WeatherRasterUtils.NetCDFToMultiBandRasters(inNetCDF, [fileVar for fileVar, maowVar in bandVariables], timeVar,
+                                                latVar, longVar, wim.forecastGDBPath, wim.weatherName)
+else:
+    arcpy.AddMessage("netCDF4 is not available, compositing NetCDF raster layers for each time step")
+    # call Make NetCDF Raster Layer, passing lat,lon and the var, for each of our raster bands
+    rasterBands = []
+    nullRaster = None
+    for fileVar, maowVar in bandVariables:
+        arcpy.AddMessage("Making NetCDF Raster Layer with " + inNetCDF + ", " + fileVar + ", " + longVar + ", " + latVar + ", " + maowVar)
+        rasterBands.append(arcpy.MakeNetCDFRasterLayer_md(inNetCDF, fileVar, longVar, latVar, maowVar))
+
+    # Now loop through each time dimentsion
+    for i in range(0, ncFP.getDimensionSize(timeVar)):
+        arcpy.AddMessage("Looping through time")
+        ncTimeValue = ncFP.getDimensionValue(timeVar, i)
+        arcpy.AddMessage(ncTimeValue)
+        arcpy.AddMessage("formatting the date")
+        locale.setlocale(locale.LC_TIME, '')
+        try:
+            dt = time.strptime(ncTimeValue, "%c")
+        except:
+            # if the time is midnight, the time portion of the date string may be missing
+            dt = time.strptime(ncTimeValue, "%x")
+        arcpy.AddMessage("got the date...")
+        strDate = time.strftime("%Y%m%dT%H%M", dt)
+        arcpy.AddMessage(strDate)
+
+        for rast in rasterBands:
+            if rast != nullRaster:
+                # call Select by Dimension tool to alter the raster layer visible dimension of each weather variable to be that of the time of interest
+                arcpy.SelectByDimension_md(rast,[[timeVar, ncTimeValue]],"BY_VALUE")       
+
+        # generate the name of the output raster
+        outName = wim.forecastGDBPath + "\\" + wim.weatherName + strDate
+        # generate the (multi-band) output raster
+        arcpy.AddMessage("Running arcpy.CompositeBands_management('" + str(rasterBands) + "', '" + outName + "')")
+        arcpy.CompositeBands_management(rasterBands, outName)
 
 arcpy.AddMessage("Finished importing rasters from NetCDF file")
 
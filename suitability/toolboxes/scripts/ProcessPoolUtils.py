@@ -0,0 +1,104 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+ProcessPoolUtils.py
+--------------------------------------------------
+requirements: ArcGIS 10.3.1+, ArcGIS Pro 1.2+
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: Process pool helpers shared by the *Utils modules of this
+toolbox: starting a multiprocessing pool from inside ArcMap/ArcGIS Pro,
+making per process scratch geodatabases and trimming on-disk caches.
+The visibility, suitability and data management toolboxes ship
+identical copies of this module; CCMUtilsTestCase and
+GPXUtilsTestCase check that they match.
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import time
+import shutil
+import multiprocessing
+import arcpy
+
+def PythonExecutable():
+    ''' the python interpreter for worker processes when running inside ArcMap/ArcGIS Pro '''
+    for name in ["pythonw.exe", "python.exe"]:
+        candidate = os.path.join(sys.exec_prefix, name)
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+def StartPool(processes, initializer=None, initargs=()):
+    ''' a process pool, started with the ArcGIS python interpreter when needed '''
+    executable = PythonExecutable()
+    if executable and os.path.basename(sys.executable).lower() not in ["python.exe", "pythonw.exe"]:
+        multiprocessing.set_executable(executable)
+    return multiprocessing.Pool(processes, initializer, initargs)
+
+def ScratchGDB(workFolder, prefix):
+    ''' a file geodatabase, <prefix>_<pid>.gdb, for this process in workFolder '''
+    name = prefix + "_" + str(os.getpid()) + ".gdb"
+    gdb = os.path.join(workFolder, name)
+    if not arcpy.Exists(gdb):
+        arcpy.CreateFileGDB_management(workFolder, name)
+    return gdb
+
+def PruneCache(cacheFolder, maxBytes, maxAge=None):
+    '''
+    Trim the entries (files or folders) of cacheFolder, least recently
+    modified first, until they add up to at most maxBytes. Entries older
+    than maxAge seconds are removed regardless. Returns the number of
+    entries removed.
+    '''
+    if not os.path.isdir(cacheFolder):
+        return 0
+    entries = []
+    for name in os.listdir(cacheFolder):
+        path = os.path.join(cacheFolder, name)
+        try:
+            if os.path.isdir(path):
+                size = 0
+                for folder, folders, files in os.walk(path):
+                    size += sum([os.path.getsize(os.path.join(folder, f)) for f in files])
+            else:
+                size = os.path.getsize(path)
+            entries.append((os.path.getmtime(path), size, path))
+        except OSError:
+            pass # removed by another process
+    entries.sort()
+    total = sum([size for modified, size, path in entries])
+    oldest = None if maxAge is None else time.time() - maxAge
+    removed = 0
+    for modified, size, path in entries:
+        if total <= maxBytes and (oldest is None or modified >= oldest):
+            continue
+        if os.path.isdir(path):
+            shutil.rmtree(path, True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        total -= size
+        removed += 1
+    return removed
@@ -23,6 +23,7 @@
 # -----------------------------------------------------------------------------
 # History:
 # 3/27/2015 - mf - Updated for Python 3 - tagged as #UPDATE2to3:
+# 10/19/2026 - ReloadMD syncs only new, re-imported and removed rasters (MosaicSyncUtils.py), pFullReload empties and reloads
 #
 
 import arcpy
@@ -30,6 +31,7 @@ import os
 import sys
 import collections
 import locale
+import MosaicSyncUtils
 
 toolboxesPath = ""
 scratchFolder = ""
@@ -273,30 +275,44 @@ def CreateEmptyRaster():
         return scratchFolder + "\\EmptyRaster.tif"
     return scratchFolder + "\\EmptyRaster.tif"
 
-def ReloadMD():
-    # Empty the mosaic dataset prior to reloading it
-    arcpy.AddMessage("Removing previous forecast data from mosaic dataset...")
-    arcpy.RemoveRastersFromMosaicDataset_management(inputMD, "1=1")
-    # Add the rasters to the mosaic dataset
-    arcpy.AddMessage("Adding new forecast data to mosaic dataset...")
-    arcpy.AddRastersToMosaicDataset_management(inputMD, "Raster Dataset", forecastGDBPath)
-    # Check something was imported
-    result = int(arcpy.GetCount_management(inputMD).getOutput(0))
-    if result > 0:
+def ReloadMD(pFullReload=False):
+    # Bring the mosaic dataset up to date with the rasters in the forecast geodatabase. By default only
+    # re-imported or new rasters are added and rasters no longer in the geodatabase are removed, after
+    # the new ones are in place, so the mosaic dataset stays queryable while it updates
+    if pFullReload:
+        # Empty the mosaic dataset prior to reloading it
+        arcpy.AddMessage("Removing previous forecast data from mosaic dataset...")
+        arcpy.RemoveRastersFromMosaicDataset_management(inputMD, "1=1")
+        # Add the rasters to the mosaic dataset
+        arcpy.AddMessage("Adding new forecast data to mosaic dataset...")
+        arcpy.AddRastersToMosaicDataset_management(inputMD, "Raster Dataset", forecastGDBPath)
+        newItems = "Category = 1"
+        # Check something was imported
+        changed = int(arcpy.GetCount_management(inputMD).getOutput(0)) > 0
+    else:
+        arcpy.AddMessage("Synchronizing mosaic dataset with the imported forecast data...")
+        arcpy.env.workspace = forecastGDBPath
+        rasters = [os.path.join(forecastGDBPath, raster) for raster in arcpy.ListRasters()]
+        added, removed = MosaicSyncUtils.SyncMosaicDataset(inputMD, rasters, "Raster Dataset")
+        newItems = "Category = 1 AND OBJECTID >= " + str(min(added)) if added else ""
+        changed = bool(added or removed)
+    if changed:
         # Re-calculate statistics on the mosaic dataset
         arcpy.AddMessage("Calculating statistics on the newly loaded mosaic dataset")
         arcpy.CalculateStatistics_management(inputMD)
         # Re-build overviews on the mosaic dataset
         #arcpy.AddMessage("Building overviews on the mosaic dataset")
         #arcpy.BuildOverviews_management(inputMD)
-        # Calculate the time fields on the mosaic dataset
+    if newItems:
+        # Calculate the time fields on the new items of the mosaic dataset
         arcpy.AddMessage("Calculating the time fields on the mosaic dataset")
         locale.setlocale(locale.LC_TIME, '')
         mdLayer = "mdLayer"
-        arcpy.MakeMosaicLayer_management(inputMD, mdLayer, "Category = 1") # Leave out overviews - only calculate fields on primary rasters
+        arcpy.MakeMosaicLayer_management(inputMD, mdLayer, newItems) # Leave out overviews - only calculate fields on primary rasters
         arcpy.CalculateField_management(mdLayer, dateForecastImportedField, """time.strftime("%c")""", "PYTHON","#")
         arcpy.CalculateField_management(mdLayer, dateForecastEffectiveFromField, """time.strftime("%c", time.strptime(!Name!,""" + "\"" + weatherName + """%Y%m%dT%H%M"))""", "PYTHON", "#")
         arcpy.CalculateField_management(mdLayer, dateForecastEffectiveToField, "!" + dateForecastEffectiveFromField + "!", "PYTHON", "#")
+        arcpy.Delete_management(mdLayer)
 
         # Now *** deal with all the referenced mosaic datasets that hang off this one - recalc stats, overviews etc ***
 
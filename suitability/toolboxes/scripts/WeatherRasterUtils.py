@@ -0,0 +1,248 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+WeatherRasterUtils.py
+--------------------------------------------------
+requirements: ArcGIS 10.3.1+, ArcGIS Pro 1.2+, NumPy, netCDF4 (NetCDF)
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: Multiband forecast raster writer for
+ParseNetCDFToMultiBandRasters.py and ParseGRIBToMultiBandRasters.py.
+The time stack of each weather variable is read from the netCDF file
+with netCDF4 in blocks of time steps, and the raster of each time step
+is written with all its bands (one per weather variable) in a single
+NumPyArrayToRaster call, with no per-time NetCDF raster layers or
+temporary rasters to composite. The rasters get the spatial reference of
+the CF grid mapping variable of the netCDF file, WGS 1984 when it has
+none. GRIB grids extracted by degrib are read into NumPy the same way.
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import numpy
+import arcpy
+
+# NoData of the forecast rasters
+weatherNoData = -9999.0
+
+# largest number of values of all bands read at once
+maxBlockValues = 50000000
+
+class WeatherGrid:
+    ''' the cells of a north-up longitude/latitude grid '''
+
+    def __init__(self, west, south, cellWidth, cellHeight, rows, cols):
+        self.west = west
+        self.south = south
+        self.cellWidth = cellWidth
+        self.cellHeight = cellHeight
+        self.rows = rows
+        self.cols = cols
+
+    def lowerLeft(self):
+        return arcpy.Point(self.west, self.south)
+
+def CoordinateGrid(lon, lat):
+    '''
+    WeatherGrid of cell center coordinates lon and lat (1D, evenly spaced),
+    and whether the rows must be flipped to be north-up
+    '''
+    lon = numpy.asarray(lon, dtype=float)
+    lat = numpy.asarray(lat, dtype=float)
+    cellWidth = abs(lon[-1] - lon[0]) / max(len(lon) - 1, 1) if len(lon) > 1 else 1.0
+    cellHeight = abs(lat[-1] - lat[0]) / max(len(lat) - 1, 1) if len(lat) > 1 else 1.0
+    grid = WeatherGrid(lon.min() - cellWidth / 2.0, lat.min() - cellHeight / 2.0,
+                       cellWidth, cellHeight, len(lat), len(lon))
+    return grid, len(lat) > 1 and lat[0] < lat[-1]
+
+def TimeStepsPerBlock(bands, rows, cols, budget=maxBlockValues):
+    ''' time steps of all bands that fit in budget values '''
+    return max(1, int(budget // max(bands * rows * cols, 1)))
+
+def SaveMultiBandRaster(bands, grid, outputRaster, spatialReference=None):
+    '''
+    Write bands (a (bands, rows, cols) array, NoData as NaN or
+    weatherNoData) to outputRaster in one NumPyArrayToRaster call, in
+    spatialReference (WGS 1984 when None)
+    '''
+    bands = numpy.asarray(bands, dtype=numpy.float32)
+    bands = numpy.where(numpy.isnan(bands), weatherNoData, bands).astype(numpy.float32)
+    if bands.shape[0] == 1:
+        bands = bands[0]
+    if arcpy.Exists(outputRaster):
+        arcpy.Delete_management(outputRaster)
+    raster = arcpy.NumPyArrayToRaster(bands, grid.lowerLeft(), grid.cellWidth, grid.cellHeight, weatherNoData)
+    raster.save(outputRaster)
+    if spatialReference is None:
+        spatialReference = arcpy.SpatialReference(4326)
+    if spatialReference.name != "Unknown":
+        arcpy.DefineProjection_management(outputRaster, spatialReference)
+    return outputRaster
+
+def _readStack(variable, timeVar, latVar, lonVar, first, last):
+    ''' (times, lat, lon) float array of a netCDF4 variable, masked values as NaN '''
+    dimensions = list(variable.dimensions)
+    index = []
+    for dimension in dimensions:
+        if dimension == timeVar:
+            index.append(slice(first, last))
+        elif dimension in (latVar, lonVar):
+            index.append(slice(None))
+        else:
+            # as Make NetCDF Raster Layer, the first value of any other dimension
+            index.append(0)
+    values = variable[tuple(index)]
+    if numpy.ma.isMaskedArray(values):
+        values = values.astype(float).filled(numpy.nan)
+    values = numpy.asarray(values, dtype=float)
+    kept = [dimension for dimension in dimensions if dimension in (timeVar, latVar, lonVar)]
+    return values.transpose([kept.index(timeVar), kept.index(latVar), kept.index(lonVar)])
+
+def _geographic(mapping):
+    ''' geographic spatial reference of a CF latitude_longitude grid mapping, WGS 1984 without an ellipsoid '''
+    semiMajor = getattr(mapping, "semi_major_axis", getattr(mapping, "earth_radius", None))
+    if semiMajor is None:
+        return arcpy.SpatialReference(4326)
+    inverseFlattening = getattr(mapping, "inverse_flattening", None)
+    semiMinor = getattr(mapping, "semi_minor_axis", None)
+    if inverseFlattening is None:
+        if semiMinor is None or float(semiMinor) == float(semiMajor):
+            inverseFlattening = 0.0 # sphere
+        else:
+            inverseFlattening = float(semiMajor) / (float(semiMajor) - float(semiMinor))
+    sr = arcpy.SpatialReference()
+    sr.loadFromString('GEOGCS["GCS_Grid_Mapping",DATUM["D_Grid_Mapping",' +
+                      'SPHEROID["S_Grid_Mapping",' + repr(float(semiMajor)) + ',' + repr(float(inverseFlattening)) + ']],' +
+                      'PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]]')
+    return sr
+
+def GridMappingSpatialReference(dataset, variables):
+    '''
+    Spatial reference of the CF grid mapping variable of the first of
+    variables that has one: its WKT (crs_wkt, spatial_ref or
+    esri_pe_string), EPSG code or latitude_longitude ellipsoid. WGS 1984
+    when there is no grid mapping or it cannot be read.
+    '''
+    for name in variables:
+        mappingName = getattr(dataset.variables[name], "grid_mapping", None)
+        if not mappingName or str(mappingName) not in dataset.variables:
+            continue
+        mapping = dataset.variables[str(mappingName)]
+        for attribute in ["crs_wkt", "spatial_ref", "esri_pe_string"]:
+            wkt = getattr(mapping, attribute, None)
+            if wkt:
+                sr = arcpy.SpatialReference()
+                sr.loadFromString(str(wkt))
+                return sr
+        code = getattr(mapping, "epsg_code", None)
+        if code:
+            return arcpy.SpatialReference(int(str(code).split(":")[-1]))
+        if getattr(mapping, "grid_mapping_name", "") == "latitude_longitude":
+            return _geographic(mapping)
+        arcpy.AddWarning("Grid mapping " + str(mappingName) + " has no WKT or EPSG code, using WGS 1984")
+        break
+    return arcpy.SpatialReference(4326)
+
+def ForecastTimes(dataset, timeVar):
+    ''' "%Y%m%dT%H%M" names of the time steps of a netCDF4 dataset '''
+    import netCDF4
+    times = dataset.variables[timeVar]
+    dates = netCDF4.num2date(times[:], times.units, getattr(times, "calendar", "standard"))
+    return [date.strftime("%Y%m%dT%H%M") for date in numpy.atleast_1d(dates)]
+
+def NetCDFToMultiBandRasters(netCDFFile, bandVariables, timeVar, latVar, lonVar, outputWorkspace, namePrefix):
+    '''
+    Write a multiband raster for each time step of netCDFFile to
+    outputWorkspace, named namePrefix and the time ("%Y%m%dT%H%M"), with a
+    band for each of the bandVariables. Each variable is read once per
+    block of time steps. Returns the output rasters.
+    '''
+    import netCDF4
+    dataset = netCDF4.Dataset(netCDFFile, "r")
+    try:
+        dataset.set_auto_maskandscale(True)
+        grid, flip = CoordinateGrid(dataset.variables[lonVar][:], dataset.variables[latVar][:])
+        spatialReference = GridMappingSpatialReference(dataset, bandVariables)
+        names = ForecastTimes(dataset, timeVar)
+        step = TimeStepsPerBlock(len(bandVariables), grid.rows, grid.cols)
+        outputs = []
+        for first in range(0, len(names), step):
+            last = min(first + step, len(names))
+            arcpy.AddMessage("Reading time steps " + str(first + 1) + " to " + str(last) + " of " + str(len(names)))
+            stack = numpy.empty((last - first, len(bandVariables), grid.rows, grid.cols), dtype=numpy.float32)
+            for band, variable in enumerate(bandVariables):
+                values = _readStack(dataset.variables[variable], timeVar, latVar, lonVar, first, last)
+                stack[:, band] = values[:, ::-1] if flip else values
+            for offset in range(last - first):
+                outputRaster = os.path.join(outputWorkspace, namePrefix + names[first + offset])
+                arcpy.AddMessage("Writing " + outputRaster)
+                outputs.append(SaveMultiBandRaster(stack[offset], grid, outputRaster, spatialReference))
+        return outputs
+    finally:
+        dataset.close()
+
+def ReadAsciiGrid(path):
+    ''' (WeatherGrid, values) of an ESRI ASCII grid, NoData as NaN '''
+    header = {}
+    with open(path) as ascii:
+        for line in ascii:
+            fields = line.split()
+            if not fields or not fields[0][0].isalpha():
+                break
+            header[fields[0].lower()] = float(fields[1])
+        values = numpy.loadtxt(path, skiprows=len(header), ndmin=2)
+    cellSize = header["cellsize"]
+    west = header.get("xllcorner", header.get("xllcenter", 0.0) - cellSize / 2.0)
+    south = header.get("yllcorner", header.get("yllcenter", 0.0) - cellSize / 2.0)
+    if "nodata_value" in header:
+        values[values == header["nodata_value"]] = numpy.nan
+    return WeatherGrid(west, south, cellSize, cellSize, values.shape[0], values.shape[1]), values
+
+def CropToExtent(grid, values, xmin, ymin, xmax, ymax):
+    ''' the cells of a grid (and its values) with their centers in an extent '''
+    cols = numpy.arange(grid.cols)
+    rows = numpy.arange(grid.rows)
+    x = grid.west + (cols + 0.5) * grid.cellWidth
+    y = grid.south + (grid.rows - rows - 0.5) * grid.cellHeight
+    keepCols = cols[(x >= xmin) & (x <= xmax)]
+    keepRows = rows[(y >= ymin) & (y <= ymax)]
+    if not len(keepCols) or not len(keepRows):
+        return grid, values
+    cropped = WeatherGrid(grid.west + keepCols[0] * grid.cellWidth,
+                          grid.south + (grid.rows - keepRows[-1] - 1) * grid.cellHeight,
+                          grid.cellWidth, grid.cellHeight, len(keepRows), len(keepCols))
+    return cropped, values[keepRows[0]:keepRows[-1] + 1, keepCols[0]:keepCols[-1] + 1]
+
+def AsciiGridsToMultiBandRaster(asciiGrids, outputRaster, extent=None):
+    '''
+    Write the ASCII grids (on the same grid) as the bands of outputRaster,
+    cropped to extent (xmin, ymin, xmax, ymax) when given, in the spatial
+    reference of the first grid
+    '''
+    bands = []
+    grid = None
+    for path in asciiGrids:
+        grid, values = ReadAsciiGrid(path)
+        if extent is not None:
+            grid, values = CropToExtent(grid, values, *extent)
+        bands.append(values)
+    return SaveMultiBandRaster(numpy.array(bands), grid, outputRaster,
+                               arcpy.Describe(asciiGrids[0]).spatialReference)
@@ -36,6 +36,23 @@ repoPath = os.path.dirname(os.path.dirname(currentPath))
 ''' Log Path: the folder where the log files go wild and multiply '''
 logPath = os.path.normpath(os.path.join(currentPath, r"log")) # should go to .\solutions-geoprocessing-toolbox\utils\test\log
 
+''' Test data: an optional local folder with the test data geodatabases (or their zip
+files) by name, used instead of downloading, and the cache of downloaded zip files
+(see DataDownload.py). Set with the SGT_TEST_DATA and SGT_DATA_CACHE environment
+variables or the TestRunner.py --data and --cache options. '''
+testDataPath = os.environ.get("SGT_TEST_DATA")
+dataCachePath = os.environ.get("SGT_DATA_CACHE", os.path.normpath(os.path.join(currentPath, r"data_cache")))
+
+''' Scratch: name of the scratch geodatabases created by the tests, which is unique per
+worker process when TestRunner.py runs tests in parallel '''
+scratchGDBName = "scratch.gdb"
+scratchPath = os.path.normpath(os.path.join(currentPath, r"scratch"))
+
+''' Test durations: per-test durations of the last run, used to start the slowest test
+classes first when running in parallel, and the number of slowest tests reported '''
+durationsPath = os.path.normpath(os.path.join(logPath, r"test_durations.json"))
+slowestTestCount = 10
+
 ''' Capability Paths'''
 capabilityPath = os.path.normpath(os.path.join(currentPath, r"capability_tests"))
 
@@ -13,22 +13,31 @@
 # limitations under the License.
 #-----------------------------------------------------------------------------
 # DataDownload.py
-# Description: This script downloads sample data from ArcGIS Online, temporarily
-# saves the zip file, extracts the zip to the target location, then deletes the 
-# temporary zip file. 
+# Description: This script resolves sample data for the tests and extracts it
+# to the target location. The data is taken from a local test data folder when
+# one is configured, from the local download cache, or else downloaded from
+# ArcGIS Online into the cache. Cached zip files are stored by the SHA-256 of
+# their content, so a run doesn't repeat a download.
 # Requirements: ArcGIS Desktop Standard
 # ----------------------------------------------------------------------------
 #
 # ==================================================
 # history:
 # 12/01/2015 - JH - creation
+# 10/19/2026 - local test data folder, content-addressed download cache and
+#              a lock so parallel test workers extract data once
 # ==================================================
 
 import arcpy
 import os
 import sys
+import time
+import errno
+import shutil
+import hashlib
 import logging
 import zipfile
+import contextlib
 import UnitTestUtilities
 import Configuration
 
@@ -72,23 +81,108 @@ def deleteZip(tempFile):
     ''' Delete the data zip file '''
     os.remove(tempFile)
     
+def fileHash(filePath):
+    ''' SHA-256 of the content of a file '''
+    digest = hashlib.sha256()
+    with open(filePath, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cacheIndexPath(url):
+    ''' Path of the cache index file holding the content hash of the zip file from the url '''
+    urlHash = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return os.path.join(Configuration.dataCachePath, "urls", urlHash + ".txt")
+
+def cacheObjectPath(contentHash):
+    ''' Path of the cached zip file with the given content hash '''
+    return os.path.join(Configuration.dataCachePath, "objects", contentHash + ".zip")
+
+def getCachedZip(url):
+    ''' Return the cached zip file downloaded from the url, or None if it is not
+    in the cache or its content doesn't match its hash '''
+    indexPath = cacheIndexPath(url)
+    if not os.path.exists(indexPath):
+        return None
+    with open(indexPath, 'r') as f:
+        contentHash = f.read().strip()
+    zipFile = cacheObjectPath(contentHash)
+    if not os.path.exists(zipFile) or fileHash(zipFile) != contentHash:
+        return None
+    return zipFile
+
+def saveOnlineDataToCache(url):
+    ''' Download the zip file from the url into the cache and return its cached path '''
+    for folder in ["urls", "objects"]:
+        UnitTestUtilities.makeFolderFromPath(os.path.join(Configuration.dataCachePath, folder))
+    tempFile = os.path.join(Configuration.dataCachePath, "objects", "download_" + str(os.getpid()) + ".tmp")
+    print("Downloading " + url)
+    saveOnlineDataAsZip(url, tempFile)
+    contentHash = fileHash(tempFile)
+    zipFile = cacheObjectPath(contentHash)
+    try:
+        os.rename(tempFile, zipFile)
+    except OSError:
+        # already cached by another worker
+        deleteZip(tempFile)
+    with open(cacheIndexPath(url), 'w') as f:
+        f.write(contentHash)
+    return zipFile
+
+def getLocalData(gdbName):
+    ''' Return the folder or zip file of gdbName in the local test data folder, or None '''
+    if not Configuration.testDataPath:
+        return None
+    for candidate in [gdbName, gdbName + ".zip"]:
+        localPath = os.path.join(Configuration.testDataPath, candidate)
+        if os.path.exists(localPath):
+            return localPath
+    return None
+
+@contextlib.contextmanager
+def fileLock(lockPath, timeout=3600):
+    ''' Hold an exclusive lock file while data is resolved, so test workers running in
+    parallel don't download or extract the same data at the same time '''
+    start = time.time()
+    while True:
+        try:
+            fd = os.open(lockPath, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+            if time.time() - start > timeout:
+                raise Exception("Timed out waiting for lock: " + lockPath)
+            time.sleep(1)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        os.remove(lockPath)
+
 def runDataDownload(basePath, gdbName, url):
-    ''' Download and extract the geodatabase with specified gdbName from the given url to the basePath's data folder '''
+    ''' Resolve and extract the geodatabase with specified gdbName to the basePath's data folder.
+    The data comes from the local test data folder if it has it, else from the zip file from
+    the given url in the download cache, which is downloaded if it isn't cached yet. '''
     dataPath = createDataFolder(basePath)
     gdbPath = os.path.normpath(os.path.join(dataPath, gdbName))
-    exists = UnitTestUtilities.folderPathsExist([gdbPath])
-        
-    if not exists:
-        zipName = gdbName + ".zip"
-        print("Zip Name: " + zipName)
-        zipFile = saveOnlineDataAsZip(url, zipName)
-        print("Extracting zip...")
-        extractDataZip(zipFile, dataPath)
-        print("Deleting zip...")
-        deleteZip(zipFile)
-        message = "Downloaded {0} to {1}".format(gdbName, dataPath)
-        print(message)
-        Configuration.Logger.info(message)
-        
+
+    with fileLock(gdbPath + ".lock"):
+        exists = UnitTestUtilities.folderPathsExist([gdbPath])
+        if not exists:
+            source = getLocalData(gdbName)
+            if source is None:
+                source = getCachedZip(url)
+            if source is None:
+                source = saveOnlineDataToCache(url)
+            if os.path.isdir(source):
+                print("Copying " + source + "...")
+                shutil.copytree(source, gdbPath)
+            else:
+                print("Extracting " + source + "...")
+                extractDataZip(source, dataPath)
+            message = "Resolved {0} to {1} from {2}".format(gdbName, dataPath, source)
+            print(message)
+            Configuration.Logger.info(message)
+
     return dataPath
-    
\ No newline at end of file
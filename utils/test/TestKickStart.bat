@@ -31,6 +31,7 @@ rem  10/06/2015 - MF - placeholder
 rem  10/30/2015 - MF - tests running
 rem  12/01/2015 - JH - added parameter for default log file name
 rem  07/05/2016 - MF - updates to changes for Pro 1.3+
+rem  10/19/2026 - options for parallel test workers and local test data
 rem ==================================================
 
 REM === TEST SETUP ===================================
@@ -43,6 +44,13 @@ REM name is optional; if not specified, name will be specified for you
 set LOG=
 REM === LOG SETUP ====================================
 
+REM === OPTIONS SETUP ================================
+REM usage: set OPTIONS=--processes <N> --data <folder> --cache <folder>
+REM all options are optional; see TestRunner.py and Readme.md
+REM e.g. set OPTIONS=--processes 4 runs test classes in 4 worker processes
+set OPTIONS=
+REM === OPTIONS SETUP ================================
+
 REM === SINGLE VERSION ==================================
 REM If you only have ONE version of Python installed
 REM uncomment the following lines of code
@@ -60,17 +68,17 @@ REM If you have BOTH versions of Python installed use
 REM these lines
 REM =====================================================
 ECHO Python 3.4 Tests ===============================
-REM py -3.4 TestRunner.py %LOG%
+REM py -3.4 TestRunner.py %LOG% %OPTIONS%
 REM The location of python.exe will depend upon your installation
 REM of ArcGIS Pro. Modify the following line as necessary:
-"C:\Program Files\ArcGIS\Pro\bin\Python\envs\arcgispro-py3\python.exe" TestRunner.py %LOG%
+"C:\Program Files\ArcGIS\Pro\bin\Python\envs\arcgispro-py3\python.exe" TestRunner.py %LOG% %OPTIONS%
 REM check if ArcGIS Pro/Python 3.4 tests failed
 IF %ERRORLEVEL% NEQ 0 (
    ECHO 'One or more tests failed'
 )
 ECHO Python 2.7 Tests ===============================
-REM py -2.7 TestRunner.py %LOG%
-py TestRunner.py %LOG%
+REM py -2.7 TestRunner.py %LOG% %OPTIONS%
+py TestRunner.py %LOG% %OPTIONS%
 REM check if Desktop for ArcGIS/Python 2.7 tests failed
 IF %ERRORLEVEL% NEQ 0 (
    ECHO 'One or more tests failed'
@@ -32,14 +32,30 @@
  history:
  10/06/2015 - MF - placeholder
  10/30/2015 - MF - tests running
+ 10/19/2026 - test classes sharded across worker processes with isolated scratch,
+              per-test durations and a report of the slowest tests; data management tests added
+==================================================
+ usage:
+ TestRunner.py [log file name] [--processes N] [--data FOLDER] [--cache FOLDER]
+               [--slowest N]
+ --processes runs test classes in N worker processes (0 for one per CPU); by
+ default all tests run in this process.
+ --data and --cache set the local test data folder and the download cache (see
+ DataDownload.py).
 ==================================================
 '''
 
 import os
 import sys
+import json
+import time
+import shutil
+import argparse
 import datetime
 import logging
 import unittest
+import traceback
+import multiprocessing
 import arcpy
 import Configuration
 import UnitTestUtilities
@@ -47,16 +63,67 @@ import DataDownload
 
 
 logFileFromBAT = None
-if len(sys.argv) > 1:
-    logFileFromBAT = sys.argv[1] #if we have an explicit log file name passed in
+
+class TimedTestResult(unittest.TestResult):
+    ''' Test result that records the duration of each test '''
+    def __init__(self):
+        super(TimedTestResult, self).__init__()
+        self.durations = []
+        self._startTime = None
+
+    def startTest(self, test):
+        self._startTime = time.time()
+        super(TimedTestResult, self).startTest(test)
+
+    def stopTest(self, test):
+        super(TimedTestResult, self).stopTest(test)
+        self.durations.append((test.id(), time.time() - self._startTime))
+
+class ParallelTestResult(object):
+    ''' Test results collected from the worker processes '''
+    def __init__(self):
+        self.testsRun = 0
+        self.errors = []
+        self.failures = []
+        self.durations = []
+
+    def add(self, workerResult):
+        self.testsRun += workerResult["testsRun"]
+        self.errors += workerResult["errors"]
+        self.failures += workerResult["failures"]
+        self.durations += workerResult["durations"]
+
+    def wasSuccessful(self):
+        return len(self.errors) == 0 and len(self.failures) == 0
+
+def parseArguments(args):
+    ''' Command line options, see usage above '''
+    parser = argparse.ArgumentParser(description="Run the solutions-geoprocessing-toolbox tests")
+    parser.add_argument("log", nargs="?", default=None, help="log file name")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="number of worker processes, 0 for one per CPU")
+    parser.add_argument("--data", default=None, help="local test data folder")
+    parser.add_argument("--cache", default=None, help="test data download cache folder")
+    parser.add_argument("--slowest", type=int, default=Configuration.slowestTestCount,
+                        help="number of slowest tests to report")
+    return parser.parse_args(args)
 
 def main():
     ''' main test logic '''
+    global logFileFromBAT
     if Configuration.DEBUG == True:
         print("TestRunner.py - main")
     else:
         print("Debug messaging is OFF")
 
+    args = parseArguments(sys.argv[1:])
+    logFileFromBAT = args.log #if we have an explicit log file name passed in
+    if args.data:
+        Configuration.testDataPath = args.data
+    if args.cache:
+        Configuration.dataCachePath = args.cache
+    Configuration.slowestTestCount = args.slowest
+
     # setup logger
     logName = None
     if not logFileFromBAT == None:
@@ -67,8 +134,13 @@ def main():
         Configuration.Logger = UnitTestUtilities.initializeLogger(logName)
     print("Logging results to: " + str(logName))
     UnitTestUtilities.setUpLogFileHeader()
-    
-    result = runTestSuite()
+
+    processes = args.processes if args.processes > 0 else multiprocessing.cpu_count()
+    if processes > 1:
+        result = runTestSuiteParallel(processes, logName)
+    else:
+        result = runTestSuite()
+    saveDurations(result.durations)
     logTestResults(result)
     print("END OF TEST =========================================\n")
     return
@@ -86,6 +158,9 @@ def logTestResults(result):
         rFail = resultsFailures(result)
         print(rFail)
         Configuration.Logger.error(rFail)
+    rSlow = resultsSlowest(result)
+    print(rSlow)
+    Configuration.Logger.info(rSlow)
     Configuration.Logger.info("END OF TEST =========================================\n")
 
     return
@@ -116,11 +191,37 @@ def resultsFailures(result):
         msg += "\n"
     return msg
 
-def runTestSuite():
-    ''' collect all test suites before running them '''
-    if Configuration.DEBUG == True: print("TestRunner.py - runTestSuite")
+def resultsSlowest(result):
+    ''' The slowest tests and their durations '''
+    msg = "SLOWEST TESTS ==========================================\n\n"
+    slowest = sorted(result.durations, key=lambda d: d[1], reverse=True)
+    for testId, seconds in slowest[:Configuration.slowestTestCount]:
+        msg += "{0:10.2f} s  {1}\n".format(seconds, testId)
+    msg += "Total test time: {0:.2f} s\n".format(sum([d[1] for d in result.durations]))
+    return msg
+
+def loadDurations():
+    ''' {test id: seconds} of previous runs '''
+    if not os.path.exists(Configuration.durationsPath):
+        return {}
+    try:
+        with open(Configuration.durationsPath, 'r') as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+def saveDurations(durations):
+    ''' Add the durations of this run to those of previous runs '''
+    allDurations = loadDurations()
+    allDurations.update(dict(durations))
+    UnitTestUtilities.makeFolderFromPath(os.path.dirname(Configuration.durationsPath))
+    with open(Configuration.durationsPath, 'w') as f:
+        json.dump(allDurations, f, indent=2, sort_keys=True)
+
+def collectTestSuite():
+    ''' collect all test suites '''
+    if Configuration.DEBUG == True: print("TestRunner.py - collectTestSuite")
     testSuite = unittest.TestSuite()
-    result = unittest.TestResult()
 
     #What are we working with?
     Configuration.Platform = "DESKTOP"
@@ -132,18 +233,99 @@ def runTestSuite():
     testSuite.addTests(addPatternsSuite())
     testSuite.addTests(addVisibilitySuite())
     testSuite.addTests(addSuitabilitySuite())
+    testSuite.addTests(addOperationalGraphicsSuite())
+    testSuite.addTests(addDataManagementSuite())
 
-    #addDataManagementTests(logger, platform)
-    #addOperationalGraphicsTests(logger, platform)
     #addPatternsTests(logger, platform)
     #addSuitabilityTests(logger, platform)
     #testSuite.addTests(addVisibilityTests(logger, platform))
+    return testSuite
+
+def runTestSuite():
+    ''' collect all test suites before running them '''
+    if Configuration.DEBUG == True: print("TestRunner.py - runTestSuite")
+    testSuite = collectTestSuite()
+    result = TimedTestResult()
 
     print("running " + str(testSuite.countTestCases()) + " tests...")
     testSuite.run(result)
     print("Test success: {0}".format(str(result.wasSuccessful())))
     return result
 
+def testIds(suite):
+    ''' ids of all tests in a (nested) test suite, in order '''
+    ids = []
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            ids += testIds(test)
+        else:
+            ids.append(test.id())
+    return ids
+
+def testClassShards(ids, durations):
+    ''' Group test ids by test class, as tests of a class share setup and data.
+    Classes expected to take longest, from the durations of previous runs, come first. '''
+    shards = []
+    for testId in ids:
+        className = testId.rsplit(".", 1)[0]
+        if shards and shards[-1][0] == className:
+            shards[-1][1].append(testId)
+        else:
+            shards.append((className, [testId]))
+    known = sorted(durations.values())
+    typical = known[len(known) // 2] if known else 0.0
+    def expected(shard):
+        return sum([durations.get(testId, typical) for testId in shard[1]])
+    return [shard[1] for shard in sorted(shards, key=expected, reverse=True)]
+
+def initWorker(logName, platform, testDataPath, dataCachePath):
+    ''' Set up a worker process: its own log file, scratch geodatabase name and scratch workspace '''
+    pid = str(os.getpid())
+    Configuration.Platform = platform
+    Configuration.testDataPath = testDataPath
+    Configuration.dataCachePath = dataCachePath
+    Configuration.scratchGDBName = "scratch_" + pid + ".gdb"
+    Configuration.Logger = UnitTestUtilities.initializeLogger(os.path.splitext(logName)[0] + "_worker" + pid + ".log")
+    scratchFolder = os.path.join(Configuration.scratchPath, "worker_" + pid)
+    arcpy.env.scratchWorkspace = UnitTestUtilities.makeFolderFromPath(scratchFolder)
+
+def runTestShard(ids):
+    ''' Run the tests with the given ids in a worker process '''
+    result = TimedTestResult()
+    errors = []
+    for testId in ids:
+        try:
+            test = unittest.defaultTestLoader.loadTestsFromName(testId)
+        except Exception:
+            errors.append((testId, traceback.format_exc()))
+            continue
+        test.run(result)
+    return {"testsRun": result.testsRun,
+            "errors": [(test.id(), text) for test, text in result.errors] + errors,
+            "failures": [(test.id(), text) for test, text in result.failures],
+            "durations": result.durations}
+
+def runTestSuiteParallel(processes, logName):
+    ''' collect all test suites and run them by test class in worker processes '''
+    if Configuration.DEBUG == True: print("TestRunner.py - runTestSuiteParallel")
+    ids = testIds(collectTestSuite())
+    shards = testClassShards(ids, loadDurations())
+    result = ParallelTestResult()
+
+    print("running " + str(len(ids)) + " tests in " + str(processes) + " processes...")
+    Configuration.Logger.info("Running {0} test classes in {1} processes".format(len(shards), processes))
+    pool = multiprocessing.Pool(processes, initWorker,
+                                (logName, Configuration.Platform, Configuration.testDataPath, Configuration.dataCachePath))
+    try:
+        for workerResult in pool.imap_unordered(runTestShard, shards):
+            result.add(workerResult)
+    finally:
+        pool.close()
+        pool.join()
+        shutil.rmtree(Configuration.scratchPath, ignore_errors=True)
+    print("Test success: {0}".format(str(result.wasSuccessful())))
+    return result
+
 def addCapabilitySuite():
     ''' Add all Capability tests in the ./capability_tests folder '''
     if Configuration.DEBUG == True: print("TestRunner.py - addCapabilitySuite")
@@ -176,6 +358,22 @@ def addSuitabilitySuite():
     suite.addTests(AllSuitabilityTestSuite.getSuitabilityTestSuites())
     return suite
 
+def addOperationalGraphicsSuite():
+    ''' Add all Operational Graphics tests in the ./operational_graphics_tests folder '''
+    if Configuration.DEBUG == True: print("TestRunner.py - addOperationalGraphicsSuite")
+    from operational_graphics_tests import AllOperationalGraphicsTestSuite
+    suite = unittest.TestSuite()
+    suite.addTests(AllOperationalGraphicsTestSuite.getOperationalGraphicsTestSuites())
+    return suite
+
+def addDataManagementSuite():
+    ''' Add all Data Management tests in the ./data_management_tests folder '''
+    if Configuration.DEBUG == True: print("TestRunner.py - addDataManagementSuite")
+    from data_management_tests import AllDataManagementTestSuite
+    suite = unittest.TestSuite()
+    suite.addTests(AllDataManagementTestSuite.getDataManagementTestSuites())
+    return suite
+
 # MAIN =============================================
 if __name__ == "__main__":
     if Configuration.DEBUG == True:
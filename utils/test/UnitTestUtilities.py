@@ -30,6 +30,7 @@ Basic methods used in unit tests
 history:
 10/06/2015 - JH - original coding
 10/23/2015 - MF - mods for tests
+10/19/2026 - scratch geodatabase name from Configuration, unique per test worker
 ==================================================
 '''
 
@@ -135,7 +136,7 @@ def checkExists(p):
 def createScratch(scratchPath):
     ''' create scratch geodatabase '''
     if Configuration.DEBUG == True: print("UnitTestUtilities - createScratch")
-    scratchName = 'scratch.gdb'
+    scratchName = Configuration.scratchGDBName
     scratchGDB = os.path.join(scratchPath, scratchName)
     if checkExists(scratchGDB):
         print("Scratch already exists")
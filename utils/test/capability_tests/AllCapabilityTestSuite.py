@@ -28,11 +28,12 @@ description:
 This test suite collects all of the capability toolbox test suites:
 * HelicopterLandingZoneToolsTestSuite.py
 * ERGToolsTestSuite.py
-* PointOfOriginToolsTestSuite.py - PENDING
+* PointOfOriginToolsTestSuite.py
 
 ==================================================
 history:
 10/23/2015 - MF - original writeup
+10/19/2026 - added the Point Of Origin tests
 ==================================================
 '''
 
@@ -46,7 +47,7 @@ from . import HelicopterLandingZoneToolsTestSuite
 # ImportError: No module named 'HelicopterLandingZoneToolsTestSuite'
 #FIX: instead of "import <module>" use "from . import <module>"
 
-#from . import PointOfOriginToolsTestSuite - Doesn't Exist Yet
+from . import PointOfOriginToolsTestSuite
 from . import ERGToolsTestSuite
 
 def getCapabilityTestSuites():
@@ -59,7 +60,8 @@ def getCapabilityTestSuites():
     # these come from HelicopterLandingZoneToolsTestSuite.py
     testSuite.addTests(HelicopterLandingZoneToolsTestSuite.getHLZTestSuite())
 
-    #TODO: these will come from PointOfOriginToolsTestSuite
+    # these come from PointOfOriginToolsTestSuite.py
+    testSuite.addTests(PointOfOriginToolsTestSuite.getPointOfOriginTestSuite())
 
     # these come from ERGToolsTestSuite.py
     testSuite.addTests(ERGToolsTestSuite.getERGTestSuite())
@@ -36,11 +36,13 @@ Includes the following tests:
 ==================================================
 history:
 11/09/2015 - MF - original coding
+10/19/2026 - tests for the in-memory ERG table and batch zone geometry
 ==================================================
 '''
 
 import arcpy
 import os
+import math
 import sys
 import unittest
 import Configuration
@@ -175,3 +177,37 @@ class ERGTest(unittest.TestCase):
         sr = outputPoint.spatialReference
         self.assertEqual(sr.factoryCode, int(32614))
         return
+
+    def test_LoadERGTable001(self):
+        ''' ERG table is indexed by material and by placard ID, and read only once '''
+        if Configuration.DEBUG == True: print(".....ERGScript.test_LoadERGTable001")
+        table = ERG.LoadERGTable(self.dbfFolderPath)
+        self.assertIs(ERG.LoadERGTable(self.dbfFolderPath), table)
+        chlorine = table[ERG.ERGKey('Chlorine', '', 'Large', 'Day')]
+        self.assertEqual(chlorine, [(500.0, 3000.0, 'Chlorine', 124)])
+        byPlacard = table[ERG.ERGKey('', '1017', 'Large', 'Day')]
+        self.assertIn(chlorine[0], byPlacard)
+        sarin = ERG.SummarizeERG(table[ERG.ERGKey('', 2810, 'Large', 'Night')])
+        self.assertEqual(sarin[3], 153)
+        self.assertNotIn(ERG.ERGKey('Not a material', '', 'Small', 'Day'), table)
+        return
+
+    def test_ERGZoneGeometries001(self):
+        ''' zone vertices for a wind blowing to the north and to the east '''
+        if Configuration.DEBUG == True: print(".....ERGScript.test_ERGZoneGeometries001")
+        zones = ERG.ERGZoneGeometries([0.0, 1000.0], [0.0, 0.0], [0, 90], [30.0, 500.0], [100.0, 3000.0])
+        self.assertEqual(zones["iiz"].shape, (2, 361, 2))
+        # protective action zone: PAD wide, PAD long downwind
+        self.assertAlmostEqual(zones["paz"][0][1][0], -50.0)
+        self.assertAlmostEqual(zones["paz"][0][1][1], 100.0)
+        self.assertAlmostEqual(zones["paz"][1][2][0], 4000.0)
+        self.assertAlmostEqual(zones["paz"][1][2][1], -1500.0)
+        # arc ends where the zone sides cut the PAD circle, 30 degrees either side of the wind
+        self.assertAlmostEqual(zones["arc"][0][0][0], -50.0)
+        self.assertAlmostEqual(zones["arc"][0][0][1], 100.0 * math.cos(math.radians(30)))
+        # radials start on the base line when the IID circle is narrower than the zone
+        self.assertAlmostEqual(zones["radials"][1][0][0][0], 1000.0)
+        self.assertAlmostEqual(zones["radials"][1][0][0][1], 500.0)
+        self.assertAlmostEqual(zones["radials"][1][1][1][1], -1500.0)
+        return
+
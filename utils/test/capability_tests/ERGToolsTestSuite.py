@@ -52,7 +52,8 @@ def getERGTestSuite():
     chemicalTests = ['test_ERGByChemical_001', 'test_ERGByChemical_002', 'test_ERGByChemical_003']
     scriptTests = ['test_LookUpERG001', 'test_LookUpERG002', 'test_LookUpERG003',
                    'test_GetProjectedPoint001', 'test_GetProjectedPoint002',
-                   'test_GetProjectedPoint003', 'test_GetProjectedPoint004']
+                   'test_GetProjectedPoint003', 'test_GetProjectedPoint004',
+                   'test_LoadERGTable001', 'test_ERGZoneGeometries001']
     testSuite = unittest.TestSuite()
     Configuration.Logger.info("ERG Tools tests")
 
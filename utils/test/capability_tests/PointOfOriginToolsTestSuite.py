@@ -26,10 +26,32 @@ company: Esri
 ==================================================
 description:
 Test Suite collects all of the test cases for the Point Of Origin Tools toolbox:
-* <tool>TestCase.py
+* PointOfOriginUtilsTestCase.py
 
 ==================================================
 history:
 10/23/2015 - MF - placeholder
+10/19/2026 - added the PointOfOriginUtils tests
 ==================================================
 '''
+
+import unittest
+import Configuration
+from . import PointOfOriginUtilsTestCase
+
+def getPointOfOriginTestSuite():
+    ''' run the Point Of Origin tests '''
+
+    utilsTests = ['test_GeodesicRings', 'test_ImpactGrid', 'test_OverlapCounts']
+
+    if Configuration.DEBUG == True:
+        print("      PointOfOriginToolsTestSuite.getPointOfOriginTestSuite")
+    testSuite = unittest.TestSuite()
+    Configuration.Logger.info("Point Of Origin Tools tests")
+
+    for t in utilsTests:
+        testSuite.addTest(PointOfOriginUtilsTestCase.PointOfOriginUtilsTestCase(t))
+        print("adding test: " + str(t))
+        Configuration.Logger.info(t)
+
+    return testSuite
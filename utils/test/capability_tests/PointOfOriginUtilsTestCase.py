@@ -0,0 +1,99 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+PointOfOriginUtilsTestCase.py
+--------------------------------------------------
+requirements: ArcGIS X.X, Python 2.7 or Python 3.4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for the Point Of Origin range engine
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import numpy
+import unittest
+import Configuration
+import UnitTestUtilities
+
+# ============================================================================
+# Add PointOfOriginUtils.py module to python path
+currentPath = os.path.dirname(__file__)
+pathToPointOfOriginUtils = os.path.normpath(os.path.join(currentPath, r"../../../capability/toolboxes/scripts"))
+sys.path.insert(0, pathToPointOfOriginUtils)
+import PointOfOriginUtils
+# ============================================================================
+
+class PointOfOriginUtilsTestCase(unittest.TestCase):
+    ''' Test all methods in PointOfOriginUtils.py '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         PointOfOriginUtilsTestCase.setUp")
+        UnitTestUtilities.checkArcPy()
+        return
+
+    def tearDown(self):
+        ''' cleanup after tests'''
+        if Configuration.DEBUG == True: print("         PointOfOriginUtilsTestCase.tearDown")
+        return
+
+    def test_GeodesicRings(self):
+        ''' ring vertices are at the ring distance from their impact point '''
+        print("PointOfOriginUtilsTestCase.test_GeodesicRings")
+        lon = numpy.array([44.5, -120.0])
+        lat = numpy.array([33.3, -60.0])
+        rings = PointOfOriginUtils.GeodesicRings(lon, lat, [[1000.0, 5000.0], [0.0, 30000.0]], 36)
+        self.assertEqual(rings.shape, (2, 2, 37, 2))
+        numpy.testing.assert_array_equal(rings[:, :, 0], rings[:, :, -1])
+        distance = PointOfOriginUtils.Distance(lon.reshape(2, 1, 1), lat.reshape(2, 1, 1),
+                                               rings[..., 0], rings[..., 1])
+        numpy.testing.assert_allclose(distance[0, 0], 1000.0)
+        numpy.testing.assert_allclose(distance[1, 1], 30000.0)
+        numpy.testing.assert_allclose(distance[1, 0], 0.0, atol=1e-6)
+        return
+
+    def test_ImpactGrid(self):
+        ''' the shared grid covers the area every impact can be reached from '''
+        print("PointOfOriginUtilsTestCase.test_ImpactGrid")
+        grid = PointOfOriginUtils.ImpactGrid([0.0, 0.1], [0.0, 0.0], [(0.0, 10000.0)], 500.0)
+        self.assertTrue(abs(grid.west + grid.cols * grid.cellLon / 2.0 - 0.05) < grid.cellLon)
+        self.assertAlmostEqual(grid.south, -grid.rows * grid.cellLat / 2.0, places=6)
+        self.assertEqual(PointOfOriginUtils.ImpactGrid([0.0, 1.0], [0.0, 0.0], [(0.0, 1000.0)]), None)
+        return
+
+    def test_OverlapCounts(self):
+        ''' cells count the ranges covering them, per weapon model '''
+        print("PointOfOriginUtilsTestCase.test_OverlapCounts")
+        lon = [0.0, 0.05, 0.025]
+        lat = [0.0, 0.0, 0.04]
+        ranges = [(0.0, 10000.0), (6000.0, 8000.0)]
+        grid = PointOfOriginUtils.ImpactGrid(lon, lat, ranges, 250.0)
+        counts = PointOfOriginUtils.OverlapCounts(grid, lon, lat, ranges)
+        self.assertEqual(counts.shape, (2, grid.rows, grid.cols))
+        # the centroid of the impacts is within 10 km of all of them, but closer than the 6 km minimum
+        cellLon, cellLat = grid.centers(0, grid.rows)
+        centroid = (numpy.abs(cellLat - 0.0133).argmin(), numpy.abs(cellLon - 0.025).argmin())
+        self.assertEqual(counts[0][centroid], 3)
+        self.assertEqual(counts[1][centroid], 0)
+        self.assertTrue((counts <= 3).all())
+        return
@@ -26,10 +26,28 @@ company: Esri
 ==================================================
 description:
 This test suite collects all of the data management toolbox test suites:
-* <toolbox>ToolsTestSuite.py
+* PatrolDataCaptureToolsTestSuite.py
 
 ==================================================
 history:
 10/23/2015 - MF - placeholder
+10/19/2026 - added the Patrol Data Capture Tools tests
 ==================================================
 '''
+
+import logging
+import unittest
+import Configuration
+from . import PatrolDataCaptureToolsTestSuite
+
+
+def getDataManagementTestSuites():
+    ''' This pulls together all of the toolbox test suites in this folder '''
+    if Configuration.DEBUG == True:
+        print("   AllDataManagementTestSuite.getDataManagementTestSuites")
+    Configuration.Logger.info("Adding Data Management Tests including: ")
+    testSuite = unittest.TestSuite()
+
+    testSuite.addTests(PatrolDataCaptureToolsTestSuite.getPatrolDataCaptureTestSuite())
+    return testSuite
+
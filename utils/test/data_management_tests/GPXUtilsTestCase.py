@@ -0,0 +1,130 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+GPXUtilsTestCase.py
+--------------------------------------------------
+requirements: ArcGIS X.X, Python 2.7 or Python 3.4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for the streaming GPX reader of GPX to Features
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import Configuration
+
+# ============================================================================
+# Add GPXUtils.py module to python path
+currentPath = os.path.dirname(__file__)
+pathToGPXUtils = os.path.normpath(os.path.join(currentPath, r"../../../data_management/toolboxes/scripts"))
+sys.path.insert(0, pathToGPXUtils)
+import GPXUtils
+# ============================================================================
+
+gpxDocument = '''<?xml version="1.0"?>
+<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1">
+ <wpt lat="34.5" lon="-117.25"><ele>100</ele><name>Camp</name><sym>Flag</sym></wpt>
+ <wpt lat="bad" lon="-117"><name>Bad</name></wpt>
+ <trk><name>Convoy 1</name><desc>day one</desc>
+  <trkseg>
+   <trkpt lat="34,6" lon="-117.3"><ele>101.5</ele><time>2016-01-01T00:00:00Z</time></trkpt>
+   <trkpt lat="34.7" lon="-117.4"><name>Checkpoint</name></trkpt>
+   <trkpt lat="34.8" lon="-117.5"/>
+  </trkseg>
+ </trk>
+</gpx>
+'''
+
+class GPXUtilsTestCase(unittest.TestCase):
+    ''' Test all methods in GPXUtils.py '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         GPXUtilsTestCase.setUp")
+        self.folder = tempfile.mkdtemp()
+        self.gpxFile = os.path.join(self.folder, "convoy.gpx")
+        with open(self.gpxFile, "w") as gpx:
+            gpx.write(gpxDocument)
+        return
+
+    def tearDown(self):
+        ''' cleanup after tests'''
+        if Configuration.DEBUG == True: print("         GPXUtilsTestCase.tearDown")
+        shutil.rmtree(self.folder, ignore_errors=True)
+        return
+
+    def test_rows(self):
+        ''' points in document order, inheriting names from their track or the point before '''
+        print("GPXUtilsTestCase.test_rows")
+        reader = GPXUtils.GPXReader(self.gpxFile)
+        rows = list(reader.rows())
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(reader.badPoints, 1)
+        self.assertEqual(rows[0], ["Camp", "", "WPT", "", "Flag", "", 100.0, -117.25, 34.5, 100.0])
+        # decimal commas are read
+        self.assertEqual(rows[1][:8], ["Convoy 1", "day one", "TRKPT", "", "Flag", "2016-01-01T00:00:00Z", 101.5, -117.3])
+        self.assertAlmostEqual(rows[1][8], 34.6)
+        self.assertEqual(rows[2][0], "Checkpoint")
+        self.assertEqual(rows[3][0], "Checkpoint")
+        self.assertEqual(rows[3][6], 0.0)
+        return
+
+    def test_batches(self):
+        ''' rows come in batches of a fixed size '''
+        print("GPXUtilsTestCase.test_batches")
+        batches = list(GPXUtils.GPXReader(self.gpxFile).batches(3))
+        self.assertEqual([len(batch) for batch in batches], [3, 1])
+        return
+
+    def test_fieldLengths(self):
+        ''' text fields are at least 255 long, or as long as the longest text '''
+        print("GPXUtilsTestCase.test_fieldLengths")
+        with open(self.gpxFile, "w") as gpx:
+            gpx.write(gpxDocument.replace("<name>Camp</name>", "<name>" + "C" * 300 + "</name>"))
+        reader = GPXUtils.GPXReader(self.gpxFile)
+        lengths, points = reader.fieldLengths()
+        self.assertEqual(points, 5)
+        self.assertEqual(lengths, {"name": 300, "desc": 255, "cmt": 255, "sym": 255})
+        self.assertEqual(reader.namespace, "http://www.topografix.com/GPX/1/1")
+        return
+
+    def test_GPXFiles(self):
+        ''' a folder, wildcard or list of files '''
+        print("GPXUtilsTestCase.test_GPXFiles")
+        other = os.path.join(self.folder, "patrol.gpx")
+        shutil.copy(self.gpxFile, other)
+        self.assertEqual(GPXUtils.GPXFiles(self.folder), [self.gpxFile, other])
+        self.assertEqual(GPXUtils.GPXFiles(os.path.join(self.folder, "p*.gpx")), [other])
+        self.assertEqual(GPXUtils.GPXFiles(other + ";" + self.gpxFile + ";" + other), [other, self.gpxFile])
+        return
+
+    def test_ProcessPoolUtilsCopy(self):
+        ''' the data management ProcessPoolUtils.py is the same as the visibility one '''
+        print("GPXUtilsTestCase.test_ProcessPoolUtilsCopy")
+        original = os.path.normpath(os.path.join(currentPath, r"../../../visibility/toolboxes/scripts/ProcessPoolUtils.py"))
+        with open(original, "rb") as source:
+            with open(os.path.join(pathToGPXUtils, "ProcessPoolUtils.py"), "rb") as copy:
+                self.assertEqual(copy.read(), source.read(), "ProcessPoolUtils.py differs from " + original)
+        return
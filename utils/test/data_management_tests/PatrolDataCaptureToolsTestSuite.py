@@ -0,0 +1,77 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+PatrolDataCaptureToolsTestSuite.py
+--------------------------------------------------
+requirements:
+* ArcGIS Desktop 10.X+ or ArcGIS Pro 1.X+
+* Python 2.7 or Python 3.4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description:
+This test suite collects all of the Patrol Data Capture Tools toolbox test cases:
+* GPXUtilsTestCase.py
+* PatrolReportUtilsTestCase.py
+
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+
+import logging
+import unittest
+import Configuration
+
+''' Test suite for all test cases for the Patrol Data Capture Tools toolbox '''
+TestSuite = unittest.TestSuite()
+
+def getPatrolDataCaptureTestSuite():
+    ''' Run the Patrol Data Capture tests'''
+
+    gpxTests = ['test_rows', 'test_batches', 'test_fieldLengths', 'test_GPXFiles',
+                'test_ProcessPoolUtilsCopy']
+    patrolReportTests = ['test_ReadReport_patrolReport', 'test_ReadReport_enemySightings',
+                         'test_ParseTimestamp', 'test_ReportFiles', 'test_ImportReports']
+
+    if Configuration.DEBUG == True: print("     PatrolDataCaptureToolsTestSuite.getPatrolDataCaptureTestSuite")
+
+    Configuration.Logger.info("Patrol Data Capture Tools tests")
+    addGPXTests(gpxTests)
+    addPatrolReportTests(patrolReportTests)
+
+    return TestSuite
+
+
+def addGPXTests(inputTestList):
+    if Configuration.DEBUG == True: print("      PatrolDataCaptureToolsTestSuite.addGPXTests")
+    from . import GPXUtilsTestCase
+    for test in inputTestList:
+        print("adding test: " + str(test))
+        Configuration.Logger.info(test)
+        TestSuite.addTest(GPXUtilsTestCase.GPXUtilsTestCase(test))
+
+
+def addPatrolReportTests(inputTestList):
+    if Configuration.DEBUG == True: print("      PatrolDataCaptureToolsTestSuite.addPatrolReportTests")
+    from . import PatrolReportUtilsTestCase
+    for test in inputTestList:
+        print("adding test: " + str(test))
+        Configuration.Logger.info(test)
+        TestSuite.addTest(PatrolReportUtilsTestCase.PatrolReportUtilsTestCase(test))
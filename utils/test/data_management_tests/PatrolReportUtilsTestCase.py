@@ -0,0 +1,153 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+PatrolReportUtilsTestCase.py
+--------------------------------------------------
+requirements: ArcGIS X.X, Python 2.7 or Python 3.4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for the streaming Patrol Report reader of
+Import Patrol Rpt XML and Import Enemy Sightings XML
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+import Configuration
+import UnitTestUtilities
+
+# ============================================================================
+# Add PatrolReportUtils.py module to python path
+currentPath = os.path.dirname(__file__)
+pathToPatrolReportUtils = os.path.normpath(os.path.join(currentPath, r"../../../data_management/toolboxes/scripts"))
+sys.path.insert(0, pathToPatrolReportUtils)
+import PatrolReportUtils
+# ============================================================================
+
+reportDocument = '''<?xml version="1.0" encoding="UTF-8"?>
+<my:myFields xmlns:my="http://helyx.co.uk/infopath/2003/myXSD/2010-06-09">
+ <my:Report><my:ReportNumber>PR-0042</my:ReportNumber><my:Classification>UNCLASSIFIED</my:Classification>
+  <my:To>HQ</my:To><my:From>2 Platoon</my:From><my:ReportDateTime>2016-03-01T14:30:00Z</my:ReportDateTime></my:Report>
+ <my:Patrol><my:Callsign>Alpha 2</my:Callsign><my:PatrolSize>8</my:PatrolSize></my:Patrol>
+ <my:Observations>
+  <my:TerrainDescription>Open desert</my:TerrainDescription>
+  <my:EnemySightings><my:DateTimeSighted>2016-03-01T12:00:00.5+01:00</my:DateTimeSighted><my:Strength>5</my:Strength></my:EnemySightings>
+  <my:EnemySightings><my:DateTimeSighted></my:DateTimeSighted><my:Strength>2</my:Strength><my:Intention>Withdraw</my:Intention></my:EnemySightings>
+ </my:Observations>
+ <my:PatrolCondition><my:NumPatrolOK>7</my:NumPatrolOK><my:NumPatrolWounded>1</my:NumPatrolWounded></my:PatrolCondition>
+</my:myFields>
+'''
+
+class PatrolReportUtilsTestCase(unittest.TestCase):
+    ''' Test all methods in PatrolReportUtils.py '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         PatrolReportUtilsTestCase.setUp")
+        self.folder = tempfile.mkdtemp()
+        self.xmlFile = os.path.join(self.folder, "PR-0042.xml")
+        with open(self.xmlFile, "w") as xml:
+            xml.write(reportDocument)
+        return
+
+    def tearDown(self):
+        ''' cleanup after tests'''
+        if Configuration.DEBUG == True: print("         PatrolReportUtilsTestCase.tearDown")
+        shutil.rmtree(self.folder, ignore_errors=True)
+        return
+
+    def test_ReadReport_patrolReport(self):
+        ''' one row per report, converted to the output field types '''
+        print("PatrolReportUtilsTestCase.test_ReadReport_patrolReport")
+        schema = PatrolReportUtils.PatrolReportSchema
+        schema.compile({"ReportDateTime": "Date", "PatrolSize": "SmallInteger", "NumPatrolOK": "SmallInteger"})
+        reportId, rows = PatrolReportUtils.ReadReport(self.xmlFile, schema)
+        self.assertEqual(reportId, "PR-0042")
+        self.assertEqual(len(rows), 1)
+        row = dict(zip(schema.fieldNames, rows[0]))
+        self.assertEqual(row["ReportNumber"], "PR-0042")
+        self.assertEqual(row["ReportFrom"], "2 Platoon")
+        self.assertEqual(row["ReportDateTime"], datetime(2016, 3, 1, 14, 30))
+        self.assertEqual(row["PatrolSize"], 8)
+        self.assertEqual(row["NumPatrolOK"], 7)
+        # missing elements and elements of other tables are left empty
+        self.assertEqual(row["NumPatrolKIA"], None)
+        self.assertEqual(row["TerrainDescription"], "Open desert")
+        return
+
+    def test_ReadReport_enemySightings(self):
+        ''' one row per EnemySightings element '''
+        print("PatrolReportUtilsTestCase.test_ReadReport_enemySightings")
+        schema = PatrolReportUtils.EnemySightingsSchema.compile({"SightingDateTime": "Date"})
+        reportId, rows = PatrolReportUtils.ReadReport(self.xmlFile, schema)
+        self.assertEqual(reportId, "PR-0042")
+        self.assertEqual(rows, [[datetime(2016, 3, 1, 12, 0, 0, 500000), "5", None, None, None, None, None],
+                                [None, "2", None, None, None, "Withdraw", None]])
+        return
+
+    def test_ParseTimestamp(self):
+        ''' xs:dateTime values, and (None, None) for anything else '''
+        print("PatrolReportUtilsTestCase.test_ParseTimestamp")
+        self.assertEqual(PatrolReportUtils.ParseTimestamp("2016-03-01T12:00:00-05:30"), (datetime(2016, 3, 1, 12), -330))
+        self.assertEqual(PatrolReportUtils.ParseTimestamp("2016-13-01T12:00:00"), (None, None))
+        self.assertEqual(PatrolReportUtils.ParseTimestamp("yesterday"), (None, None))
+        self.assertEqual(PatrolReportUtils.ParseTimestamp(None), (None, None))
+        return
+
+    def test_ReportFiles(self):
+        ''' a folder, wildcard or list of reports; other documents are not read '''
+        print("PatrolReportUtilsTestCase.test_ReportFiles")
+        other = os.path.join(self.folder, "PR-0043.xml")
+        with open(other, "w") as xml:
+            xml.write('<?xml version="1.0"?><gpx xmlns="http://www.topografix.com/GPX/1/1"/>')
+        self.assertEqual(PatrolReportUtils.ReportFiles(self.folder), [self.xmlFile, other])
+        self.assertEqual(PatrolReportUtils.ReportFiles(os.path.join(self.folder, "*43.xml")), [other])
+        self.assertEqual(PatrolReportUtils.ReportFiles(other + ";" + self.xmlFile + ";" + other), [other, self.xmlFile])
+        self.assertRaises(ValueError, PatrolReportUtils.ReadReport, other, PatrolReportUtils.PatrolReportSchema)
+        return
+
+    def test_ImportReports(self):
+        ''' sightings get their report number, and a report is imported once whatever its track '''
+        print("PatrolReportUtilsTestCase.test_ImportReports")
+        UnitTestUtilities.checkArcPy()
+        import arcpy
+        table = arcpy.CreateTable_management("in_memory", "enemySightings")[0]
+        try:
+            arcpy.AddField_management(table, "SightingDateTime", "DATE")
+            for field in PatrolReportUtils.EnemySightingsSchema.fieldNames[1:] + [PatrolReportUtils.trackField]:
+                arcpy.AddField_management(table, field, "TEXT")
+            schema = PatrolReportUtils.EnemySightingsSchema
+            inserted, skipped, failed = PatrolReportUtils.ImportReports([self.xmlFile], table, schema, "track1", 1)
+            self.assertEqual((inserted, skipped, failed), (2, 0, []))
+            self.assertTrue(schema.reportIdField in [field.name for field in arcpy.ListFields(table)])
+            # again, under another track
+            inserted, skipped, failed = PatrolReportUtils.ImportReports([self.xmlFile], table, schema, "track2", 1)
+            self.assertEqual((inserted, skipped, failed), (0, 1, []))
+            with arcpy.da.SearchCursor(table, ["Strength", PatrolReportUtils.trackField, schema.reportIdField]) as cursor:
+                self.assertEqual(sorted([tuple(row) for row in cursor]),
+                                 [("2", "track1", "PR-0042"), ("5", "track1", "PR-0042")])
+        finally:
+            arcpy.Delete_management(table)
+        return
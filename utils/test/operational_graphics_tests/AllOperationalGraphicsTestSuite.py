@@ -26,10 +26,24 @@ company: Esri
 ==================================================
 description:
 This test suite collects all of the operational graphics toolbox test suites:
-* <toolbox>ToolsTestSuite.py
+* ClearingOperationsToolsTestSuite.py
 
 ==================================================
 history:
 10/23/2015 - MF - placeholder
+10/19/2026 - added Clearing Operations test suite
 ==================================================
 '''
+
+import unittest
+import Configuration
+from . import ClearingOperationsToolsTestSuite
+
+def getOperationalGraphicsTestSuites():
+    ''' This pulls together all of the toolbox test suites in this folder '''
+    if Configuration.DEBUG == True:
+        print("   AllOperationalGraphicsTestSuite.getOperationalGraphicsTestSuites")
+    Configuration.Logger.info("Adding Operational Graphics Tests including: ")
+    testSuite = unittest.TestSuite()
+    testSuite.addTests(ClearingOperationsToolsTestSuite.getClearingOperationsTestSuite())
+    return testSuite
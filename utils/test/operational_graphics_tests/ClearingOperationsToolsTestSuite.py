@@ -0,0 +1,62 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+ClearingOperationsToolsTestSuite.py
+--------------------------------------------------
+requirments:
+* ArcGIS Desktop 10.X+ or ArcGIS Pro 1.X+
+* Python 2.7 or Python 3.4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description:
+This test suite collects all of the Clearing Operations toolbox tests:
+* GRGUtilitiesTestCase.py
+
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+
+import unittest
+import Configuration
+from . import GRGUtilitiesTestCase
+
+def getClearingOperationsTestSuite():
+    ''' Clearing Operations test suite '''
+
+    testList = ['test_ColIdxToXlName',
+                'test_AlphaLabels',
+                'test_GridLabels_AlphaNumeric_UpperLeft',
+                'test_GridLabels_AlphaAlpha_LowerRight',
+                'test_GridLabels_Numeric',
+                'test_GridCellCorners',
+                'test_RotateCoordinates',
+                'test_CreateGRG']
+
+    if Configuration.DEBUG == True:
+        print("      ClearingOperationsToolsTestSuite.getClearingOperationsTestSuite")
+
+    suite = unittest.TestSuite()
+    Configuration.Logger.info("Clearing Operations tests")
+    for test in testList:
+        print("adding test: " + str(test))
+        Configuration.Logger.info(test)
+        suite.addTest(GRGUtilitiesTestCase.GRGUtilitiesTestCase(test))
+    return suite
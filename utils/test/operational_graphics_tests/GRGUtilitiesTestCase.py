@@ -0,0 +1,143 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+GRGUtilitiesTestCase.py
+--------------------------------------------------
+requirements: ArcGIS X.X, Python 2.7 or Python 3.4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for the GRG grid engine
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import arcpy
+import unittest
+import Configuration
+import UnitTestUtilities
+
+# ============================================================================
+# Add GRGUtilities.py module to python path
+currentPath = os.path.dirname(__file__)
+pathToGRGUtils = os.path.normpath(os.path.join(currentPath, r"../../../operational_graphics/toolboxes/scripts"))
+sys.path.insert(0, pathToGRGUtils)
+import GRGUtilities
+# ============================================================================
+
+class GRGUtilitiesTestCase(unittest.TestCase):
+    ''' Test the grid, label and write methods in GRGUtilities.py '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         GRGUtilitiesTestCase.setUp")
+        UnitTestUtilities.checkArcPy()
+        self.srWebMerc = arcpy.SpatialReference(3857) #WGS_1984_Web_Mercator
+        self.deleteme = []
+        return
+
+    def tearDown(self):
+        ''' cleanup after tests'''
+        if Configuration.DEBUG == True: print("         GRGUtilitiesTestCase.tearDown")
+        for i in self.deleteme:
+            if arcpy.Exists(i):
+                arcpy.Delete_management(i)
+        return
+
+    def test_ColIdxToXlName(self):
+        ''' test excel style column names '''
+        print("GRGUtilitiesTestCase.test_ColIdxToXlName")
+        self.assertEqual(GRGUtilities.ColIdxToXlName(1), "A")
+        self.assertEqual(GRGUtilities.ColIdxToXlName(26), "Z")
+        self.assertEqual(GRGUtilities.ColIdxToXlName(27), "AA")
+        self.assertEqual(GRGUtilities.ColIdxToXlName(703), "AAA")
+        self.assertRaises(ValueError, GRGUtilities.ColIdxToXlName, 0)
+        return
+
+    def test_AlphaLabels(self):
+        ''' test the label table matches ColIdxToXlName '''
+        print("GRGUtilitiesTestCase.test_AlphaLabels")
+        labels = GRGUtilities.AlphaLabels(800)
+        self.assertEqual(len(labels), 800)
+        for i in [0, 25, 26, 701, 702, 799]:
+            self.assertEqual(labels[i], GRGUtilities.ColIdxToXlName(i + 1))
+        return
+
+    def test_GridLabels_AlphaNumeric_UpperLeft(self):
+        ''' first label is the upper left cell, rows are lettered '''
+        print("GRGUtilitiesTestCase.test_GridLabels_AlphaNumeric_UpperLeft")
+        labels = GRGUtilities.GridLabels(3, 4, "Alpha-Numeric", "Upper-Left")
+        self.assertEqual(labels[2, 0], "A1")
+        self.assertEqual(labels[2, 3], "A4")
+        self.assertEqual(labels[0, 0], "C1")
+        return
+
+    def test_GridLabels_AlphaAlpha_LowerRight(self):
+        ''' first label is the lower right cell '''
+        print("GRGUtilitiesTestCase.test_GridLabels_AlphaAlpha_LowerRight")
+        labels = GRGUtilities.GridLabels(2, 3, "Alpha-Alpha", "Lower-Right")
+        self.assertEqual(labels[0, 2], "AA")
+        self.assertEqual(labels[0, 0], "AC")
+        self.assertEqual(labels[1, 2], "BA")
+        return
+
+    def test_GridLabels_Numeric(self):
+        ''' numeric labels run on across rows '''
+        print("GRGUtilitiesTestCase.test_GridLabels_Numeric")
+        labels = GRGUtilities.GridLabels(2, 3, "Numeric", "Upper-Right")
+        self.assertEqual(labels[1, 2], "1")
+        self.assertEqual(labels[1, 0], "3")
+        self.assertEqual(labels[0, 2], "4")
+        return
+
+    def test_GridCellCorners(self):
+        ''' cells tile the grid extent '''
+        print("GRGUtilitiesTestCase.test_GridCellCorners")
+        corners = GRGUtilities.GridCellCorners(100.0, 200.0, 10.0, 5.0, 2, 3)
+        self.assertEqual(corners.shape, (2, 3, 5, 2))
+        self.assertEqual(corners[0, 0, 0].tolist(), [100.0, 200.0])
+        self.assertEqual(corners[1, 2, 2].tolist(), [130.0, 210.0])
+        return
+
+    def test_RotateCoordinates(self):
+        ''' rotation is clockwise about the pivot '''
+        print("GRGUtilitiesTestCase.test_RotateCoordinates")
+        corners = GRGUtilities.GridCellCorners(0.0, 0.0, 10.0, 10.0, 1, 1)
+        rotated = GRGUtilities.RotateCoordinates(corners, 90.0, 0.0, 0.0)
+        self.assertAlmostEqual(rotated[0, 0, 1, 0], 10.0)
+        self.assertAlmostEqual(rotated[0, 0, 1, 1], 0.0)
+        return
+
+    def test_CreateGRG(self):
+        ''' write a rotated grid '''
+        print("GRGUtilitiesTestCase.test_CreateGRG")
+        outputGRG = os.path.join("in_memory", "tempGRG")
+        if arcpy.Exists(outputGRG): arcpy.Delete_management(outputGRG)
+        GRGUtilities.CreateGRG(outputGRG, 0.0, 0.0, 100.0, 100.0, 20, 30,
+                               "Alpha-Numeric", "Upper-Left", 30.0, (1500.0, 1000.0),
+                               self.srWebMerc)
+        self.deleteme.append(outputGRG)
+        self.assertEqual(int(arcpy.GetCount_management(outputGRG).getOutput(0)), 600)
+        with arcpy.da.SearchCursor(outputGRG, ["Grid"]) as cursor:
+            firstLabel = next(cursor)[0]
+        self.assertEqual(firstLabel, "A1")
+        self.assertEqual(arcpy.Describe(outputGRG).spatialReference.factoryCode, 3857)
+        return
@@ -27,10 +27,12 @@ company: Esri
 description:
 This test suite collects all of the patterns toolbox test suites:
 * IncidentAnalysisToolsTestSuite.py
+* MovementAnalysisToolsTestSuite.py
 
 ==================================================
 history:
 10/23/2015 - MF - placeholder
+10/19/2026 - added the Movement Analysis Tools tests
 ==================================================
 '''
 
@@ -38,6 +40,7 @@ import logging
 import unittest
 import Configuration
 from . import IncidentAnalysisToolsTestSuite
+from . import MovementAnalysisToolsTestSuite
 
 
 def getPatternsTestSuites():
@@ -48,5 +51,6 @@ def getPatternsTestSuites():
     testSuite = unittest.TestSuite()
     
     testSuite.addTests(IncidentAnalysisToolsTestSuite.getIncidentAnalysisTestSuite())
+    testSuite.addTests(MovementAnalysisToolsTestSuite.getMovementAnalysisTestSuite())
     return testSuite
     
\ No newline at end of file
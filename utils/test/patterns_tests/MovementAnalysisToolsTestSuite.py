@@ -0,0 +1,63 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+MovementAnalysisToolsTestSuite.py
+--------------------------------------------------
+requirements:
+* ArcGIS Desktop 10.X+ or ArcGIS Pro 1.X+
+* Python 2.7 or Python 3.4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description:
+This test suite collects all of the Movement Analysis Tools toolbox test cases:
+* VisitationUtilsTestCase.py
+
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+
+import logging
+import unittest
+import Configuration
+
+''' Test suite for all test cases for the Movement Analysis Tools toolbox '''
+TestSuite = unittest.TestSuite()
+
+def getMovementAnalysisTestSuite():
+    ''' Run the Movement Analysis tests'''
+
+    visitationTests = ['test_PeriodMinutes', 'test_PeriodMinutes_rounding', 'test_ValidEvents', 'test_VisitationTable']
+
+    if Configuration.DEBUG == True: print("     MovementAnalysisToolsTestSuite.getMovementAnalysisTestSuite")
+
+    Configuration.Logger.info("Movement Analysis Tools tests")
+    addVisitationTests(visitationTests)
+
+    return TestSuite
+
+
+def addVisitationTests(inputTestList):
+    if Configuration.DEBUG == True: print("      MovementAnalysisToolsTestSuite.addVisitationTests")
+    from . import VisitationUtilsTestCase
+    for test in inputTestList:
+        print("adding test: " + str(test))
+        Configuration.Logger.info(test)
+        TestSuite.addTest(VisitationUtilsTestCase.VisitationUtilsTestCase(test))
@@ -0,0 +1,109 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+VisitationUtilsTestCase.py
+--------------------------------------------------
+requirements: ArcGIS X.X, Python 2.7 or Python 3.4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for the Visitation By Day Period kernel
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import numpy
+import unittest
+from datetime import datetime
+import Configuration
+
+# ============================================================================
+# Add VisitationUtils.py module to python path
+currentPath = os.path.dirname(__file__)
+pathToVisitationUtils = os.path.normpath(os.path.join(currentPath, r"../../../patterns/toolboxes/scripts"))
+sys.path.insert(0, pathToVisitationUtils)
+import VisitationUtils
+# ============================================================================
+
+class VisitationUtilsTestCase(unittest.TestCase):
+    ''' Test all methods in VisitationUtils.py '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         VisitationUtilsTestCase.setUp")
+        return
+
+    def tearDown(self):
+        ''' cleanup after tests'''
+        if Configuration.DEBUG == True: print("         VisitationUtilsTestCase.tearDown")
+        return
+
+    def test_PeriodMinutes(self):
+        ''' minutes in night, morning, afternoon and evening '''
+        print("VisitationUtilsTestCase.test_PeriodMinutes")
+        arrive = [datetime(2015, 3, 1, 5, 0), datetime(2015, 3, 1, 13, 0),
+                  datetime(2015, 3, 1, 21, 30), datetime(2015, 3, 1, 5, 0)]
+        depart = [datetime(2015, 3, 1, 12, 0), datetime(2015, 3, 1, 14, 30),
+                  datetime(2015, 3, 3, 7, 0), datetime(2015, 3, 2, 5, 0)]
+        duration, minutes = VisitationUtils.PeriodMinutes(arrive, depart)
+        self.assertEqual(list(duration), [420, 90, 2010, 1440])
+        # departing on a period break counts the whole period before it
+        self.assertEqual(list(minutes[0]), [60, 360, 0, 0])
+        self.assertEqual(list(minutes[1]), [0, 0, 90, 0])
+        # over midnight into the day after next
+        self.assertEqual(list(minutes[2]), [720, 420, 300, 570])
+        self.assertEqual(list(minutes[3]), [360, 360, 300, 420])
+        return
+
+    def test_PeriodMinutes_rounding(self):
+        ''' partial minutes round up in the arrival and departure periods '''
+        print("VisitationUtilsTestCase.test_PeriodMinutes_rounding")
+        arrive = [datetime(2015, 3, 1, 10, 0, 30), datetime(2015, 3, 1, 11, 59, 30)]
+        depart = [datetime(2015, 3, 1, 10, 1, 10), datetime(2015, 3, 1, 12, 0, 30)]
+        duration, minutes = VisitationUtils.PeriodMinutes(arrive, depart)
+        self.assertEqual(list(duration), [1, 1])
+        self.assertEqual(list(minutes[0]), [0, 1, 0, 0])
+        self.assertEqual(list(minutes[1]), [0, 1, 1, 0])
+        return
+
+    def test_ValidEvents(self):
+        ''' events without times or departing before arriving are not valid '''
+        print("VisitationUtilsTestCase.test_ValidEvents")
+        arrive = numpy.array([datetime(2015, 3, 1), None, datetime(2015, 3, 2), datetime(2015, 3, 1)],
+                             dtype="datetime64[us]")
+        depart = numpy.array([datetime(2015, 3, 2), datetime(2015, 3, 2), datetime(2015, 3, 1), datetime(2015, 3, 1)],
+                             dtype="datetime64[us]")
+        self.assertEqual(list(VisitationUtils.ValidEvents(arrive, depart)), [True, False, False, False])
+        self.assertEqual(list(VisitationUtils.MissingTimes(arrive, depart)), [False, True, False, False])
+        return
+
+    def test_VisitationTable(self):
+        ''' the summary table has the output fields and percentages of the duration '''
+        print("VisitationUtilsTestCase.test_VisitationTable")
+        arrive = [datetime(2015, 3, 1, 5, 0)]
+        depart = [datetime(2015, 3, 1, 12, 0)]
+        duration, minutes = VisitationUtils.PeriodMinutes(arrive, depart)
+        table = VisitationUtils.VisitationTable([7], [12], arrive, depart, duration, minutes)
+        self.assertEqual(list(table.dtype.names), [field[0] for field in VisitationUtils.visitationFields])
+        self.assertEqual(table["locid"][0], "12")
+        self.assertEqual(table["minMorn"][0], 360)
+        self.assertAlmostEqual(table["pctNight"][0] + table["pctMorn"][0], 100.0)
+        return
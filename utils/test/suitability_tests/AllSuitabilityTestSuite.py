@@ -27,10 +27,14 @@ company: Esri
 description:
 This test suite collects all of the suitability toolbox test suites:
 * MilitaryAspectsOfWeatherTestSuite.py
+* MilitaryAspectsOfTerrainTestSuite.py
+* MultidimensionSupplementalToolsTestSuite.py
 
 ==================================================
 history:
 2/9/2016 - JH - creation
+10/19/2026 - added Military Aspects of Terrain tests
+10/19/2026 - added Multidimension Supplemental Tools tests
 ==================================================
 '''
 
@@ -39,6 +43,8 @@ import unittest
 import Configuration
 from . import MilitaryAspectsOfWeatherTestSuite
 from . import MaritimeDecisionAidToolsTestSuite
+from . import MilitaryAspectsOfTerrainTestSuite
+from . import MultidimensionSupplementalToolsTestSuite
 
 def getSuitabilityTestSuites():
     ''' This pulls together all of the toolbox test suites in this folder '''
@@ -49,6 +55,8 @@ def getSuitabilityTestSuites():
     
     testSuite.addTests(MilitaryAspectsOfWeatherTestSuite.getWeatherTestSuite())
     testSuite.addTests(MaritimeDecisionAidToolsTestSuite.getMaritimeTestSuite())
+    testSuite.addTests(MilitaryAspectsOfTerrainTestSuite.getTerrainTestSuite())
+    testSuite.addTests(MultidimensionSupplementalToolsTestSuite.getMultidimensionTestSuite())
     
     return testSuite
         
\ No newline at end of file
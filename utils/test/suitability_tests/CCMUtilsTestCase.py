@@ -0,0 +1,235 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+CCMUtilsTestCase.py
+--------------------------------------------------
+requirements: ArcGIS X.X, Python 2.7 or Python 3.4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for the FM 5-33 CCM engine
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import shutil
+import tempfile
+import numpy
+import unittest
+import Configuration
+import UnitTestUtilities
+
+# ============================================================================
+# Add CCMUtils.py module to python path
+currentPath = os.path.dirname(__file__)
+pathToCCMUtils = os.path.normpath(os.path.join(currentPath, r"../../../suitability/toolboxes/scripts"))
+sys.path.insert(0, pathToCCMUtils)
+import CCMUtils
+# ============================================================================
+
+class ToolParameter(object):
+    ''' the value and valueAsText of an arcpy.Parameter of a .pyt '''
+    def __init__(self, value=None):
+        self.value = value
+        self.valueAsText = None if value is None else str(value)
+
+class CCMUtilsTestCase(unittest.TestCase):
+    ''' Test all methods in CCMUtils.py '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         CCMUtilsTestCase.setUp")
+        UnitTestUtilities.checkArcPy()
+        return
+
+    def tearDown(self):
+        ''' cleanup after tests'''
+        if Configuration.DEBUG == True: print("         CCMUtilsTestCase.tearDown")
+        return
+
+    def test_ProcessPoolUtilsCopy(self):
+        ''' the suitability ProcessPoolUtils.py is the same as the visibility one '''
+        print("CCMUtilsTestCase.test_ProcessPoolUtilsCopy")
+        original = os.path.normpath(os.path.join(currentPath, r"../../../visibility/toolboxes/scripts/ProcessPoolUtils.py"))
+        with open(original, "rb") as source:
+            with open(os.path.join(pathToCCMUtils, "ProcessPoolUtils.py"), "rb") as copy:
+                self.assertEqual(copy.read(), source.read(), "ProcessPoolUtils.py differs from " + original)
+        return
+
+    def test_SampleOIDs(self):
+        ''' samples are repeatable for a seed and hold at most samplesPerCategory OIDs '''
+        print("CCMUtilsTestCase.test_SampleOIDs")
+        oids = {1: list(range(1, 101)), 2: [205, 201, 203]}
+        sample = CCMUtils.SampleOIDs(oids, CCMUtils.TileSeed(0, 7))
+        self.assertEqual(sample, CCMUtils.SampleOIDs(oids, CCMUtils.TileSeed(0, 7)))
+        self.assertEqual(len(sample[1]), CCMUtils.samplesPerCategory)
+        self.assertEqual(len(set(sample[1])), CCMUtils.samplesPerCategory)
+        self.assertTrue(set(sample[1]) <= set(oids[1]))
+        self.assertEqual(sample[1], sorted(sample[1]))
+        self.assertEqual(sample[2], [201, 203, 205])
+        self.assertNotEqual(sample[1], CCMUtils.SampleOIDs(oids, CCMUtils.TileSeed(0, 8))[1])
+        return
+
+    def test_OIDWhereClause(self):
+        ''' OIDs are selected with IN lists '''
+        print("CCMUtilsTestCase.test_OIDWhereClause")
+        self.assertEqual(CCMUtils.OIDWhereClause("OBJECTID", [3, 1, 2, 3]), "OBJECTID IN (1,2,3)")
+        self.assertEqual(CCMUtils.OIDWhereClause("OBJECTID", []), "OBJECTID IS NULL")
+        clause = CCMUtils.OIDWhereClause("FID", range(CCMUtils.maxInValues + 1))
+        self.assertEqual(clause.count(" IN ("), 2)
+        self.assertTrue(clause.endswith(" OR FID IN (" + str(CCMUtils.maxInValues) + ")"))
+        return
+
+    def test_CalcSIF(self):
+        ''' f2 is 1.0 without intercepts and drops with the intercept count '''
+        print("CCMUtilsTestCase.test_CalcSIF")
+        self.assertEqual(CCMUtils.CalcSIF(None), 1.0)
+        self.assertEqual(CCMUtils.CalcSIF(0.0), 1.0)
+        self.assertAlmostEqual(CCMUtils.CalcSIF(28.0), 0.5)
+        return
+
+    def test_MeanIntercepts(self):
+        ''' samples without intercepts count as zero '''
+        print("CCMUtilsTestCase.test_MeanIntercepts")
+        means = CCMUtils.MeanIntercepts({10: 1, 11: 1, 12: 2}, {10: 4, 12: 3})
+        self.assertEqual(means, {1: 2.0, 2: 3.0})
+        return
+
+    def test_F1ByCategory(self):
+        ''' f1 for each slope category from the vehicle parameters '''
+        print("CCMUtilsTestCase.test_F1ByCategory")
+        f1 = CCMUtils.F1ByCategory(72.0, 60.0, 45.0)
+        self.assertEqual(sorted(f1.keys()), [1, 2, 3, 4, 5, 6])
+        self.assertAlmostEqual(f1[1], (45.0 - 1.5) / (60.0 / 72.0))
+        self.assertAlmostEqual(f1[6], 0.0)
+        return
+
+    def test_FactorFields(self):
+        ''' only the chosen vegetation and soil factors are used '''
+        print("CCMUtilsTestCase.test_FactorFields")
+        fields = ["OBJECTID", "Shape", "f1", "f2", "f3min", "f3max", "F4WET", "f4dry"]
+        self.assertEqual(CCMUtils.FactorFields(fields), ["f1", "f2", "f3max", "f4dry"])
+        self.assertEqual(CCMUtils.FactorFields(fields, "MIN", "WET"), ["f1", "f2", "f3min", "f4wet"])
+        self.assertEqual(CCMUtils.FactorFields(["f1", "f2", "f5"]), ["f1", "f2", "f5"])
+        return
+
+    def test_CCMBlock(self):
+        ''' f1 from the slope categories times the factors, missing factors as 1.0 '''
+        print("CCMUtilsTestCase.test_CCMBlock")
+        categories = numpy.array([[1.0, 2.0], [numpy.nan, 6.0]])
+        f2 = numpy.array([[0.5, numpy.nan], [0.5, 0.5]])
+        f5 = numpy.array([[0.8, 0.8], [0.8, numpy.nan]])
+        ccm = CCMUtils.CCMBlock(categories, {1: 2.0, 2: 3.0, 6: 0.0}, [f2, f5])
+        self.assertAlmostEqual(ccm[0, 0], 0.8)
+        self.assertAlmostEqual(ccm[0, 1], 2.4)
+        self.assertTrue(numpy.isnan(ccm[1, 0]))
+        self.assertEqual(ccm[1, 1], 0.0)
+        return
+
+    def test_Curvature(self):
+        ''' curvature of a parabolic trough (Curvature tool units) '''
+        print("CCMUtilsTestCase.test_Curvature")
+        x = numpy.arange(7, dtype=float) * 10.0
+        elevation = numpy.tile(x ** 2 / 100.0, (5, 1))
+        curvature = CCMUtils.Curvature(elevation, 10.0)
+        self.assertEqual(curvature.shape, (3, 5))
+        self.assertTrue(numpy.allclose(curvature, -2.0))
+        # NoData neighbors take the center value
+        elevation[0, 3] = numpy.nan
+        self.assertFalse(numpy.isnan(CCMUtils.Curvature(elevation, 10.0)).any())
+        return
+
+    def test_FocalRange(self):
+        ''' range over a circle of radius 3 cells, ignoring NoData '''
+        print("CCMUtilsTestCase.test_FocalRange")
+        values = numpy.zeros((9, 9))
+        values[4, 7] = 5.0 # in the circle of the center cell
+        values[1, 1] = 9.0 # outside it (corner)
+        values[4, 4] = numpy.nan
+        result = CCMUtils.FocalRange(values, 3)
+        self.assertEqual(result.shape, (3, 3))
+        self.assertEqual(result[1, 1], 5.0)
+        self.assertEqual(result[0, 0], 9.0)
+        return
+
+    def test_OffRoadBlock(self):
+        ''' flat ground: the CCM is the vehicle's slope limited speed times the factors '''
+        print("CCMUtilsTestCase.test_OffRoadBlock")
+        halo = CCMUtils.focalRadius + 1
+        slope = numpy.array([[0.0, 10.0], [50.0, numpy.nan]])
+        elevation = numpy.zeros((2 + 2 * halo, 2 + 2 * halo))
+        f5 = numpy.array([[0.5, numpy.nan], [0.5, 0.5]])
+        ccms = CCMUtils.OffRoadBlock(slope, elevation, [f5], {"M1": (72.0, 60.0, 45.0)}, 10.0, 0.0)
+        ccm = ccms["M1"]
+        self.assertAlmostEqual(ccm[0, 0], 45.0 / (60.0 / 72.0) * 0.5)
+        self.assertAlmostEqual(ccm[0, 1], 35.0 / (60.0 / 72.0))
+        self.assertEqual(ccm[1, 0], 0.0)
+        self.assertTrue(numpy.isnan(ccm[1, 1]))
+        cost = CCMUtils.TravelCost(ccm)
+        self.assertAlmostEqual(cost[0, 0], 3.6 / ccm[0, 0])
+        self.assertTrue(numpy.isnan(cost[1, 0]))
+        return
+
+    def test_ToolParameters(self):
+        ''' the parameters of Cross Country Mobility Tools.pyt are read and set as those of the script tool '''
+        print("CCMUtilsTestCase.test_ToolParameters")
+        parameters = CCMUtils.ToolParameters([ToolParameter("AOI"), ToolParameter(), ToolParameter(3)])
+        self.assertEqual(parameters.count(), 3)
+        self.assertEqual(parameters.text(0), "AOI")
+        self.assertEqual(parameters.text(1), "")
+        self.assertEqual(parameters.text(2), "3")
+        self.assertEqual(parameters.value(2), 3)
+        self.assertEqual(parameters.value(1), None)
+        parameters.set(1, "output")
+        self.assertEqual(parameters.value(1), "output")
+        return
+
+    def test_RasterizeFactor(self):
+        ''' the factor is on the cells of the template, and the snap raster and extent are restored '''
+        print("CCMUtilsTestCase.test_RasterizeFactor")
+        import arcpy
+        folder = tempfile.mkdtemp()
+        polygons = os.path.join("in_memory", "factorPolygons")
+        previousSnapRaster = arcpy.env.snapRaster
+        previousExtent = arcpy.env.extent
+        try:
+            template = os.path.join(folder, "template.tif")
+            arcpy.NumPyArrayToRaster(numpy.ones((4, 5), numpy.float32), arcpy.Point(0.5, 0.25), 10.0, 10.0).save(template)
+            arcpy.CreateFeatureclass_management("in_memory", "factorPolygons", "POLYGON")
+            arcpy.AddField_management(polygons, "f5", "DOUBLE")
+            corners = [(-20.0, -20.0), (-20.0, 70.0), (80.0, 70.0), (80.0, -20.0)]
+            with arcpy.da.InsertCursor(polygons, ["SHAPE@", "f5"]) as cursor:
+                cursor.insertRow([arcpy.Polygon(arcpy.Array([arcpy.Point(*corner) for corner in corners])), 0.5])
+            arcpy.env.snapRaster = None
+            arcpy.env.extent = "MAXOF"
+            factor = CCMUtils.RasterizeFactor(polygons, "f5", template, os.path.join(folder, "f5.tif"))
+            self.assertEqual(arcpy.env.snapRaster, None)
+            self.assertEqual(str(arcpy.env.extent), "MAXOF")
+            factor = arcpy.Raster(factor)
+            self.assertEqual((factor.width, factor.height), (5, 4))
+            self.assertAlmostEqual(factor.extent.XMin, 0.5)
+            self.assertAlmostEqual(factor.extent.YMin, 0.25)
+        finally:
+            arcpy.env.snapRaster = previousSnapRaster
+            arcpy.env.extent = previousExtent
+            arcpy.Delete_management(polygons)
+            shutil.rmtree(folder, True)
+        return
@@ -0,0 +1,147 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+CRUUtilsTestCase.py
+--------------------------------------------------
+requirements: Python 2.7 or Python 3.4, NumPy
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for CRUUtils.py, on synthetic CL 2.0
+archives
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import gzip
+import shutil
+import tempfile
+import numpy
+import unittest
+import Configuration
+
+# ============================================================================
+# Add CRUUtils.py module to python path
+currentPath = os.path.dirname(__file__)
+pathToCRUUtils = os.path.normpath(os.path.join(currentPath, r"../../../suitability/toolboxes/scripts"))
+sys.path.insert(0, pathToCRUUtils)
+import CRUUtils
+# ============================================================================
+
+# three pre records: lat, lon, 12 monthly precipitation values and their
+#   12 coefficients of variation
+preRecords = [[-59.083, -26.583] + [float(m) for m in range(1, 13)] + [100.0 + m for m in range(12)],
+              [0.083, 0.083] + [10.0 * m for m in range(12)] + [50.0] * 12,
+              [83.583, 179.917] + [0.5] * 12 + [9.5] * 12]
+
+class CRUUtilsTestCase(unittest.TestCase):
+    ''' Test all methods in CRUUtils.py '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         CRUUtilsTestCase.setUp")
+        self.folder = tempfile.mkdtemp()
+        return
+
+    def tearDown(self):
+        ''' cleanup after tests'''
+        if Configuration.DEBUG == True: print("         CRUUtilsTestCase.tearDown")
+        shutil.rmtree(self.folder, True)
+        return
+
+    def _archive(self, name, lines):
+        ''' a gzipped archive of the text lines '''
+        gzFile = os.path.join(self.folder, name)
+        gzOpen = gzip.open(gzFile, "wb")
+        try:
+            gzOpen.write(("\n".join(lines) + "\n").encode("ascii"))
+        finally:
+            gzOpen.close()
+        return gzFile
+
+    def _cell(self, lat, lon):
+        ''' row and column of the 10' cell of lat, lon '''
+        return int((90.0 - lat) * CRUUtils.cellsPerDegree), int((lon + 180.0) * CRUUtils.cellsPerDegree)
+
+    def test_CL2Type(self):
+        ''' the variable follows grid_10min_ in the archive name '''
+        print("CRUUtilsTestCase.test_CL2Type")
+        self.assertEqual(CRUUtils.CL2Type(os.path.join("c:\\data", "grid_10min_pre.dat.gz")), "pre")
+        self.assertEqual(CRUUtils.CL2Type("grid_10min_sunp.dat.gz"), "sunp")
+        return
+
+    def test_DecodeRecords(self):
+        ''' whitespace separated and run-together fixed-width records '''
+        print("CRUUtilsTestCase.test_DecodeRecords")
+        records = CRUUtils.DecodeRecords(" 10.5  20.0  1.0 -2.5\n-11.0 -21.0 -1.0  2.0", 4)
+        self.assertEqual(records.tolist(), [[10.5, 20.0, 1.0, -2.5], [-11.0, -21.0, -1.0, 2.0]])
+        # negative values fill the field width and run into the value before them
+        records = CRUUtils.DecodeRecords("-45.917 169.583-12.3-10.0\n-45.917 169.750 -9.8-11.2", 4)
+        self.assertEqual(records.tolist(), [[-45.917, 169.583, -12.3, -10.0], [-45.917, 169.75, -9.8, -11.2]])
+        self.assertRaises(ValueError, CRUUtils.DecodeRecords, "1.0 2.0 3.0\n4.0 5.0", 3)
+        return
+
+    def test_ReadGridsPre(self):
+        ''' the 12 precipitation values of 26-column pre records, the coefficients of variation skipped '''
+        print("CRUUtilsTestCase.test_ReadGridsPre")
+        lines = [" ".join(["%.3f" % value for value in record]) for record in preRecords]
+        gzFile = self._archive("grid_10min_pre.dat.gz", lines)
+        chunkBytes = CRUUtils.chunkBytes
+        CRUUtils.chunkBytes = 200 # a record or two at a time
+        try:
+            grids, bounds = CRUUtils.ReadGrids(gzFile, len(CRUUtils.fieldList))
+        finally:
+            CRUUtils.chunkBytes = chunkBytes
+        self.assertEqual(grids.shape, (12, CRUUtils.gridRows, CRUUtils.gridCols))
+        cells = [self._cell(record[0], record[1]) for record in preRecords]
+        for (row, col), record in zip(cells, preRecords):
+            self.assertEqual(grids[:, row, col].tolist(), record[2:14])
+        rows = [cell[0] for cell in cells]
+        cols = [cell[1] for cell in cells]
+        self.assertEqual(bounds, [min(rows), min(cols), max(rows), max(cols)])
+        self.assertEqual(numpy.count_nonzero(grids != CRUUtils.noDataValue), 3 * 12)
+        return
+
+    def test_ReadGridsRunTogether(self):
+        ''' tmp records whose negative values run together '''
+        print("CRUUtilsTestCase.test_ReadGridsRunTogether")
+        lines = ["-45.917 169.583" + "".join(["%5.1f" % (-10.0 - m) for m in range(12)]),
+                 "-45.917 169.750" + "".join(["%5.1f" % (2.0 * m) for m in range(12)])]
+        gzFile = self._archive("grid_10min_tmp.dat.gz", lines)
+        grids, bounds = CRUUtils.ReadGrids(gzFile, len(CRUUtils.fieldList))
+        row, col = self._cell(-45.917, 169.583)
+        self.assertEqual(grids[:, row, col].tolist(), [-10.0 - m for m in range(12)])
+        self.assertEqual(grids[:, row, col + 1].tolist(), [2.0 * m for m in range(12)])
+        self.assertEqual(bounds, [row, col, row, col + 1])
+        return
+
+    def test_ReadGridsElevation(self):
+        ''' one layer from elv records; an empty archive has no cells with data '''
+        print("CRUUtilsTestCase.test_ReadGridsElevation")
+        gzFile = self._archive("grid_10min_elv.dat.gz", ["27.917 86.917 8.848"])
+        grids, bounds = CRUUtils.ReadGrids(gzFile, 1)
+        row, col = self._cell(27.917, 86.917)
+        self.assertEqual(grids.shape, (1, CRUUtils.gridRows, CRUUtils.gridCols))
+        self.assertAlmostEqual(float(grids[0, row, col]), 8.848, places=5)
+        self.assertEqual(bounds, [row, col, row, col])
+        grids, bounds = CRUUtils.ReadGrids(self._archive("grid_10min_wnd.dat.gz", [""]), 12)
+        self.assertTrue(bounds[2] < 0)
+        return
@@ -0,0 +1,131 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+MathTestCase.py
+--------------------------------------------------
+requirements: ArcGIS X.X, Python 2.7
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for the block-wise statistics of mds.math
+(RunningStatistics, statistic_over_dimension) of the Multidimension
+Supplemental Tools, checked against numpy.ma
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import unittest
+import numpy
+import Configuration
+
+# ============================================================================
+# Add the mds package to python path
+currentPath = os.path.dirname(__file__)
+pathToMDS = os.path.normpath(os.path.join(currentPath,
+    r"../../../suitability/toolboxes/scripts/MultidimensionSupplementalTools/MultidimensionSupplementalTools/Scripts"))
+sys.path.insert(0, pathToMDS)
+# ============================================================================
+
+def maskedData():
+    ''' a (7, 5, 4) masked float32 array with a large mean and cells masked along each axis '''
+    random = numpy.random.RandomState(42)
+    values = (1.0e5 + random.standard_normal((7, 5, 4)) * 10.0).astype(numpy.float32)
+    mask = random.uniform(size=values.shape) < 0.3
+    mask[:, 1, 2] = True  # all masked along axis 0
+    mask[3, :, 0] = True  # all masked along axis 1
+    mask[5, 4, :] = True  # all masked along axis 2
+    return numpy.ma.masked_array(values, mask)
+
+class MathTestCase(unittest.TestCase):
+    ''' Test mds.math.RunningStatistics and mds.math.statistic_over_dimension '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         MathTestCase.setUp")
+        import mds.math
+        self.data = maskedData()
+        self.statistics = mds.math.RunningStatistics.STATISTICS
+        return
+
+    def expected(self, statistic, axis):
+        ''' statistic of self.data over axis, computed by numpy.ma in float64 '''
+        data = self.data.astype(numpy.float64)
+        if statistic == "count":
+            return numpy.ma.asarray(numpy.ma.count(data, axis))
+        return numpy.ma.asarray(getattr(numpy.ma, statistic)(data, axis))
+
+    def assertMaskedEqual(self, result, expected, message):
+        ''' same mask, and values close where not masked '''
+        resultMask = numpy.ma.getmaskarray(result)
+        expectedMask = numpy.ma.getmaskarray(expected)
+        self.assertEqual(result.shape, expected.shape, message)
+        self.assertTrue((resultMask == expectedMask).all(), message)
+        self.assertTrue(numpy.allclose(numpy.ma.filled(result, 0.0),
+            numpy.ma.filled(expected, 0.0), rtol=1.0e-9, atol=1.0e-9), message)
+        return
+
+    def test_running_statistics(self):
+        ''' statistics added in blocks of 1, 2, 3 and all rows match numpy.ma '''
+        print("MathTestCase.test_running_statistics")
+        import mds.math
+        for axis in range(self.data.ndim):
+            for rows in [1, 2, 3, self.data.shape[axis]]:
+                statistics = mds.math.RunningStatistics()
+                for start in range(0, self.data.shape[axis], rows):
+                    slices = [slice(None)] * self.data.ndim
+                    slices[axis] = slice(start, start + rows)
+                    statistics.update(self.data[tuple(slices)], axis)
+                for statistic in self.statistics:
+                    message = "%s over axis %d in blocks of %d" % (statistic, axis, rows)
+                    if Configuration.DEBUG == True: print("             " + message)
+                    self.assertMaskedEqual(statistics.result(statistic),
+                        self.expected(statistic, axis), message)
+        return
+
+    def test_statistic_over_dimension(self):
+        ''' statistic_over_dimension matches numpy.ma for every statistic, axis and block size '''
+        print("MathTestCase.test_statistic_over_dimension")
+        import mds.math
+        for axis in range(self.data.ndim):
+            sliceSize = self.data.dtype.itemsize * self.data.size // self.data.shape[axis]
+            # blocks of 1 row (also when block_size is smaller than a row),
+            # 2 rows, 3 rows and everything at once
+            for blockSize in [1, sliceSize, 2 * sliceSize, 3 * sliceSize + 1,
+                    self.data.dtype.itemsize * self.data.size]:
+                for statistic in self.statistics:
+                    message = "%s over axis %d in blocks of %d bytes" % (statistic, axis, blockSize)
+                    if Configuration.DEBUG == True: print("             " + message)
+                    result = mds.math.statistic_over_dimension(self.data, axis,
+                        statistic, blockSize)
+                    self.assertMaskedEqual(result, self.expected(statistic, axis), message)
+        return
+
+    def test_statistic_unmasked(self):
+        ''' plain (unmasked) arrays give no masked cells '''
+        print("MathTestCase.test_statistic_unmasked")
+        import mds.math
+        data = numpy.arange(24, dtype=numpy.int16).reshape((4, 3, 2))
+        for statistic in self.statistics:
+            result = mds.math.statistic_over_dimension(data, 0, statistic, 1)
+            self.assertFalse(numpy.ma.getmaskarray(result).any(), statistic)
+            self.assertTrue(numpy.allclose(result, getattr(numpy.ma, statistic)(
+                data.astype(numpy.float64), 0) if statistic != "count" else 4), statistic)
+        return
@@ -0,0 +1,66 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+MilitaryAspectsOfTerrainTestSuite.py
+--------------------------------------------------
+requirments:
+* ArcGIS Desktop 10.X+ or ArcGIS Pro 1.X+
+* Python 2.7 or Python 3.4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description:
+This test suite collects all of the Military Aspects of Terrain test cases:
+* CCMUtilsTestCase.py
+
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+
+import logging
+import unittest
+import Configuration
+
+TestSuite = unittest.TestSuite()
+
+def getTerrainTestSuite():
+    ''' Run the Military Aspects of Terrain tests'''
+
+    ccmUtilsTests = ['test_ProcessPoolUtilsCopy',
+                     'test_SampleOIDs', 'test_OIDWhereClause', 'test_CalcSIF', 'test_MeanIntercepts',
+                     'test_F1ByCategory', 'test_FactorFields', 'test_CCMBlock',
+                     'test_Curvature', 'test_FocalRange', 'test_OffRoadBlock',
+                     'test_ToolParameters', 'test_RasterizeFactor']
+
+    if Configuration.DEBUG == True: print("     MilitaryAspectsOfTerrainTestSuite.getTerrainTestSuite")
+
+    Configuration.Logger.info("Military Aspects of Terrain tests")
+    addCCMUtilsTests(ccmUtilsTests)
+
+    return TestSuite
+
+
+def addCCMUtilsTests(inputTestList):
+    if Configuration.DEBUG == True: print("      MilitaryAspectsOfTerrainTestSuite.addCCMUtilsTests")
+    from . import CCMUtilsTestCase
+    for test in inputTestList:
+        print("adding test: " + str(test))
+        Configuration.Logger.info(test)
+        TestSuite.addTest(CCMUtilsTestCase.CCMUtilsTestCase(test))
@@ -29,10 +29,16 @@ This test suite collects all of the Military Aspects of Weather toolbox test cas
 * ImportWMOStationDataTestCase.py
 * ImportWMOStationsTestCase.py
 * ImportCRUToRasterTestCase.py
+* CRUUtilsTestCase.py
 * SubsetRasterWorkspaceTestCase.py
+* MosaicSyncUtilsTestCase.py
+* WeatherRasterUtilsTestCase.py
 ==================================================
 history:
 2/9/2016 - JH - creation
+10/19/2026 - added MosaicSyncUtils tests
+10/19/2026 - added WeatherRasterUtils tests
+10/19/2026 - added CRUUtils tests
 ==================================================
 '''
 
@@ -48,7 +54,12 @@ def getWeatherTestSuite():
     importWMODataTests = ['test_import_wmo_station_data']
     importWMOStationsTests = ['test_import_wmo_stations']
     importCRUToRasterTests = ['test_import_cru_to_raster']
+    cruUtilsTests = ['test_CL2Type', 'test_DecodeRecords', 'test_ReadGridsPre',
+                     'test_ReadGridsRunTogether', 'test_ReadGridsElevation']
     subsetRasterWorkspaceTests = ['test_subset_raster_workspace']
+    mosaicSyncUtilsTests = ['test_DimensionTime', 'test_PlanSync', 'test_NetCDFSlices']
+    weatherRasterUtilsTests = ['test_CoordinateGrid', 'test_CropToExtent', 'test_TimeStepsPerBlock',
+                               'test_readStack', 'test_GridMappingSpatialReference']
           
     if Configuration.DEBUG == True: print("     MilitaryAspectsOfWeatherTestSuite.getWeatherTestSuite")
         
@@ -57,7 +68,10 @@ def getWeatherTestSuite():
         addWMOStationsTests(importWMOStationsTests)
         addWMOStationDataTests(importWMODataTests)
         addCRUToRasterTests(importCRUToRasterTests)
+        addCRUUtilsTests(cruUtilsTests)
         addSubsetRasterWorkspaceTests(subsetRasterWorkspaceTests)
+        addMosaicSyncUtilsTests(mosaicSyncUtilsTests)
+        addWeatherRasterUtilsTests(weatherRasterUtilsTests)
 
     return TestSuite
 
@@ -86,6 +100,14 @@ def addCRUToRasterTests(inputTestList):
         Configuration.Logger.info(test)
         TestSuite.addTest(ImportCRUToRasterTestCase.ImportCRUToRasterTestCase(test))
 
+def addCRUUtilsTests(inputTestList):
+    if Configuration.DEBUG == True: print("      MilitaryAspectsOfWeatherTestSuite.addCRUUtilsTests")
+    from . import CRUUtilsTestCase
+    for test in inputTestList:
+        print("adding test: " + str(test))
+        Configuration.Logger.info(test)
+        TestSuite.addTest(CRUUtilsTestCase.CRUUtilsTestCase(test))
+
 def addSubsetRasterWorkspaceTests(inputTestList):
     if Configuration.DEBUG == True: print("      MilitaryAspectsOfWeatherTestSuite.addSubsetRasterWorkspaceTests")
     from . import SubsetRasterWorkspaceTestCase
@@ -94,4 +116,20 @@ def addSubsetRasterWorkspaceTests(inputTestList):
         Configuration.Logger.info(test)
         TestSuite.addTest(SubsetRasterWorkspaceTestCase.SubsetRasterWorkspaceTestCase(test))
     
-    
\ No newline at end of file
+    
+
+def addMosaicSyncUtilsTests(inputTestList):
+    if Configuration.DEBUG == True: print("      MilitaryAspectsOfWeatherTestSuite.addMosaicSyncUtilsTests")
+    from . import MosaicSyncUtilsTestCase
+    for test in inputTestList:
+        print("adding test: " + str(test))
+        Configuration.Logger.info(test)
+        TestSuite.addTest(MosaicSyncUtilsTestCase.MosaicSyncUtilsTestCase(test))
+
+def addWeatherRasterUtilsTests(inputTestList):
+    if Configuration.DEBUG == True: print("      MilitaryAspectsOfWeatherTestSuite.addWeatherRasterUtilsTests")
+    from . import WeatherRasterUtilsTestCase
+    for test in inputTestList:
+        print("adding test: " + str(test))
+        Configuration.Logger.info(test)
+        TestSuite.addTest(WeatherRasterUtilsTestCase.WeatherRasterUtilsTestCase(test))
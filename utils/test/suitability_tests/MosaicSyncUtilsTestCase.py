@@ -0,0 +1,140 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+MosaicSyncUtilsTestCase.py
+--------------------------------------------------
+requirements: ArcGIS X.X, Python 2.7 or Python 3.4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for the incremental mosaic dataset update
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import shutil
+import datetime
+import tempfile
+import unittest
+import Configuration
+import UnitTestUtilities
+
+# ============================================================================
+# Add MosaicSyncUtils.py module to python path
+currentPath = os.path.dirname(__file__)
+pathToMosaicSyncUtils = os.path.normpath(os.path.join(currentPath, r"../../../suitability/toolboxes/scripts"))
+sys.path.insert(0, pathToMosaicSyncUtils)
+import MosaicSyncUtils
+# ============================================================================
+
+class MosaicSyncUtilsTestCase(unittest.TestCase):
+    ''' Test all methods in MosaicSyncUtils.py '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         MosaicSyncUtilsTestCase.setUp")
+        UnitTestUtilities.checkArcPy()
+        return
+
+    def tearDown(self):
+        ''' cleanup after tests'''
+        if Configuration.DEBUG == True: print("         MosaicSyncUtilsTestCase.tearDown")
+        return
+
+    def test_DimensionTime(self):
+        ''' numbers with CF units, datetimes and date strings convert to datetimes '''
+        print("MosaicSyncUtilsTestCase.test_DimensionTime")
+        self.assertEqual(MosaicSyncUtils.DimensionTime(36.0, "hours since 2026-10-19 00:00:00"),
+                         datetime.datetime(2026, 10, 20, 12))
+        self.assertEqual(MosaicSyncUtils.DimensionTime("90", "minutes since 2026-10-19T06:00"),
+                         datetime.datetime(2026, 10, 19, 7, 30))
+        # days since 1-1-1 on the standard calendar start from a Julian date (NAM files)
+        self.assertEqual(MosaicSyncUtils.DimensionTime(739908.25, "days since 1-1-1 00:00:0.0"),
+                         datetime.datetime(2026, 10, 18, 6))
+        self.assertEqual(MosaicSyncUtils.DimensionTime(739908.25, "days since 1-1-1", "proleptic_gregorian"),
+                         datetime.datetime(2026, 10, 20, 6))
+        self.assertEqual(MosaicSyncUtils.DimensionTime(datetime.datetime(2026, 10, 19, 6, 0, 0, 500)),
+                         datetime.datetime(2026, 10, 19, 6))
+        self.assertEqual(MosaicSyncUtils.DimensionTime("10/19/2026 6:00:00 PM"),
+                         datetime.datetime(2026, 10, 19, 18))
+        self.assertEqual(MosaicSyncUtils.DimensionTime(None), None)
+        self.assertRaises(ValueError, MosaicSyncUtils.DimensionTime, 1.0, "fortnights since 2026-1-1")
+        self.assertRaises(ValueError, MosaicSyncUtils.DimensionTime, "19.10.2026 06:00")
+        return
+
+    def test_PlanSync(self):
+        ''' only missing slices are added and only stale items removed '''
+        print("MosaicSyncUtilsTestCase.test_PlanSync")
+        t0 = datetime.datetime(2026, 10, 19, 0)
+        t1 = datetime.datetime(2026, 10, 19, 6)
+        t2 = datetime.datetime(2026, 10, 19, 12)
+        sources = {"a.nc": (100.0, set([("tmp", t0), ("tmp", t1)])),
+                   "b.nc": (200.0, set([("tmp", t1), ("tmp", t2)])),
+                   "c.nc": (300.0, set([("hgt", None)]))}
+        items = [(1, "a.nc", 100.0, "tmp", t0),    # current
+                 (2, "a.nc", 100.0, "tmp", t1),    # superseded by b.nc
+                 (3, "b.nc", 150.0, "tmp", t1),    # b.nc changed since
+                 (4, "gone.nc", 50.0, "tmp", t0),  # source deleted
+                 (5, "c.nc", 300.0, "hgt", None)]  # current, no time
+        add, remove = MosaicSyncUtils.PlanSync(items, sources)
+        self.assertEqual(add, ["b.nc"])
+        self.assertEqual(sorted(remove), [2, 3, 4])
+
+        # expired slices are neither added nor kept
+        add, remove = MosaicSyncUtils.PlanSync(items, sources, expireBefore=t1)
+        self.assertEqual(add, ["b.nc"])
+        self.assertEqual(sorted(remove), [1, 2, 3, 4])
+
+        # an up to date catalog needs nothing
+        current = [(1, "a.nc", 100.0, "tmp", t0), (2, "b.nc", 200.0, "tmp", t1),
+                   (3, "b.nc", 200.0, "tmp", t2), (4, "c.nc", 300.0, "hgt", None)]
+        self.assertEqual(MosaicSyncUtils.PlanSync(current, sources), ([], []))
+        return
+
+    def test_NetCDFSlices(self):
+        ''' slices come from the numeric time values, static variables have no time '''
+        print("MosaicSyncUtilsTestCase.test_NetCDFSlices")
+        try:
+            import netCDF4
+        except ImportError:
+            self.skipTest("netCDF4 is not available")
+        folder = tempfile.mkdtemp()
+        try:
+            path = os.path.join(folder, "forecast.nc")
+            dataset = netCDF4.Dataset(path, "w")
+            dataset.createDimension("time", 2)
+            dataset.createDimension("lat", 2)
+            dataset.createDimension("lon", 3)
+            time = dataset.createVariable("time", "f8", ("time",))
+            time.units = "hours since 2026-10-19 00:00:00"
+            time[:] = [0.0, 6.0]
+            dataset.createVariable("lat", "f4", ("lat",))[:] = [10.0, 11.0]
+            dataset.createVariable("lon", "f4", ("lon",))[:] = [20.0, 21.0, 22.0]
+            dataset.createVariable("tmp", "f4", ("time", "lat", "lon"))
+            dataset.createVariable("hgt", "f4", ("lat", "lon"))
+            dataset.close()
+            self.assertEqual(MosaicSyncUtils.NetCDFSlices(path),
+                             set([("tmp", datetime.datetime(2026, 10, 19, 0)),
+                                  ("tmp", datetime.datetime(2026, 10, 19, 6)),
+                                  ("hgt", None)]))
+        finally:
+            shutil.rmtree(folder, True)
+        return
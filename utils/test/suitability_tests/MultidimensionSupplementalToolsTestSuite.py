@@ -0,0 +1,107 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+MultidimensionSupplementalToolsTestSuite.py
+--------------------------------------------------
+requirments:
+* ArcGIS Desktop 10.X+
+* Python 2.7
+* netCDF4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description:
+This test suite collects all of the Multidimension Supplemental Tools test cases:
+* NetCDFDatasetTestCase.py
+* NetCDFDatasetPoolTestCase.py
+* MathTestCase.py
+* TableTestCase.py
+
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+
+import logging
+import unittest
+import Configuration
+
+TestSuite = unittest.TestSuite()
+
+def getMultidimensionTestSuite():
+    ''' Run the Multidimension Supplemental Tools tests (Desktop only)'''
+
+    netCDFDatasetTests = ['test_copy_blocks', 'test_copy_blocks_chunks', 'test_chunk_shape',
+                          'test_xcopy_no_extent', 'test_xcopy_extent', 'test_xcopy_blocks',
+                          'test_xcopy_copyfile']
+    netCDFDatasetPoolTests = ['test_get_shares_handle', 'test_release_closes_idle',
+                              'test_evict_at_capacity', 'test_changed_file_reopened',
+                              'test_changed_file_keeps_pinned',
+                              'test_discard', 'test_all']
+    mathTests = ['test_running_statistics', 'test_statistic_over_dimension',
+                 'test_statistic_unmasked']
+    tableTests = ['test_is_table_name', 'test_broadcast_columns', 'test_write_csv',
+                  'test_write_netcdf', 'test_write_parquet', 'test_write_overwrite']
+
+    if Configuration.DEBUG == True: print("     MultidimensionSupplementalToolsTestSuite.getMultidimensionTestSuite")
+
+    if Configuration.Platform == "DESKTOP":
+        Configuration.Logger.info("Multidimension Supplemental Tools Desktop tests")
+        addNetCDFDatasetTests(netCDFDatasetTests)
+        addNetCDFDatasetPoolTests(netCDFDatasetPoolTests)
+        addMathTests(mathTests)
+        addTableTests(tableTests)
+
+    return TestSuite
+
+
+def addNetCDFDatasetTests(inputTestList):
+    if Configuration.DEBUG == True: print("      MultidimensionSupplementalToolsTestSuite.addNetCDFDatasetTests")
+    from . import NetCDFDatasetTestCase
+    for test in inputTestList:
+        print("adding test: " + str(test))
+        Configuration.Logger.info(test)
+        TestSuite.addTest(NetCDFDatasetTestCase.NetCDFDatasetTestCase(test))
+
+
+def addNetCDFDatasetPoolTests(inputTestList):
+    if Configuration.DEBUG == True: print("      MultidimensionSupplementalToolsTestSuite.addNetCDFDatasetPoolTests")
+    from . import NetCDFDatasetPoolTestCase
+    for test in inputTestList:
+        print("adding test: " + str(test))
+        Configuration.Logger.info(test)
+        TestSuite.addTest(NetCDFDatasetPoolTestCase.NetCDFDatasetPoolTestCase(test))
+
+
+def addMathTests(inputTestList):
+    if Configuration.DEBUG == True: print("      MultidimensionSupplementalToolsTestSuite.addMathTests")
+    from . import MathTestCase
+    for test in inputTestList:
+        print("adding test: " + str(test))
+        Configuration.Logger.info(test)
+        TestSuite.addTest(MathTestCase.MathTestCase(test))
+
+
+def addTableTests(inputTestList):
+    if Configuration.DEBUG == True: print("      MultidimensionSupplementalToolsTestSuite.addTableTests")
+    from . import TableTestCase
+    for test in inputTestList:
+        print("adding test: " + str(test))
+        Configuration.Logger.info(test)
+        TestSuite.addTest(TableTestCase.TableTestCase(test))
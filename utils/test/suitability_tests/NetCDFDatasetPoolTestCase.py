@@ -0,0 +1,163 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+NetCDFDatasetPoolTestCase.py
+--------------------------------------------------
+requirements: ArcGIS X.X, Python 2.7, netCDF4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for mds.netcdf.DatasetPool of the
+Multidimension Supplemental Tools, on synthetic datasets
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import Configuration
+
+# ============================================================================
+# Add the mds package to python path
+currentPath = os.path.dirname(__file__)
+pathToMDS = os.path.normpath(os.path.join(currentPath,
+    r"../../../suitability/toolboxes/scripts/MultidimensionSupplementalTools/MultidimensionSupplementalTools/Scripts"))
+sys.path.insert(0, pathToMDS)
+# ============================================================================
+
+class NetCDFDatasetPoolTestCase(unittest.TestCase):
+    ''' Test mds.netcdf.DatasetPool '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         NetCDFDatasetPoolTestCase.setUp")
+        try:
+            import netCDF4
+        except ImportError:
+            self.skipTest("netCDF4 is not available")
+        import mds.netcdf
+        import mds.benchmark
+        self.folder = tempfile.mkdtemp()
+        self.inputFiles = [os.path.join(self.folder, "grid_" + str(i) + ".nc") for i in range(3)]
+        for inputFile in self.inputFiles:
+            mds.benchmark.write_grid_dataset(inputFile, 6, 12, 2, 1)
+        self.pool = mds.netcdf.DatasetPool(capacity=2)
+        return
+
+    def tearDown(self):
+        ''' cleanup after tests'''
+        if Configuration.DEBUG == True: print("         NetCDFDatasetPoolTestCase.tearDown")
+        if hasattr(self, "pool"):
+            self.pool.clear()
+            shutil.rmtree(self.folder, ignore_errors=True)
+        return
+
+    def test_get_shares_handle(self):
+        ''' repeated requests for the same dataset share one handle '''
+        print("NetCDFDatasetPoolTestCase.test_get_shares_handle")
+        dataset = self.pool.get(self.inputFiles[0], True)
+        self.assertTrue(self.pool.get(self.inputFiles[0], True) is dataset)
+        self.assertTrue(self.pool.acquire(self.inputFiles[0], True) is dataset)
+        self.pool.release(dataset)
+        # different convention settings get their own handle
+        other = self.pool.get(self.inputFiles[0], False)
+        self.assertFalse(other is dataset)
+        return
+
+    def test_release_closes_idle(self):
+        ''' a dataset is closed when its last pin is released '''
+        print("NetCDFDatasetPoolTestCase.test_release_closes_idle")
+        dataset = self.pool.acquire(self.inputFiles[0], True)
+        self.assertTrue(self.pool.acquire(self.inputFiles[0], True) is dataset)
+        self.pool.release(dataset)
+        self.assertTrue(dataset.dataset is not None)
+        self.pool.release(dataset)
+        self.assertTrue(dataset.dataset is None)
+        self.assertEqual(len(self.pool), 0)
+        return
+
+    def test_evict_at_capacity(self):
+        ''' least recently used, unpinned datasets are closed at capacity '''
+        print("NetCDFDatasetPoolTestCase.test_evict_at_capacity")
+        pinned = self.pool.acquire(self.inputFiles[0], True)
+        first = self.pool.get(self.inputFiles[1], True)
+        second = self.pool.get(self.inputFiles[2], True)
+        self.assertEqual(len(self.pool), 2)
+        self.assertTrue(pinned.dataset is not None)
+        self.assertTrue(first.dataset is None)
+        self.assertTrue(second.dataset is not None)
+        self.pool.release(pinned)
+        return
+
+    def test_changed_file_reopened(self):
+        ''' a file rewritten after discard gets a fresh handle on the new contents '''
+        print("NetCDFDatasetPoolTestCase.test_changed_file_reopened")
+        import mds.benchmark
+        dataset = self.pool.get(self.inputFiles[0], True)
+        self.pool.discard(self.inputFiles[0])
+        mds.benchmark.write_grid_dataset(self.inputFiles[0], 8, 12, 2, 1)
+        other = self.pool.get(self.inputFiles[0], True)
+        self.assertFalse(other is dataset)
+        self.assertEqual(other.variable("variable_0").shape, (2, 8, 12))
+        return
+
+    def test_changed_file_keeps_pinned(self):
+        ''' a file touched while pinned gets a new handle; the pinned one stays usable '''
+        print("NetCDFDatasetPoolTestCase.test_changed_file_keeps_pinned")
+        pinned = self.pool.acquire(self.inputFiles[0], True)
+        variable = pinned.variable("variable_0")
+        modified = os.path.getmtime(self.inputFiles[0]) + 10
+        os.utime(self.inputFiles[0], (modified, modified))
+        self.assertEqual(list(pinned.data_variable_names()), ["variable_0"])
+        self.assertEqual(variable[:].shape, (2, 6, 12))
+        other = self.pool.get(self.inputFiles[0], True)
+        self.assertFalse(other is pinned)
+        self.assertTrue(pinned.variable("variable_0") is variable)
+        self.pool.release(pinned)
+        self.assertTrue(pinned.dataset is None)
+        self.assertTrue(other.dataset is not None)
+        return
+
+    def test_discard(self):
+        ''' discard closes idle handles of a file so it can be overwritten '''
+        print("NetCDFDatasetPoolTestCase.test_discard")
+        dataset = self.pool.get(self.inputFiles[0], True)
+        pinned = self.pool.acquire(self.inputFiles[1], True)
+        self.pool.discard(os.path.join(self.folder, ".", "grid_0.nc"))
+        self.pool.discard(self.inputFiles[1])
+        self.assertTrue(dataset.dataset is None)
+        self.assertTrue(pinned.dataset is not None)
+        self.assertEqual(len(self.pool), 1)
+        self.pool.release(pinned)
+        return
+
+    def test_all(self):
+        ''' only the pool API is exported into mds.netcdf '''
+        print("NetCDFDatasetPoolTestCase.test_all")
+        import mds.netcdf
+        import mds.netcdf.pool
+        self.assertEqual(sorted(mds.netcdf.pool.__all__), sorted(["DatasetPool",
+            "DATASET_POOL", "open_dataset", "acquire_dataset", "release_dataset",
+            "discard_dataset"]))
+        self.assertFalse(hasattr(mds.netcdf, "threading"))
+        self.assertFalse(hasattr(mds.netcdf, "collections"))
+        return
@@ -0,0 +1,262 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+NetCDFDatasetTestCase.py
+--------------------------------------------------
+requirements: ArcGIS X.X, Python 2.7, netCDF4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for mds.netcdf.Dataset of the
+Multidimension Supplemental Tools, on a synthetic dataset
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import numpy
+import Configuration
+
+# ============================================================================
+# Add the mds package to python path
+currentPath = os.path.dirname(__file__)
+pathToMDS = os.path.normpath(os.path.join(currentPath,
+    r"../../../suitability/toolboxes/scripts/MultidimensionSupplementalTools/MultidimensionSupplementalTools/Scripts"))
+sys.path.insert(0, pathToMDS)
+# ============================================================================
+
+def writeGrid(filename, chunksizes=None):
+    ''' a CF-1.6 dataset with two float32 variables on a (time, lat, lon) 10 degree global grid '''
+    import netCDF4
+    dataset = netCDF4.Dataset(filename, mode="w", format="NETCDF4_CLASSIC")
+    try:
+        dataset.Conventions = "CF-1.6"
+        dataset.history = "synthetic"
+        dataset.createDimension("time", None)
+        time = dataset.createVariable("time", "f8", ("time",))
+        time.standard_name = "time"
+        time.units = "hours since 2016-01-01 00:00:00"
+        time.calendar = "standard"
+        time[:] = numpy.arange(4) * 6.0
+        for name, length, start, units in [("lat", 18, -90.0, "degrees_north"),
+                                           ("lon", 36, -180.0, "degrees_east")]:
+            dataset.createDimension(name, length)
+            coordinate = dataset.createVariable(name, "f8", (name,))
+            coordinate.standard_name = "latitude" if name == "lat" else "longitude"
+            coordinate.units = units
+            coordinate[:] = start + (numpy.arange(length) + 0.5) * 10.0
+        values = numpy.arange(4 * 18 * 36, dtype="f4").reshape((4, 18, 36))
+        for index in range(2):
+            variable = dataset.createVariable("variable_" + str(index), "f4", ("time", "lat", "lon"),
+                                              fill_value=-9999.0, chunksizes=chunksizes)
+            variable.units = "K"
+            variable[:] = numpy.ma.masked_where(values % 97 == 0, values + index)
+    finally:
+        dataset.close()
+
+class NetCDFDatasetTestCase(unittest.TestCase):
+    ''' Test mds.netcdf.Dataset '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         NetCDFDatasetTestCase.setUp")
+        try:
+            import netCDF4
+        except ImportError:
+            self.skipTest("netCDF4 is not available")
+        import mds.netcdf
+        self.folder = tempfile.mkdtemp()
+        self.inputFile = os.path.join(self.folder, "grid.nc")
+        self.outputFile = os.path.join(self.folder, "copy.nc")
+        writeGrid(self.inputFile, [2, 9, 36])
+        self.dataset = mds.netcdf.Dataset(self.inputFile, filter_out_nd_coordinates=True)
+        return
+
+    def tearDown(self):
+        ''' cleanup after tests'''
+        if Configuration.DEBUG == True: print("         NetCDFDatasetTestCase.tearDown")
+        if hasattr(self, "dataset"):
+            del self.dataset # closes the file
+            shutil.rmtree(self.folder, ignore_errors=True)
+        return
+
+    def assertPartition(self, blocks, ranges, itemSize, blockSize):
+        ''' blocks cover the hyperslab ranges exactly once, each within blockSize bytes '''
+        covered = numpy.zeros([end for start, end in ranges], "i4")
+        for block in blocks:
+            cells = numpy.prod([end - start for start, end in block])
+            self.assertTrue(cells * itemSize <= blockSize or block[-1][1] - block[-1][0] == 1)
+            covered[tuple(slice(start, end) for start, end in block)] += 1
+        self.assertTrue((covered[tuple(slice(start, end) for start, end in ranges)] == 1).all())
+        self.assertEqual(covered.sum(), numpy.prod([end - start for start, end in ranges]))
+        return
+
+    def test_copy_blocks(self):
+        ''' blocks are cut along the first dimension, then along inner dimensions when a row is too large '''
+        print("NetCDFDatasetTestCase.test_copy_blocks")
+        from mds.netcdf.dataset import copy_blocks
+        ranges = [(0, 10), (0, 4), (0, 5)]
+        blocks = list(copy_blocks(ranges, 4, 240))
+        self.assertEqual([block[0] for block in blocks], [(0, 3), (3, 6), (6, 9), (9, 10)])
+        self.assertTrue(all(block[1:] == ((0, 4), (0, 5)) for block in blocks))
+        self.assertPartition(blocks, ranges, 4, 240)
+
+        # one index along the first dimension holds more than block_size bytes
+        ranges = [(2, 4), (0, 6), (0, 4)]
+        blocks = list(copy_blocks(ranges, 4, 40))
+        self.assertEqual(blocks[:3], [((2, 3), (0, 2), (0, 4)), ((2, 3), (2, 4), (0, 4)), ((2, 3), (4, 6), (0, 4))])
+        self.assertEqual(len(blocks), 6)
+        self.assertPartition(blocks, ranges, 4, 40)
+
+        # a single value along the last dimension larger than block_size
+        blocks = list(copy_blocks([(0, 2), (0, 3)], 8, 4))
+        self.assertEqual(len(blocks), 6)
+        self.assertPartition(blocks, [(0, 2), (0, 3)], 8, 4)
+
+        self.assertEqual(list(copy_blocks([], 4)), [()])
+        self.assertEqual(list(copy_blocks([(0, 3), (2, 2)], 4)), [])
+        return
+
+    def test_copy_blocks_chunks(self):
+        ''' block boundaries along the first dimension fall on chunk boundaries '''
+        print("NetCDFDatasetTestCase.test_copy_blocks_chunks")
+        from mds.netcdf.dataset import copy_blocks
+        ranges = [(0, 10), (0, 4), (0, 5)]
+        blocks = list(copy_blocks(ranges, 4, 240, [2, 4, 5]))
+        self.assertEqual([block[0] for block in blocks], [(0, 2), (2, 4), (4, 6), (6, 8), (8, 10)])
+
+        # a range that starts inside a chunk: the first block ends at the chunk boundary
+        blocks = list(copy_blocks([(3, 10), (0, 2)], 1, 8, [4, 2]))
+        self.assertEqual([block[0] for block in blocks], [(3, 4), (4, 8), (8, 10)])
+
+        # blocks cut along inner dimensions are aligned to the inner chunks
+        ranges = [(0, 2), (0, 8), (0, 4)]
+        blocks = list(copy_blocks(ranges, 4, 64, [1, 3, 4]))
+        self.assertEqual([block[1] for block in blocks if block[0] == (0, 1)], [(0, 3), (3, 6), (6, 8)])
+        self.assertPartition(blocks, ranges, 4, 64)
+
+        # fewer rows than a chunk's length fit in a block: blocks share chunks
+        blocks = list(copy_blocks([(0, 8), (0, 2)], 1, 2, [4, 2]))
+        self.assertEqual([block[0] for block in blocks], [(index, index + 1) for index in range(8)])
+        return
+
+    def test_chunk_shape(self):
+        ''' map chunks hold spatial slices, time series chunks all times; both halved down to chunk_size '''
+        print("NetCDFDatasetTestCase.test_chunk_shape")
+        import mds.constants
+        from mds.netcdf.dataset import chunk_shape
+        self.assertEqual(chunk_shape([4, 18, 36], [1, 2], mds.constants.MAP_ACCESS, 4), [1, 18, 36])
+        self.assertEqual(chunk_shape([4, 18, 36], [1, 2], mds.constants.TIME_SERIES_ACCESS, 4), [4, 18, 36])
+        self.assertEqual(chunk_shape([4, 18, 36], [1, 2], mds.constants.MAP_ACCESS, 4, 600), [1, 5, 9])
+        self.assertEqual(chunk_shape([4, 18, 36], [1, 2], mds.constants.TIME_SERIES_ACCESS, 4, 600), [4, 3, 5])
+        self.assertEqual(chunk_shape([0, 1, 1], [1, 2], mds.constants.TIME_SERIES_ACCESS, 4), [1, 1, 1])
+        return
+
+    def test_xcopy_no_extent(self):
+        ''' without an extent, the full extent of the first spatial variable is copied '''
+        print("NetCDFDatasetTestCase.test_xcopy_no_extent")
+        import netCDF4
+        expected = self.dataset.variable("variable_0")[:]
+        self.dataset.xcopy(["variable_0"], self.outputFile, extent=None)
+        output = netCDF4.Dataset(self.outputFile)
+        try:
+            self.assertEqual(list(output.variables.keys()), ["time", "lat", "lon", "variable_0"])
+            self.assertEqual(output.variables["variable_0"].shape, (4, 18, 36))
+            self.assertTrue((output.variables["variable_0"][:] == expected).all())
+            self.assertEqual(output.variables["variable_0"].chunking(), [2, 9, 36])
+        finally:
+            output.close()
+        return
+
+    def test_xcopy_extent(self):
+        ''' an extent selects the cells with their centers in it '''
+        print("NetCDFDatasetTestCase.test_xcopy_extent")
+        import netCDF4
+        expected = self.dataset.variable("variable_1")[:, 9:13, 18:27]
+        self.dataset.xcopy(["variable_1"], self.outputFile, extent=[0.0, 0.0, 90.0, 40.0])
+        output = netCDF4.Dataset(self.outputFile)
+        try:
+            self.assertEqual(output.variables["variable_1"].shape, (4, 4, 9))
+            self.assertTrue(output.variables["lon"][:].min() > 0.0)
+            self.assertTrue(output.variables["lat"][:].max() < 40.0)
+            self.assertTrue((output.variables["variable_1"][:] == expected).all())
+            self.assertTrue((numpy.ma.getmaskarray(output.variables["variable_1"][:]) ==
+                             numpy.ma.getmaskarray(expected)).all())
+        finally:
+            output.close()
+        # the source variable is masked again after the copy
+        self.assertTrue(numpy.ma.getmaskarray(expected).any())
+        source = self.dataset.variable("variable_1")[:, 9:13, 18:27]
+        self.assertTrue((numpy.ma.getmaskarray(source) == numpy.ma.getmaskarray(expected)).all())
+        return
+
+    def test_xcopy_blocks(self):
+        ''' small blocks, deflate and a time series chunk layout copy the same values '''
+        print("NetCDFDatasetTestCase.test_xcopy_blocks")
+        import netCDF4
+        import mds.constants
+        expected = self.dataset.variable("variable_0")[:]
+        self.dataset.xcopy(["variable_0"], self.outputFile, extent=[-180.0, -90.0, 180.0, 90.0],
+                           zlib=True, complevel=1, chunk_layout=mds.constants.TIME_SERIES_ACCESS,
+                           block_size=100)
+        output = netCDF4.Dataset(self.outputFile)
+        try:
+            variable = output.variables["variable_0"]
+            self.assertTrue(variable.filters()["zlib"])
+            self.assertEqual(variable.filters()["complevel"], 1)
+            self.assertEqual(variable.chunking(), [4, 18, 36])
+            self.assertEqual(variable.getncattr("_FillValue"), -9999.0)
+            self.assertTrue((variable[:] == expected).all())
+            self.assertTrue((numpy.ma.getmaskarray(variable[:]) == numpy.ma.getmaskarray(expected)).all())
+        finally:
+            output.close()
+        return
+
+    def test_xcopy_copyfile(self):
+        ''' a copy of the whole file is made with shutil.copyfile, unless storage settings change '''
+        print("NetCDFDatasetTestCase.test_xcopy_copyfile")
+        import netCDF4
+        import mds.netcdf.dataset
+        expected = self.dataset.variable("variable_1")[:]
+        copies = []
+        copyfile = mds.netcdf.dataset.shutil.copyfile
+        def recordCopy(source, target):
+            copies.append(target)
+            return copyfile(source, target)
+        mds.netcdf.dataset.shutil.copyfile = recordCopy
+        try:
+            self.dataset.xcopy(["variable_0", "variable_1"], self.outputFile, history_message="copied")
+            self.assertEqual(copies, [self.outputFile])
+            output = netCDF4.Dataset(self.outputFile)
+            try:
+                self.assertEqual(output.history, "synthetic\ncopied")
+                self.assertEqual(output.Source_Software, "Esri ArcGIS")
+                self.assertTrue((output.variables["variable_1"][:] == expected).all())
+            finally:
+                output.close()
+
+            self.dataset.xcopy(["variable_0", "variable_1"], self.outputFile, zlib=True)
+            self.assertEqual(len(copies), 1)
+        finally:
+            mds.netcdf.dataset.shutil.copyfile = copyfile
+        return
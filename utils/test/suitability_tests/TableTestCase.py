@@ -0,0 +1,204 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+TableTestCase.py
+--------------------------------------------------
+requirements: ArcGIS X.X, Python 2.7, netCDF4, pyarrow (optional)
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for mds.table (broadcast_columns and the
+csv, netCDF and Parquet writers of write_table) of the Multidimension
+Supplemental Tools. These do not need arcpy.
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import csv
+import shutil
+import datetime
+import tempfile
+import unittest
+import numpy
+import Configuration
+
+# ============================================================================
+# Add the mds package to python path
+currentPath = os.path.dirname(__file__)
+pathToMDS = os.path.normpath(os.path.join(currentPath,
+    r"../../../suitability/toolboxes/scripts/MultidimensionSupplementalTools/MultidimensionSupplementalTools/Scripts"))
+sys.path.insert(0, pathToMDS)
+# ============================================================================
+
+class TableTestCase(unittest.TestCase):
+    ''' Test mds.table '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         TableTestCase.setUp")
+        import mds.table
+        self.folder = tempfile.mkdtemp()
+        # Two time steps by two depths by three zones, as the zonal
+        #   statistics tool fills its table, with one zone dropped
+        self.times = numpy.array([0.0, 6.0])
+        self.depths = numpy.array([5, 10], numpy.int32)
+        self.zones = numpy.array([3, 7, 11], numpy.int16)
+        columns = mds.table.broadcast_columns([self.times, self.depths], self.zones)
+        self.keep = numpy.ones(12, numpy.bool_)
+        self.keep[4] = False # time 0, depth 10, zone 7
+        self.dates = numpy.array([datetime.datetime(2016, 1, 1, 0),
+            datetime.datetime(2016, 1, 1, 6)], 'datetime64[us]')
+        dates = self.dates[numpy.searchsorted(self.times, columns[0])]
+        self.table = numpy.zeros((numpy.count_nonzero(self.keep),), numpy.dtype([
+            ('time', dates.dtype), ('depth', numpy.int32), ('zone', numpy.int16),
+            ('COUNT', numpy.int32), ('MEAN', numpy.float64)]))
+        for name, column in zip(self.table.dtype.names, [dates, columns[1],
+                columns[2], numpy.arange(12, dtype=numpy.int32),
+                numpy.arange(12) * 0.25]):
+            self.table[name] = column[self.keep]
+        return
+
+    def tearDown(self):
+        ''' cleanup after tests'''
+        if Configuration.DEBUG == True: print("         TableTestCase.tearDown")
+        shutil.rmtree(self.folder, ignore_errors=True)
+        return
+
+    def expectedRows(self):
+        ''' (time index, depth, zone) of the kept rows, in nested loop order with zones fastest '''
+        rows = []
+        for timeIndex in range(len(self.times)):
+            for depth in self.depths:
+                for zone in self.zones:
+                    rows.append((timeIndex, int(depth), int(zone)))
+        return [row for row, keep in zip(rows, self.keep) if keep]
+
+    def test_is_table_name(self):
+        ''' tables are recognized by extension or geodatabase '''
+        print("TableTestCase.test_is_table_name")
+        import mds.table
+        for name in ["zones.dbf", "zones.CSV", "zones.nc", "zones.parquet",
+                os.path.join("C:\\data", "zones.gdb", "table")]:
+            self.assertTrue(mds.table.is_table_name(name), name)
+        for name in ["zones.txt", "zones", os.path.join("C:\\data", "zones")]:
+            self.assertFalse(mds.table.is_table_name(name), name)
+        return
+
+    def test_broadcast_columns(self):
+        ''' a row per coordinate combination and zone, zones varying fastest '''
+        print("TableTestCase.test_broadcast_columns")
+        import mds.table
+        columns = mds.table.broadcast_columns([self.times, self.depths], self.zones)
+        self.assertEqual(len(columns), 3)
+        self.assertEqual(columns[0].tolist(), [0.0] * 6 + [6.0] * 6)
+        self.assertEqual(columns[1].tolist(), ([5] * 3 + [10] * 3) * 2)
+        self.assertEqual(columns[2].tolist(), [3, 7, 11] * 4)
+        # dtypes of the coordinates and zones are kept
+        self.assertEqual(columns[0].dtype, numpy.float64)
+        self.assertEqual(columns[1].dtype, numpy.int32)
+        self.assertEqual(columns[2].dtype, numpy.int16)
+        # without non-spatial dimensions there is a row per zone
+        columns = mds.table.broadcast_columns([], self.zones)
+        self.assertEqual(len(columns), 1)
+        self.assertEqual(columns[0].tolist(), [3, 7, 11])
+        return
+
+    def test_write_csv(self):
+        ''' csv: header row, rows in table order, dates as text '''
+        print("TableTestCase.test_write_csv")
+        import mds.table
+        filename = os.path.join(self.folder, "zones.csv")
+        mds.table.write_table(self.table, filename)
+        with open(filename, "r") as file_:
+            rows = list(csv.reader(file_))
+        self.assertEqual(rows[0], list(self.table.dtype.names))
+        self.assertEqual(len(rows), self.table.size + 1)
+        self.assertEqual(rows[1][0], "2016-01-01 00:00:00")
+        self.assertEqual(rows[-1][0], "2016-01-01 06:00:00")
+        self.assertEqual([(int(row[0] == "2016-01-01 06:00:00"), int(row[1]),
+            int(row[2])) for row in rows[1:]], self.expectedRows())
+        self.assertEqual([float(row[4]) for row in rows[1:]],
+            self.table['MEAN'].tolist())
+        return
+
+    def test_write_netcdf(self):
+        ''' netCDF: a variable per field along row, field dtypes kept, dates as CF time '''
+        print("TableTestCase.test_write_netcdf")
+        try:
+            import netCDF4
+        except ImportError:
+            self.skipTest("netCDF4 is not available")
+        import mds.table
+        filename = os.path.join(self.folder, "zones.nc")
+        mds.table.write_table(self.table, filename)
+        dataset = netCDF4.Dataset(filename)
+        try:
+            self.assertEqual(list(dataset.dimensions), ["row"])
+            self.assertEqual(len(dataset.dimensions["row"]), self.table.size)
+            self.assertEqual(list(dataset.variables), list(self.table.dtype.names))
+            for name in ["depth", "zone", "COUNT", "MEAN"]:
+                variable = dataset.variables[name]
+                self.assertEqual(variable.dtype, self.table.dtype[name], name)
+                self.assertEqual(variable[:].tolist(), self.table[name].tolist(), name)
+            time = dataset.variables["time"]
+            self.assertEqual(time.dtype, numpy.float64)
+            self.assertEqual(time.units, "seconds since 1970-01-01 00:00:00")
+            dates = netCDF4.num2date(time[:], time.units, time.calendar)
+            self.assertEqual([(date.year, date.month, date.day, date.hour) for date in dates],
+                [(2016, 1, 1, 6 * row[0]) for row in self.expectedRows()])
+        finally:
+            dataset.close()
+        return
+
+    def test_write_parquet(self):
+        ''' Parquet: a column per field, field types kept, dates as timestamps '''
+        print("TableTestCase.test_write_parquet")
+        import mds.table
+        filename = os.path.join(self.folder, "zones.parquet")
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            # Parquet output needs pyarrow; other formats do not
+            self.assertRaises(ImportError, mds.table.write_table, self.table, filename)
+            return
+        mds.table.write_table(self.table, filename)
+        table = pyarrow.parquet.read_table(filename)
+        self.assertEqual(table.column_names, list(self.table.dtype.names))
+        self.assertEqual(str(table.schema.field("depth").type), "int32")
+        self.assertEqual(str(table.schema.field("zone").type), "int16")
+        self.assertEqual(str(table.schema.field("MEAN").type), "double")
+        self.assertEqual(str(table.schema.field("time").type), "timestamp[us]")
+        self.assertEqual(table.column("zone").to_pylist(), self.table["zone"].tolist())
+        self.assertEqual(table.column("time").to_pylist(), self.table["time"].tolist())
+        return
+
+    def test_write_overwrite(self):
+        ''' an existing file is replaced, unless overwrite is off '''
+        print("TableTestCase.test_write_overwrite")
+        import mds.table
+        filename = os.path.join(self.folder, "zones.csv")
+        mds.table.write_table(self.table, filename)
+        mds.table.write_table(self.table[:2], filename)
+        with open(filename, "r") as file_:
+            self.assertEqual(len(list(csv.reader(file_))), 3)
+        self.assertRaises(AssertionError, mds.table.write_table, self.table,
+            filename, False)
+        return
@@ -0,0 +1,143 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+WeatherRasterUtilsTestCase.py
+--------------------------------------------------
+requirements: ArcGIS X.X, Python 2.7 or Python 3.4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for the multiband forecast raster writer
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import numpy
+import unittest
+import Configuration
+import UnitTestUtilities
+
+# ============================================================================
+# Add WeatherRasterUtils.py module to python path
+currentPath = os.path.dirname(__file__)
+pathToWeatherRasterUtils = os.path.normpath(os.path.join(currentPath, r"../../../suitability/toolboxes/scripts"))
+sys.path.insert(0, pathToWeatherRasterUtils)
+import WeatherRasterUtils
+# ============================================================================
+
+class WeatherRasterUtilsTestCase(unittest.TestCase):
+    ''' Test all methods in WeatherRasterUtils.py '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         WeatherRasterUtilsTestCase.setUp")
+        UnitTestUtilities.checkArcPy()
+        return
+
+    def tearDown(self):
+        ''' cleanup after tests'''
+        if Configuration.DEBUG == True: print("         WeatherRasterUtilsTestCase.tearDown")
+        return
+
+    def _dataset(self):
+        ''' an in-memory netCDF4 dataset with a (time, level, lon, lat) variable '''
+        try:
+            import netCDF4
+        except ImportError:
+            self.skipTest("netCDF4 is not available")
+        dataset = netCDF4.Dataset("weather.nc", "w", diskless=True)
+        for name, size in [("time", 3), ("level", 2), ("lon", 4), ("lat", 5)]:
+            dataset.createDimension(name, size)
+        variable = dataset.createVariable("tmp", "f4", ("time", "level", "lon", "lat"), fill_value=-1.0)
+        variable[:] = numpy.arange(3 * 2 * 4 * 5, dtype=numpy.float32).reshape(3, 2, 4, 5)
+        variable[1, 0, 2, 3] = numpy.ma.masked
+        return dataset
+
+    def test_CoordinateGrid(self):
+        ''' cell centers give the lower left corner, cell size and row order '''
+        print("WeatherRasterUtilsTestCase.test_CoordinateGrid")
+        grid, flip = WeatherRasterUtils.CoordinateGrid([10.0, 10.5, 11.0, 11.5], [40.0, 40.25, 40.5])
+        self.assertEqual((grid.west, grid.south), (9.75, 39.875))
+        self.assertEqual((grid.cellWidth, grid.cellHeight), (0.5, 0.25))
+        self.assertEqual((grid.rows, grid.cols), (3, 4))
+        self.assertTrue(flip)
+        grid, flip = WeatherRasterUtils.CoordinateGrid([10.0, 10.5], [40.5, 40.25, 40.0])
+        self.assertEqual(grid.south, 39.875)
+        self.assertFalse(flip)
+        return
+
+    def test_CropToExtent(self):
+        ''' only the cells with their centers in the extent are kept '''
+        print("WeatherRasterUtilsTestCase.test_CropToExtent")
+        grid = WeatherRasterUtils.WeatherGrid(0.0, 0.0, 1.0, 1.0, 4, 5)
+        values = numpy.arange(20.0).reshape(4, 5)
+        cropped, croppedValues = WeatherRasterUtils.CropToExtent(grid, values, 1.0, 1.0, 3.0, 2.9)
+        self.assertEqual((cropped.west, cropped.south, cropped.rows, cropped.cols), (1.0, 1.0, 2, 2))
+        self.assertTrue((croppedValues == [[6.0, 7.0], [11.0, 12.0]]).all())
+        # an extent that misses the grid keeps the whole grid
+        cropped, croppedValues = WeatherRasterUtils.CropToExtent(grid, values, 10.0, 10.0, 11.0, 11.0)
+        self.assertTrue(cropped is grid)
+        self.assertTrue(croppedValues is values)
+        return
+
+    def test_TimeStepsPerBlock(self):
+        ''' blocks hold as many time steps of all bands as the budget allows, at least one '''
+        print("WeatherRasterUtilsTestCase.test_TimeStepsPerBlock")
+        self.assertEqual(WeatherRasterUtils.TimeStepsPerBlock(4, 100, 100, 1000000), 25)
+        self.assertEqual(WeatherRasterUtils.TimeStepsPerBlock(4, 100, 100, 39999), 1)
+        self.assertEqual(WeatherRasterUtils.TimeStepsPerBlock(0, 0, 0, 10), 10)
+        return
+
+    def test_readStack(self):
+        ''' stacks are (times, lat, lon), first level, masked values as NaN '''
+        print("WeatherRasterUtilsTestCase.test_readStack")
+        dataset = self._dataset()
+        try:
+            stack = WeatherRasterUtils._readStack(dataset.variables["tmp"], "time", "lat", "lon", 1, 3)
+            expected = numpy.arange(3 * 2 * 4 * 5, dtype=float).reshape(3, 2, 4, 5)[1:3, 0].transpose(0, 2, 1)
+            self.assertEqual(stack.shape, (2, 5, 4))
+            self.assertTrue(numpy.isnan(stack[0, 3, 2]))
+            stack[0, 3, 2] = expected[0, 3, 2]
+            self.assertTrue((stack == expected).all())
+        finally:
+            dataset.close()
+        return
+
+    def test_GridMappingSpatialReference(self):
+        ''' the spatial reference comes from the grid mapping variable, WGS 1984 without one '''
+        print("WeatherRasterUtilsTestCase.test_GridMappingSpatialReference")
+        dataset = self._dataset()
+        try:
+            self.assertEqual(WeatherRasterUtils.GridMappingSpatialReference(dataset, ["tmp"]).factoryCode, 4326)
+            mapping = dataset.createVariable("crs", "i4")
+            dataset.variables["tmp"].grid_mapping = "crs"
+            mapping.grid_mapping_name = "latitude_longitude"
+            mapping.epsg_code = "EPSG:4269"
+            self.assertEqual(WeatherRasterUtils.GridMappingSpatialReference(dataset, ["tmp"]).factoryCode, 4269)
+            del mapping.epsg_code
+            mapping.earth_radius = 6371229.0
+            sr = WeatherRasterUtils.GridMappingSpatialReference(dataset, ["tmp"])
+            self.assertEqual(sr.type, "Geographic")
+            self.assertAlmostEqual(sr.semiMajorAxis, 6371229.0)
+            self.assertAlmostEqual(sr.flattening, 0.0)
+        finally:
+            dataset.close()
+        return
@@ -30,11 +30,13 @@ This test suite collects all of the visibility toolbox test suites:
 * SunPositionAnalysisToolsTestSuite.py
 * VisibilityDataPrepToolsTestSuite.py
 * RangeRingTestSuite.py
+* VisibilityAndRangeToolsTestSuite.py
 
 ==================================================
 history:
 12/4/2015 - JH - original writeup
 04/07/2016 - mf - added Range Rings test suite
+10/19/2026 - added Visibility and Range test suite
 ==================================================
 '''
 
@@ -42,6 +44,7 @@ import unittest
 import Configuration
 from . import SunPositionAnalysisToolsTestSuite
 from . import RangeRingTestSuite
+from . import VisibilityAndRangeToolsTestSuite
 
 def getVisibilityTestSuites():
     ''' This pulls together all of the toolbox test suites in this folder '''
@@ -52,4 +55,5 @@ def getVisibilityTestSuites():
 
     testSuite.addTests(SunPositionAnalysisToolsTestSuite.getSunPositionTestSuite())
     testSuite.addTests(RangeRingTestSuite.getRangeRingTestSuite())
+    testSuite.addTests(VisibilityAndRangeToolsTestSuite.getVisibilityAndRangeTestSuite())
     return testSuite
@@ -0,0 +1,177 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+LLOSProfileGraphUtilsTestCase.py
+--------------------------------------------------
+requirements: ArcGIS X.X, Python 2.7 or Python 3.4, matplotlib (optional)
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for LLOSProfileGraphUtils.py
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+import Configuration
+import UnitTestUtilities
+
+# ============================================================================
+# Add LLOSProfileGraphUtils.py module to python path
+currentPath = os.path.dirname(__file__)
+pathToLLOSProfileGraphUtils = os.path.normpath(os.path.join(currentPath, r"../../../visibility/toolboxes/scripts"))
+sys.path.insert(0, pathToLLOSProfileGraphUtils)
+import LLOSProfileGraphUtils
+# ============================================================================
+
+def makeProfile(tgtZ=12.0):
+    ''' a profile as read by ReadProfiles: visible, then hidden ground to the target '''
+    return {"visible": 2, "obsID": 1, "obsZ": 12.0, "tgtID": 4, "tgtZ": tgtZ, "tgtD": 10.0,
+            "segments": [(1, [0.0, 5.0], [10.0, 11.0]), (2, [5.0, 10.0], [11.0, 9.0])]}
+
+class LLOSProfileGraphUtilsTestCase(unittest.TestCase):
+    ''' Test all methods in LLOSProfileGraphUtils.py '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         LLOSProfileGraphUtilsTestCase.setUp")
+        UnitTestUtilities.checkArcPy()
+        self.folder = tempfile.mkdtemp()
+        return
+
+    def tearDown(self):
+        ''' cleanup after tests'''
+        if Configuration.DEBUG == True: print("         LLOSProfileGraphUtilsTestCase.tearDown")
+        shutil.rmtree(self.folder, True)
+        return
+
+    def makeSightLines(self):
+        ''' an in_memory LLOS output: sight line 7 in two pieces, sight line 8 in one '''
+        import arcpy
+        fc = arcpy.CreateFeatureclass_management("in_memory", "llosProfileLines", "POLYLINE",
+                                                 None, "DISABLED", "ENABLED")[0]
+        for field in ["SourceOID", "TarIsVis", "VisCode", "OID_OBSERV", "OID_TARGET"]:
+            arcpy.AddField_management(fc, field, "LONG")
+        for field in ["ObsZ", "TgtZ"]:
+            arcpy.AddField_management(fc, field, "DOUBLE")
+        fields = ["SHAPE@", "SourceOID", "TarIsVis", "VisCode", "ObsZ", "TgtZ", "OID_OBSERV", "OID_TARGET"]
+        lines = [([(0.0, 0.0, 10.0), (3.0, 4.0, 11.0)], 7, 2, 1),
+                 ([(3.0, 4.0, 11.0), (6.0, 8.0, 9.0)], 7, 2, 2),
+                 ([(0.0, 0.0, 10.0), (0.0, 20.0, 5.0)], 8, 1, 1)]
+        with arcpy.da.InsertCursor(fc, fields) as cursor:
+            for points, sourceOID, visible, visibilityCode in lines:
+                line = arcpy.Polyline(arcpy.Array([arcpy.Point(*point) for point in points]), None, True)
+                cursor.insertRow([line, sourceOID, visible, visibilityCode, 12.0, 9.0, 1, sourceOID - 6])
+        return fc
+
+    def test_ReadProfiles(self):
+        ''' sight line pieces are grouped by SourceOID, distances from the first vertex '''
+        print("LLOSProfileGraphUtilsTestCase.test_ReadProfiles")
+        import arcpy
+        fc = self.makeSightLines()
+        try:
+            profiles = LLOSProfileGraphUtils.ReadProfiles(fc)
+        finally:
+            arcpy.Delete_management(fc)
+        self.assertEqual(sorted(profiles.keys()), [7, 8])
+        profile = profiles[7]
+        self.assertEqual((profile["visible"], profile["obsID"], profile["tgtID"]), (2, 1, 1))
+        self.assertEqual((profile["obsZ"], profile["tgtZ"]), (12.0, 9.0))
+        self.assertAlmostEqual(profile["tgtD"], 10.0)
+        self.assertEqual([segment[0] for segment in profile["segments"]], [1, 2])
+        self.assertEqual([[round(d, 6) for d in segment[1]] for segment in profile["segments"]],
+                         [[0.0, 5.0], [5.0, 10.0]])
+        self.assertEqual([segment[2] for segment in profile["segments"]], [[10.0, 11.0], [11.0, 9.0]])
+        self.assertAlmostEqual(profiles[8]["tgtD"], 20.0)
+        self.assertEqual(profiles[8]["visible"], 1)
+        return
+
+    def test_ProfileHash(self):
+        ''' the hash only changes with what is drawn '''
+        print("LLOSProfileGraphUtilsTestCase.test_ProfileHash")
+        profileHash = LLOSProfileGraphUtils.ProfileHash(makeProfile())
+        self.assertEqual(profileHash, LLOSProfileGraphUtils.ProfileHash(makeProfile()))
+        self.assertNotEqual(profileHash, LLOSProfileGraphUtils.ProfileHash(makeProfile(tgtZ=13.0)))
+        profile = makeProfile()
+        profile["visible"] = 1
+        self.assertNotEqual(profileHash, LLOSProfileGraphUtils.ProfileHash(profile))
+        profile = makeProfile()
+        profile["segments"][1] = (1, [5.0, 10.0], [11.0, 9.0])
+        self.assertNotEqual(profileHash, LLOSProfileGraphUtils.ProfileHash(profile))
+        return
+
+    def test_RenderProfiles(self):
+        ''' cached graphs are copied without drawing; the rest are drawn into the cache '''
+        print("LLOSProfileGraphUtilsTestCase.test_RenderProfiles")
+        outputFolder = os.path.join(self.folder, "graphs")
+        cacheFolder = os.path.join(self.folder, "cache")
+        os.makedirs(cacheFolder)
+        profiles = {7: makeProfile(), 8: makeProfile(), 9: makeProfile(tgtZ=13.0)}
+        cached = os.path.join(cacheFolder, LLOSProfileGraphUtils.ProfileHash(profiles[7]) + ".png")
+        with open(cached, "wb") as graph:
+            graph.write(b"cached 7 and 8")
+        os.utime(cached, (time.time() - 1000, time.time() - 1000))
+        cachedOther = os.path.join(cacheFolder, LLOSProfileGraphUtils.ProfileHash(profiles[9]) + ".png")
+        with open(cachedOther, "wb") as graph:
+            graph.write(b"cached 9")
+
+        graphs, drawn = LLOSProfileGraphUtils.RenderProfiles(profiles, outputFolder, cacheFolder, 1)
+        self.assertEqual(drawn, 0)
+        self.assertEqual(sorted(graphs.keys()), [7, 8, 9])
+        for sourceOID, content in [(7, b"cached 7 and 8"), (8, b"cached 7 and 8"), (9, b"cached 9")]:
+            self.assertEqual(graphs[sourceOID], os.path.join(outputFolder, "profile" + str(sourceOID) + ".png"))
+            with open(graphs[sourceOID], "rb") as graph:
+                self.assertEqual(graph.read(), content)
+        # reused graphs count as recently used for PruneCache
+        self.assertTrue(os.path.getmtime(cached) > time.time() - 100)
+
+        try:
+            import matplotlib
+        except ImportError:
+            return
+        os.remove(cachedOther)
+        graphs, drawn = LLOSProfileGraphUtils.RenderProfiles(profiles, outputFolder, cacheFolder, 1)
+        self.assertEqual(drawn, 1)
+        with open(graphs[9], "rb") as graph:
+            self.assertEqual(graph.read(8), b"\x89PNG\r\n\x1a\n")
+        self.assertTrue(os.path.exists(cachedOther))
+        return
+
+    def test_PruneCache(self):
+        ''' graphs are dropped least recently used first, and when too old '''
+        print("LLOSProfileGraphUtilsTestCase.test_PruneCache")
+        now = time.time()
+        for i in range(4):
+            graphPath = os.path.join(self.folder, "graph" + str(i) + ".png")
+            with open(graphPath, "wb") as graph:
+                graph.write(b"\0" * 1000)
+            os.utime(graphPath, (now - 100 * (4 - i), now - 100 * (4 - i)))
+        self.assertEqual(LLOSProfileGraphUtils.PruneCache(self.folder, 2500, None), 2)
+        self.assertEqual(sorted(os.listdir(self.folder)), ["graph2.png", "graph3.png"])
+        self.assertEqual(LLOSProfileGraphUtils.PruneCache(self.folder, 2500, 150), 1)
+        self.assertEqual(os.listdir(self.folder), ["graph3.png"])
+        # the defaults keep a small, fresh cache
+        self.assertEqual(LLOSProfileGraphUtils.PruneCache(self.folder), 0)
+        self.assertEqual(LLOSProfileGraphUtils.PruneCache(os.path.join(self.folder, "missing")), 0)
+        return
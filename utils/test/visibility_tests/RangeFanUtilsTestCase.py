@@ -0,0 +1,116 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+RangeFanUtilsTestCase.py
+--------------------------------------------------
+requirements: ArcGIS X.X, Python 2.7 or Python 3.4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for the batch range fan engine
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import arcpy
+import unittest
+import Configuration
+import UnitTestUtilities
+
+# ============================================================================
+# Add RangeFanUtils.py module to python path
+currentPath = os.path.dirname(__file__)
+pathToRFUtils = os.path.normpath(os.path.join(currentPath, r"../../../visibility/toolboxes/scripts"))
+sys.path.insert(0, pathToRFUtils)
+import RangeFanUtils
+# ============================================================================
+
+class RangeFanUtilsTestCase(unittest.TestCase):
+    ''' Test all methods in RangeFanUtils.py '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         RangeFanUtilsTestCase.setUp")
+        UnitTestUtilities.checkArcPy()
+        self.srWebMerc = arcpy.SpatialReference(3857) #WGS_1984_Web_Mercator
+        self.srWGS84 = arcpy.SpatialReference(4326) #GCS_WGS_1984
+        self.deleteme = []
+        return
+
+    def tearDown(self):
+        ''' cleanup after tests'''
+        if Configuration.DEBUG == True: print("         RangeFanUtilsTestCase.tearDown")
+        for i in self.deleteme:
+            if arcpy.Exists(i):
+                arcpy.Delete_management(i)
+        return
+
+    def test_BearingAndTraversal(self):
+        ''' bearing limits across north '''
+        print("RangeFanUtilsTestCase.test_BearingAndTraversal")
+        bearing, traversal = RangeFanUtils.BearingAndTraversal(350.0, 10.0)
+        self.assertAlmostEqual(float(bearing), 0.0)
+        self.assertAlmostEqual(float(traversal), 20.0)
+        bearing, traversal = RangeFanUtils.BearingAndTraversal(180.0, 90.0)
+        self.assertAlmostEqual(float(bearing), 315.0)
+        self.assertAlmostEqual(float(traversal), 270.0)
+        return
+
+    def test_MakeFans_planar(self):
+        ''' one fan array per weapon, one ring per position '''
+        print("RangeFanUtilsTestCase.test_MakeFans_planar")
+        centers = [[0.0, 0.0], [100.0, 0.0], [0.0, 100.0]]
+        fans = RangeFanUtils.MakeFans(centers, [10.0, 20.0], [90.0, 0.0], [90.0, 360.0])
+        self.assertEqual(len(fans), 2)
+        self.assertEqual(fans[0].shape, (3, 93, 2))
+        # fan starts and ends at the apex, arc is at the weapon range
+        self.assertEqual(fans[0][1, 0].tolist(), [100.0, 0.0])
+        self.assertEqual(fans[0][1, -1].tolist(), [100.0, 0.0])
+        self.assertAlmostEqual(float(((fans[0][1, 1] - fans[0][1, 0]) ** 2).sum() ** 0.5), 10.0)
+        # full traversal is a closed circle with no apex
+        self.assertEqual(fans[1].shape, (3, 361, 2))
+        self.assertEqual(fans[1][0, 0].tolist(), fans[1][0, -1].tolist())
+        return
+
+    def test_MakeFans_geodesic(self):
+        ''' geodesic fan to the north from the equator '''
+        print("RangeFanUtilsTestCase.test_MakeFans_geodesic")
+        oneDegree = RangeFanUtils.earthRadius * 3.141592653589793 / 180.0
+        fans = RangeFanUtils.MakeFans([[0.0, 0.0]], [oneDegree], 0.0, 10.0, 1.0, True)
+        self.assertAlmostEqual(float(fans[0][0, 6, 0]), 0.0)
+        self.assertAlmostEqual(float(fans[0][0, 6, 1]), 1.0)
+        return
+
+    def test_WriteFans(self):
+        ''' bulk write fans for several positions '''
+        print("RangeFanUtilsTestCase.test_WriteFans")
+        outFans = os.path.join("in_memory", "tempFans")
+        if arcpy.Exists(outFans): arcpy.Delete_management(outFans)
+        centers = [[0.0, 0.0], [1000.0, 0.0], [0.0, 1000.0], [1000.0, 1000.0]]
+        fans = RangeFanUtils.MakeFans(centers, [500.0, 800.0], 45.0, 60.0)
+        attributes = [[500.0, 45.0, 60.0, 15.0, 75.0, "A"],
+                      [800.0, 45.0, 60.0, 15.0, 75.0, "B"]]
+        count = RangeFanUtils.WriteFans(outFans, fans, attributes, self.srWebMerc, self.srWGS84)
+        self.deleteme.append(outFans)
+        self.assertEqual(count, 8)
+        self.assertEqual(int(arcpy.GetCount_management(outFans).getOutput(0)), 8)
+        self.assertEqual(arcpy.Describe(outFans).spatialReference.factoryCode, 4326)
+        return
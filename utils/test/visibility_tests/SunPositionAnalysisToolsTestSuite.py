@@ -28,10 +28,12 @@ description:
 This test suite collects all of the test cases for the
 Sun Position Analysis Tools toolboxes:
 * SunPositionAndHillshadeTestCase.py
+* SunPositionUtilsTestCase.py
 
 ==================================================
 history:
 10/29/2015 - JH - wired up SunPositionAnalysisToolsTestSuite to run SunPositionAndHillshadeTestCase in Pro or Desktop
+10/19/2026 - added SunPositionUtilsTestCase
 ==================================================
 '''
 
@@ -39,6 +41,7 @@ import os
 import unittest
 import logging
 from . import SunPositionAndHillshadeTestCase
+from . import SunPositionUtilsTestCase
 import Configuration
 
 ''' Test suite for all tools in the Sun Position Analysis Tools toolbox '''
@@ -59,6 +62,15 @@ def getSunPositionTestSuite():
     else:
         Configuration.Logger.info("Sun Position Analysis Tools Desktop tests")
         suite = addTests(suite, desktopTestList)
+
+    utilsTestList = ["test_SolarPosition_noon",
+                     "test_SolarPosition_minutes",
+                     "test_SolarPosition_broadcast",
+                     "test_Hillshade"]
+    for test in utilsTestList:
+        print("adding test: " + str(test))
+        Configuration.Logger.info(test)
+        suite.addTest(SunPositionUtilsTestCase.SunPositionUtilsTestCase(test))
     return suite
     
 def addTests(suite, inputTestList):
@@ -0,0 +1,99 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+SunPositionUtilsTestCase.py
+--------------------------------------------------
+requirements: ArcGIS X.X, Python 2.7 or Python 3.4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for the vectorized sun position and hillshade functions
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import datetime
+import numpy
+import unittest
+import Configuration
+import UnitTestUtilities
+
+# ============================================================================
+# Add SunPositionUtils.py module to python path
+currentPath = os.path.dirname(__file__)
+pathToSunPositionUtils = os.path.normpath(os.path.join(currentPath, r"../../../visibility/toolboxes/scripts"))
+sys.path.insert(0, pathToSunPositionUtils)
+import SunPositionUtils
+# ============================================================================
+
+class SunPositionUtilsTestCase(unittest.TestCase):
+    ''' Test all methods in SunPositionUtils.py '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         SunPositionUtilsTestCase.setUp")
+        UnitTestUtilities.checkArcPy()
+        return
+
+    def tearDown(self):
+        ''' cleanup after tests'''
+        if Configuration.DEBUG == True: print("         SunPositionUtilsTestCase.tearDown")
+        return
+
+    def test_SolarPosition_noon(self):
+        ''' summer solstice, local noon at Greenwich: sun due south, about 62 degrees up '''
+        print("SunPositionUtilsTestCase.test_SolarPosition_noon")
+        azimuth, elevation = SunPositionUtils.SolarPosition([datetime.datetime(2015, 6, 21, 12, 0, 0)], 0.0, 51.5)
+        self.assertAlmostEqual(float(azimuth[0]), 180.0, delta=2.0)
+        self.assertAlmostEqual(float(elevation[0]), 90.0 - 51.5 + 23.44, delta=0.5)
+        return
+
+    def test_SolarPosition_minutes(self):
+        ''' minutes and seconds move the sun '''
+        print("SunPositionUtilsTestCase.test_SolarPosition_minutes")
+        times = [datetime.datetime(2015, 6, 21, 9, 0, 0), datetime.datetime(2015, 6, 21, 9, 30, 30)]
+        azimuth, elevation = SunPositionUtils.SolarPosition(times, 0.0, 51.5)
+        self.assertGreater(float(elevation[1]), float(elevation[0]))
+        self.assertGreater(float(azimuth[1]), float(azimuth[0]))
+        return
+
+    def test_SolarPosition_broadcast(self):
+        ''' times x locations '''
+        print("SunPositionUtilsTestCase.test_SolarPosition_broadcast")
+        times = numpy.array(SunPositionUtils.TimeSteps(datetime.datetime(2015, 6, 21, 0, 0, 0),
+                                                       datetime.datetime(2015, 6, 21, 23, 0, 0),
+                                                       datetime.timedelta(hours=1)))
+        lons = numpy.array([-120.0, 0.0, 120.0])
+        lats = numpy.array([35.0, 51.5, -33.0])
+        azimuth, elevation = SunPositionUtils.SolarPosition(times[:, numpy.newaxis], lons, lats)
+        self.assertEqual(elevation.shape, (24, 3))
+        for j in range(3):
+            single = SunPositionUtils.SolarPosition(times, lons[j], lats[j])[1]
+            self.assertTrue(numpy.allclose(single, elevation[:, j]))
+        return
+
+    def test_Hillshade(self):
+        ''' a flat surface is lit by the sine of the sun altitude '''
+        print("SunPositionUtilsTestCase.test_Hillshade")
+        slope, aspect = SunPositionUtils.SlopeAspect(numpy.zeros((4, 4)), 30.0, 30.0)
+        shade = SunPositionUtils.Hillshade(slope, aspect, 315.0, 30.0)
+        self.assertTrue(numpy.allclose(shade, 255.0 * 0.5))
+        return
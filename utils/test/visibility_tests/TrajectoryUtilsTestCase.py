@@ -0,0 +1,124 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+TrajectoryUtilsTestCase.py
+--------------------------------------------------
+requirements: ArcGIS X.X, Python 2.7 or Python 3.4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for the trajectory engine
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import numpy
+import unittest
+import Configuration
+import UnitTestUtilities
+
+# ============================================================================
+# Add TrajectoryUtils.py module to python path
+currentPath = os.path.dirname(__file__)
+pathToTrajectoryUtils = os.path.normpath(os.path.join(currentPath, r"../../../visibility/toolboxes/scripts"))
+sys.path.insert(0, pathToTrajectoryUtils)
+import TrajectoryUtils
+# ============================================================================
+
+class TrajectoryUtilsTestCase(unittest.TestCase):
+    ''' Test all methods in TrajectoryUtils.py '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         TrajectoryUtilsTestCase.setUp")
+        UnitTestUtilities.checkArcPy()
+        return
+
+    def tearDown(self):
+        ''' cleanup after tests'''
+        if Configuration.DEBUG == True: print("         TrajectoryUtilsTestCase.tearDown")
+        return
+
+    def flatWindow(self, elevation, size=2000.0, cellSize=10.0):
+        ''' a SurfaceWindow of constant elevation centered on 0, 0 '''
+        window = TrajectoryUtils.SurfaceWindow.__new__(TrajectoryUtils.SurfaceWindow)
+        cells = int(size / cellSize)
+        window.cellWidth = window.cellHeight = cellSize
+        window.xmin = window.ymin = -size / 2.0
+        window.ymax = size / 2.0
+        window.array = numpy.full((cells, cells), float(elevation))
+        return window
+
+    def test_BallisticFormulas(self):
+        ''' flat range, maximum height and heights along the path '''
+        print("TrajectoryUtilsTestCase.test_BallisticFormulas")
+        g = TrajectoryUtils.gravityMetric
+        self.assertAlmostEqual(float(TrajectoryUtils.FlatRange(100.0, 45.0)), 100.0 ** 2 / g)
+        self.assertAlmostEqual(float(TrajectoryUtils.MaximumHeight(100.0, 90.0)), 100.0 ** 2 / (2.0 * g))
+        self.assertAlmostEqual(float(TrajectoryUtils.MaximumHeight(100.0, 30.0)), 2500.0 / (2.0 * g))
+        flatRange = float(TrajectoryUtils.FlatRange(100.0, 30.0))
+        self.assertAlmostEqual(float(TrajectoryUtils.Heights(flatRange, 100.0, 30.0)), 0.0, places=6)
+        return
+
+    def test_SurfaceWindowSample(self):
+        ''' bilinear sampling inside, NaN outside the window '''
+        print("TrajectoryUtilsTestCase.test_SurfaceWindowSample")
+        window = self.flatWindow(0.0)
+        window.array[:] = numpy.arange(window.array.shape[1], dtype=float)[numpy.newaxis, :]
+        # cell centers are at -995, -985, ... so x = -990 is halfway between columns 0 and 1
+        self.assertAlmostEqual(float(window.sample(-990.0, 0.0)), 0.5)
+        self.assertTrue(numpy.isnan(window.sample(5000.0, 0.0)))
+        return
+
+    def test_ComputeTrajectories(self):
+        ''' paths over flat ground land near the flat range, on every azimuth '''
+        print("TrajectoryUtilsTestCase.test_ComputeTrajectories")
+        window = self.flatWindow(100.0)
+        azimuths = [0.0, 90.0, 180.0, 270.0]
+        results = TrajectoryUtils.ComputeTrajectories([window], [[0.0, 0.0]], 80.0, [45.0], azimuths)
+        self.assertEqual(len(results), len(azimuths))
+        flatRange = float(TrajectoryUtils.FlatRange(80.0, 45.0))
+        for result in results:
+            self.assertTrue(result["impact"])
+            end = result["path"][-1]
+            self.assertAlmostEqual(numpy.hypot(end[0], end[1]), flatRange, delta=10.0)
+            self.assertAlmostEqual(end[2], 100.0)
+        # bearing 90 (east) lands on the positive x axis
+        east = [r for r in results if r["azimuth"] == 90.0][0]["path"][-1]
+        self.assertGreater(east[0], 0.0)
+        self.assertAlmostEqual(east[1], 0.0, places=6)
+        return
+
+    def test_ComputeTrajectoriesNoData(self):
+        ''' an observer on NoData gets a result without a path, so the tool can warn '''
+        print("TrajectoryUtilsTestCase.test_ComputeTrajectoriesNoData")
+        window = self.flatWindow(100.0)
+        window.array[:, :] = numpy.nan
+        results = TrajectoryUtils.ComputeTrajectories([window], [[0.0, 0.0]], 80.0, [45.0], [0.0, 90.0])
+        self.assertEqual(len(results), 2)
+        for result in results:
+            self.assertFalse(result["impact"])
+            self.assertTrue(result["path"] is None)
+        # a given launch elevation on NoData stops at the first sample
+        results = TrajectoryUtils.ComputeTrajectories([window], [[0.0, 0.0]], 80.0, [45.0], [0.0], observerZ=[100.0])
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0]["path"] is None)
+        return
@@ -0,0 +1,147 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+ViewshedUtilsTestCase.py
+--------------------------------------------------
+requirements: ArcGIS X.X, Python 2.7 or Python 3.4
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: unittest test case for the viewshed engine
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import sys
+import math
+import time
+import shutil
+import tempfile
+import numpy
+import unittest
+import Configuration
+import UnitTestUtilities
+
+# ============================================================================
+# Add ViewshedUtils.py module to python path
+currentPath = os.path.dirname(__file__)
+pathToViewshedUtils = os.path.normpath(os.path.join(currentPath, r"../../../visibility/toolboxes/scripts"))
+sys.path.insert(0, pathToViewshedUtils)
+import ViewshedUtils
+# ============================================================================
+
+class ViewshedUtilsTestCase(unittest.TestCase):
+    ''' Test all methods in ViewshedUtils.py '''
+
+    def setUp(self):
+        ''' setup for tests'''
+        if Configuration.DEBUG == True: print("         ViewshedUtilsTestCase.setUp")
+        UnitTestUtilities.checkArcPy()
+        return
+
+    def tearDown(self):
+        ''' cleanup after tests'''
+        if Configuration.DEBUG == True: print("         ViewshedUtilsTestCase.tearDown")
+        return
+
+    def test_HorizonDistance(self):
+        ''' distance to the horizon from sea level and from 100 m '''
+        print("ViewshedUtilsTestCase.test_HorizonDistance")
+        self.assertEqual(ViewshedUtils.HorizonDistance(0.0), 0.0)
+        self.assertAlmostEqual(ViewshedUtils.HorizonDistance(100.0), 35716.1, delta=1.0)
+        return
+
+    def test_TileKey(self):
+        ''' tile keys only change with the surface, center, extent or cell size '''
+        print("ViewshedUtilsTestCase.test_TileKey")
+        signature = ("c:\\data\\dem.tif", 0.0, 0.0, 1000.0, 1000.0, 10.0, 10.0, 12345.0)
+        extent = (-4200.0, -4200.0, 4200.0, 4200.0)
+        key = ViewshedUtils.TileKey(signature, -117.1, 34.05, extent)
+        self.assertEqual(key, ViewshedUtils.TileKey(signature, -117.1, 34.05, (-4200.2, -4200.0, 4200.0, 4200.0)))
+        self.assertNotEqual(key, ViewshedUtils.TileKey(signature, -117.2, 34.05, extent))
+        self.assertNotEqual(key, ViewshedUtils.TileKey(signature, -117.1, 34.05, (-5000.0, -5000.0, 5000.0, 5000.0)))
+        self.assertNotEqual(key, ViewshedUtils.TileKey(signature[:-1] + (12346.0,), -117.1, 34.05, extent))
+        self.assertNotEqual(key, ViewshedUtils.TileKey(signature, -117.1, 34.05, extent, 30.0))
+        return
+
+    def test_VisibilityHorizon(self):
+        ''' on a flat curved earth cells are visible out to the refracted horizon '''
+        print("ViewshedUtilsTestCase.test_VisibilityHorizon")
+        dem = numpy.zeros((401, 401))
+        visible = ViewshedUtils.Visibility(dem, 100.0, 100.0, 200, 200, offsetA=10.0)
+        distance = numpy.hypot(*(numpy.indices(dem.shape) - 200)) * 100.0
+        horizon = math.sqrt(10.0 * ViewshedUtils.earthDiameter / (1.0 - ViewshedUtils.terrestrialRefractivityCoefficient))
+        self.assertAlmostEqual(distance[visible].max(), horizon, delta=200.0)
+        self.assertAlmostEqual(distance[~visible].min(), horizon, delta=200.0)
+        return
+
+    def test_VisibilityModifiers(self):
+        ''' a wall hides the cells behind it; azimuth, radius and vertical limits apply '''
+        print("ViewshedUtilsTestCase.test_VisibilityModifiers")
+        dem = numpy.zeros((101, 101))
+        dem[:, 80] = 100.0
+        visible = ViewshedUtils.Visibility(dem, 10.0, 10.0, 50, 50, offsetA=10.0, curvedEarth=False)
+        self.assertTrue(visible[50, 70])
+        self.assertTrue(visible[50, 80])
+        self.assertFalse(visible[50, 90])
+        visible = ViewshedUtils.Visibility(dem, 10.0, 10.0, 50, 50, offsetA=10.0, radius2=200.0,
+                                           azimuth1=80.0, azimuth2=100.0, curvedEarth=False)
+        self.assertTrue(visible[50, 60])
+        self.assertFalse(visible[50, 40])
+        self.assertFalse(visible[40, 50])
+        self.assertFalse(visible[50, 75])
+        visible = ViewshedUtils.Visibility(dem, 10.0, 10.0, 50, 50, offsetA=10.0, vert2=-5.0, curvedEarth=False)
+        self.assertFalse(visible[50, 55])
+        self.assertTrue(visible[50, 70])
+        return
+
+    def test_BatchVisibility(self):
+        ''' observer counts are the sum of the single observer visibilities '''
+        print("ViewshedUtilsTestCase.test_BatchVisibility")
+        dem = numpy.random.RandomState(1).rand(120, 120) * 50.0
+        observers = [{"row": 10 * i, "col": 120 - 1 - 10 * i, "offsetA": 5.0, "radius2": 400.0}
+                     for i in range(12)]
+        counts = ViewshedUtils.BatchVisibility(dem, 10.0, 10.0, observers, processes=1)
+        rasters = ViewshedUtils.BatchVisibility(dem, 10.0, 10.0, observers, perObserver=True, processes=1)
+        expected = sum(ViewshedUtils.Visibility(dem, 10.0, 10.0, **o).astype(int) for o in observers)
+        self.assertTrue((counts == expected).all())
+        self.assertEqual(len(rasters), len(observers))
+        self.assertTrue((rasters[3] == ViewshedUtils.Visibility(dem, 10.0, 10.0, **observers[3])).all())
+        return
+
+    def test_PruneTileCache(self):
+        ''' tiles are dropped least recently used first, and when too old '''
+        print("ViewshedUtilsTestCase.test_PruneTileCache")
+        cacheFolder = tempfile.mkdtemp()
+        try:
+            now = time.time()
+            for i in range(4):
+                tileFolder = os.path.join(cacheFolder, "tile" + str(i))
+                os.makedirs(tileFolder)
+                with open(os.path.join(tileFolder, "surface.tif"), "wb") as tile:
+                    tile.write(b"\0" * 1000)
+                os.utime(tileFolder, (now - 100 * (4 - i), now - 100 * (4 - i)))
+            self.assertEqual(ViewshedUtils.PruneTileCache(cacheFolder, 2500, None), 2)
+            self.assertEqual(sorted(os.listdir(cacheFolder)), ["tile2", "tile3"])
+            self.assertEqual(ViewshedUtils.PruneTileCache(cacheFolder, 2500, 150), 1)
+            self.assertEqual(os.listdir(cacheFolder), ["tile3"])
+        finally:
+            shutil.rmtree(cacheFolder, True)
+        return
@@ -28,20 +28,75 @@ description:
 This test suite collects all of the test cases for the
 Visibility and Range Tools toolboxes:
 * FindLocalPeaksTestCase.py
+* LLOSProfileGraphUtilsTestCase.py
+* RangeFanUtilsTestCase.py
+* TrajectoryUtilsTestCase.py
+* ViewshedUtilsTestCase.py
 
 ==================================================
 history:
 <date> - <initals> - <modifications>
+10/19/2026 - added Range Fan tests
+10/19/2026 - added Trajectory tests
+10/19/2026 - added Viewshed tests
+10/19/2026 - added LLOS profile graph tests
 ==================================================
 '''
 import unittest
 import Configuration
 from . import RangeRingUtilsTestCase
+from . import RangeFanUtilsTestCase
+from . import TrajectoryUtilsTestCase
+from . import ViewshedUtilsTestCase
+from . import LLOSProfileGraphUtilsTestCase
 
 
 def getVisibilityAndRangeTestSuite():
     '''Collecting all test cases from Visibility and Range'''
     if Configuration.DEBUG == True:
         print("      getVisibilityAndRangeTestSuite")
-    
-    return
\ No newline at end of file
+
+    rangeFanTestList = ['test_BearingAndTraversal',
+                        'test_MakeFans_planar',
+                        'test_MakeFans_geodesic',
+                        'test_WriteFans']
+
+    suite = unittest.TestSuite()
+    Configuration.Logger.info("Range Fan tests")
+    for test in rangeFanTestList:
+        print("adding test: " + str(test))
+        Configuration.Logger.info(test)
+        suite.addTest(RangeFanUtilsTestCase.RangeFanUtilsTestCase(test))
+
+    trajectoryTestList = ['test_BallisticFormulas',
+                          'test_SurfaceWindowSample',
+                          'test_ComputeTrajectories',
+                          'test_ComputeTrajectoriesNoData']
+    Configuration.Logger.info("Trajectory tests")
+    for test in trajectoryTestList:
+        print("adding test: " + str(test))
+        Configuration.Logger.info(test)
+        suite.addTest(TrajectoryUtilsTestCase.TrajectoryUtilsTestCase(test))
+
+    viewshedTestList = ['test_HorizonDistance',
+                        'test_TileKey',
+                        'test_VisibilityHorizon',
+                        'test_VisibilityModifiers',
+                        'test_BatchVisibility',
+                        'test_PruneTileCache']
+    Configuration.Logger.info("Viewshed tests")
+    for test in viewshedTestList:
+        print("adding test: " + str(test))
+        Configuration.Logger.info(test)
+        suite.addTest(ViewshedUtilsTestCase.ViewshedUtilsTestCase(test))
+
+    llosProfileGraphTestList = ['test_ReadProfiles',
+                                'test_ProfileHash',
+                                'test_RenderProfiles',
+                                'test_PruneCache']
+    Configuration.Logger.info("LLOS profile graph tests")
+    for test in llosProfileGraphTestList:
+        print("adding test: " + str(test))
+        Configuration.Logger.info(test)
+        suite.addTest(LLOSProfileGraphUtilsTestCase.LLOSProfileGraphUtilsTestCase(test))
+    return suite
\ No newline at end of file
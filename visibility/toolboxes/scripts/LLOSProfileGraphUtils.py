@@ -0,0 +1,197 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+LLOSProfileGraphUtils.py
+--------------------------------------------------
+requirements: ArcGIS 10.3.1+, ArcGIS Pro 1.2+, matplotlib
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: Profile graph rendering for LLOSProfileGraphAttachments.py.
+Sight lines are read in one cursor pass and grouped by SourceOID. Each
+profile is drawn with the matplotlib object API (no pylab state) in a
+process pool, and PNGs are cached by a hash of their content so
+unchanged profiles are not drawn again on re-runs. The cache is trimmed
+to cacheMaxBytes and cacheMaxAge, least recently used first.
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import math
+import shutil
+import hashlib
+import multiprocessing
+import arcpy
+import ProcessPoolUtils
+
+# resolution of the graphs, as drawn by the original tool
+graphDPI = 900
+
+# the graph cache is trimmed to this size (bytes) and age (seconds)
+cacheMaxBytes = 512 * 1024 * 1024
+cacheMaxAge = 30 * 24 * 60 * 60
+
+# bump when the look of the graphs changes so cached PNGs are redrawn
+graphVersion = "1"
+
+sightLineFields = ["OID@", "SHAPE@", "SourceOID", "TarIsVis", "VisCode",
+                   "ObsZ", "TgtZ", "OID_OBSERV", "OID_TARGET"]
+
+def ReadProfiles(inputFeatures):
+    '''
+    Read the LLOS output lines in one pass and group them by SourceOID.
+
+    Returns {SourceOID: profile} where profile is a dictionary with the
+    target visibility, observer and target IDs, observer and target Z, the
+    distance to the target and the list of (VisCode, distances, elevations)
+    segments, distances measured from the first vertex of the sight line.
+    '''
+    rowsByID = {}
+    with arcpy.da.SearchCursor(inputFeatures, sightLineFields) as rows:
+        for row in rows:
+            rowsByID.setdefault(row[2], []).append(row)
+
+    profiles = {}
+    for sourceOID, sightLineRows in rowsByID.items():
+        sightLineRows.sort(key=lambda r: r[0])
+        start = None
+        tgtD = 0.0
+        segments = []
+        for row in sightLineRows:
+            geometry = row[1]
+            for part in geometry:
+                partD = []
+                partZ = []
+                for pnt in part:
+                    if pnt is None:
+                        continue
+                    if start is None:
+                        start = (pnt.X, pnt.Y)
+                    distFromStart = math.sqrt((pnt.X - start[0]) ** 2 + (pnt.Y - start[1]) ** 2)
+                    tgtD = max(tgtD, distFromStart)
+                    partD.append(distFromStart)
+                    partZ.append(pnt.Z)
+                segments.append((row[4], partD, partZ))
+        last = sightLineRows[-1]
+        profiles[sourceOID] = {"visible": last[3],
+                               "obsID": last[7], "obsZ": last[5],
+                               "tgtID": last[8], "tgtZ": last[6], "tgtD": tgtD,
+                               "segments": segments}
+    return profiles
+
+def ProfileHash(profile):
+    ''' hash of everything that is drawn in a profile graph '''
+    content = repr((graphVersion, graphDPI, profile["visible"],
+                    profile["obsID"], profile["obsZ"],
+                    profile["tgtID"], profile["tgtZ"], profile["tgtD"],
+                    profile["segments"]))
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+def RenderProfile(profile, graphPath):
+    ''' draw one profile graph to a PNG file '''
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot(1, 1, 1)
+
+    # the line of sight
+    axes.plot([0.0, profile["tgtD"]], [profile["obsZ"], profile["tgtZ"]], 'k--', linewidth=1)
+
+    # visible segments in green, non-visible in red
+    for visibilityCode, distances, elevations in profile["segments"]:
+        if not distances:
+            continue
+        if visibilityCode == 1:
+            axes.plot(distances, elevations, 'g', linewidth=1)
+        elif visibilityCode == 2:
+            axes.plot(distances, elevations, 'r', linewidth=1)
+
+    # titles & labels
+    if profile["visible"] == 1:
+        axes.set_title("Target " + str(profile["tgtID"]) + " is VISIBLE to observer " + str(profile["obsID"]))
+    else:
+        axes.set_title("Target " + str(profile["tgtID"]) + " is NOT VISIBLE to observer " + str(profile["obsID"]))
+    axes.set_ylabel("Elevation above sea level")
+    axes.set_xlabel("Distance to target")
+    axes.grid(True)
+
+    figure.savefig(graphPath, dpi=graphDPI)
+    return graphPath
+
+def _renderJob(job):
+    ''' pool worker: (profile, graphPath) '''
+    return RenderProfile(*job)
+
+def RenderProfiles(profiles, outputFolder, cacheFolder=None, processes=None):
+    '''
+    Write profile<SourceOID>.png for each profile to outputFolder.
+
+    Graphs whose content hash is already in cacheFolder are copied from the
+    cache; the rest are drawn across a pool of processes (serially when
+    processes is 1 or there is only one graph to draw) and added to the cache.
+    Returns ({SourceOID: graphPath}, number of graphs drawn).
+    '''
+    if cacheFolder is None:
+        cacheFolder = os.path.join(outputFolder, "cache")
+    for folder in [outputFolder, cacheFolder]:
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+    jobs = []
+    queued = set()
+    cached = {}
+    for sourceOID, profile in profiles.items():
+        cachePath = os.path.join(cacheFolder, ProfileHash(profile) + ".png")
+        cached[sourceOID] = cachePath
+        if cachePath in queued:
+            continue
+        if os.path.exists(cachePath):
+            # mark the graph as recently used for PruneCache
+            os.utime(cachePath, None)
+        else:
+            queued.add(cachePath)
+            jobs.append((profile, cachePath))
+
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    processes = max(1, min(int(processes), len(jobs)))
+    if processes == 1:
+        for job in jobs:
+            _renderJob(job)
+    else:
+        pool = ProcessPoolUtils.StartPool(processes)
+        try:
+            pool.map(_renderJob, jobs)
+        finally:
+            pool.close()
+            pool.join()
+
+    graphs = {}
+    for sourceOID, cachePath in cached.items():
+        graphPath = os.path.join(outputFolder, "profile" + str(sourceOID) + ".png")
+        shutil.copyfile(cachePath, graphPath)
+        graphs[sourceOID] = graphPath
+    return graphs, len(jobs)
+
+def PruneCache(cacheFolder, maxBytes=cacheMaxBytes, maxAge=cacheMaxAge):
+    ''' drop the least recently used graphs of cacheFolder beyond maxBytes or maxAge seconds '''
+    return ProcessPoolUtils.PruneCache(cacheFolder, maxBytes, maxAge)
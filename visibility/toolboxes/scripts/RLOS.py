@@ -26,6 +26,8 @@
 # history:
 # 4/1/2015 - mf - update for coding standards
 # 4/23/2015 - mf - Updates for Extent properties
+# 10/19/2026 - projected surface from the viewshed tile cache (ViewshedUtils.py)
+# 10/19/2026 - trim the viewshed tile cache before each run
 # ==================================================
 
 import os
@@ -35,6 +37,7 @@ import math
 import decimal
 import arcpy
 from arcpy import env, sa
+import ViewshedUtils
 
 
 observers = arcpy.GetParameterAsText(0)
@@ -226,76 +229,46 @@ def main():
             pointy = pnt.Y
         del row
         del rows
-        # write new central meridian and latitude of origin...
-        strAZED = '''PROJCS["World_Azimuthal_Equidistant",
-        GEOGCS["GCS_WGS_1984",
-        DATUM["D_WGS_1984",
-        SPHEROID["WGS_1984",6378137.0,298.257223563]],
-        PRIMEM["Greenwich",0.0],
-        UNIT["Degree",0.0174532925199433]],
-        PROJECTION["Azimuthal_Equidistant"],
-        PARAMETER["False_Easting",0.0],
-        PARAMETER["False_Northing",0.0],
-        PARAMETER["Central_Meridian",' + str(pointx) + '],
-        PARAMETER["Latitude_Of_Origin",' + str(pointy) + '],
-        UNIT["Meter",1.0],
-        AUTHORITY["ESRI",54032]]'''
+        # new central meridian and latitude of origin...
+        azed = ViewshedUtils.AzimuthalEquidistant(pointx, pointy)
         delete_me.append(mbgCenterWGS84)
 
-        # Clip the input surface to the maximum visibilty range and extract
-        # it to a 1000 x 1000 raster
-        # if going to infinity then clip to horizion extent
-        surf_extract = os.path.join(env.scratchWorkspace, "surf_extract")
+        # Buffer the MBG to the maximum visibilty range (or the horizon when
+        # going to infinity) in the new AZED
+        mbgBuffer = os.path.join(env.scratchWorkspace, "mbgBuffer")
         if RADIUS2_to_infinity is True:
-            mbgBuffer = os.path.join(env.scratchWorkspace, "mbgBuffer")
             arcpy.Buffer_analysis(observers_mbg, mbgBuffer, horizonDistance)
-            delete_me.append(mbgBuffer)
-            surfaceSR = arcpy.Describe(input_surface).spatialReference
-            mbgBufferPrj = os.path.join(env.scratchWorkspace, "mbgBufferPrj")
-            arcpy.Project_management(mbgBuffer, mbgBufferPrj, surfaceSR)
-            delete_me.append(mbgBufferPrj)
-            mbgBufferPrjExtent = arcpy.Describe(mbgBufferPrj).extent
-            cellSize = max(float(mbgBufferPrjExtent.width)/1000.0,
-                           float(mbgBufferPrjExtent.height)/1000.0)
-            env.cellSize = cellSize
-            arcpy.AddMessage("Clipping and resampling surface to analysis area with " +
-                             str(cellSize) + " meter cell size ...")
-            arcpy.Clip_management(input_surface, "#", surf_extract, mbgBufferPrj)
         else:
-            # buffer MBG by max RADIUS 2 + 10%
-            mbgBuffer = os.path.join(env.scratchWorkspace, "mbgBuffer")
             arcpy.Buffer_analysis(observers_mbg, mbgBuffer, obsMaximums['RADIUS2'])
-            delete_me.append(mbgBuffer)
-            # project buffer to surface SR
-            surfaceSR = arcpy.Describe(input_surface).spatialReference
-            mbgBufferPrj = os.path.join(env.scratchWorkspace, "mbgBufferPrj")
-            arcpy.Project_management(mbgBuffer, mbgBufferPrj, surfaceSR)
-            delete_me.append(mbgBufferPrj)
-            # clip surface to projected buffer
-            arcpy.Clip_management(input_surface, "#", surf_extract, mbgBufferPrj)
-        delete_me.append(surf_extract)
-
-        # Project surface to the new AZED
-        extract_prj = os.path.join(env.scratchWorkspace, "extract_prj")
+        delete_me.append(mbgBuffer)
+        obs_buf = os.path.join(env.scratchWorkspace, "obs_buf")
+        arcpy.Project_management(mbgBuffer, obs_buf, azed)
+        delete_me.append(obs_buf)
+        bufExtent = arcpy.Describe(obs_buf).extent
+
+        # Project the surface to the new AZED, clipped to the buffer, or
+        # reuse it from the tile cache; if going to infinity resample it to
+        # a 1000 x 1000 raster
+        cellSize = None
+        if RADIUS2_to_infinity is True:
+            cellSize = max(float(bufExtent.width)/1000.0,
+                           float(bufExtent.height)/1000.0)
+            arcpy.AddMessage("Resampling surface to analysis area with " +
+                             str(cellSize) + " meter cell size ...")
         arcpy.AddMessage("Projecting surface ...")
-        arcpy.ProjectRaster_management(surf_extract, extract_prj, strAZED)
-        delete_me.append(extract_prj)
+        ViewshedUtils.PruneTileCache()
+        extract_prj = ViewshedUtils.ProjectedSurface(input_surface, pointx, pointy,
+                                                     (bufExtent.XMin, bufExtent.YMin,
+                                                      bufExtent.XMax, bufExtent.YMax),
+                                                     ViewshedUtils.DefaultCacheFolder(),
+                                                     cellSize=cellSize)
 
         # Project observers to the new AZED
         obs_prj = os.path.join(env.scratchWorkspace, "obs_prj")
         arcpy.AddMessage("Projecting observers ...")
-        arcpy.Project_management(observers, obs_prj, strAZED)
+        arcpy.Project_management(observers, obs_prj, azed)
         delete_me.append(obs_prj)
 
-        # Project the MBG buffer to AZED
-        obs_buf = os.path.join(env.scratchWorkspace, "obs_buf")
-        # if RADIUS2_to_infinity == True:
-        #    arcpy.Buffer_analysis(obs_prj,obs_buf,horizonDistance)
-        # else:
-        #    arcpy.Project_management(mbgBufferPrj,obs_buf,strAZED)
-        arcpy.Project_management(mbgBufferPrj, obs_buf, strAZED)
-        delete_me.append(obs_buf)
-
         # Finally ... run Viewshed
         arcpy.AddMessage("Calculating Viewshed ...")
         vshed = os.path.join(env.scratchWorkspace, "vshed")
@@ -20,12 +20,14 @@
 # Built for ArcGIS Desktop 10.x and ArcGIS Pro 1.x
 # ==================================================
 # 2/5/2015 - mf - Updates to change Web Mercator to user-selected coordinate system
+# 10/19/2026 - Build fans with the shared RangeFanUtils engine
 
 
 # IMPORTS ==========================================
 import os, sys, math, traceback
 import arcpy
 from arcpy import env
+import RangeFanUtils
 
 # ARGUMENTS & LOCALS ===============================
 inFeature = arcpy.GetParameterAsText(0)
@@ -42,34 +44,11 @@ commonSpatialReferenceAsText = arcpy.GetParameterAsText(9)
 
 deleteme = []
 debug = False
-leftAngle = 0.0 # degrees
-rightAngle = 90.0 # degrees
 
 
 # CONSTANTS ========================================
 
 
-# FUNCTIONS ========================================
-def Geo2Arithmetic(inAngle):
-    outAngle = -1.0
-    # force input angle into 0 to 360 range
-    if (inAngle > 360.0):
-        inAngle = math.fmod(inAngle,360.0)
-    
-    # if 360, make it zero
-    if inAngle == 360.0: inAngle = 0.0
-    
-    #0 to 90
-    if (inAngle >= 0.0 and inAngle <= 90.0):
-        outAngle = math.fabs(inAngle - 90.0)
-    
-    # 90 to 360
-    if (inAngle > 90.0 and inAngle < 360.0):
-        outAngle = 360.0 - (inAngle - 90.0)
-        
-    if debug == True: arcpy.AddMessage("G2A inAngle(" + str(inAngle) + "), outAngle(" + str(outAngle) + ")")
-    return outAngle
-
 try:
 
     currentOverwriteOutput = env.overwriteOutput
@@ -78,112 +57,33 @@ try:
     if commonSpatialReferenceAsText == '':
         commonSpatialReference = arcpy.Describe(inFeature).spatialReference
         arcpy.AddWarning("Spatial Reference is not defined. Using Spatial Reference of input features: " + str(commonSpatialReference.name))    
-    env.outputCoordinateSystem = commonSpatialReference
     
-    env.overwriteOutput = True
-    scratch = env.scratchWorkspace
-    
-    #Project doesn't like in_memory featureclasses, copy to scratch
-    copyInFeatures = os.path.join(scratch,"copyInFeatures")
-    arcpy.CopyFeatures_management(inFeature,copyInFeatures)
-    deleteme.append(copyInFeatures)
-    
-    prjInFeature = os.path.join(scratch,"prjInFeature")
-    srInputPoints = arcpy.Describe(copyInFeatures).spatialReference
-    arcpy.AddMessage("Projecting input points to " + str(env.outputCoordinateSystem.name) + " ...")
-    arcpy.Project_management(copyInFeatures,prjInFeature,env.outputCoordinateSystem)
-    deleteme.append(prjInFeature)
-    tempFans = os.path.join(scratch,"tempFans")
-            
     # put bearing into 0 - 360 range
     geoBearing = math.fmod(geoBearing,360.0)
     if debug == True: arcpy.AddMessage("geoBearing: " + str(geoBearing))
-    arithmeticBearing = Geo2Arithmetic(geoBearing) # need to convert from geographic angles (zero north clockwise) to arithmetic (zero east counterclockwise)
-    if debug == True: arcpy.AddMessage("arithmeticBearing: " + str(arithmeticBearing))
-    
     if traversal == 0.0:
         traversal = 1.0 # modify so there is at least 1 degree of angle.
         arcpy.AddWarning("Traversal is zero! Forcing traversal to 1.0 degrees.")
-    leftAngle = arithmeticBearing + (traversal / 2.0) # get left angle (arithmetic)
-    leftBearing = geoBearing - (traversal / 2.0) # get left bearing (geographic)
-    if leftBearing < 0.0: leftBearing = 360.0 + leftBearing
-    
-    rightAngle = arithmeticBearing - (traversal / 2.0) # get right angle (arithmetic)
-    rightBearing = geoBearing + (traversal / 2.0) # get right bearing (geographic)
-    if rightBearing < 0.0: rightBearing = 360.0 + rightBearing
-    
-    if debug == True: arcpy.AddMessage("arithemtic left/right: " + str(leftAngle) + "/" + str(rightAngle))
+    leftBearing, rightBearing = [float(v) for v in RangeFanUtils.BearingLimits(geoBearing, traversal)]
     if debug == True: arcpy.AddMessage("geo left/right: " + str(leftBearing) + "/" + str(rightBearing))
-    
-    centerPoints = []
-    arcpy.AddMessage("Getting centers ....")
-    shapefieldname = arcpy.Describe(prjInFeature).ShapeFieldName
-    rows = arcpy.SearchCursor(prjInFeature)
-    for row in rows:
-        feat = row.getValue(shapefieldname)
-        pnt = feat.getPart()
-        centerPointX = pnt.X
-        centerPointY = pnt.Y
-        centerPoints.append([centerPointX,centerPointY])
-    del row
-    del rows
-    
-    paths = []
+
+    # read the range fan center points, projected to the common spatial reference so we're working with linear units
+    # (fans are built geodesically if the common spatial reference is geographic)
+    srInputPoints = arcpy.Describe(inFeature).spatialReference
+    geodesic = commonSpatialReference.type == "Geographic"
+    fanSR = RangeFanUtils.srWGS84 if geodesic else commonSpatialReference
+    arcpy.AddMessage("Getting centers in " + str(fanSR.name) + " ...")
+    centerPoints = RangeFanUtils.ReadCenters(inFeature, fanSR)
+
+    # create the vertices for all range fans at once
     arcpy.AddMessage("Creating paths ...")
-    for centerPoint in centerPoints:
-        path = []
-        centerPointX = centerPoint[0]
-        centerPointY = centerPoint[1]
-        path.append([centerPointX,centerPointY]) # add first point
-        step = -1.0 # step in degrees
-        rightAngleRelativeToLeft = leftAngle - traversal - 1
-        #for d in xrange(int(leftAngle),int(rightAngleRelativeToLeft),int(step)): #UPDATE
-        for d in range(int(leftAngle),int(rightAngleRelativeToLeft),int(step)):
-            x = centerPointX + (maxRange * math.cos(math.radians(d)))
-            y = centerPointY + (maxRange * math.sin(math.radians(d)))
-            path.append([x,y])
-            if debug == True: arcpy.AddMessage("d,x,y: " + str(d) + "," + str(x) + "," + str(y))    
-        path.append([centerPointX,centerPointY]) # add last point
-        paths.append(path)
-        if debug == True: arcpy.AddMessage("Points in path: " + str(len(path)))
-    if debug == True: arcpy.AddMessage("paths: " + str(paths))
-    
-    arcpy.AddMessage("Creating target feature class ...")
-    arcpy.CreateFeatureclass_management(os.path.dirname(tempFans),os.path.basename(tempFans),"Polygon","#","DISABLED","DISABLED",env.outputCoordinateSystem)
-    arcpy.AddField_management(tempFans,"Range","DOUBLE","#","#","#","Range (meters)")
-    arcpy.AddField_management(tempFans,"Bearing","DOUBLE","#","#","#","Bearing (degrees)")
-    arcpy.AddField_management(tempFans,"Traversal","DOUBLE","#","#","#","Traversal (degrees)")
-    arcpy.AddField_management(tempFans,"LeftAz","DOUBLE","#","#","#","Left Bearing (degrees)")
-    arcpy.AddField_management(tempFans,"RightAz","DOUBLE","#","#","#","Right Bearing (degrees)")
-    arcpy.AddField_management(tempFans,"Model","TEXT","#","#","#","Weapon Model")
-    deleteme.append(tempFans)
-    
-    arcpy.AddMessage("Building " + str(len(paths)) + " fans ...")
-    cur = arcpy.InsertCursor(tempFans)
-    for outPath in paths:
-        lineArray = arcpy.Array()
-        for vertex in outPath:
-            pnt = arcpy.Point()
-            pnt.X = vertex[0]
-            pnt.Y = vertex[1]
-            lineArray.add(pnt)
-            del pnt
-        feat = cur.newRow()
-        feat.shape = lineArray
-        feat.Range = maxRange
-        feat.Bearing = geoBearing
-        feat.Traversal = traversal
-        feat.LeftAz = leftBearing
-        feat.RightAz = rightBearing
-        feat.Model = str(weaponModel)
-        cur.insertRow(feat)
-        del lineArray
-        del feat
-    del cur
-            
-    arcpy.AddMessage("Projecting Range Fans back to " + str(srInputPoints.name))
-    arcpy.Project_management(tempFans,outFeature,srInputPoints)
-    
+    fans = RangeFanUtils.MakeFans(centerPoints, [maxRange], geoBearing, traversal, 1.0, geodesic)
+
+    # take the fans and add them into the output fc, in the input points' coordinate system
+    arcpy.AddMessage("Building " + str(len(centerPoints)) + " fans in " + str(srInputPoints.name) + " ...")
+    attributes = [[maxRange, geoBearing, traversal, leftBearing, rightBearing, str(weaponModel)]]
+    RangeFanUtils.WriteFans(outFeature, fans, attributes, fanSR, srInputPoints)
+
     arcpy.SetParameter(8,outFeature)
     
 
@@ -0,0 +1,176 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+RangeFanUtils.py
+--------------------------------------------------
+requirements: ArcGIS 10.3.1+, ArcGIS Pro 1.2+, NumPy
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: Batch range fan (wedge) geometry shared by the Range Fan,
+Range Fan By Bearing Limits, Range Fan By Bearing And Traversal and Tower
+Range Fan tools. Fan vertices for N weapons x M positions are computed as
+NumPy coordinate arrays, planar or geodesic, and written with one insert
+cursor.
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import math
+import numpy
+import arcpy
+
+# Mean earth radius (meters) used for geodesic fan construction
+earthRadius = 6371008.8
+
+srWGS84 = arcpy.SpatialReference(4326) # GCS_WGS_1984
+
+# Fields written by WriteFans: (name, type, alias)
+fanFields = [("Range", "DOUBLE", "Range (meters)"),
+             ("Bearing", "DOUBLE", "Bearing (degrees)"),
+             ("Traversal", "DOUBLE", "Traversal (degrees)"),
+             ("LeftAz", "DOUBLE", "Left Bearing (degrees)"),
+             ("RightAz", "DOUBLE", "Right Bearing (degrees)"),
+             ("Model", "TEXT", "Weapon Model")]
+
+def BearingAndTraversal(leftBearing, rightBearing):
+    '''
+    Convert left and right bearing limits (degrees) to a center bearing and a
+    clockwise traversal. Equal limits are given a traversal of 1 degree.
+    '''
+    left = numpy.mod(numpy.asarray(leftBearing, dtype=float), 360.0)
+    right = numpy.mod(numpy.asarray(rightBearing, dtype=float), 360.0)
+    traversal = numpy.mod(right - left, 360.0)
+    traversal = numpy.where(traversal == 0.0, 1.0, traversal)
+    bearing = numpy.mod(left + traversal / 2.0, 360.0)
+    return bearing, traversal
+
+def BearingLimits(bearing, traversal):
+    ''' Return the (left, right) geographic bearings of a fan '''
+    bearing = numpy.asarray(bearing, dtype=float)
+    traversal = numpy.asarray(traversal, dtype=float)
+    return (numpy.mod(bearing - traversal / 2.0, 360.0),
+            numpy.mod(bearing + traversal / 2.0, 360.0))
+
+def ArcBearings(bearing, traversal, step=1.0):
+    '''
+    Geographic bearings (degrees) of the arc vertices of one fan, clockwise
+    from the left limit to the right limit, always including both limits.
+    A traversal of 360 or more returns a closed circle.
+    '''
+    traversal = float(traversal)
+    if traversal <= 0.0:
+        traversal = 1.0
+    if traversal >= 360.0:
+        return numpy.linspace(0.0, 360.0, int(math.ceil(360.0 / step)) + 1)
+    count = int(math.ceil(round(traversal / step, 9))) + 1
+    return numpy.linspace(bearing - traversal / 2.0, bearing + traversal / 2.0, count)
+
+def _destination(centers, distance, bearings, geodesic):
+    '''
+    (M, K, 2) vertices at <distance> along each of K geographic bearings from
+    M centers. Planar centers are in linear units, geodesic centers are
+    longitude/latitude degrees and use the spherical direct solution.
+    '''
+    theta = numpy.radians(bearings)[numpy.newaxis, :]
+    x0 = centers[:, 0][:, numpy.newaxis]
+    y0 = centers[:, 1][:, numpy.newaxis]
+    if not geodesic:
+        return numpy.stack([x0 + distance * numpy.sin(theta),
+                            y0 + distance * numpy.cos(theta)], axis=-1)
+    delta = distance / earthRadius
+    lon1 = numpy.radians(x0)
+    lat1 = numpy.radians(y0)
+    sinLat2 = numpy.sin(lat1) * numpy.cos(delta) + numpy.cos(lat1) * numpy.sin(delta) * numpy.cos(theta)
+    lat2 = numpy.arcsin(numpy.clip(sinLat2, -1.0, 1.0))
+    lon2 = lon1 + numpy.arctan2(numpy.sin(theta) * numpy.sin(delta) * numpy.cos(lat1),
+                                numpy.cos(delta) - numpy.sin(lat1) * sinLat2)
+    lon2 = numpy.mod(lon2 + math.pi, 2.0 * math.pi) - math.pi
+    return numpy.stack([numpy.degrees(lon2), numpy.degrees(lat2)], axis=-1)
+
+def MakeFans(centers, ranges, bearings, traversals, step=1.0, geodesic=False):
+    '''
+    Make fan rings for every weapon at every position.
+
+    centers     (M, 2) array of positions (lon/lat degrees when geodesic)
+    ranges      N weapon ranges (meters, or working units when planar)
+    bearings    N (or one) center bearings, geographic degrees
+    traversals  N (or one) traversals, degrees
+    Returns a list of N closed ring arrays, each (M, K + 2, 2) (the fan apex
+    is the first and last vertex) or (M, K, 2) for a full circle.
+    '''
+    centers = numpy.asarray(centers, dtype=float).reshape(-1, 2)
+    ranges = numpy.atleast_1d(numpy.asarray(ranges, dtype=float))
+    bearings = numpy.broadcast_to(numpy.asarray(bearings, dtype=float), ranges.shape)
+    traversals = numpy.broadcast_to(numpy.asarray(traversals, dtype=float), ranges.shape)
+
+    fans = []
+    for dRange, bearing, traversal in zip(ranges, bearings, traversals):
+        arc = _destination(centers, dRange, ArcBearings(bearing, traversal, step), geodesic)
+        if traversal >= 360.0:
+            # close the circle on its first vertex exactly
+            arc[:, -1] = arc[:, 0]
+            fans.append(arc)
+        else:
+            apex = centers[:, numpy.newaxis, :]
+            fans.append(numpy.concatenate([apex, arc, apex], axis=1))
+    return fans
+
+def ReadCenters(inFeature, sr=None):
+    ''' Read point positions into an (M, 2) array, projected on the fly to sr '''
+    if sr:
+        arr = arcpy.da.FeatureClassToNumPyArray(inFeature, ["SHAPE@X", "SHAPE@Y"],
+                                                spatial_reference=sr)
+    else:
+        arr = arcpy.da.FeatureClassToNumPyArray(inFeature, ["SHAPE@X", "SHAPE@Y"])
+    return numpy.column_stack([arr["SHAPE@X"], arr["SHAPE@Y"]]).astype(float)
+
+def WriteFans(outFeature, fans, attributes, fanSR, outputSR=None, fields=None):
+    '''
+    Bulk write fans to a new polygon feature class.
+
+    fans        list of (M, K, 2) ring arrays from MakeFans, in fanSR
+    attributes  one row of field values per fan array, written for each of its M rings
+    outputSR    spatial reference of outFeature (defaults to fanSR); rings
+                are projected to it geometry by geometry
+    fields      list of (name, type, alias), defaults to fanFields
+    '''
+    if fields is None:
+        fields = fanFields
+    if outputSR is None:
+        outputSR = fanSR
+    project = outputSR.factoryCode != fanSR.factoryCode or outputSR.name != fanSR.name
+
+    arcpy.CreateFeatureclass_management(os.path.dirname(outFeature), os.path.basename(outFeature),
+                                        "POLYGON", "#", "DISABLED", "DISABLED", outputSR)
+    for name, fieldType, alias in fields:
+        arcpy.AddField_management(outFeature, name, fieldType, "#", "#", "#", alias)
+
+    count = 0
+    with arcpy.da.InsertCursor(outFeature, ["SHAPE@"] + [f[0] for f in fields]) as cursor:
+        for rings, values in zip(fans, attributes):
+            values = list(values)
+            for ring in rings.tolist():
+                shape = arcpy.Polygon(arcpy.Array([arcpy.Point(x, y) for x, y in ring]), fanSR)
+                if project:
+                    shape = shape.projectAs(outputSR)
+                cursor.insertRow([shape] + values)
+                count += 1
+    return count
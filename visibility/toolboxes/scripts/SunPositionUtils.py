@@ -0,0 +1,215 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+SunPositionUtils.py
+--------------------------------------------------
+requirements: ArcGIS 10.3.1+, ArcGIS Pro 1.2+, NumPy
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: Vectorized sun position and hillshade for spa.py.
+Sun azimuth and elevation are computed with NumPy for arrays of UTC
+times and locations (same low precision algorithm as spa.py, after
+Michalsky 1988). The batch functions read a DEM once and produce a
+series of hillshades or an illuminated sun-hours raster for a range of
+times.
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import datetime
+import numpy
+import arcpy
+
+def JulianDayNumber(year, month, day):
+    ''' Julian day number of (arrays of) Gregorian dates '''
+    year = numpy.asarray(year, dtype=numpy.int64)
+    month = numpy.asarray(month, dtype=numpy.int64)
+    day = numpy.asarray(day, dtype=numpy.int64)
+    a = (14 - month) // 12
+    y = year + 4800 - a
+    m = month + 12 * a - 3
+    return day + ((153 * m + 2) // 5) + 365 * y + y // 4 - y // 100 + y // 400 - 32045
+
+def _dateParts(times):
+    ''' (year, month, day, decimal hour) arrays from datetimes or datetime64 values '''
+    times = numpy.asarray(times, dtype="datetime64[s]")
+    days = times.astype("datetime64[D]")
+    months = times.astype("datetime64[M]")
+    years = times.astype("datetime64[Y]")
+    year = years.astype(numpy.int64) + 1970
+    month = (months - years).astype(numpy.int64) + 1
+    day = (days - months).astype(numpy.int64) + 1
+    hour = (times - days).astype(numpy.int64) / 3600.0
+    return year, month, day, hour
+
+def SolarPosition(times, lon, lat):
+    '''
+    Sun azimuth (degrees clockwise from north) and elevation (degrees above
+    the horizon) for UTC times at lon, lat (degrees). Arguments broadcast
+    against each other, e.g. times[:, None] with lon[None, :] gives a
+    (times x locations) result.
+    '''
+    year, month, day, hour = _dateParts(times)
+    lon = numpy.asarray(lon, dtype=float)
+    lat = numpy.asarray(lat, dtype=float)
+    time = JulianDayNumber(year, month, day) - 2451545.0
+
+    # Ecliptic coordinates
+    mnlong = numpy.mod(280.460 + .9856474 * time, 360.0)
+    mnanom = numpy.radians(numpy.mod(357.528 + .9856003 * time, 360.0))
+    eclong = numpy.mod(mnlong + 1.915 * numpy.sin(mnanom) + 0.020 * numpy.sin(2 * mnanom), 360.0)
+    oblqec = numpy.radians(23.439 - 0.0000004 * time)
+    eclong = numpy.radians(eclong)
+
+    # Celestial coordinates: right ascension and declination
+    ra = numpy.mod(numpy.arctan2(numpy.cos(oblqec) * numpy.sin(eclong), numpy.cos(eclong)), 2 * numpy.pi)
+    dec = numpy.arcsin(numpy.sin(oblqec) * numpy.sin(eclong))
+
+    # Local coordinates: Greenwich and local mean sidereal time, hour angle
+    gmst = numpy.mod(6.697375 + .0657098242 * time + hour, 24.0)
+    lmst = numpy.radians(numpy.mod(gmst + lon / 15.0, 24.0) * 15.0)
+    ha = numpy.mod(lmst - ra + numpy.pi, 2 * numpy.pi) - numpy.pi
+
+    latRad = numpy.radians(lat)
+    sinEl = numpy.sin(dec) * numpy.sin(latRad) + numpy.cos(dec) * numpy.cos(latRad) * numpy.cos(ha)
+    el = numpy.arcsin(numpy.clip(sinEl, -1.0, 1.0))
+
+    # azimuth from the zenith angle, resolved by the sign of the hour angle
+    zenithAngle = numpy.pi / 2.0 - el
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        cosAz = (numpy.sin(latRad) * numpy.cos(zenithAngle) - numpy.sin(dec)) / \
+                (numpy.cos(latRad) * numpy.sin(zenithAngle))
+    az = numpy.degrees(numpy.arccos(numpy.clip(numpy.nan_to_num(cosAz), -1.0, 1.0)))
+    az = numpy.mod(numpy.where(ha > 0, az + 180.0, 540.0 - az), 360.0)
+    return az, numpy.degrees(el)
+
+def TimeSteps(start, end, step):
+    ''' datetimes from start to end inclusive every step (a timedelta) '''
+    if step <= datetime.timedelta(0):
+        raise ValueError("Time step must be positive")
+    steps = []
+    current = start
+    while current <= end:
+        steps.append(current)
+        current += step
+    return steps
+
+def SlopeAspect(dem, cellWidth, cellHeight, zFactor=1.0):
+    '''
+    Slope and aspect (radians, as used by hillshade) of a DEM array with the
+    3x3 Horn method. Edges repeat the outer cells; NoData (NaN) stays NaN.
+    '''
+    z = numpy.pad(numpy.asarray(dem, dtype=float), 1, mode="edge")
+    a, b, c = z[:-2, :-2], z[:-2, 1:-1], z[:-2, 2:]
+    d, f = z[1:-1, :-2], z[1:-1, 2:]
+    g, h, i = z[2:, :-2], z[2:, 1:-1], z[2:, 2:]
+    dzdx = ((c + 2 * f + i) - (a + 2 * d + g)) / (8.0 * cellWidth)
+    dzdy = ((g + 2 * h + i) - (a + 2 * b + c)) / (8.0 * cellHeight)
+    slope = numpy.arctan(zFactor * numpy.sqrt(dzdx ** 2 + dzdy ** 2))
+    aspect = numpy.arctan2(dzdy, -dzdx)
+    aspect = numpy.where(aspect < 0, aspect + 2 * numpy.pi, aspect)
+    return slope, aspect
+
+def Hillshade(slope, aspect, azimuth, altitude):
+    ''' 0-255 hillshade (no shadows) from SlopeAspect for one sun position '''
+    zenith = numpy.radians(90.0 - altitude)
+    azimuthMath = numpy.radians(numpy.mod(360.0 - azimuth + 90.0, 360.0))
+    shade = 255.0 * (numpy.cos(zenith) * numpy.cos(slope) +
+                     numpy.sin(zenith) * numpy.sin(slope) * numpy.cos(azimuthMath - aspect))
+    return numpy.clip(shade, 0.0, 255.0)
+
+class Surface:
+    ''' A DEM read once into a float array (NoData as NaN) with its georeference '''
+
+    def __init__(self, raster):
+        raster = arcpy.Raster(raster)
+        self.lowerLeft = arcpy.Point(raster.extent.XMin, raster.extent.YMin)
+        self.cellWidth = raster.meanCellWidth
+        self.cellHeight = raster.meanCellHeight
+        self.spatialReference = raster.spatialReference
+        noData = raster.noDataValue
+        array = arcpy.RasterToNumPyArray(raster)
+        self.array = array.astype(float)
+        if noData is not None:
+            self.array[array == noData] = numpy.nan
+        center = arcpy.PointGeometry(arcpy.Point((raster.extent.XMin + raster.extent.XMax) / 2.0,
+                                                 (raster.extent.YMin + raster.extent.YMax) / 2.0),
+                                     self.spatialReference).projectAs(arcpy.SpatialReference(4326))
+        self.lon = center.firstPoint.X
+        self.lat = center.firstPoint.Y
+        self._slopeAspect = None
+
+    def slopeAspect(self):
+        ''' slope and aspect, computed on first use '''
+        if self._slopeAspect is None:
+            cellWidth, cellHeight = self.cellWidth, self.cellHeight
+            if self.spatialReference.type == "Geographic":
+                # approximate degrees as meters at the DEM center
+                cellWidth = cellWidth * 111320.0 * numpy.cos(numpy.radians(self.lat))
+                cellHeight = cellHeight * 110540.0
+            self._slopeAspect = SlopeAspect(self.array, cellWidth, cellHeight)
+        return self._slopeAspect
+
+    def save(self, array, outputRaster, noData=-1):
+        ''' write an array on this surface's grid to outputRaster '''
+        array = numpy.where(numpy.isnan(self.array), noData, array)
+        out = arcpy.NumPyArrayToRaster(array, self.lowerLeft, self.cellWidth, self.cellHeight, noData)
+        out.save(outputRaster)
+        arcpy.DefineProjection_management(outputRaster, self.spatialReference)
+        return outputRaster
+
+def HillshadeSeries(inputElevation, times, outputWorkspace, prefix="hillshade"):
+    '''
+    Write one hillshade per UTC time to outputWorkspace from a single read of
+    inputElevation, named <prefix>_YYYYMMDD_HHMMSS. Times when the sun is
+    below the horizon give an all zero raster, as in spa.py.
+    Returns the list of output rasters.
+    '''
+    surface = Surface(inputElevation)
+    slope, aspect = surface.slopeAspect()
+    azimuths, altitudes = SolarPosition(times, surface.lon, surface.lat)
+    outputs = []
+    for when, azimuth, altitude in zip(times, azimuths, altitudes):
+        if altitude < 0:
+            shade = numpy.zeros(surface.array.shape)
+        else:
+            shade = numpy.round(Hillshade(slope, aspect, azimuth, altitude))
+        name = prefix + "_" + when.strftime("%Y%m%d_%H%M%S")
+        outputs.append(surface.save(shade.astype(numpy.int16), os.path.join(outputWorkspace, name)))
+    return outputs
+
+def SunHours(inputElevation, times, outputRaster, minimumHillshade=1):
+    '''
+    Accumulate the hours each cell is lit (sun above the horizon and
+    hillshade at least minimumHillshade) over the UTC times, each time
+    standing for the interval to the next one. DEM read once.
+    '''
+    if len(times) < 2:
+        raise ValueError("Sun hours needs at least two times")
+    surface = Surface(inputElevation)
+    slope, aspect = surface.slopeAspect()
+    azimuths, altitudes = SolarPosition(times, surface.lon, surface.lat)
+    hours = numpy.array([(t1 - t0).total_seconds() / 3600.0 for t0, t1 in zip(times[:-1], times[1:])])
+    total = numpy.zeros(surface.array.shape)
+    for azimuth, altitude, duration in zip(azimuths[:-1], altitudes[:-1], hours):
+        if altitude >= 0:
+            total += duration * (Hillshade(slope, aspect, azimuth, altitude) >= minimumHillshade)
+    return surface.save(total.astype(numpy.float32), outputRaster)
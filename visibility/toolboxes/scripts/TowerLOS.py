@@ -24,6 +24,7 @@
 # ---------------------------------------------------------------------------
 # history:
 # 4/23/2015 - mf - Updates for Extent properties
+# 10/19/2026 - viewshed from a cached projected surface (ViewshedUtils.py)
 # ==================================================
 
 # Import arcpy module
@@ -31,6 +32,7 @@ import os, sys, traceback, math, decimal
 import arcpy
 from arcpy import env
 from arcpy import sa
+import ViewshedUtils
 
 def zfactor(dataset):
     desc = arcpy.Describe(dataset)
@@ -153,12 +155,14 @@ try:
     installInfo = arcpy.GetInstallInfo("desktop")
     installDirectory = installInfo["InstallDir"]
     
-    # Get the towerHeight value from the towerHeightField (assuming that there is only one)
+    # Get the towerHeight value and location from the towerHeightField (assuming that there is only one)
     towerHeight = None
-    towerRows = arcpy.da.SearchCursor(towerClass,[descField,towerHeightField])
+    towerXY = None
+    towerRows = arcpy.da.SearchCursor(towerClass,[descField,towerHeightField,"SHAPE@XY"])
     for towerRow in towerRows:
         if str(towerRow[0]) == str(towerName):
             towerHeight = float(towerRow[1])
+            towerXY = towerRow[2]
     if DEBUG == True: arcpy.AddMessage("towerHeight: " + str(towerHeight))
     del towerRow
     del towerRows
@@ -166,180 +170,19 @@ try:
     # get observer's vibility modifier maximums
     obsMaximums = {'SPOT':None,'OFFSETA':towerHeight, 'RADIUS2':4000, 'REMOVE_SPOT':False}
     #TODO: Why is RADIUS2 hardcoded to be 4000?
-    
-    removeSPOT = obsMaximums['REMOVE_SPOT']
-    if (removeSPOT == True):
-        if DEBUG == True:
-            arcpy.AddMessage("Observer SPOT is <NULL>, deleteing field ...")
-        arcpy.DeleteField_management(observers,"SPOT")
-
-    # Remove special characters and replace spaces with underscores
-    scrubbedTowerName = ''.join(e for e in towerName if (e.isalnum() or e == " " or e == "_"))
-    scrubbedTowerName = scrubbedTowerName.replace(" ", "_")
-    if DEBUG == True:
-        arcpy.AddMessage("towerName: " + towerName)
-        arcpy.AddMessage("scrubbedTowerName: " + scrubbedTowerName)
-        arcpy.AddMessage("DescField: " + descField)
-    tower = arcpy.MakeFeatureLayer_management(towerClass, scrubbedTowerName, descField + " = '" + str(towerName) +"'")
-
-    # Do a Minimum Bounding Geometry (MBG) on the tower
-    observers_mbg = os.path.join(env.scratchWorkspace,"observers_mbg_towerlos")
-    delete_me.append(observers_mbg)
-    arcpy.AddMessage("Finding observer's minimum bounding envelope using " + observers_mbg)
-    arcpy.MinimumBoundingGeometry_management(tower,observers_mbg)
-
-    # Now find the center of the (MBG)
-    arcpy.AddMessage("Finding center of Defensive Position ...")
-    mbgCenterPoint = os.path.join(env.scratchWorkspace,"mbgCenterPoint_towerlos")
-    mbgExtent = arcpy.Describe(observers_mbg).extent
-    mbgSR = arcpy.Describe(observers_mbg).spatialReference
-    mbgCenterX = mbgExtent.XMin + (mbgExtent.XMax - mbgExtent.XMin)
-    mbgCenterY = mbgExtent.YMin + (mbgExtent.YMax - mbgExtent.YMin)
-    arcpy.CreateFeatureclass_management(os.path.dirname(mbgCenterPoint),os.path.basename(mbgCenterPoint),"POINT","#","DISABLED","DISABLED",mbgSR)
-    mbgShapeFieldName = arcpy.Describe(mbgCenterPoint).ShapeFieldName
-    rows = arcpy.InsertCursor(mbgCenterPoint)
-    feat = rows.newRow()
-    feat.setValue(mbgShapeFieldName,arcpy.Point(mbgCenterX,mbgCenterY))
-    rows.insertRow(feat)
-    del rows
-    delete_me.append(mbgCenterPoint)
-
-    # Get the maximum radius of the Defensive Position
-    maxRad = obsMaximums['RADIUS2']
-    maxOffset = obsMaximums['OFFSETA']
-    z_factor = float(zfactor(tower))
-    horizonDistance = 0.
-
-    if RADIUS2_to_infinity == True:
-        # if going to infinity what we really need is the distance to the horizon based on height/elevation
-        arcpy.AddMessage("Finding horizon distance ...")
-        result = arcpy.GetCellValue_management(input_surface, str(mbgCenterX) + " " + str(mbgCenterY))
-        centroid_elev = result.getOutput(0)
-        R2 = float(centroid_elev) + float(maxOffset)
-        R = 6378137.0 # length, in meters, of semimajor axis of WGS_1984 spheroid.
-        horizonDistance = math.sqrt(math.pow((R + R2),2) - math.pow(R,2))
-
-        horizonExtent = str(mbgCenterX - horizonDistance) + " " + str(mbgCenterY - horizonDistance) + " " + str(mbgCenterX + horizonDistance) + " " + str(mbgCenterY + horizonDistance)
-    else:
-        pass
-
-    # reset center of AZED using Lat/Lon of MBG center point
-    # Project point to WGS 84
-    arcpy.AddMessage("Recentering Azimuthal Equidistant to centroid ...")
-    mbgCenterWGS84 = os.path.join(env.scratchWorkspace,"mbgCenterWGS84_towerlos")
-    arcpy.Project_management(mbgCenterPoint,mbgCenterWGS84,GCS_WGS_1984)
-    arcpy.AddXY_management(mbgCenterWGS84)
-    pointx = 0.0
-    pointy = 0.0
-    shapeField = arcpy.Describe(mbgCenterWGS84).ShapeFieldName
-    rows = arcpy.SearchCursor(mbgCenterWGS84)
-    for row in rows:
-        feat = row.getValue(shapeField)
-        pnt = feat.getPart()
-        pointx = pnt.X
-        pointy = pnt.Y
-    del row
-    del rows
-    # write new central meridian and latitude of origin...
-    strAZED = 'PROJCS["World_Azimuthal_Equidistant",GEOGCS["GCS_WGS_1984",DATUM["D_WGS_1984",SPHEROID["WGS_1984",6378137.0,298.257223563]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],PROJECTION    ["Azimuthal_Equidistant"],PARAMETER["False_Easting",0.0],PARAMETER["False_Northing",0.0],PARAMETER["Central_Meridian",' + str(pointx) + '],PARAMETER["Latitude_Of_Origin",' + str(pointy) + '],UNIT["Meter",1.0],AUTHORITY    ["ESRI",54032]]'
-    if DEBUG == True:
-        arcpy.AddMessage("strAZED: " + strAZED)
-        arcpy.AddMessage("pointx: " + str(pointx))
-        arcpy.AddMessage("pointy: " + str(pointy))
-    delete_me.append(mbgCenterWGS84)
-
-    # Determine the proper buffer distance based on whether visibility should be generated to Infinity
-    bufferDistance = obsMaximums['RADIUS2']
-    if RADIUS2_to_infinity == True:
-        arcpy.AddMessage("Running viewshed to infinity...")
-        bufferDistance = horizonDistance
-        if DEBUG == True:
-            arcpy.AddMessage("Creating a buffer from the observer points to the horizion distance.  infinity (horizon): " + str(bufferDistance))
-    else:
-        arcpy.AddMessage("Running viewshed to the maximum observer radius...")
-        if DEBUG == True:
-            arcpy.AddMessage("Creating a buffer from the observer points to the horizion distance.  maximum observer radius: " + str(bufferDistance))
-
-
-    # Create the processing buffer to the appropriate distance
-    mbgBuffer = os.path.join(env.scratchWorkspace,"mbgBuffer_towerlos")
-    arcpy.Buffer_analysis(observers_mbg,mbgBuffer,obsMaximums['RADIUS2'])
-    delete_me.append(mbgBuffer)
-    if DEBUG == True:
-        arcpy.AddMessage("Projecting the buffer to Azimuthal Equidistant")
-    mbgBufferPrj = os.path.join(env.scratchWorkspace,"mbgBufferPrj_towerlos")
-    arcpy.Project_management(mbgBuffer,mbgBufferPrj,strAZED)
-    delete_me.append(mbgBufferPrj)
-    mbgBufferPrjExtent = arcpy.Describe(mbgBufferPrj).extent
-    if DEBUG == True:
-        arcpy.AddMessage("Setting procesing extent to: " + str(mbgBufferPrjExtent))
-    env.extent = mbgBufferPrjExtent
-
-    # Project surface to the new AZED
-    extract_prj = os.path.join(env.scratchWorkspace,"input_surface_prj_towerlos")
-    arcpy.AddMessage("Projecting surface ...")
-    arcpy.ProjectRaster_management(input_surface,extract_prj,strAZED)
-    delete_me.append(extract_prj)
-
-    # Project observers to the new AZED
-    obs_prj = os.path.join(env.scratchWorkspace,"obs_prj_towerlos")
-    arcpy.AddMessage("Projecting observers ...")
-    arcpy.Project_management(mbgCenterPoint,obs_prj,strAZED)
-    
-    #Add viewshed-utilized fields
-    if DEBUG == True: arcpy.AddMessage("Adding OFFSETA field to: " + str(obs_prj))
-    arcpy.AddField_management(obs_prj, "OFFSETA", "DOUBLE", "", "", "", "Observer Offset", "NULLABLE", "NON_REQUIRED", "")
-    arcpy.CalculateField_management(obs_prj, "OFFSETA", maxOffset, "PYTHON_9.3", "")
-    
-    if DEBUG == True: arcpy.AddMessage("Adding RADIUS2 field to: " + str(obs_prj))
-    arcpy.AddField_management(obs_prj, "RADIUS2", "DOUBLE", "", "", "", "Farthest distance", "NULLABLE", "NON_REQUIRED", "")
-    arcpy.CalculateField_management(obs_prj, "RADIUS2", maxRad, "PYTHON_9.3", "")
-    delete_me.append(obs_prj)
-
-    # Project the MBG buffer to AZED
-    obs_buf = os.path.join(env.scratchWorkspace,"obs_buf_towerlos")
-    arcpy.Project_management(mbgBufferPrj,obs_buf,strAZED)
-    delete_me.append(obs_buf)
-
-    # determine the proper z factor
-    arcpy.AddMessage("Calculating Z Factor ...")
-    z_factor = float(zfactor(extract_prj))
-    if DEBUG == True:
-        arcpy.AddMessage("z_factor: " + str(z_factor))
 
-    # Finally ... run Viewshed
+    # Viewshed of the tower on the surface projected to an Azimuthal
+    # Equidistant centered on the tower, reused from the tile cache when
+    # the same tower was analyzed before
     arcpy.AddMessage("Calculating Viewshed ...")
     if DEBUG == True:
         arcpy.AddMessage("terrestrial_refractivity_coefficient" + str(terrestrial_refractivity_coefficient))
-    vshed = os.path.join(env.scratchWorkspace,"vshed_towerlos")
-    delete_me.append(vshed)
-    #Use the visibility tool instead of the viewshed. This will allow is to set the observation height offset for the tower
-    #outVshed = sa.Visibility(extract_prj,mbgCenterPoint,z_factor=z_factor,curvature_correction="CURVED_EARTH",refractivity_coefficient=terrestrial_refractivity_coefficient,observer_offset=towerHeight)
-    outVshed = sa.Viewshed(extract_prj,obs_prj,z_factor,"CURVED_EARTH",terrestrial_refractivity_coefficient)
-    outVshed.save(vshed)
-
-    # Raster To Polygon
-    arcpy.AddMessage("Converting to polygons ...")
-    ras_poly = os.path.join(env.scratchWorkspace,"ras_poly_towerlos")
-    arcpy.RasterToPolygon_conversion(vshed,ras_poly,polygon_simplify)
-    delete_me.append(ras_poly)
-
-    # clip output polys to buffer
-    if RADIUS2_to_infinity != True:
-        if DEBUG == True:
-            arcpy.AddMessage("Clipping output polygon ...")
-        out_buf = os.path.join(env.scratchWorkspace,"out_buf_towerlos")
-        arcpy.Buffer_analysis(obs_prj,out_buf,"RADIUS2")
-        delete_me.append(out_buf)
-        arcpy.Clip_analysis(ras_poly,out_buf,output_rlos)
-    else:
-        if DEBUG == True:
-            arcpy.AddMessage("Copying output polygon ...")
-        arcpy.CopyFeatures_management(ras_poly, output_rlos)
-
-    arcpy.AddMessage("Adding visibility fields ...")
-    arcpy.AddField_management(output_rlos, "visibility", "DOUBLE", "", "", "", "Observer Visibility", "NULLABLE", "NON_REQUIRED", "")
-    arcpy.CalculateField_management(output_rlos, "visibility", "!gridcode!", "PYTHON", "")
+    towerSR = arcpy.Describe(towerClass).spatialReference
+    job = ViewshedUtils.ObserverJob(1, towerXY[0], towerXY[1], towerSR,
+                                    obsMaximums['OFFSETA'], obsMaximums['RADIUS2'],
+                                    RADIUS2_to_infinity)
+    results = ViewshedUtils.RunViewsheds([job], input_surface, processes=1)
+    ViewshedUtils.CopyViewsheds(results, {1: output_rlos})
 
     # Add the layer to the map
     #UPDATE
@@ -19,6 +19,7 @@
 # --------------------------------------------------
 # Built for ArcGIS 10.1
 # ==================================================
+# 10/19/2026 - Build fans with the shared RangeFanUtils engine
 
 
 # IMPORTS ==========================================
@@ -26,6 +27,7 @@ import os, sys, math, traceback, decimal
 import arcpy
 from arcpy import env
 from arcpy import sa
+import RangeFanUtils
 
 # ARGUMENTS & LOCALS ===============================
 # (0) ?
@@ -56,34 +58,12 @@ deleteme = []
 DEBUG = True
 desktopVersion = ["10.2.2","10.3","10.3.1"]
 proVersion = ["1.0"]
-leftAngle = 0.0 # degrees
-rightAngle = 90.0 # degrees
 
 
 # CONSTANTS ========================================
 
 
 # FUNCTIONS ========================================
-def Geo2Arithmetic(inAngle):
-    outAngle = -1.0
-    # force input angle into 0 to 360 range
-    if (inAngle > 360.0):
-        inAngle = math.fmod(inAngle,360.0)
-    
-    # if 360, make it zero
-    if inAngle == 360.0: inAngle = 0.0
-    
-    #0 to 90
-    if (inAngle >= 0.0 and inAngle <= 90.0):
-        outAngle = math.fabs(inAngle - 90.0)
-    
-    # 90 to 360
-    if (inAngle > 90.0 and inAngle < 360.0):
-        outAngle = 360.0 - (inAngle - 90.0)
-        
-    if DEBUG == True: arcpy.AddMessage("G2A inAngle(" + str(inAngle) + "), outAngle(" + str(outAngle) + ")")
-    return outAngle
-
 def updateValue(fc, field, value):
     cursor = arcpy.UpdateCursor(fc)
     for row in cursor:
@@ -197,7 +177,7 @@ try:
     if DEBUG == True: arcpy.AddMessage("Projecting input points to Web Mercator ...")
     arcpy.Project_management(copyInFeatures,prjInFeature,webMercator)
     deleteme.append(prjInFeature)
-    tempFans = os.path.join(env.scratchWorkspace,"tempFans_towerrangefanlos")
+    tempFanFeature = os.path.join(env.scratchWorkspace,"tempRangeFan_towerrangefanlos")
     
     #########################################################################
     # Create Range Fans
@@ -205,79 +185,25 @@ try:
     # put bearing into 0 - 360 range
     geoBearing = math.fmod(geoBearing,360.0)
     if DEBUG == True: arcpy.AddMessage("geoBearing: " + str(geoBearing))
-    arithmeticBearing = Geo2Arithmetic(geoBearing) # need to convert from geographic angles (zero north clockwise) to arithmetic (zero east counterclockwise)
-    if DEBUG == True: arcpy.AddMessage("arithmeticBearing: " + str(arithmeticBearing))
     
     if traversal == 0.0:
         traversal = 1.0 # modify so there is at least 1 degree of angle.
         arcpy.AddWarning("Traversal is zero! Forcing traversal to 1.0 degrees.")
-    leftAngle = arithmeticBearing + (traversal / 2.0) # get left angle (arithmetic)
-    leftBearing = geoBearing - (traversal / 2.0) # get left bearing (geographic)
-    if leftBearing < 0.0: leftBearing = 360.0 + leftBearing
-            
-    rightAngle = arithmeticBearing - (traversal / 2.0) # get right angle (arithmetic)
-    rightBearing = geoBearing + (traversal / 2.0) # get right bearing (geographic)
-    if rightBearing < 0.0: rightBearing = 360.0 + rightBearing
-    
-    if DEBUG == True: arcpy.AddMessage("arithemtic left/right: " + str(leftAngle) + "/" + str(rightAngle))
+    leftBearing, rightBearing = [float(v) for v in RangeFanUtils.BearingLimits(geoBearing, traversal)]
     if DEBUG == True: arcpy.AddMessage("geo left/right: " + str(leftBearing) + "/" + str(rightBearing))
     
-    centerPoints = []
     arcpy.AddMessage("Getting centers ....")
-    centerPoints.append([mbgCenterX,mbgCenterY])
+    mbgCenterGeo = arcpy.PointGeometry(arcpy.Point(mbgCenterX,mbgCenterY),mbgSR).projectAs(GCS_WGS_1984)
+    centerPoints = [[mbgCenterGeo.firstPoint.X,mbgCenterGeo.firstPoint.Y]]
     
-    paths = []
     arcpy.AddMessage("Creating paths ...")
-    for centerPoint in centerPoints:
-        path = []
-        centerPointX = centerPoint[0]
-        centerPointY = centerPoint[1]
-        path.append([centerPointX,centerPointY]) # add first point
-        step = -1.0 # step in degrees
-        rightAngleRelativeToLeft = leftAngle - traversal - 1
-        #for d in xrange(int(leftAngle),int(rightAngleRelativeToLeft),int(step)): #UPDATE
-        for d in range(int(leftAngle),int(rightAngleRelativeToLeft),int(step)):
-            x = centerPointX + (maxRange * math.cos(math.radians(d)))
-            y = centerPointY + (maxRange * math.sin(math.radians(d)))
-            path.append([x,y])
-            if DEBUG == True: arcpy.AddMessage("d,x,y: " + str(d) + "," + str(x) + "," + str(y))    
-        path.append([centerPointX,centerPointY]) # add last point
-        paths.append(path)
-        if DEBUG == True: arcpy.AddMessage("Points in path: " + str(len(path)))
-    if DEBUG == True: arcpy.AddMessage("paths: " + str(paths))
+    fans = RangeFanUtils.MakeFans(centerPoints, [maxRange], geoBearing, traversal, 1.0, True)
     
-    arcpy.AddMessage("Creating target feature class ...")
-    arcpy.CreateFeatureclass_management(os.path.dirname(tempFans),os.path.basename(tempFans),"Polygon","#","DISABLED","DISABLED",webMercator)
-    arcpy.AddField_management(tempFans,"Range","DOUBLE","#","#","#","Range (meters)")
-    arcpy.AddField_management(tempFans,"Bearing","DOUBLE","#","#","#","Bearing (degrees)")
-    arcpy.AddField_management(tempFans,"Traversal","DOUBLE","#","#","#","Traversal (degrees)")
-    arcpy.AddField_management(tempFans,"LeftAz","DOUBLE","#","#","#","Left Bearing (degrees)")
-    arcpy.AddField_management(tempFans,"RightAz","DOUBLE","#","#","#","Right Bearing (degrees)")
-    arcpy.AddField_management(tempFans,"Model","TEXT","#","#","#","Weapon Model")
-    deleteme.append(tempFans)
-    
-    if DEBUG == True: arcpy.AddMessage("Building " + str(len(paths)) + " fans ...")
-    cur = arcpy.InsertCursor(tempFans)
-    for outPath in paths:
-        lineArray = arcpy.Array()
-        for vertex in outPath:
-            pnt = arcpy.Point()
-            pnt.X = vertex[0]
-            pnt.Y = vertex[1]
-            lineArray.add(pnt)
-            del pnt
-        feat = cur.newRow()
-        feat.shape = lineArray
-        feat.Range = maxRange
-        feat.Bearing = geoBearing
-        feat.Traversal = traversal
-        feat.LeftAz = leftBearing
-        feat.RightAz = rightBearing
-        feat.Model = str(weaponModel)
-        cur.insertRow(feat)
-        del lineArray
-        del feat
-    del cur
+    # fans are built geodesically and written in the input points' coordinate system
+    if DEBUG == True: arcpy.AddMessage("Building " + str(len(centerPoints)) + " fans ...")
+    attributes = [[maxRange, geoBearing, traversal, leftBearing, rightBearing, str(weaponModel)]]
+    RangeFanUtils.WriteFans(tempFanFeature, fans, attributes, GCS_WGS_1984, srInputPoints)
+    deleteme.append(tempFanFeature)
                 
     #########################################################################
     # Viewshed/Line of Sight
@@ -375,13 +301,6 @@ try:
     arcpy.RasterToPolygon_conversion(vshed,ras_poly,polygon_simplify)
     deleteme.append(ras_poly)   
     
-    arcpy.AddMessage("Projecting Range Fans back to " + str(srInputPoints.name))
-    tempFanFeature = os.path.join(env.scratchWorkspace,"tempRangeFan_towerrangefanlos")
-    arcpy.Project_management(tempFans,outFeature,srInputPoints)
-    arcpy.CopyFeatures_management(outFeature, tempFanFeature)
-    arcpy.Project_management(tempFans,tempFanFeature,srInputPoints)
-    deleteme.append(tempFanFeature)
-   
 
     # Add and calculate the visibility field, this is used by the layer symbology
     arcpy.AddField_management(ras_poly, "visibility", "DOUBLE", "", "", "", "Observer Visibility", "NULLABLE", "NON_REQUIRED", "")
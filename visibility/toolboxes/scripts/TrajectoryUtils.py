@@ -0,0 +1,241 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+TrajectoryUtils.py
+--------------------------------------------------
+requirements: ArcGIS 10.3.1+, ArcGIS Pro 1.2+, NumPy
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: Raster-sampling trajectory engine for Trajectory_Path.py.
+The surface around the observers is read once into a NumPy array and
+sampled bilinearly. Ideal (no drag, no wind) ballistic paths and their
+terrain impact points are computed for many observers, azimuths and
+elevation angles at once.
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import math
+import numpy
+import arcpy
+
+gravityMetric = 9.80665 # meters/second^2
+gravityFeet = 32.17405 # feet/second^2
+
+# Largest shared surface window (in cells) read for all observers at once;
+# observers spread further apart get a window each.
+maxWindowCells = 25000000
+
+class SurfaceWindow:
+    '''
+    A rectangular block of a surface raster held as a float NumPy array,
+    NoData as NaN, with bilinear sampling in map coordinates.
+    '''
+
+    def __init__(self, surface, xmin, ymin, xmax, ymax):
+        ''' read the cells of surface covering xmin, ymin, xmax, ymax '''
+        raster = arcpy.Raster(surface)
+        self.cellWidth = float(raster.meanCellWidth)
+        self.cellHeight = float(raster.meanCellHeight)
+        ext = raster.extent
+
+        # snap the window to the raster's cells and clamp it to the raster
+        col0 = max(int(math.floor((xmin - ext.XMin) / self.cellWidth)) - 1, 0)
+        col1 = min(int(math.ceil((xmax - ext.XMin) / self.cellWidth)) + 1, raster.width)
+        row0 = max(int(math.floor((ymin - ext.YMin) / self.cellHeight)) - 1, 0)
+        row1 = min(int(math.ceil((ymax - ext.YMin) / self.cellHeight)) + 1, raster.height)
+        self.xmin = ext.XMin + col0 * self.cellWidth
+        self.ymin = ext.YMin + row0 * self.cellHeight
+        ncols = max(col1 - col0, 0)
+        nrows = max(row1 - row0, 0)
+        self.ymax = self.ymin + nrows * self.cellHeight
+
+        if ncols == 0 or nrows == 0:
+            self.array = numpy.empty((0, 0))
+            return
+        noData = raster.noDataValue
+        if noData is None:
+            arr = arcpy.RasterToNumPyArray(raster, arcpy.Point(self.xmin, self.ymin), ncols, nrows)
+            self.array = arr.astype(float)
+        else:
+            arr = arcpy.RasterToNumPyArray(raster, arcpy.Point(self.xmin, self.ymin), ncols, nrows, noData)
+            self.array = arr.astype(float)
+            self.array[arr == noData] = numpy.nan
+
+    def sample(self, x, y):
+        ''' bilinear surface value at x, y (arrays); NaN off the window or on NoData '''
+        x = numpy.asarray(x, dtype=float)
+        y = numpy.asarray(y, dtype=float)
+        nrows, ncols = self.array.shape
+        if nrows == 0:
+            return numpy.full(x.shape, numpy.nan)
+        # fractional row/column of the cell centers
+        fc = (x - self.xmin) / self.cellWidth - 0.5
+        fr = (self.ymax - y) / self.cellHeight - 0.5
+        inside = (fc >= -0.5) & (fc <= ncols - 0.5) & (fr >= -0.5) & (fr <= nrows - 0.5)
+        fc = numpy.clip(fc, 0.0, ncols - 1.0)
+        fr = numpy.clip(fr, 0.0, nrows - 1.0)
+        c0 = numpy.minimum(numpy.floor(fc).astype(int), max(ncols - 2, 0))
+        r0 = numpy.minimum(numpy.floor(fr).astype(int), max(nrows - 2, 0))
+        c1 = numpy.minimum(c0 + 1, ncols - 1)
+        r1 = numpy.minimum(r0 + 1, nrows - 1)
+        wc = fc - c0
+        wr = fr - r0
+        a = self.array
+        top = a[r0, c0] * (1.0 - wc) + a[r0, c1] * wc
+        bottom = a[r1, c0] * (1.0 - wc) + a[r1, c1] * wc
+        values = top * (1.0 - wr) + bottom * wr
+        return numpy.where(inside, values, numpy.nan)
+
+def LoadSurfaceWindows(surface, observers, reach):
+    '''
+    Return one SurfaceWindow per observer covering reach around it. Observers
+    share a single window when the window around all of them is small enough.
+    '''
+    observers = numpy.asarray(observers, dtype=float).reshape(-1, 2)
+    raster = arcpy.Raster(surface)
+    xmin, ymin = observers.min(axis=0) - reach
+    xmax, ymax = observers.max(axis=0) + reach
+    cells = ((xmax - xmin) / raster.meanCellWidth) * ((ymax - ymin) / raster.meanCellHeight)
+    if cells <= maxWindowCells:
+        window = SurfaceWindow(surface, xmin, ymin, xmax, ymax)
+        return [window] * len(observers)
+    return [SurfaceWindow(surface, x - reach, y - reach, x + reach, y + reach) for x, y in observers]
+
+def FlatRange(velocity, elevationAngle, gravity=gravityMetric):
+    ''' ideal range over flat ground, elevationAngle in degrees '''
+    return velocity ** 2 * numpy.sin(2.0 * numpy.radians(elevationAngle)) / gravity
+
+def MaximumHeight(velocity, elevationAngle, gravity=gravityMetric):
+    ''' ideal apex height above the launch point, elevationAngle in degrees '''
+    return (velocity * numpy.sin(numpy.radians(elevationAngle))) ** 2 / (2.0 * gravity)
+
+def SampleStep(stepRange, linearUnits="Meter"):
+    ''' sample interval along a path: 50 m (328 ft), 10 for ranges up to 1000, 1 up to 100 '''
+    if stepRange <= 100:
+        return 1.0
+    if stepRange <= 1000:
+        return 10.0
+    if linearUnits == "Feet":
+        return 328.0
+    return 50.0
+
+def Heights(distance, velocity, elevationAngle, gravity=gravityMetric):
+    ''' projectile height above the launch point at horizontal distance '''
+    theta = numpy.radians(elevationAngle)
+    return distance * numpy.tan(theta) - gravity * distance ** 2 / (2.0 * (velocity * numpy.cos(theta)) ** 2)
+
+def _noPath(obsIndex, azimuth, elevationAngle, velocity, gravity):
+    ''' the result of a trajectory that starts on NoData '''
+    return {"observer": obsIndex, "azimuth": float(azimuth),
+            "elevation": float(elevationAngle), "path": None,
+            "impact": False, "range": 0.0,
+            "maxHeight": float(MaximumHeight(velocity, elevationAngle, gravity)), "time": 0.0}
+
+def ComputeTrajectories(windows, observers, velocity, elevationAngles, azimuths,
+                        gravity=gravityMetric, linearUnits="Meter", observerZ=None):
+    '''
+    Ideal ballistic paths for every observer x elevation angle x azimuth.
+
+    windows          SurfaceWindow per observer (see LoadSurfaceWindows)
+    observers        (M, 2) array of observer X, Y in the surface coordinate system
+    elevationAngles  degrees above horizontal
+    azimuths         geographic bearings, degrees
+    observerZ        M launch elevations, sampled from the surface if None
+
+    Returns a list of dictionaries with the observer index, azimuth,
+    elevation angle, the (K, 4) X, Y, Z, M(time) path ending at the terrain
+    impact point (when it was found), the impact flag, the 3D range, the
+    maximum height and the time to impact. The path is None, and impact
+    False, when the observer stands on NoData.
+    '''
+    observers = numpy.asarray(observers, dtype=float).reshape(-1, 2)
+    elevationAngles = numpy.atleast_1d(numpy.asarray(elevationAngles, dtype=float))
+    azimuths = numpy.atleast_1d(numpy.asarray(azimuths, dtype=float))
+    if observerZ is None:
+        observerZ = numpy.array([w.sample(x, y) for w, (x, y) in zip(windows, observers)], dtype=float)
+    observerZ = numpy.asarray(observerZ, dtype=float)
+
+    results = []
+    for obsIndex, (window, (x0, y0), z0) in enumerate(zip(windows, observers, observerZ)):
+        if numpy.isnan(z0):
+            for elevationAngle in elevationAngles:
+                for azimuth in azimuths:
+                    results.append(_noPath(obsIndex, azimuth, elevationAngle, velocity, gravity))
+            continue
+        for elevationAngle in elevationAngles:
+            theta = math.radians(elevationAngle)
+            maxHeight = float(MaximumHeight(velocity, elevationAngle, gravity))
+            # since we are using a surface assume we might be shooting downhill, so the flat range needs to be extended
+            stepRange = int(2 * FlatRange(velocity, elevationAngle, gravity))
+            if stepRange <= 0:
+                # projectile is shot straight up into the air
+                tHalf = velocity * math.sin(theta) / gravity
+                path = numpy.array([[x0, y0, z0, 0.0],
+                                    [x0, y0, z0 + maxHeight, tHalf],
+                                    [x0, y0, z0, 2.0 * tHalf]])
+                for azimuth in azimuths:
+                    results.append({"observer": obsIndex, "azimuth": float(azimuth),
+                                    "elevation": float(elevationAngle), "path": path,
+                                    "impact": True, "range": 0.0,
+                                    "maxHeight": maxHeight, "time": 2.0 * tHalf})
+                continue
+
+            step = SampleStep(stepRange, linearUnits)
+            distance = numpy.arange(0.0, stepRange, step)
+            heights = Heights(distance, velocity, elevationAngle, gravity)
+            times = distance / (velocity * math.cos(theta))
+
+            # (A, K) sample positions for every azimuth at once
+            bearing = numpy.radians(azimuths)[:, numpy.newaxis]
+            xs = x0 + distance[numpy.newaxis, :] * numpy.sin(bearing)
+            ys = y0 + distance[numpy.newaxis, :] * numpy.cos(bearing)
+            zs = numpy.broadcast_to(z0 + heights[numpy.newaxis, :], xs.shape)
+            surf = window.sample(xs, ys)
+
+            below = surf > zs
+            below[:, 0] = False
+            noData = numpy.isnan(surf)
+            hitIndex = numpy.where(below.any(axis=1), below.argmax(axis=1), distance.size)
+            noDataIndex = numpy.where(noData.any(axis=1), noData.argmax(axis=1), distance.size)
+
+            for a, azimuth in enumerate(azimuths):
+                hit = hitIndex[a] < noDataIndex[a]
+                last = hitIndex[a] if hit else noDataIndex[a] - 1
+                if last < 0:
+                    results.append(_noPath(obsIndex, azimuth, elevationAngle, velocity, gravity))
+                    continue
+                path = numpy.column_stack([xs[a, :last + 1], ys[a, :last + 1],
+                                           zs[a, :last + 1], times[:last + 1]])
+                if hit and last > 0:
+                    # interpolate the impact point between the last two samples
+                    above0 = zs[a, last - 1] - surf[a, last - 1]
+                    above1 = zs[a, last] - surf[a, last]
+                    f = above0 / (above0 - above1) if above0 != above1 else 1.0
+                    path[-1] = path[-2] + f * (path[-1] - path[-2])
+                    impactZ = window.sample(path[-1, 0], path[-1, 1])
+                    if not numpy.isnan(impactZ):
+                        path[-1, 2] = impactZ
+                dddRange = float(numpy.sqrt(((path[-1, :3] - path[0, :3]) ** 2).sum()))
+                results.append({"observer": obsIndex, "azimuth": float(azimuth),
+                                "elevation": float(elevationAngle), "path": path,
+                                "impact": bool(hit), "range": dddRange,
+                                "maxHeight": maxHeight, "time": float(path[-1, 3])})
+    return results
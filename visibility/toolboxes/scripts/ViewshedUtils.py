@@ -0,0 +1,560 @@
+# coding: utf-8
+'''
+-----------------------------------------------------------------------------
+Copyright 2026 Esri
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+-----------------------------------------------------------------------------
+
+==================================================
+ViewshedUtils.py
+--------------------------------------------------
+requirements: ArcGIS 10.3.1+, ArcGIS Pro 1.2+, Spatial Analyst
+author: ArcGIS Solutions
+company: Esri
+==================================================
+description: Viewshed engine for RLOS.py, TowerLOS.py and TowersLOS.py.
+Surfaces projected to an Azimuthal Equidistant (AZED) projection centered
+on the observers are cached on disk, keyed by the surface, the projection
+center and the extent, so repeated runs reuse them. The viewsheds of many
+observers run in a process pool, each worker in its own scratch
+geodatabase, and the polygons are copied to the outputs at the end.
+The cache is trimmed to cacheMaxBytes and cacheMaxAge before each run.
+A NumPy radial line of sight (R2) kernel computes visibility for
+thousands of observers in process, each with its own modifiers.
+==================================================
+history:
+10/19/2026 - original coding
+==================================================
+'''
+import os
+import math
+import uuid
+import shutil
+import hashlib
+import multiprocessing
+import numpy
+import arcpy
+import TrajectoryUtils
+import ProcessPoolUtils
+
+terrestrialRefractivityCoefficient = 0.13
+polygonSimplify = "SIMPLIFY"
+
+# length, in meters, of semimajor axis of WGS_1984 spheroid.
+earthRadius = 6378137.0
+
+# bump when the way tiles are made changes so cached tiles are rebuilt
+tileVersion = "1"
+
+# the tile cache is trimmed to this size (bytes) and age (seconds)
+cacheMaxBytes = 2 * 1024 * 1024 * 1024
+cacheMaxAge = 30 * 24 * 60 * 60
+
+srWGS84 = arcpy.SpatialReference(4326) # GCS_WGS_1984
+
+def AzimuthalEquidistant(lon, lat):
+    ''' WGS 1984 Azimuthal Equidistant spatial reference centered on lon, lat '''
+    strAZED = 'PROJCS["World_Azimuthal_Equidistant",GEOGCS["GCS_WGS_1984",DATUM["D_WGS_1984",' + \
+              'SPHEROID["WGS_1984",6378137.0,298.257223563]],PRIMEM["Greenwich",0.0],' + \
+              'UNIT["Degree",0.0174532925199433]],PROJECTION["Azimuthal_Equidistant"],' + \
+              'PARAMETER["False_Easting",0.0],PARAMETER["False_Northing",0.0],' + \
+              'PARAMETER["Central_Meridian",' + repr(float(lon)) + '],' + \
+              'PARAMETER["Latitude_Of_Origin",' + repr(float(lat)) + '],UNIT["Meter",1.0]]'
+    sr = arcpy.SpatialReference()
+    sr.loadFromString(strAZED)
+    return sr
+
+def HorizonDistance(elevation):
+    ''' distance (meters) to the horizon from a height above the spheroid '''
+    return math.sqrt(math.pow(earthRadius + float(elevation), 2) - math.pow(earthRadius, 2))
+
+def _modified(path):
+    '''
+    Last time the raster at path was written: the file time of a single
+    file raster, else the latest file time in its folder (a GRID) or its
+    workspace (a file geodatabase). None when the raster is not on the
+    file system (an enterprise geodatabase, for example).
+    '''
+    if os.path.isfile(path):
+        return os.path.getmtime(path)
+    folder = path if os.path.isdir(path) else os.path.dirname(path)
+    if not os.path.isdir(folder):
+        return None
+    modified = os.path.getmtime(folder)
+    for root, folders, files in os.walk(folder):
+        for name in files:
+            modified = max(modified, os.path.getmtime(os.path.join(root, name)))
+    return modified
+
+def SurfaceSignature(surface):
+    '''
+    Identify the content of a surface raster: its catalog path, extent, cell
+    size and the time it was last written. The time is None, and tiles of
+    the surface are not reused, when it cannot be read from the file system.
+    '''
+    desc = arcpy.Describe(surface)
+    path = desc.catalogPath
+    extent = desc.extent
+    return (os.path.normcase(os.path.abspath(path)),
+            extent.XMin, extent.YMin, extent.XMax, extent.YMax,
+            desc.meanCellWidth, desc.meanCellHeight, _modified(path))
+
+def TileKey(signature, lon, lat, extent, cellSize=None):
+    '''
+    Cache key of a projected surface tile: the surface signature, the AZED
+    center (rounded to about 1 cm), the AZED extent (xmin, ymin, xmax,
+    ymax, rounded to the meter) and the output cell size.
+    '''
+    content = repr((tileVersion, tuple(signature),
+                    round(float(lon), 7), round(float(lat), 7),
+                    tuple(int(round(float(v))) for v in extent),
+                    None if cellSize is None else round(float(cellSize), 6)))
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+def ProjectedSurface(surface, lon, lat, extent, cacheFolder, signature=None, cellSize=None):
+    '''
+    Return the path of surface projected to the AZED centered on lon, lat and
+    clipped to extent (xmin, ymin, xmax, ymax in AZED meters), resampled to
+    cellSize meters if given, from cacheFolder when it is already there.
+
+    Tiles are written to a temporary folder and renamed into place, so
+    concurrent workers never read a partly written tile.
+    '''
+    if signature is None:
+        signature = SurfaceSignature(surface)
+    if signature[-1] is None:
+        # no way to tell when the surface changes: build a tile of its own
+        signature = tuple(signature) + (uuid.uuid4().hex,)
+    key = TileKey(signature, lon, lat, extent, cellSize)
+    tileFolder = os.path.join(cacheFolder, key)
+    tile = os.path.join(tileFolder, "surface.tif")
+    if os.path.exists(tile):
+        try:
+            # mark the tile as recently used for PruneTileCache
+            os.utime(tileFolder, None)
+        except OSError:
+            pass
+        return tile
+
+    if not os.path.exists(cacheFolder):
+        try:
+            os.makedirs(cacheFolder)
+        except OSError:
+            pass # made by another worker
+    buildFolder = os.path.join(cacheFolder, key + "_" + str(os.getpid()))
+    if os.path.exists(buildFolder):
+        shutil.rmtree(buildFolder)
+    os.makedirs(buildFolder)
+
+    previousExtent = arcpy.env.extent
+    try:
+        arcpy.env.extent = arcpy.Extent(*extent)
+        arcpy.ProjectRaster_management(surface, os.path.join(buildFolder, "surface.tif"),
+                                       AzimuthalEquidistant(lon, lat), "#",
+                                       "#" if cellSize is None else str(cellSize))
+    finally:
+        arcpy.env.extent = previousExtent
+    try:
+        os.rename(buildFolder, tileFolder)
+    except OSError:
+        # another worker cached the same tile first
+        shutil.rmtree(buildFolder, True)
+    return tile
+
+def DefaultCacheFolder():
+    ''' the tile cache folder in the scratch folder '''
+    return os.path.join(arcpy.env.scratchFolder, "viewshedCache")
+
+def PruneTileCache(cacheFolder=None, maxBytes=cacheMaxBytes, maxAge=cacheMaxAge):
+    ''' drop the least recently used tiles of cacheFolder beyond maxBytes or maxAge seconds '''
+    if cacheFolder is None:
+        cacheFolder = DefaultCacheFolder()
+    return ProcessPoolUtils.PruneCache(cacheFolder, maxBytes, maxAge)
+
+def ObserverJob(jobID, x, y, sr, offset, radius, toHorizon=False):
+    '''
+    A viewshed job for one observer at x, y (in sr) with an OFFSETA of
+    offset and a RADIUS2 of radius meters. With toHorizon the radius is
+    replaced by the distance to the horizon from the observer.
+    '''
+    point = arcpy.PointGeometry(arcpy.Point(x, y), sr).projectAs(srWGS84)
+    return {"id": jobID, "x": x, "y": y, "sr": sr.exportToString(),
+            "lon": point.firstPoint.X, "lat": point.firstPoint.Y,
+            "offset": float(offset or 0.0), "radius": float(radius),
+            "toHorizon": bool(toHorizon)}
+
+def RunViewshed(job, surface, cacheFolder, workFolder, signature=None):
+    '''
+    Viewshed polygons for one observer job. The surface is projected to an
+    AZED centered on the observer (or taken from the tile cache), Viewshed
+    is run with curved earth and refraction correction and the polygons,
+    clipped to the observer's radius unless it sees to the horizon, get a
+    'visibility' field with the viewshed value.
+    Returns the path of the polygon feature class in this process's
+    scratch geodatabase.
+    '''
+    if arcpy.CheckExtension("Spatial") == "Available":
+        arcpy.CheckOutExtension("Spatial")
+    arcpy.env.overwriteOutput = True
+    gdb = ProcessPoolUtils.ScratchGDB(workFolder, "viewshed")
+    name = "vshed_" + str(job["id"])
+
+    radius = job["radius"]
+    if job["toHorizon"]:
+        sr = arcpy.SpatialReference()
+        sr.loadFromString(job["sr"])
+        point = arcpy.PointGeometry(arcpy.Point(job["x"], job["y"]), sr)
+        point = point.projectAs(arcpy.Describe(surface).spatialReference).firstPoint
+        result = arcpy.GetCellValue_management(surface, str(point.X) + " " + str(point.Y))
+        try:
+            elevation = float(result.getOutput(0))
+        except ValueError:
+            elevation = 0.0 # NoData under the observer
+        radius = HorizonDistance(elevation + job["offset"])
+
+    azed = AzimuthalEquidistant(job["lon"], job["lat"])
+    reach = math.ceil(radius * 1.05)
+    extent = (-reach, -reach, reach, reach)
+    tile = ProjectedSurface(surface, job["lon"], job["lat"], extent, cacheFolder, signature)
+
+    # the observer sits at the center of the AZED
+    observer = os.path.join(gdb, "obs_" + str(job["id"]))
+    arcpy.CreateFeatureclass_management(gdb, os.path.basename(observer), "POINT",
+                                        "#", "DISABLED", "DISABLED", azed)
+    arcpy.AddField_management(observer, "OFFSETA", "DOUBLE", "", "", "", "Observer Offset")
+    arcpy.AddField_management(observer, "RADIUS2", "DOUBLE", "", "", "", "Farthest distance")
+    with arcpy.da.InsertCursor(observer, ["SHAPE@XY", "OFFSETA", "RADIUS2"]) as cursor:
+        cursor.insertRow([(0.0, 0.0), job["offset"], radius])
+
+    vshed = arcpy.sa.Viewshed(tile, observer, 1.0, "CURVED_EARTH",
+                              terrestrialRefractivityCoefficient)
+    rasPoly = os.path.join(gdb, "ras_poly_" + str(job["id"]))
+    arcpy.RasterToPolygon_conversion(vshed, rasPoly, polygonSimplify)
+    del vshed
+
+    output = os.path.join(gdb, name)
+    if job["toHorizon"]:
+        arcpy.CopyFeatures_management(rasPoly, output)
+    else:
+        circle = arcpy.PointGeometry(arcpy.Point(0.0, 0.0), azed).buffer(radius)
+        arcpy.Clip_analysis(rasPoly, circle, output)
+    arcpy.AddField_management(output, "visibility", "DOUBLE", "", "", "", "Observer Visibility")
+    with arcpy.da.UpdateCursor(output, ["gridcode", "visibility"]) as cursor:
+        for row in cursor:
+            cursor.updateRow([row[0], row[0]])
+    for scratch in [observer, rasPoly]:
+        arcpy.Delete_management(scratch)
+    return output
+
+def _viewshedJob(args):
+    ''' pool worker: (job, surface, cacheFolder, workFolder, signature) '''
+    return RunViewshed(*args)
+
+def RunViewsheds(jobs, surface, cacheFolder=None, workFolder=None, processes=None):
+    '''
+    Run the viewshed of every observer job across a pool of processes
+    (serially when processes is 1 or there is one job).
+    Returns {job id: polygon feature class}, in the workers' scratch
+    geodatabases; copy them to their outputs with CopyViewsheds.
+    '''
+    if cacheFolder is None:
+        cacheFolder = DefaultCacheFolder()
+    if workFolder is None:
+        workFolder = arcpy.env.scratchFolder
+    PruneTileCache(cacheFolder)
+    signature = SurfaceSignature(surface)
+    surfacePath = signature[0]
+    tasks = [(job, surfacePath, cacheFolder, workFolder, signature) for job in jobs]
+
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    processes = max(1, min(int(processes), len(tasks)))
+    if processes == 1:
+        results = [_viewshedJob(task) for task in tasks]
+    else:
+        pool = ProcessPoolUtils.StartPool(processes)
+        try:
+            results = pool.map(_viewshedJob, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    return dict(zip([job["id"] for job in jobs], results))
+
+def CopyViewsheds(results, outputs):
+    '''
+    Copy the viewshed polygons of RunViewsheds to their outputs,
+    {job id: output feature class}, and remove the scratch copies.
+    '''
+    for jobID, output in outputs.items():
+        arcpy.CopyFeatures_management(results[jobID], output)
+        arcpy.Delete_management(results[jobID])
+    return outputs
+
+# ----------------------------------------------------------------------------
+# NumPy radial line of sight (R2) kernel
+
+# Earth diameter (meters) used by the Viewshed curvature correction
+earthDiameter = 12740000.0
+
+# Observer visibility modifier fields and their defaults
+# (None for RADIUS2: to the edge of the surface)
+observerModifiers = [("OFFSETA", 1.0), ("OFFSETB", 0.0),
+                     ("RADIUS1", 0.0), ("RADIUS2", None),
+                     ("AZIMUTH1", 0.0), ("AZIMUTH2", 360.0),
+                     ("VERT1", 90.0), ("VERT2", -90.0)]
+
+# ray templates by radius in cells, shared by all observers of that radius
+_rayTemplates = {}
+
+def RayTemplate(radiusCells):
+    '''
+    Row and column offsets, (rays, radiusCells) each, of the cells crossed
+    by rays from an observer to every cell on the perimeter of the square
+    of half-size radiusCells around it (R2 sampling: one sample per step
+    along the major axis of the ray).
+    '''
+    radiusCells = int(radiusCells)
+    if radiusCells not in _rayTemplates:
+        n = radiusCells
+        side = numpy.arange(-n, n)
+        # perimeter cells clockwise from the top left corner
+        endRows = numpy.concatenate([numpy.full(2 * n, -n), side, numpy.full(2 * n, n), -side])
+        endCols = numpy.concatenate([side, numpy.full(2 * n, n), -side, numpy.full(2 * n, -n)])
+        steps = numpy.arange(1, n + 1) / float(n)
+        rows = numpy.rint(endRows[:, numpy.newaxis] * steps[numpy.newaxis, :]).astype(int)
+        cols = numpy.rint(endCols[:, numpy.newaxis] * steps[numpy.newaxis, :]).astype(int)
+        _rayTemplates[radiusCells] = (rows, cols)
+    return _rayTemplates[radiusCells]
+
+def Visibility(dem, cellWidth, cellHeight, row, col, offsetA=1.0, offsetB=0.0,
+               radius1=0.0, radius2=None, azimuth1=0.0, azimuth2=360.0,
+               vert1=90.0, vert2=-90.0, curvedEarth=True,
+               refractivity=terrestrialRefractivityCoefficient):
+    '''
+    Boolean array of the cells of dem (float, NoData as NaN, in meters) a
+    single observer at cell row, col can see, using the observer modifiers
+    of the Viewshed tool:
+
+    offsetA             observer height above the surface
+    offsetB             height added to each target cell
+    radius1, radius2    horizontal search distance limits (radius2 None: no limit)
+    azimuth1, azimuth2  horizontal scan limits, geographic degrees, clockwise
+    vert1, vert2        upper and lower vertical angle limits, degrees
+
+    With curvedEarth, target elevations are lowered by the earth curvature,
+    less the refractivity share: d^2 (1 - refractivity) / earthDiameter.
+    '''
+    nrows, ncols = dem.shape
+    visible = numpy.zeros(dem.shape, dtype=bool)
+    observerZ = dem[row, col]
+    if numpy.isnan(observerZ):
+        return visible
+    observerZ += offsetA
+
+    # the square around the observer holding the search radius, within dem
+    reach = max(row, col, nrows - 1 - row, ncols - 1 - col)
+    if radius2 is not None:
+        reach = min(reach, int(math.ceil(float(radius2) / min(cellWidth, cellHeight))))
+    if reach < 1:
+        visible[row, col] = True
+        return visible
+    dr, dc = RayTemplate(reach)
+    rows = row + dr
+    cols = col + dc
+    inside = (rows >= 0) & (rows < nrows) & (cols >= 0) & (cols < ncols)
+    rows = numpy.clip(rows, 0, nrows - 1)
+    cols = numpy.clip(cols, 0, ncols - 1)
+
+    z = numpy.where(inside, dem[rows, cols], numpy.nan)
+    dx = dc * float(cellWidth)
+    dy = -dr * float(cellHeight)
+    distance = numpy.hypot(dx, dy)
+    if curvedEarth:
+        z = z - distance ** 2 * (1.0 - refractivity) / earthDiameter
+
+    # slope of the sight line to each cell's surface and target, and the
+    # highest slope met before it along the ray (the local horizon)
+    with numpy.errstate(invalid="ignore"):
+        surfaceSlope = (z - observerZ) / distance
+        targetSlope = (z + offsetB - observerZ) / distance
+    horizon = numpy.maximum.accumulate(numpy.where(numpy.isnan(surfaceSlope), -numpy.inf, surfaceSlope),
+                                       axis=1)
+    horizon = numpy.concatenate([numpy.full((horizon.shape[0], 1), -numpy.inf), horizon[:, :-1]], axis=1)
+    with numpy.errstate(invalid="ignore"):
+        seen = inside & (targetSlope >= horizon)
+
+    # observer modifiers
+    seen &= distance >= radius1
+    if radius2 is not None:
+        seen &= distance <= radius2
+    scan = numpy.mod(float(azimuth2) - float(azimuth1), 360.0)
+    if scan != 0.0 or azimuth1 == azimuth2:
+        bearing = numpy.mod(numpy.degrees(numpy.arctan2(dx, dy)), 360.0)
+        seen &= numpy.mod(bearing - azimuth1, 360.0) <= scan
+    if vert1 < 90.0 or vert2 > -90.0:
+        angle = numpy.degrees(numpy.arctan(targetSlope))
+        with numpy.errstate(invalid="ignore"):
+            seen &= (angle <= vert1) & (angle >= vert2)
+
+    visible[rows[seen], cols[seen]] = True
+    visible[row, col] = True
+    return visible
+
+# dem shared by the kernel workers, set once per process
+_kernelSurface = {}
+
+def _initKernel(dem, cellWidth, cellHeight, curvedEarth, refractivity):
+    ''' pool initializer: keep the dem in the worker '''
+    _kernelSurface.update({"dem": dem, "cellWidth": cellWidth, "cellHeight": cellHeight,
+                           "curvedEarth": curvedEarth, "refractivity": refractivity})
+
+def _kernelJob(args):
+    ''' pool worker: (indexed observers, perObserver) -> visible count or [(index, raster)] '''
+    observers, perObserver = args
+    surface = _kernelSurface
+    counts = None
+    rasters = []
+    for index, observer in observers:
+        visible = Visibility(surface["dem"], surface["cellWidth"], surface["cellHeight"],
+                             curvedEarth=surface["curvedEarth"],
+                             refractivity=surface["refractivity"], **observer)
+        if perObserver:
+            rasters.append((index, visible))
+        elif counts is None:
+            counts = visible.astype(numpy.int32)
+        else:
+            counts += visible
+    return rasters if perObserver else counts
+
+def BatchVisibility(dem, cellWidth, cellHeight, observers, perObserver=False,
+                    curvedEarth=True, refractivity=terrestrialRefractivityCoefficient,
+                    processes=None):
+    '''
+    Visibility for many observers on one dem, across a pool of processes
+    (serially when processes is 1). observers is a list of dictionaries of
+    Visibility keyword arguments, each with at least row and col.
+
+    Returns an int32 array counting the observers that see each cell, or
+    with perObserver, a list of one boolean array per observer.
+    '''
+    dem = numpy.asarray(dem, dtype=float)
+    observers = list(observers)
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    processes = max(1, min(int(processes), len(observers)))
+    # a few chunks per process keeps the workers busy with uneven radii
+    chunkCount = processes * 4 if processes > 1 else 1
+    indexed = list(enumerate(observers))
+    chunks = [(indexed[i::chunkCount], perObserver) for i in range(chunkCount)
+              if indexed[i::chunkCount]]
+    initargs = (dem, cellWidth, cellHeight, curvedEarth, refractivity)
+
+    if processes == 1:
+        _initKernel(*initargs)
+        results = [_kernelJob(chunk) for chunk in chunks]
+    else:
+        pool = ProcessPoolUtils.StartPool(processes, _initKernel, initargs)
+        try:
+            results = pool.map(_kernelJob, chunks)
+        finally:
+            pool.close()
+            pool.join()
+
+    if perObserver:
+        # put the rasters back in observer order
+        rasters = [None] * len(observers)
+        for chunkRasters in results:
+            for index, raster in chunkRasters:
+                rasters[index] = raster
+        return rasters
+    counts = numpy.zeros(dem.shape, dtype=numpy.int32)
+    for partial in results:
+        if partial is not None:
+            counts += partial
+    return counts
+
+def ReadObservers(observers, sr):
+    '''
+    Observer positions (in sr) and visibility modifiers from a point feature
+    class. Missing modifier fields, and NULL values, take the defaults in
+    observerModifiers. Returns (OIDs, (M, 2) positions, list of modifier
+    dictionaries keyed by Visibility argument name).
+    '''
+    fieldNames = [f.name.upper() for f in arcpy.ListFields(observers)]
+    present = [name for name, default in observerModifiers if name in fieldNames]
+    arr = arcpy.da.FeatureClassToNumPyArray(observers, ["OID@", "SHAPE@X", "SHAPE@Y"] + present,
+                                            spatial_reference=sr, null_value=numpy.nan)
+    arguments = {"OFFSETA": "offsetA", "OFFSETB": "offsetB", "RADIUS1": "radius1",
+                 "RADIUS2": "radius2", "AZIMUTH1": "azimuth1", "AZIMUTH2": "azimuth2",
+                 "VERT1": "vert1", "VERT2": "vert2"}
+    modifiers = []
+    for record in arr:
+        values = {}
+        for name, default in observerModifiers:
+            value = float(record[name]) if name in present else numpy.nan
+            values[arguments[name]] = default if numpy.isnan(value) else value
+        modifiers.append(values)
+    positions = numpy.column_stack([arr["SHAPE@X"], arr["SHAPE@Y"]]).astype(float)
+    return arr["OID@"], positions, modifiers
+
+def RadialLOS(surface, observers, outputRaster=None, perObserver=False,
+              curvedEarth=True, refractivity=terrestrialRefractivityCoefficient,
+              processes=None):
+    '''
+    In-process radial line of sight for every observer of a point feature
+    class, honoring each observer's own OFFSETA, OFFSETB, RADIUS1, RADIUS2,
+    AZIMUTH1/2 and VERT1/2. surface must have a projected coordinate
+    system in meters (e.g. a tile from ProjectedSurface).
+
+    The surface is read once, around all observers out to their largest
+    RADIUS2 (all of it if any observer has none). Returns (counts, window)
+    with the int32 observer count per cell, or (list of boolean arrays, one
+    per observer, window) with perObserver; window is the
+    TrajectoryUtils.SurfaceWindow the arrays are on. The counts are saved
+    to outputRaster when given.
+    '''
+    raster = arcpy.Raster(surface)
+    sr = raster.spatialReference
+    if sr.type == "Geographic":
+        raise ValueError("Radial line of sight needs a projected surface")
+    oids, positions, modifiers = ReadObservers(observers, sr)
+    if len(oids) == 0:
+        raise ValueError("No observers")
+
+    radii = [m["radius2"] for m in modifiers]
+    ext = raster.extent
+    if any(r is None for r in radii):
+        xmin, ymin, xmax, ymax = ext.XMin, ext.YMin, ext.XMax, ext.YMax
+    else:
+        reach = max(radii)
+        xmin, ymin = positions.min(axis=0) - reach
+        xmax, ymax = positions.max(axis=0) + reach
+    window = TrajectoryUtils.SurfaceWindow(surface, xmin, ymin, xmax, ymax)
+    nrows, ncols = window.array.shape
+
+    jobs = []
+    for (x, y), observer in zip(positions, modifiers):
+        row = int(math.floor((window.ymax - y) / window.cellHeight))
+        col = int(math.floor((x - window.xmin) / window.cellWidth))
+        if 0 <= row < nrows and 0 <= col < ncols:
+            observer = dict(observer, row=row, col=col)
+            jobs.append(observer)
+    result = BatchVisibility(window.array, window.cellWidth, window.cellHeight, jobs,
+                             perObserver, curvedEarth, refractivity, processes)
+
+    if outputRaster and not perObserver:
+        out = arcpy.NumPyArrayToRaster(result, arcpy.Point(window.xmin, window.ymin),
+                                       window.cellWidth, window.cellHeight)
+        out.save(outputRaster)
+        arcpy.DefineProjection_management(outputRaster, sr)
+    return result, window
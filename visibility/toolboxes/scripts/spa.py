@@ -15,6 +15,7 @@
 # spa.py
 # Description: Sun Position and Hillshade
 # Requirements: ArcGIS Desktop Standard
+# 10/19/2026 - Sun position from SunPositionUtils; the hour of day now keeps minutes and seconds
 #------------------------------------------------------------------------------
 
 
@@ -25,6 +26,7 @@ from arcpy import env
 from arcpy import sa
 from arcpy.sa import *
 from time import mktime, gmtime, strftime
+import SunPositionUtils
 
 timezone = {
     '(UTC-12:00) International Date Line West': -12,
@@ -103,127 +105,22 @@ def CenterPoint(fc):
 
     return point
 
-#Returns the Julian day number of a date.
-def date_to_julian_day(my_date):
-    a = (14 - my_date.month)//12
-    y = my_date.year + 4800 - a
-    m = my_date.month + 12*a - 3
-    return my_date.day + ((153*m + 2)//5) + 365*y + y//4 - y//100 + y//400 - 32045
-
 # Given a datetime and a observation point, determine the position of the sun
 def CalculateSunPosition(date, observerPoint):
 
     if debug == True:
         arcpy.AddMessage("Determining sun position for date: " + str(date))
+        arcpy.AddMessage("lat: " + str(observerPoint.Y))
+        arcpy.AddMessage("lon: " + str(observerPoint.X))
 
-    twoPi = math.pi * 2
-    lat = observerPoint.Y
-    lon = observerPoint.X
-
-    if debug == True:
-        arcpy.AddMessage("lat: " + str(lat))
-        arcpy.AddMessage("lon: " + str(lon))
-
-    # Determine the the day in the year (i.e. 123rd, 345th, 366th, etc...) on which the requested date falls
-    timetuple = date.timetuple()
-    tempHour = timetuple.tm_hour + (timetuple.tm_min / 60) + (timetuple.tm_sec/3600)
-    julianDate = date_to_julian_day(date)
-    time = julianDate - 2451545.0
-
-    # Ecliptic coordinates
-
-    # Mean Longitude
-    mnlong = 280.460 + .9856474 * time
-    mnlong = mnlong % 360
-    if mnlong < 0:
-        mnlong += 360
-
-    # Mean Anomaly
-    mnanom = 357.528 + .9856003 * time
-    mnanom = mnanom % 360
-    if mnanom < 0:
-        mnanom += 360
-    mnanom = math.radians(mnanom)
-
-    # Ecliptic longitude and obliquity of ecliptic
-    eclong = mnlong + 1.915 * math.sin(mnanom) + 0.020 * math.sin(2*mnanom)
-    eclong = eclong % 360
-    if eclong<0:
-        eclong += 360
-    oblqec = 23.439 - 0.0000004 * time
-    eclong = math.radians(eclong)
-    oblqec = math.radians(oblqec)
-
-    # Celestial Coordinates
-    # Right ascension and declination
-    num = math.cos(oblqec) * math.sin(eclong)
-    den = math.cos(eclong)
-    ra = math.atan(num / den)
-    if den < 0:
-        ra += math.pi
-
-    if den >= 0 and num < 0:
-        ra += twoPi
-    dec = math.asin(math.sin(oblqec) * math.sin(eclong))
-
-    # Local coordinates
-    # Greenwich mean sidereal time
-    gmst = 6.697375 + .0657098242 * time + tempHour
-    gmst = gmst % 24
-    if gmst < 0:
-        gmst += 24
-
-    # Local mean sidereal time
-    lmst = gmst + lon / 15
-    lmst = lmst % 24
-    if lmst < 0:
-        lmst += 24
-    lmst = lmst * 15.0
-    lmst = math.radians(lmst)
-
-    # Hour angle
-    ha = lmst - ra
-    if ha < (-math.pi):
-        ha += twoPi
-    if ha > math.pi:
-        ha -= twoPi
-
-    # Latitude to Radians
-    latRad = math.radians(lat)
-
-    # Solar zenith angle amd Azimuth
-    zenithAngle = math.acos(math.sin(latRad) * math.sin(dec) + math.cos(latRad) * math.cos(dec) * math.cos(ha))
-    az = math.acos(((math.sin(latRad) * math.cos(zenithAngle)) - math.sin(dec)) / (math.cos(latRad) * math.sin(zenithAngle)))
-
-    # Elevation
-    el = math.asin(math.sin(dec) * math.sin(latRad) + math.cos(dec) * math.cos(latRad) * math.cos(ha))
-
-    if debug == True:
-        arcpy.AddMessage("dec: " + str(dec))
-        arcpy.AddMessage("latRad: " + str(latRad))
-        arcpy.AddMessage("ha: " + str(ha))
-
-    # For logic and names, see Spencer, J.W. 1989 Solar Energy.  42(4):353
-    cosAzPos = ( 0 <= (math.sin(dec) - math.sin(el) * math.sin(lat)) )
-    sinAzNeg = ( math.sin(az) < 0 )
-
-    if debug == True:
-        arcpy.AddMessage("Calculated Elevation Radians: " + str(el))
-    if debug == True:
-        arcpy.AddMessage("Calculated Azimuth Radians: " + str(az))
-
-    el = math.degrees(el)
-    az = math.degrees(az)
-
-    if ha > 0:
-        az = az + 180
-    else:
-        az = 540 - az
-    az = az % 360
+    # vectorized calculation, see SunPositionUtils.SolarPosition for the
+    # batch version over many times and locations
+    az, el = SunPositionUtils.SolarPosition([date], observerPoint.X, observerPoint.Y)
+    az = float(az[0])
+    el = float(el[0])
 
     if debug == True:
         arcpy.AddMessage("Calculated Elevation Degrees: " + str(el))
-    if debug == True:
         arcpy.AddMessage("Calculated Azimuth Degrees: " + str(az))
 
     sp = SunPosition(date,observerPoint,az,el)